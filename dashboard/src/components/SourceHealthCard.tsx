@@ -11,9 +11,23 @@ interface Source {
   status: 'active' | 'disabled'
   lastChecked?: { seconds: number }
   lastSuccess?: { seconds: number }
+  lastError?: string | null
+  consecutiveFailures?: number
+  circuitState?: 'closed' | 'open' | 'half_open'
   articlesLast24h?: number
 }
 
+function healthDot(source: Source): { color: string; title: string } {
+  if (source.status !== 'active') return { color: 'bg-zinc-300', title: source.status }
+  if (source.circuitState === 'open') {
+    return { color: 'bg-red-500', title: `Paused after repeated failures: ${source.lastError ?? 'unknown error'}` }
+  }
+  if (source.consecutiveFailures) {
+    return { color: 'bg-amber-500', title: `${source.consecutiveFailures} failed fetch(es): ${source.lastError ?? 'unknown error'}` }
+  }
+  return { color: 'bg-green-500', title: source.status }
+}
+
 interface SourceStats {
   total: number
   active: number
@@ -158,10 +172,8 @@ export default function SourceHealthCard() {
                   </span>
                 )}
                 <div
-                  className={`h-2 w-2 rounded-full ${
-                    source.status === 'active' ? 'bg-green-500' : 'bg-zinc-300'
-                  }`}
-                  title={source.status}
+                  className={`h-2 w-2 rounded-full ${healthDot(source).color}`}
+                  title={healthDot(source).title}
                 />
               </div>
             </div>
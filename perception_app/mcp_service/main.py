@@ -16,6 +16,7 @@ Deployment:
 
 import logging
 import json
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
@@ -27,6 +28,11 @@ from fastapi.middleware.cors import CORSMiddleware
 
 # Import routers (created in next step)
 from routers import rss, api, webpage, storage, briefs, logging as log_router, notifications
+from routers import http_pool
+from routers.feed_cache import validator_cache
+from routers.parse_executor import parse_executor, loop_lag_monitor
+from routers.result_cache import result_cache
+from routers.host_limiter import host_limiter
 
 # Configure structured logging
 logging.basicConfig(
@@ -35,13 +41,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifecycle: start the event-loop lag monitor, and release
+    pooled outbound connections and parse workers on shutdown.
+    """
+    loop_lag_monitor.start()
+    yield
+    await loop_lag_monitor.stop()
+    await http_pool.close_client()
+    parse_executor.shutdown()
+
+
 # FastAPI app
 app = FastAPI(
     title="Perception MCP Service",
     description="Model Context Protocol tools for Perception agents",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware (for local development)
@@ -71,6 +92,25 @@ async def health_check():
     }
 
 
+# Metrics endpoint
+@app.get("/metrics")
+async def metrics():
+    """
+    Runtime metrics for sizing the service under load.
+    """
+    return {
+        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+        "http_pool": http_pool.pool_stats(),
+        "feed_validator_cache": validator_cache.stats(),
+        "rss_result_cache": result_cache.stats(),
+        "rss_serialization": rss.serialization_metrics(),
+        "rss_parser_engine": rss.parser_engine_metrics(),
+        "feed_host_limiter": host_limiter.stats(),
+        "rss_parse": parse_executor.stats(),
+        "event_loop_lag": loop_lag_monitor.stats()
+    }
+
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -81,8 +121,10 @@ async def root():
         "service": "Perception MCP Service",
         "docs": "/docs",
         "health": "/health",
+        "metrics": "/metrics",
         "tools": [
             "/mcp/tools/fetch_rss_feed",
+            "/mcp/tools/fetch_rss_feeds",
             "/mcp/tools/fetch_api_feed",
             "/mcp/tools/fetch_webpage",
             "/mcp/tools/store_articles",
@@ -0,0 +1,145 @@
+"""
+Feed Date Normalization
+
+Turns RSS/Atom entry dates into ISO 8601 strings and decides whether each
+entry falls inside the requested time window.
+
+A DateNormalizer is built once per feed fetch: it computes "now" and the
+window cutoff a single time, compares feedparser's struct_time values
+against the cutoff directly (no ISO round trip), and for raw date strings
+remembers which strptime format each feed uses so generic dateutil parsing
+only runs for formats it has not seen before.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional, Tuple
+
+from dateutil import parser as date_parser
+
+logger = logging.getLogger(__name__)
+
+# Formats seen in real feeds, most common first. "iso" means datetime.fromisoformat.
+KNOWN_DATE_FORMATS = (
+    "%a, %d %b %Y %H:%M:%S %z",
+    "%a, %d %b %Y %H:%M:%S GMT",
+    "iso",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%a, %d %b %Y %H:%M:%S UTC",
+    "%a, %d %b %Y %H:%M %z",
+    "%d %b %Y %H:%M:%S %z",
+    "%a, %d %b %Y %H:%M:%S",
+    "%d %b %Y %H:%M:%S",
+)
+
+MAX_LEARNED_FORMATS = 4096
+
+# feed URL -> strptime format that last parsed one of its dates. Feeds are
+# parsed on several threads (parse_executor), so reads and updates hold the lock.
+_learned_formats: "OrderedDict[str, str]" = OrderedDict()
+_learned_formats_lock = threading.Lock()
+
+
+def _parse_with_format(value: str, fmt: str) -> datetime:
+    if fmt == "iso":
+        return datetime.fromisoformat(value)
+    return datetime.strptime(value, fmt)
+
+
+def parse_date_string(value: str, feed_key: Optional[str] = None) -> datetime:
+    """
+    Parse a feed date string, preferring the format this feed used before.
+
+    Tries the learned format for `feed_key`, then KNOWN_DATE_FORMATS, and
+    only then dateutil. Naive results are treated as UTC.
+
+    Raises:
+        ValueError / OverflowError if no parser understands the string.
+    """
+    value = value.strip()
+    learned = learned_format(feed_key) if feed_key else None
+    candidates = ((learned,) if learned else ()) + tuple(f for f in KNOWN_DATE_FORMATS if f != learned)
+
+    dt = None
+    for fmt in candidates:
+        try:
+            dt = _parse_with_format(value, fmt)
+        except ValueError:
+            continue
+        if feed_key and fmt != learned:
+            with _learned_formats_lock:
+                _learned_formats[feed_key] = fmt
+                _learned_formats.move_to_end(feed_key)
+                while len(_learned_formats) > MAX_LEARNED_FORMATS:
+                    _learned_formats.popitem(last=False)
+        break
+
+    if dt is None:
+        dt = date_parser.parse(value)
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def learned_format(feed_key: str) -> Optional[str]:
+    """Return the date format learned for a feed, if any."""
+    with _learned_formats_lock:
+        return _learned_formats.get(feed_key)
+
+
+class DateNormalizer:
+    """Per-fetch date normalizer with a precomputed time-window cutoff."""
+
+    def __init__(self, time_window_hours: Optional[int] = None, feed_key: Optional[str] = None,
+                 now: Optional[datetime] = None):
+        self.now = now or datetime.now(tz=timezone.utc)
+        self.now_iso = self.now.isoformat()
+        self.feed_key = feed_key
+        self.cutoff = self.now - timedelta(hours=time_window_hours) if time_window_hours else None
+        # struct_time fields are UTC; compare the first six directly
+        self.cutoff_tuple = self.cutoff.utctimetuple()[:6] if self.cutoff else None
+
+    def _from_struct(self, parsed: Any) -> Tuple[str, bool]:
+        fields = tuple(parsed[:6])
+        in_window = self.cutoff_tuple is None or fields >= self.cutoff_tuple
+        return datetime(*fields, tzinfo=timezone.utc).isoformat(), in_window
+
+    def _from_datetime(self, dt: datetime) -> Tuple[str, bool]:
+        return dt.isoformat(), self.cutoff is None or dt >= self.cutoff
+
+    def normalize(self, entry: Any) -> Tuple[str, bool]:
+        """
+        Return (published_at ISO string, within time window) for an entry.
+
+        Same precedence as before: published_parsed, then the published
+        string, then updated_parsed, then "now" (always in the window).
+        """
+        try:
+            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                return self._from_struct(entry.published_parsed)
+
+            if hasattr(entry, 'published'):
+                return self._from_datetime(parse_date_string(entry.published, self.feed_key))
+
+            if hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+                return self._from_struct(entry.updated_parsed)
+
+            return self.now_iso, True
+        except Exception as e:
+            logger.warning(f"Date parsing failed: {e}")
+            return self.now_iso, True
+
+    def is_within_window(self, published_at: str) -> bool:
+        """Check an ISO 8601 timestamp against the cutoff (unparseable counts as inside)."""
+        if self.cutoff is None:
+            return True
+        try:
+            article_time = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+            if article_time.tzinfo is None:
+                article_time = article_time.replace(tzinfo=timezone.utc)
+            return article_time >= self.cutoff
+        except Exception:
+            return True  # Include if we can't parse date
@@ -0,0 +1,85 @@
+"""
+Feed Validator Cache
+
+Remembers the ETag / Last-Modified validators returned by each feed so the
+next fetch can be a conditional GET. Feeds that have not changed answer
+304 Not Modified with an empty body, which skips both the download and the
+feedparser run.
+
+The cache is per process and bounded (LRU), sized by
+FEED_VALIDATOR_CACHE_SIZE (default 1024 feeds).
+"""
+
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional
+
+FEED_VALIDATOR_CACHE_SIZE = int(os.getenv("FEED_VALIDATOR_CACHE_SIZE", "1024"))
+
+
+class ValidatorCache:
+    """LRU map of feed URL -> HTTP cache validators, with hit/miss counters."""
+
+    def __init__(self, max_entries: int = FEED_VALIDATOR_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+
+    def conditional_headers(self, feed_url: str) -> Dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for a known feed."""
+        validators = self._entries.get(feed_url)
+        if not validators:
+            return {}
+
+        self._entries.move_to_end(feed_url)
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def store(self, feed_url: str, response_headers: Mapping[str, Any]) -> None:
+        """Record the validators from a 200 response (drops the entry if none)."""
+        etag = response_headers.get("etag")
+        last_modified = response_headers.get("last-modified")
+
+        if not etag and not last_modified:
+            self._entries.pop(feed_url, None)
+            return
+
+        self._entries[feed_url] = {"etag": etag, "last_modified": last_modified}
+        self._entries.move_to_end(feed_url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def record_hit(self) -> None:
+        self.hits += 1
+
+    def record_miss(self) -> None:
+        self.misses += 1
+
+    def get(self, feed_url: str) -> Optional[Dict[str, str]]:
+        """Return the stored validators for a feed, if any."""
+        return self._entries.get(feed_url)
+
+    def clear(self) -> None:
+        """Drop all validators and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss counters."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+validator_cache = ValidatorCache()
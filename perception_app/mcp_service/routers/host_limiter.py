@@ -0,0 +1,232 @@
+"""
+Per-Host Feed Politeness
+
+Token-bucket rate limiting per feed host, plus Retry-After handling for
+hosts that answer 429 (or 503 with Retry-After).
+
+Each host has its own bucket, so a throttled host only delays fetches for
+that host; fetches for other hosts never wait behind it. A host that asked
+us to back off is blocked until its Retry-After passes. Callers that would
+have to wait longer than `max_wait` get HostThrottled instead of queueing.
+
+Used by the MCP RSS router (around every feed GET) and by the harvester in
+perception_agent (before each per-feed MCP call). The module only depends
+on the standard library so both can import it.
+
+Configured via environment variables:
+
+- FEED_HOST_RATE_PER_SECOND: sustained requests per second per host (default 2)
+- FEED_HOST_BURST: bucket size, i.e. back-to-back requests allowed (default 4)
+- FEED_HOST_MAX_WAIT_SECONDS: longest a caller waits for a token (default 30)
+- FEED_HOST_DEFAULT_RETRY_AFTER_SECONDS: backoff for 429s without Retry-After (default 60)
+- FEED_HOST_MAX_RETRY_AFTER_SECONDS: cap on honoured Retry-After values (default 600)
+- FEED_HOST_LIMITER_SIZE: hosts tracked, LRU-evicted (default 4096)
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Union
+from urllib.parse import urlparse
+
+FEED_HOST_RATE_PER_SECOND = float(os.getenv("FEED_HOST_RATE_PER_SECOND", "2"))
+FEED_HOST_BURST = float(os.getenv("FEED_HOST_BURST", "4"))
+FEED_HOST_MAX_WAIT_SECONDS = float(os.getenv("FEED_HOST_MAX_WAIT_SECONDS", "30"))
+FEED_HOST_DEFAULT_RETRY_AFTER_SECONDS = float(os.getenv("FEED_HOST_DEFAULT_RETRY_AFTER_SECONDS", "60"))
+FEED_HOST_MAX_RETRY_AFTER_SECONDS = float(os.getenv("FEED_HOST_MAX_RETRY_AFTER_SECONDS", "600"))
+FEED_HOST_LIMITER_SIZE = int(os.getenv("FEED_HOST_LIMITER_SIZE", "4096"))
+
+
+class HostThrottled(Exception):
+    """Raised when a host cannot be fetched within the caller's max wait."""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"Host {host} is throttled for another {retry_after:.1f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+def host_of(url: str) -> str:
+    """Return the lowercase host of a URL (empty string if unparseable)."""
+    return (urlparse(url or "").hostname or "").lower()
+
+
+def parse_retry_after(value: Optional[str], default: float = FEED_HOST_DEFAULT_RETRY_AFTER_SECONDS) -> float:
+    """
+    Convert a Retry-After header (delta-seconds or HTTP-date) to seconds.
+
+    Missing or unparseable values yield `default`.
+    """
+    if value is None:
+        return default
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(tz=timezone.utc)).total_seconds())
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "blocked_until")
+
+    def __init__(self, burst: float, now: float):
+        self.tokens = burst
+        self.updated = now
+        self.blocked_until = 0.0
+
+
+class HostRateLimiter:
+    """Per-host token buckets with Retry-After blocking."""
+
+    def __init__(
+        self,
+        rate_per_second: float = FEED_HOST_RATE_PER_SECOND,
+        burst: float = FEED_HOST_BURST,
+        max_wait: float = FEED_HOST_MAX_WAIT_SECONDS,
+        max_retry_after: float = FEED_HOST_MAX_RETRY_AFTER_SECONDS,
+        max_hosts: int = FEED_HOST_LIMITER_SIZE,
+    ):
+        self.rate_per_second = rate_per_second
+        self.burst = max(1.0, burst)
+        self.max_wait = max_wait
+        self.max_retry_after = max_retry_after
+        self.max_hosts = max_hosts
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+
+        self.acquired = 0
+        self.delayed = 0
+        self.wait_ms_total = 0.0
+        self.rejected = 0
+        self.throttle_responses = 0
+
+    def _bucket(self, host: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(self.burst, now)
+            while len(self._buckets) > self.max_hosts:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(host)
+            if self.rate_per_second > 0:
+                bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate_per_second)
+            bucket.updated = now
+        return bucket
+
+    def _delay(self, bucket: _Bucket, now: float) -> float:
+        """Seconds until `bucket` can hand out a token (0 if it can now)."""
+        blocked = max(0.0, bucket.blocked_until - now)
+        if bucket.tokens >= 1 or self.rate_per_second <= 0:
+            return blocked
+        return max(blocked, (1 - bucket.tokens) / self.rate_per_second)
+
+    async def acquire(self, host: str, max_wait: Optional[float] = None, consume: bool = True) -> float:
+        """
+        Wait for a token for `host` and consume it.
+
+        Args:
+            host: Feed host (see host_of)
+            max_wait: Longest acceptable wait in seconds (default: self.max_wait)
+            consume: False to only wait until a token is available, e.g. before
+                taking a shared concurrency slot that the real fetch acquires under
+
+        Returns:
+            Seconds spent waiting.
+
+        Raises:
+            HostThrottled: if the host cannot be fetched within max_wait.
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        started = time.monotonic()
+        slept = False
+
+        while True:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            delay = self._delay(bucket, now)
+            if delay <= 0:
+                if not consume:
+                    return now - started if slept else 0.0
+                bucket.tokens -= 1
+                waited = now - started
+                self.acquired += 1
+                if slept:
+                    self.delayed += 1
+                    self.wait_ms_total += waited * 1000
+                return waited if slept else 0.0
+
+            if now - started + delay > max_wait:
+                self.rejected += 1
+                raise HostThrottled(host, delay)
+            await asyncio.sleep(delay)
+            slept = True
+
+    def penalize(self, host: str, retry_after: Union[str, float, None] = None) -> float:
+        """
+        Block `host` after a 429/503, honouring its Retry-After.
+
+        Args:
+            host: Feed host
+            retry_after: Retry-After header value or seconds (None: default backoff)
+
+        Returns:
+            Seconds the host is now blocked for.
+        """
+        seconds = retry_after if isinstance(retry_after, (int, float)) else parse_retry_after(retry_after)
+        seconds = min(max(0.0, float(seconds)), self.max_retry_after)
+
+        now = time.monotonic()
+        bucket = self._bucket(host, now)
+        bucket.tokens = 0.0
+        bucket.blocked_until = max(bucket.blocked_until, now + seconds)
+        self.throttle_responses += 1
+        return bucket.blocked_until - now
+
+    def retry_after(self, host: str) -> float:
+        """Seconds until `host` is unblocked (0 if it is not blocked)."""
+        bucket = self._buckets.get(host)
+        return max(0.0, bucket.blocked_until - time.monotonic()) if bucket else 0.0
+
+    def clear(self) -> None:
+        """Forget all hosts and reset counters."""
+        self._buckets.clear()
+        self.acquired = 0
+        self.delayed = 0
+        self.wait_ms_total = 0.0
+        self.rejected = 0
+        self.throttle_responses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return limiter settings, counters and currently blocked hosts."""
+        now = time.monotonic()
+        blocked = {
+            host: math.ceil(bucket.blocked_until - now)
+            for host, bucket in self._buckets.items()
+            if bucket.blocked_until > now
+        }
+        return {
+            "rate_per_second": self.rate_per_second,
+            "burst": self.burst,
+            "hosts": len(self._buckets),
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "wait_ms_avg": round(self.wait_ms_total / self.delayed, 2) if self.delayed else 0.0,
+            "rejected": self.rejected,
+            "throttle_responses": self.throttle_responses,
+            "blocked_hosts": blocked,
+        }
+
+
+host_limiter = HostRateLimiter()
@@ -0,0 +1,163 @@
+"""
+Shared HTTP Client Pool
+
+Process-wide httpx.AsyncClient used by the tool routers for outbound fetches.
+
+Reusing one client keeps TCP/TLS connections alive between feed fetches
+instead of paying a fresh handshake per request. Pool sizing and HTTP/2 are
+configured via environment variables:
+
+- FEED_HTTP_MAX_CONNECTIONS (default 100)
+- FEED_HTTP_MAX_KEEPALIVE (default 20)
+- FEED_HTTP_TIMEOUT_SECONDS (default 30)
+- FEED_HTTP2 ("true" to negotiate HTTP/2, requires the `h2` package)
+"""
+
+import asyncio
+import logging
+import json
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+FEED_HTTP_MAX_CONNECTIONS = int(os.getenv("FEED_HTTP_MAX_CONNECTIONS", "100"))
+FEED_HTTP_MAX_KEEPALIVE = int(os.getenv("FEED_HTTP_MAX_KEEPALIVE", "20"))
+FEED_HTTP_TIMEOUT_SECONDS = float(os.getenv("FEED_HTTP_TIMEOUT_SECONDS", "30"))
+FEED_HTTP2 = os.getenv("FEED_HTTP2", "false").lower() == "true"
+
+
+class PoolStats:
+    """
+    Connection pool counters collected from httpcore trace events.
+
+    A request that emits `connection.connect_tcp.started` opened a new
+    connection; one that goes straight to sending headers reused a pooled
+    connection. Requests that have not reached either event are waiting
+    for a free connection.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+
+    def tracer(self):
+        """Return a per-request trace callback for the httpx `trace` extension."""
+        state = {"waiting": True, "opened": False}
+        self.requests += 1
+        self.in_flight += 1
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if not state["waiting"]:
+                return
+            if event_name == "connection.connect_tcp.started":
+                state["opened"] = True
+            elif not event_name.endswith(".send_request_headers.started"):
+                return
+            state["waiting"] = False
+            self.waiting -= 1
+            if state["opened"]:
+                self.connections_opened += 1
+            else:
+                self.connections_reused += 1
+
+        def done() -> None:
+            self.in_flight -= 1
+            if state["waiting"]:
+                state["waiting"] = False
+                self.waiting -= 1
+
+        return trace, done
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters as a plain dict."""
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "peak_waiting": self.peak_waiting,
+            "max_connections": FEED_HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": FEED_HTTP_MAX_KEEPALIVE,
+            "http2": _http2_enabled(),
+        }
+
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_stats = PoolStats()
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 is only negotiated when requested and `h2` is installed."""
+    if not FEED_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Get or initialize the shared AsyncClient.
+
+    Connections are bound to the event loop that opened them, so a new
+    client is created if the running loop has changed (e.g. between test
+    clients); in a uvicorn worker there is exactly one loop.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        if FEED_HTTP2 and not _http2_enabled():
+            logger.warning(json.dumps({
+                "severity": "WARNING",
+                "message": "FEED_HTTP2 requested but h2 is not installed, using HTTP/1.1"
+            }))
+        _client = httpx.AsyncClient(
+            timeout=FEED_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=FEED_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=FEED_HTTP_MAX_KEEPALIVE,
+            ),
+            http2=_http2_enabled(),
+            follow_redirects=True,
+        )
+        _client_loop = loop
+
+    return _client
+
+
+async def request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a request through the shared client and record pool statistics."""
+    trace, done = _stats.tracer()
+    extensions = {**kwargs.pop("extensions", {}), "trace": trace}
+    try:
+        return await get_client().request(method, url, extensions=extensions, **kwargs)
+    finally:
+        done()
+
+
+async def close_client() -> None:
+    """Close the shared client (called on application shutdown)."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Return current connection pool statistics."""
+    return _stats.snapshot()
@@ -0,0 +1,212 @@
+"""
+Feed Parse Executor
+
+Runs CPU-bound feed parsing (feedparser, date parsing, Pydantic model
+construction) off the event loop so one large feed does not stall every
+other in-flight request on the worker.
+
+Configured via environment variables:
+
+- RSS_PARSE_MODE: "thread" (default), "process" or "inline"
+- RSS_PARSE_WORKERS: pool size (default: CPU count)
+- RSS_PARSE_MAX_PENDING: parse jobs admitted at once, queued or running (default 32)
+- RSS_PARSE_QUEUE_TIMEOUT_SECONDS: how long a job waits for a slot before
+  the request is rejected (default 30)
+
+Also hosts the event-loop lag monitor exported on /metrics.
+"""
+
+import asyncio
+import logging
+import json
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PARSE_MODES = ("inline", "thread", "process")
+
+RSS_PARSE_MODE = os.getenv("RSS_PARSE_MODE", "thread").lower()
+RSS_PARSE_WORKERS = int(os.getenv("RSS_PARSE_WORKERS", str(os.cpu_count() or 2)))
+RSS_PARSE_MAX_PENDING = int(os.getenv("RSS_PARSE_MAX_PENDING", "32"))
+RSS_PARSE_QUEUE_TIMEOUT_SECONDS = float(os.getenv("RSS_PARSE_QUEUE_TIMEOUT_SECONDS", "30"))
+LOOP_LAG_INTERVAL_SECONDS = float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", "0.5"))
+
+
+class ParseQueueFull(Exception):
+    """Raised when a parse job cannot get a slot within the queue timeout."""
+
+
+class ParseExecutor:
+    """
+    Bounded executor for parse jobs.
+
+    At most `max_pending` jobs are admitted at a time; further callers wait
+    (backpressure) and are rejected with ParseQueueFull after
+    `queue_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        mode: str = RSS_PARSE_MODE,
+        max_workers: int = RSS_PARSE_WORKERS,
+        max_pending: int = RSS_PARSE_MAX_PENDING,
+        queue_timeout: float = RSS_PARSE_QUEUE_TIMEOUT_SECONDS,
+    ):
+        if mode not in PARSE_MODES:
+            raise ValueError(f"Unknown parse mode '{mode}', expected one of {PARSE_MODES}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.pending = 0
+        self.peak_pending = 0
+        self.jobs = 0
+        self.rejected = 0
+        self.parse_ms_total = 0.0
+        self.parse_ms_max = 0.0
+        self.wait_ms_total = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rss-parse")
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # asyncio primitives bind to the loop they first wait on
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._slots_loop = loop
+        return self._slots
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn(*args)` according to the configured mode and record timing."""
+        slots = self._get_slots()
+        queued_at = time.perf_counter()
+
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            try:
+                await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise ParseQueueFull(
+                    f"Parse queue full ({self.max_pending} pending) for {self.queue_timeout}s"
+                )
+
+            try:
+                started = time.perf_counter()
+                self.wait_ms_total += (started - queued_at) * 1000
+                if self.mode == "inline":
+                    result = fn(*args)
+                else:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(self._get_executor(), fn, *args)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self.jobs += 1
+                self.parse_ms_total += elapsed_ms
+                self.parse_ms_max = max(self.parse_ms_max, elapsed_ms)
+                return result
+            finally:
+                slots.release()
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        """Shut down the worker pool (called on application shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return parse timing and queue metrics."""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "peak_pending": self.peak_pending,
+            "jobs": self.jobs,
+            "rejected": self.rejected,
+            "parse_ms_avg": round(self.parse_ms_total / self.jobs, 2) if self.jobs else 0.0,
+            "parse_ms_max": round(self.parse_ms_max, 2),
+            "queue_wait_ms_avg": round(self.wait_ms_total / self.jobs, 2) if self.jobs else 0.0,
+        }
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: how late a periodic sleep wakes up.
+
+    Lag close to zero means the loop is free; sustained lag means something
+    is running synchronously on it.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL_SECONDS):
+        self.interval = interval
+        self.samples = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - expected) * 1000)
+            self.samples += 1
+            self.last_ms = lag_ms
+            self.max_ms = max(self.max_ms, lag_ms)
+            self.total_ms += lag_ms
+
+    def start(self) -> None:
+        """Start sampling on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return lag samples in milliseconds."""
+        return {
+            "samples": self.samples,
+            "last_ms": round(self.last_ms, 2),
+            "max_ms": round(self.max_ms, 2),
+            "avg_ms": round(self.total_ms / self.samples, 2) if self.samples else 0.0,
+        }
+
+
+def _build_default_executor() -> ParseExecutor:
+    if RSS_PARSE_MODE not in PARSE_MODES:
+        logger.warning(json.dumps({
+            "severity": "WARNING",
+            "message": f"Unknown RSS_PARSE_MODE '{RSS_PARSE_MODE}', using thread",
+        }))
+        return ParseExecutor(mode="thread")
+    return ParseExecutor()
+
+
+parse_executor = _build_default_executor()
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,121 @@
+"""
+Feed Result Cache
+
+Single-flight request coalescing plus a short-TTL result cache for
+fetch_rss_feed.
+
+Concurrent requests for the same key share one upstream fetch and one
+parse; completed results are kept for a few seconds so back-to-back callers
+(several users, overlapping runs, batch + single calls) reuse them. Failures
+are never cached.
+
+Configured via environment variables:
+
+- RSS_RESULT_CACHE_TTL_SECONDS (default 60; 0 disables caching, coalescing stays on)
+- RSS_RESULT_CACHE_SIZE (default 512 entries, LRU-evicted)
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+RSS_RESULT_CACHE_TTL_SECONDS = float(os.getenv("RSS_RESULT_CACHE_TTL_SECONDS", "60"))
+RSS_RESULT_CACHE_SIZE = int(os.getenv("RSS_RESULT_CACHE_SIZE", "512"))
+
+
+class SingleFlightCache:
+    """Coalesces concurrent identical fetches and caches results for `ttl_seconds`."""
+
+    def __init__(self, ttl_seconds: float = RSS_RESULT_CACHE_TTL_SECONDS, max_entries: int = RSS_RESULT_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for `key`, join an in-flight fetch, or start one.
+
+        The shared fetch is shielded so a cancelled caller does not cancel it
+        for the others.
+        """
+        found, value = self._lookup(key)
+        if found:
+            self.hits += 1
+            return value
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+
+        async def run():
+            try:
+                result = await fetch()
+                self._store(key, result)
+                return result
+            finally:
+                self._in_flight.pop(key, None)
+
+        task = asyncio.ensure_future(run())
+        self._in_flight[key] = task
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        """Drop cached results and reset counters (in-flight fetches are left alone)."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size, counters and hit ratios."""
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "shared_ratio": round((self.hits + self.coalesced) / total, 4) if total else 0.0,
+        }
+
+
+result_cache = SingleFlightCache()
@@ -6,16 +6,28 @@ Fetches and parses articles from RSS feeds.
 Phase 5: Real implementation with feedparser and HTTP fetching.
 """
 
+import asyncio
 import logging
 import json
-from datetime import datetime, timezone, timedelta
-from typing import List, Optional
+import math
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, Iterable, List, Literal, Optional, Union
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response, StreamingResponse
 import httpx
 import feedparser
-from dateutil import parser as date_parser
 from pydantic import BaseModel, Field
 
+from . import http_pool
+from .date_normalizer import DateNormalizer
+from .feed_cache import validator_cache
+from .feed_parser import FeedStreamError, iter_entries
+from .host_limiter import HostThrottled, host_limiter, host_of
+from .parse_executor import parse_executor, ParseQueueFull
+from .result_cache import result_cache
+
 # TODO Phase 5: Import OpenTelemetry
 # from opentelemetry import trace
 # tracer = trace.get_tracer(__name__)
@@ -23,6 +35,13 @@ from pydantic import BaseModel, Field
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# "feedparser" (default) or "stream" (incremental expat parser, feedparser fallback)
+RSS_PARSER_ENGINE = os.getenv("RSS_PARSER_ENGINE", "feedparser").lower()
+
+ArticleField = Literal[
+    "title", "url", "published_at", "summary", "author", "content_snippet", "raw_content", "categories"
+]
+
 
 # Pydantic Models
 class FetchRSSFeedRequest(BaseModel):
@@ -31,6 +50,10 @@ class FetchRSSFeedRequest(BaseModel):
     time_window_hours: Optional[int] = Field(24, description="Only return articles from last N hours", ge=1, le=720)
     max_items: Optional[int] = Field(50, description="Maximum number of articles to return", ge=1, le=500)
     request_id: Optional[str] = Field(None, description="Optional request tracking ID")
+    conditional_get: bool = Field(False, description="Send cached ETag/Last-Modified validators; unchanged feeds return no articles")
+    fields: Optional[List[ArticleField]] = Field(None, description="Only return these article fields (default: all)")
+    exclude_fields: Optional[List[ArticleField]] = Field(None, description="Article fields to leave out, e.g. raw_content")
+    early_cutoff: bool = Field(False, description="Stop scanning once a date-sorted feed passes the time window")
 
 
 class Article(BaseModel):
@@ -52,12 +75,16 @@ class FetchRSSFeedResponse(BaseModel):
     fetched_at: str  # ISO 8601 timestamp
     article_count: int
     articles: List[Article]
+    not_modified: bool = False  # True when the feed answered 304 to a conditional GET
+    cache_hits: int = 0  # Process-wide conditional GET hits (304s)
+    cache_misses: int = 0  # Process-wide conditional GET misses (full downloads)
 
 
 class ErrorDetail(BaseModel):
     """Error details for failures."""
     http_status: Optional[int] = None
     timeout_seconds: Optional[int] = None
+    retry_after_seconds: Optional[int] = None
 
 
 class ErrorResponse(BaseModel):
@@ -68,36 +95,91 @@ class ErrorResponse(BaseModel):
     details: Optional[ErrorDetail] = None
 
 
+class FetchRSSFeedsRequest(BaseModel):
+    """Request schema for fetch_rss_feeds batch tool."""
+    feeds: List[FetchRSSFeedRequest] = Field(..., description="Feeds to fetch, each with its own time window and max_items", min_length=1, max_length=256)
+    max_concurrency: int = Field(16, description="Maximum feeds fetched at once", ge=1, le=64)
+    stream: bool = Field(False, description="Stream per-feed results as NDJSON in completion order")
+    request_id: Optional[str] = Field(None, description="Optional request tracking ID")
+
+
+class FeedBatchResult(BaseModel):
+    """Outcome for one feed in a batch."""
+    index: int  # Position of the feed in the request
+    feed_url: str
+    status: str  # "ok" or "error"
+    elapsed_ms: int
+    result: Optional[FetchRSSFeedResponse] = None
+    error: Optional[ErrorResponse] = None
+
+
+class FetchRSSFeedsResponse(BaseModel):
+    """Response schema for fetch_rss_feeds batch tool."""
+    fetched_at: str  # ISO 8601 timestamp
+    feed_count: int
+    succeeded: int
+    failed: int
+    article_count: int
+    results: List[FeedBatchResult]  # In request order
+
+
+ARTICLE_FIELDS: FrozenSet[str] = frozenset(Article.model_fields)
+
+# Response size / serialization time for fetch_rss_feed (exported on /metrics)
+_serialization_stats = {"responses": 0, "bytes_total": 0, "bytes_max": 0, "ms_total": 0.0, "ms_max": 0.0}
+
+# Feeds parsed per engine ("fallback" = streaming parser rejected the body)
+_engine_stats = {"stream": 0, "feedparser": 0, "fallback": 0}
+
+
 # Helper functions
+def projected_fields(request: FetchRSSFeedRequest) -> FrozenSet[str]:
+    """Article fields the caller asked for (fields minus exclude_fields)."""
+    wanted = frozenset(request.fields) if request.fields else ARTICLE_FIELDS
+    return wanted - frozenset(request.exclude_fields or [])
+
+
+def serialize_feed_response(result: FetchRSSFeedResponse, fields: FrozenSet[str]) -> bytes:
+    """Serialize a feed response with only the projected article fields, recording size and time."""
+    started = time.perf_counter()
+    excluded = ARTICLE_FIELDS - fields
+    exclude = {"articles": {"__all__": set(excluded)}} if excluded else None
+    body = result.model_dump_json(exclude=exclude).encode()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    _serialization_stats["responses"] += 1
+    _serialization_stats["bytes_total"] += len(body)
+    _serialization_stats["bytes_max"] = max(_serialization_stats["bytes_max"], len(body))
+    _serialization_stats["ms_total"] += elapsed_ms
+    _serialization_stats["ms_max"] = max(_serialization_stats["ms_max"], elapsed_ms)
+    return body
+
+
+def serialization_metrics() -> Dict[str, Any]:
+    """Return response size and serialization time metrics for fetch_rss_feed."""
+    responses = _serialization_stats["responses"]
+    return {
+        "responses": responses,
+        "bytes_avg": round(_serialization_stats["bytes_total"] / responses) if responses else 0,
+        "bytes_max": _serialization_stats["bytes_max"],
+        "serialize_ms_avg": round(_serialization_stats["ms_total"] / responses, 3) if responses else 0.0,
+        "serialize_ms_max": round(_serialization_stats["ms_max"], 3),
+    }
+
+
+def parser_engine_metrics() -> Dict[str, Any]:
+    """Return the configured parser engine and feeds parsed per engine."""
+    return {"configured": RSS_PARSER_ENGINE, **_engine_stats}
+
+
 def normalize_published_date(entry) -> Optional[str]:
     """
     Extract and normalize published date from RSS entry.
 
     Returns ISO 8601 timestamp or None if not available.
     """
-    try:
-        # Try published_parsed first (time.struct_time)
-        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-            dt = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-            return dt.isoformat()
-
-        # Try published string
-        if hasattr(entry, 'published'):
-            dt = date_parser.parse(entry.published)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt.isoformat()
-
-        # Try updated_parsed
-        if hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-            dt = datetime(*entry.updated_parsed[:6], tzinfo=timezone.utc)
-            return dt.isoformat()
-
-        # Fallback to now
-        return datetime.now(tz=timezone.utc).isoformat()
-    except Exception as e:
-        logger.warning(f"Date parsing failed: {e}")
-        return datetime.now(tz=timezone.utc).isoformat()
+    published_at, _ = DateNormalizer().normalize(entry)
+    return published_at
 
 
 def extract_categories(entry) -> List[str]:
@@ -115,12 +197,172 @@ def extract_categories(entry) -> List[str]:
 
 def is_within_time_window(published_at: str, time_window_hours: int) -> bool:
     """Check if article is within the specified time window."""
-    try:
-        article_time = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-        cutoff_time = datetime.now(tz=timezone.utc) - timedelta(hours=time_window_hours)
-        return article_time >= cutoff_time
-    except Exception:
-        return True  # Include if we can't parse date
+    return DateNormalizer(time_window_hours).is_within_window(published_at)
+
+
+def parse_feed(
+    feed_content: Union[bytes, str],
+    time_window_hours: Optional[int],
+    max_items: Optional[int],
+    feed_url: Optional[str] = None,
+    fields: Optional[FrozenSet[str]] = None,
+    early_cutoff: bool = False,
+    content_type: Optional[str] = None,
+    engine: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Parse a feed body and normalize its entries into Articles.
+
+    This is the CPU-bound part of fetch_rss_feed. It is a plain module-level
+    function so it can run inline, in a thread pool or in a process pool.
+
+    With the "stream" engine the body is parsed incrementally and parsing
+    stops as soon as max_items articles (or the early cutoff) are reached;
+    bodies the streaming parser rejects are reparsed with feedparser.
+
+    Only the article fields in `fields` are computed (title, url and
+    published_at are always set); the rest stay at their defaults. With
+    `early_cutoff`, scanning stops at the first out-of-window entry once an
+    in-window entry has been seen and dates have been non-increasing so far,
+    i.e. the feed looks newest-first.
+
+    Args:
+        content_type: HTTP Content-Type of the body; its charset is used
+            when the body does not declare an encoding
+        engine: "feedparser" or "stream" (default: RSS_PARSER_ENGINE)
+
+    Returns:
+        A dict with:
+        - articles: List[Article] within the time window, capped at max_items
+        - malformed: True if the feed is malformed and has no entries
+        - bozo_exception: feedparser's error string for malformed feeds
+        - stopped_early: True if early_cutoff ended the scan
+        - engine: "stream", "feedparser", or "fallback" (stream rejected the body)
+    """
+    fields = ARTICLE_FIELDS if fields is None else fields
+    engine = engine or RSS_PARSER_ENGINE
+
+    if engine == "stream":
+        try:
+            result = _normalize_entries(
+                iter_entries(feed_content, content_type=content_type), time_window_hours, max_items, feed_url, fields, early_cutoff
+            )
+            result["engine"] = "stream"
+            return result
+        except FeedStreamError as e:
+            logger.info(json.dumps({
+                "severity": "INFO",
+                "message": "Streaming parser rejected feed, falling back to feedparser",
+                "feed_url": feed_url,
+                "error": str(e)
+            }))
+            engine = "fallback"
+    else:
+        engine = "feedparser"
+
+    feed = feedparser.parse(
+        feed_content,
+        response_headers={"content-type": content_type} if content_type else None
+    )
+
+    if feed.bozo and not feed.entries:
+        return {
+            "articles": [],
+            "malformed": True,
+            "bozo_exception": str(feed.bozo_exception) if hasattr(feed, 'bozo_exception') else None,
+            "stopped_early": False,
+            "engine": engine
+        }
+
+    result = _normalize_entries(feed.entries, time_window_hours, max_items, feed_url, fields, early_cutoff)
+    result["engine"] = engine
+    return result
+
+
+def _normalize_entries(
+    entries: Iterable[Any],
+    time_window_hours: Optional[int],
+    max_items: Optional[int],
+    feed_url: Optional[str],
+    fields: FrozenSet[str],
+    early_cutoff: bool
+) -> Dict[str, Any]:
+    """Turn parsed entries into Articles (shared by both parser engines)."""
+    # Normalize articles (cutoff computed once; date formats learned per feed)
+    dates = DateNormalizer(time_window_hours, feed_key=feed_url)
+    articles = []
+    stopped_early = False
+    seen_in_window = False
+    newest_first = True
+    previous_published = None
+    for entry in entries:
+        published_at, in_window = dates.normalize(entry)
+
+        if early_cutoff:
+            current = datetime.fromisoformat(published_at)
+            if previous_published is not None and current > previous_published:
+                newest_first = False
+            previous_published = current
+            if not in_window and seen_in_window and newest_first:
+                stopped_early = True
+                break
+
+        # Filter by time window
+        if not in_window:
+            continue
+        seen_in_window = True
+
+        # Build normalized article with only the requested fields
+        article = Article(
+            title=entry.get('title', 'Untitled'),
+            url=entry.get('link', ''),
+            published_at=published_at
+        )
+        if 'summary' in fields:
+            article.summary = entry.get('summary')
+        if 'author' in fields:
+            article.author = entry.get('author')
+        if 'content_snippet' in fields:
+            # Extract content snippet (prefer summary, fallback to description)
+            if hasattr(entry, 'summary'):
+                article.content_snippet = entry.summary[:500] if len(entry.summary) > 500 else entry.summary
+            elif hasattr(entry, 'description'):
+                article.content_snippet = entry.description[:500] if len(entry.description) > 500 else entry.description
+        if 'raw_content' in fields:
+            article.raw_content = entry.get('content', [{}])[0].get('value') if entry.get('content') else None
+        if 'categories' in fields:
+            article.categories = extract_categories(entry)
+        articles.append(article)
+
+        # Respect max_items limit
+        if max_items and len(articles) >= max_items:
+            break
+
+    return {"articles": articles, "malformed": False, "bozo_exception": None, "stopped_early": stopped_early}
+
+
+def _not_modified_response(request: FetchRSSFeedRequest) -> FetchRSSFeedResponse:
+    """Build the response for a feed that answered 304 Not Modified."""
+    validator_cache.record_hit()
+
+    logger.info(json.dumps({
+        "severity": "INFO",
+        "message": "RSS feed not modified",
+        "mcp_tool": "fetch_rss_feed",
+        "feed_url": request.feed_url,
+        "request_id": request.request_id
+    }))
+
+    return FetchRSSFeedResponse(
+        feed_id="",  # No feed_id in Phase 5 spec
+        feed_url=request.feed_url,
+        fetched_at=datetime.now(tz=timezone.utc).isoformat(),
+        article_count=0,
+        articles=[],
+        not_modified=True,
+        cache_hits=validator_cache.hits,
+        cache_misses=validator_cache.misses
+    )
 
 
 # Tool Endpoint
@@ -130,7 +372,36 @@ async def fetch_rss_feed(request: FetchRSSFeedRequest):
     Fetch and parse articles from an RSS feed.
 
     Phase 5: Real implementation with feedparser and HTTP fetching.
+
+    Articles only carry the fields selected by `fields` / `exclude_fields`.
     """
+    result = await load_rss_feed(request)
+    return Response(
+        content=serialize_feed_response(result, projected_fields(request)),
+        media_type="application/json"
+    )
+
+
+async def load_rss_feed(request: FetchRSSFeedRequest) -> FetchRSSFeedResponse:
+    """
+    Fetch a feed and return the response model (unserialized).
+
+    Concurrent identical requests share one fetch, and results are reused
+    for a short TTL (see result_cache).
+    """
+    key = (
+        request.feed_url,
+        request.time_window_hours,
+        request.max_items,
+        request.conditional_get,
+        projected_fields(request),
+        request.early_cutoff
+    )
+    return await result_cache.get_or_fetch(key, lambda: _fetch_rss_feed_uncached(request))
+
+
+async def _fetch_rss_feed_uncached(request: FetchRSSFeedRequest) -> FetchRSSFeedResponse:
+    """Fetch, parse and normalize one feed (the uncoalesced fetch_rss_feed body)."""
     start_time = datetime.now(tz=timezone.utc)
 
     # TODO Phase 5: Add OpenTelemetry span
@@ -149,59 +420,125 @@ async def fetch_rss_feed(request: FetchRSSFeedRequest):
     }))
 
     try:
-        # Fetch RSS feed via HTTP
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(request.feed_url, follow_redirects=True)
-                response.raise_for_status()
-            except httpx.TimeoutException:
-                logger.error(json.dumps({
-                    "severity": "ERROR",
-                    "message": "RSS feed fetch timeout",
-                    "feed_url": request.feed_url,
-                    "timeout_seconds": 30
-                }))
-                raise HTTPException(
-                    status_code=504,
-                    detail={
-                        "error": {
-                            "code": "FEED_FETCH_FAILED",
-                            "message": "Feed fetch timeout after 30 seconds",
-                            "feed_url": request.feed_url,
-                            "details": {"timeout_seconds": 30}
-                        }
+        # Fetch RSS feed via the shared pooled client
+        headers = validator_cache.conditional_headers(request.feed_url) if request.conditional_get else {}
+        host = host_of(request.feed_url)
+        try:
+            # Per-host politeness: waits for a token, or fails fast while the host is backing us off
+            await host_limiter.acquire(host)
+            response = await http_pool.request("GET", request.feed_url, headers=headers)
+            if request.conditional_get and response.status_code == 304:
+                return _not_modified_response(request)
+            if response.status_code == 429 or (response.status_code == 503 and "retry-after" in response.headers):
+                host_limiter.penalize(host, response.headers.get("retry-after"))
+            response.raise_for_status()
+        except HostThrottled as e:
+            logger.warning(json.dumps({
+                "severity": "WARNING",
+                "message": "RSS feed host throttled",
+                "feed_url": request.feed_url,
+                "host": host,
+                "retry_after_seconds": round(e.retry_after, 1),
+                "request_id": request.request_id
+            }))
+            raise HTTPException(
+                status_code=429,
+                detail={
+                    "error": {
+                        "code": "FEED_HOST_THROTTLED",
+                        "message": str(e),
+                        "feed_url": request.feed_url,
+                        "details": {"retry_after_seconds": math.ceil(e.retry_after)}
+                    }
+                },
+                headers={"Retry-After": str(math.ceil(e.retry_after))}
+            )
+        except httpx.TimeoutException:
+            logger.error(json.dumps({
+                "severity": "ERROR",
+                "message": "RSS feed fetch timeout",
+                "feed_url": request.feed_url,
+                "timeout_seconds": int(http_pool.FEED_HTTP_TIMEOUT_SECONDS)
+            }))
+            raise HTTPException(
+                status_code=504,
+                detail={
+                    "error": {
+                        "code": "FEED_FETCH_FAILED",
+                        "message": f"Feed fetch timeout after {int(http_pool.FEED_HTTP_TIMEOUT_SECONDS)} seconds",
+                        "feed_url": request.feed_url,
+                        "details": {"timeout_seconds": int(http_pool.FEED_HTTP_TIMEOUT_SECONDS)}
                     }
-                )
-            except httpx.HTTPStatusError as e:
-                logger.error(json.dumps({
-                    "severity": "ERROR",
-                    "message": "RSS feed HTTP error",
-                    "feed_url": request.feed_url,
-                    "status_code": e.response.status_code
-                }))
-                raise HTTPException(
-                    status_code=e.response.status_code,
-                    detail={
-                        "error": {
-                            "code": "FEED_FETCH_FAILED",
-                            "message": f"Feed returned HTTP {e.response.status_code}",
-                            "feed_url": request.feed_url,
-                            "details": {"http_status": e.response.status_code}
-                        }
+                }
+            )
+        except httpx.HTTPStatusError as e:
+            logger.error(json.dumps({
+                "severity": "ERROR",
+                "message": "RSS feed HTTP error",
+                "feed_url": request.feed_url,
+                "status_code": e.response.status_code
+            }))
+            details = {"http_status": e.response.status_code}
+            retry_after = math.ceil(host_limiter.retry_after(host))
+            if retry_after:
+                details["retry_after_seconds"] = retry_after
+            raise HTTPException(
+                status_code=e.response.status_code,
+                detail={
+                    "error": {
+                        "code": "FEED_FETCH_FAILED",
+                        "message": f"Feed returned HTTP {e.response.status_code}",
+                        "feed_url": request.feed_url,
+                        "details": details
+                    }
+                },
+                headers={"Retry-After": str(retry_after)} if retry_after else None
+            )
+
+        if request.conditional_get:
+            validator_cache.record_miss()
+            validator_cache.store(request.feed_url, response.headers)
+
+        # Parse and normalize off the event loop
+        try:
+            parsed = await parse_executor.run(
+                parse_feed,
+                response.content,
+                request.time_window_hours,
+                request.max_items,
+                request.feed_url,
+                projected_fields(request),
+                request.early_cutoff,
+                response.headers.get("content-type")
+            )
+        except ParseQueueFull as e:
+            logger.error(json.dumps({
+                "severity": "ERROR",
+                "message": "RSS parse queue full",
+                "feed_url": request.feed_url,
+                "error": str(e),
+                "request_id": request.request_id
+            }))
+            raise HTTPException(
+                status_code=503,
+                detail={
+                    "error": {
+                        "code": "PARSE_QUEUE_FULL",
+                        "message": str(e),
+                        "feed_url": request.feed_url
                     }
-                )
+                }
+            )
 
-        # Parse RSS with feedparser
-        feed_content = response.text
-        feed = feedparser.parse(feed_content)
+        _engine_stats[parsed["engine"]] += 1
 
-        if feed.bozo and not feed.entries:
+        if parsed["malformed"]:
             # Feed is malformed and has no entries
             logger.warning(json.dumps({
                 "severity": "WARNING",
                 "message": "Malformed RSS feed",
                 "feed_url": request.feed_url,
-                "bozo_exception": str(feed.bozo_exception) if hasattr(feed, 'bozo_exception') else None
+                "bozo_exception": parsed["bozo_exception"]
             }))
             # Return empty list instead of failing
             return FetchRSSFeedResponse(
@@ -209,41 +546,12 @@ async def fetch_rss_feed(request: FetchRSSFeedRequest):
                 feed_url=request.feed_url,
                 fetched_at=datetime.now(tz=timezone.utc).isoformat(),
                 article_count=0,
-                articles=[]
+                articles=[],
+                cache_hits=validator_cache.hits,
+                cache_misses=validator_cache.misses
             )
 
-        # Normalize articles
-        articles = []
-        for entry in feed.entries:
-            published_at = normalize_published_date(entry)
-
-            # Filter by time window
-            if request.time_window_hours and not is_within_time_window(published_at, request.time_window_hours):
-                continue
-
-            # Extract content snippet (prefer summary, fallback to description)
-            content_snippet = None
-            if hasattr(entry, 'summary'):
-                content_snippet = entry.summary[:500] if len(entry.summary) > 500 else entry.summary
-            elif hasattr(entry, 'description'):
-                content_snippet = entry.description[:500] if len(entry.description) > 500 else entry.description
-
-            # Build normalized article
-            article = Article(
-                title=entry.get('title', 'Untitled'),
-                url=entry.get('link', ''),
-                published_at=published_at,
-                summary=entry.get('summary'),
-                author=entry.get('author'),
-                content_snippet=content_snippet,
-                raw_content=entry.get('content', [{}])[0].get('value') if entry.get('content') else None,
-                categories=extract_categories(entry)
-            )
-            articles.append(article)
-
-            # Respect max_items limit
-            if request.max_items and len(articles) >= request.max_items:
-                break
+        articles = parsed["articles"]
 
         # Build response
         end_time = datetime.now(tz=timezone.utc)
@@ -254,7 +562,9 @@ async def fetch_rss_feed(request: FetchRSSFeedRequest):
             feed_url=request.feed_url,
             fetched_at=end_time.isoformat(),
             article_count=len(articles),
-            articles=articles
+            articles=articles,
+            cache_hits=validator_cache.hits,
+            cache_misses=validator_cache.misses
         )
 
         logger.info(json.dumps({
@@ -295,3 +605,145 @@ async def fetch_rss_feed(request: FetchRSSFeedRequest):
                 }
             }
         )
+
+
+async def _fetch_batch_item(index: int, feed: FetchRSSFeedRequest, slots: asyncio.Semaphore) -> FeedBatchResult:
+    """Fetch one feed of a batch, converting failures into a per-feed error."""
+    started = time.perf_counter()
+    try:
+        # Wait out host politeness before taking a slot, so a throttled host
+        # does not hold batch slots that other hosts could use
+        await host_limiter.acquire(host_of(feed.feed_url), consume=False)
+        async with slots:
+            result = await load_rss_feed(feed)
+        return FeedBatchResult(
+            index=index,
+            feed_url=feed.feed_url,
+            status="ok",
+            elapsed_ms=int((time.perf_counter() - started) * 1000),
+            result=result
+        )
+    except HostThrottled as e:
+        error_response = ErrorResponse(
+            code="FEED_HOST_THROTTLED",
+            message=str(e),
+            details=ErrorDetail(http_status=429, retry_after_seconds=math.ceil(e.retry_after))
+        )
+    except HTTPException as e:
+        error = e.detail.get("error", {}) if isinstance(e.detail, dict) else {}
+        error_response = ErrorResponse(
+            code=error.get("code", "FEED_FETCH_FAILED"),
+            message=error.get("message", str(e.detail)),
+            details=ErrorDetail(**(error.get("details") or {"http_status": e.status_code}))
+        )
+    except Exception as e:
+        error_response = ErrorResponse(code="FEED_FETCH_FAILED", message=f"Unexpected error: {str(e)}")
+
+    return FeedBatchResult(
+        index=index,
+        feed_url=feed.feed_url,
+        status="error",
+        elapsed_ms=int((time.perf_counter() - started) * 1000),
+        error=error_response
+    )
+
+
+@router.post("/fetch_rss_feeds", response_model=FetchRSSFeedsResponse)
+async def fetch_rss_feeds(request: FetchRSSFeedsRequest):
+    """
+    Fetch many RSS feeds concurrently in one call.
+
+    Each feed is fetched exactly as fetch_rss_feed would (including its
+    field projection), up to max_concurrency at a time. A failing feed becomes an error entry in the
+    results instead of failing the batch. With stream=true, results are
+    written as NDJSON lines (one FeedBatchResult per line) as they complete.
+    """
+    logger.info(json.dumps({
+        "severity": "INFO",
+        "message": "Fetching RSS feed batch",
+        "mcp_tool": "fetch_rss_feeds",
+        "feed_count": len(request.feeds),
+        "max_concurrency": request.max_concurrency,
+        "stream": request.stream,
+        "request_id": request.request_id
+    }))
+
+    tasks = _start_batch(request)
+
+    if request.stream:
+        async def ndjson():
+            try:
+                for finished in asyncio.as_completed(tasks):
+                    item = await finished
+                    yield item.model_dump_json(exclude=_batch_item_exclude(request.feeds[item.index])) + "\n"
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    response = await _gather_batch(request, tasks)
+    exclude = {
+        i: item_exclude
+        for i, feed in enumerate(request.feeds)
+        if (item_exclude := _batch_item_exclude(feed))
+    }
+    return Response(
+        content=response.model_dump_json(exclude={"results": exclude} if exclude else None),
+        media_type="application/json"
+    )
+
+
+async def load_rss_feeds(request: FetchRSSFeedsRequest) -> FetchRSSFeedsResponse:
+    """
+    Fetch a batch of feeds and return the response model (unserialized).
+
+    Articles are not projected; callers apply each feed's projection when
+    they serialize (see _batch_item_exclude). `stream` is ignored.
+    """
+    return await _gather_batch(request, _start_batch(request))
+
+
+def _start_batch(request: FetchRSSFeedsRequest) -> List["asyncio.Future[FeedBatchResult]"]:
+    """Schedule one _fetch_batch_item task per feed, sharing max_concurrency slots."""
+    slots = asyncio.Semaphore(request.max_concurrency)
+    return [
+        asyncio.ensure_future(_fetch_batch_item(i, feed, slots))
+        for i, feed in enumerate(request.feeds)
+    ]
+
+
+async def _gather_batch(
+    request: FetchRSSFeedsRequest,
+    tasks: List["asyncio.Future[FeedBatchResult]"]
+) -> FetchRSSFeedsResponse:
+    """Wait for all batch tasks and build the batch response."""
+    results = await asyncio.gather(*tasks)
+    succeeded = sum(1 for r in results if r.status == "ok")
+
+    logger.info(json.dumps({
+        "severity": "INFO",
+        "message": "RSS feed batch fetched",
+        "mcp_tool": "fetch_rss_feeds",
+        "feed_count": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "request_id": request.request_id
+    }))
+
+    return FetchRSSFeedsResponse(
+        fetched_at=datetime.now(tz=timezone.utc).isoformat(),
+        feed_count=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        article_count=sum(r.result.article_count for r in results if r.result),
+        results=results
+    )
+
+
+def _batch_item_exclude(feed: FetchRSSFeedRequest) -> Optional[Dict[str, Any]]:
+    """Pydantic exclude spec applying a feed's field projection to its batch result."""
+    excluded = ARTICLE_FIELDS - projected_fields(feed)
+    if not excluded:
+        return None
+    return {"result": {"articles": {"__all__": set(excluded)}}}
@@ -14,17 +14,45 @@ from datetime import datetime, timezone
 import logging
 import json
 import asyncio
+import os
 
 # Import agent tools
-from .agent_1_tools import harvest_all_sources
+from .agent_1_tools import harvest_all_sources, load_sources_from_csv
 from .agent_2_tools import get_active_topics
-from .agent_3_tools import score_articles, filter_top_articles
+from .agent_3_tools import score_articles, filter_top_articles, save_scoring_stats
 from .agent_4_tools import build_brief_payload
-from .agent_6_tools import validate_articles, validate_brief
-from .agent_7_tools import store_articles, store_brief, update_ingestion_run
+from .agent_6_tools import detect_duplicates, record_article_history, validate_articles, validate_brief
+from .agent_7_tools import (
+    ASYNC_STORAGE,
+    _generate_article_id,
+    load_source_health,
+    store_articles,
+    store_articles_async,
+    store_brief,
+    update_ingestion_run,
+    update_source_health,
+)
+from .article_existence import ArticleExistenceChecker
+from .feed_scheduler import get_feed_scheduler
+from .pipeline import StreamingPipeline
+from .seen_urls import SEEN_URL_FILTER, SeenUrlIndex, get_seen_url_index
+from .source_health import get_source_health
+from .stage_timer import StageTimer
+from .url_canonicalizer import legacy_article_id
 
 logger = logging.getLogger(__name__)
 
+# Opt-in: harvest only feeds the adaptive scheduler considers due (see feed_scheduler)
+ADAPTIVE_HARVEST = os.getenv("ADAPTIVE_HARVEST", "false").lower() == "true"
+
+# Score articles while sources are still being fetched (see pipeline)
+STREAMING_PIPELINE = os.getenv("STREAMING_PIPELINE", "false").lower() == "true"
+
+# Top-article selection shared by the staged and streaming paths
+MAX_PER_TOPIC = 10
+MAX_PER_SOURCE = 5
+MIN_SCORE = 5
+
 
 def start_ingestion_run(trigger: str) -> Dict[str, Any]:
     """
@@ -104,7 +132,11 @@ def build_daily_ingestion_plan(user_id: Optional[str] = None) -> Dict[str, Any]:
     }
 
 
-async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "scheduled") -> Dict[str, Any]:
+async def run_daily_ingestion(
+    user_id: Optional[str] = None,
+    trigger: str = "scheduled",
+    streaming: Optional[bool] = None
+) -> Dict[str, Any]:
     """
     Execute the complete daily ingestion pipeline.
 
@@ -116,12 +148,16 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
     5. Filter top articles (Agent 3)
     6. Build brief payload (Agent 4)
     7. Validate articles and brief (Agent 6)
-    8. Store articles and brief (Agent 7)
-    9. Update ingestion run with final status (Agent 7)
+    8. Detect articles already stored or near-duplicated (Agent 6)
+    9. Store new articles and the brief (Agent 7)
+    10. Update ingestion run with final status (Agent 7)
 
     Args:
         user_id: Optional user ID (defaults to system user)
         trigger: What triggered this run (scheduled, manual, etc.)
+        streaming: Run steps 3-5 as a streaming pipeline, scoring each
+                   source's articles as it arrives and keeping only the
+                   running top articles (default STREAMING_PIPELINE)
 
     Returns:
         Complete ingestion result with:
@@ -147,9 +183,11 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
     run_info = start_ingestion_run(trigger)
     run_id = run_info["run_id"]
 
+    timer = StageTimer(run_id)
     errors = []
     stats = {
         "articles_harvested": 0,
+        "articles_already_seen": 0,
         "articles_scored": 0,
         "articles_selected": 0,
         "articles_stored": 0,
@@ -166,7 +204,9 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
             "run_id": run_id
         }))
 
-        topics = get_active_topics(user_id)
+        with timer.stage("get_active_topics") as stage:
+            topics = get_active_topics(user_id)
+            stage["items"] = len(topics)
 
         # If no topics, use default topics for E2E testing
         if not topics:
@@ -204,19 +244,73 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
             "run_id": run_id
         }))
 
-        harvest_result = await harvest_all_sources(time_window_hours=24, max_items_per_source=50)
-        articles = harvest_result.get("articles", [])
-        stats["articles_harvested"] = len(articles)
-
-        if not articles:
+        # Circuit breaker state lives on the /sources documents
+        source_health = get_source_health()
+        if not source_health.loaded:
+            with timer.stage("load_source_health") as stage:
+                source_health.load(load_source_health([s["source_id"] for s in load_sources_from_csv()]))
+                stage["items"] = len(source_health.records)
+
+        if streaming is None:
+            streaming = STREAMING_PIPELINE
+
+        # Articles stored by earlier runs are dropped before scoring
+        seen_index = get_seen_url_index() if SEEN_URL_FILTER else None
+
+        with timer.stage("streaming_pipeline" if streaming else "harvest_all_sources") as stage:
+            if streaming:
+                # Steps 3-5 overlapped: harvest -> dedupe -> score -> top-k
+                pipeline = StreamingPipeline(
+                    topics, score_articles, top_k=MAX_PER_TOPIC * 5, min_score=MIN_SCORE,
+                    max_per_topic=MAX_PER_TOPIC, max_per_source=MAX_PER_SOURCE, seen_index=seen_index
+                )
+                harvest_result = await pipeline.run(lambda sink: harvest_all_sources(
+                    time_window_hours=24,
+                    max_items_per_source=50,
+                    concurrent=True,
+                    adaptive=ADAPTIVE_HARVEST,
+                    sink=sink
+                ))
+                pipeline_metrics = pipeline.metrics()
+                stats["articles_harvested"] = pipeline_metrics["articles_harvested"]
+                stats["articles_already_seen"] = pipeline_metrics["already_seen_dropped"]
+                stats["pipeline"] = pipeline_metrics
+            else:
+                harvest_result = await harvest_all_sources(
+                    time_window_hours=24,
+                    max_items_per_source=50,
+                    concurrent=True,
+                    adaptive=ADAPTIVE_HARVEST
+                )
+                articles = harvest_result.get("articles", [])
+                stats["articles_harvested"] = len(articles)
+            stage["items"] = stats["articles_harvested"]
+
+        if not streaming and seen_index is not None and articles:
+            with timer.stage("filter_seen") as stage:
+                articles = _drop_seen_articles(articles, seen_index)
+                stats["articles_already_seen"] = stats["articles_harvested"] - len(articles)
+                stage["items"] = len(articles)
+        stats["sources_skipped"] = harvest_result.get("sources_skipped", 0)
+        stats["sources_circuit_open"] = harvest_result.get("sources_circuit_open", 0)
+
+        health_updates = source_health.pending_updates()
+        if health_updates:
+            with timer.stage("update_source_health") as stage:
+                update_source_health(health_updates)
+                stage["items"] = len(health_updates)
+
+        if stats["articles_harvested"] <= stats["articles_already_seen"]:
             logger.warning(json.dumps({
                 "severity": "WARNING",
                 "tool": "agent_0",
                 "operation": "run_daily_ingestion",
-                "message": "No articles harvested",
+                "message": "No new articles harvested" if stats["articles_harvested"] else "No articles harvested",
                 "run_id": run_id
             }))
             # Update run as success with no articles
+            _advance_feed_watermarks([])
+            stats["stage_timings"] = timer.summary()
             update_ingestion_run(run_id, "success", stats)
             return {
                 "run_id": run_id,
@@ -226,30 +320,41 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
                 "errors": []
             }
 
-        # Step 4: Score articles (Agent 3)
-        logger.info(json.dumps({
-            "severity": "INFO",
-            "tool": "agent_0",
-            "operation": "run_daily_ingestion",
-            "step": "score_articles",
-            "run_id": run_id,
-            "article_count": len(articles)
-        }))
+        if streaming:
+            top_articles = pipeline.top_articles()
+            stats["articles_scored"] = pipeline_metrics["articles_scored"]
+            stats["articles_selected"] = len(top_articles)
+        else:
+            # Step 4: Score articles (Agent 3)
+            logger.info(json.dumps({
+                "severity": "INFO",
+                "tool": "agent_0",
+                "operation": "run_daily_ingestion",
+                "step": "score_articles",
+                "run_id": run_id,
+                "article_count": len(articles)
+            }))
 
-        scored_articles = score_articles(articles, topics)
-        stats["articles_scored"] = len(scored_articles)
+            with timer.stage("score_articles") as stage:
+                scored_articles = score_articles(articles, topics)
+                stats["articles_scored"] = stage["items"] = len(scored_articles)
 
-        # Step 5: Filter top articles (Agent 3)
-        logger.info(json.dumps({
-            "severity": "INFO",
-            "tool": "agent_0",
-            "operation": "run_daily_ingestion",
-            "step": "filter_top_articles",
-            "run_id": run_id
-        }))
+            # Step 5: Filter top articles (Agent 3)
+            logger.info(json.dumps({
+                "severity": "INFO",
+                "tool": "agent_0",
+                "operation": "run_daily_ingestion",
+                "step": "filter_top_articles",
+                "run_id": run_id
+            }))
+
+            with timer.stage("filter_top_articles") as stage:
+                top_articles = filter_top_articles(
+                    scored_articles, max_per_topic=MAX_PER_TOPIC, min_score=MIN_SCORE, max_per_source=MAX_PER_SOURCE
+                )
+                stats["articles_selected"] = stage["items"] = len(top_articles)
 
-        top_articles = filter_top_articles(scored_articles, max_per_topic=10, min_score=5)
-        stats["articles_selected"] = len(top_articles)
+        save_scoring_stats()
 
         # Step 6: Build brief payload (Agent 4)
         logger.info(json.dumps({
@@ -260,8 +365,10 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
             "run_id": run_id
         }))
 
-        brief = build_brief_payload(top_articles, run_id=run_id)
-        stats["brief_id"] = brief.get("brief_id")
+        with timer.stage("build_brief_payload") as stage:
+            brief = build_brief_payload(top_articles, run_id=run_id)
+            stats["brief_id"] = brief.get("brief_id")
+            stage["items"] = len(top_articles)
 
         # Step 7: Validate articles and brief (Agent 6)
         logger.info(json.dumps({
@@ -272,7 +379,11 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
             "run_id": run_id
         }))
 
-        articles_validation = validate_articles(top_articles)
+        with timer.stage("validate") as stage:
+            articles_validation = validate_articles(top_articles)
+            brief_validation = validate_brief(brief)
+            stage["items"] = len(top_articles)
+
         if not articles_validation["valid"]:
             errors.extend(articles_validation["errors"])
             logger.error(json.dumps({
@@ -284,7 +395,6 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
                 "run_id": run_id
             }))
 
-        brief_validation = validate_brief(brief)
         if not brief_validation["valid"]:
             errors.extend(brief_validation["errors"])
             logger.error(json.dumps({
@@ -306,6 +416,7 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
                 "run_id": run_id,
                 "error_count": len(errors)
             }))
+            stats["stage_timings"] = timer.summary()
             update_ingestion_run(run_id, "failed", stats)
             return {
                 "run_id": run_id,
@@ -315,7 +426,42 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
                 "errors": errors
             }
 
-        # Step 8: Store articles and brief (Agent 7)
+        # Step 8: Skip writes for articles already in Firestore (Agent 6)
+        logger.info(json.dumps({
+            "severity": "INFO",
+            "tool": "agent_0",
+            "operation": "run_daily_ingestion",
+            "step": "detect_duplicates",
+            "run_id": run_id
+        }))
+
+        existence = ArticleExistenceChecker()
+        with timer.stage("detect_duplicates") as stage:
+            try:
+                # Recorded in the history only once stored (below)
+                duplicates = detect_duplicates(top_articles, existence=existence, record=False)
+            except Exception as e:
+                # Best effort: without the check every article is upserted
+                duplicates = []
+                logger.warning(json.dumps({
+                    "severity": "WARNING",
+                    "tool": "agent_0",
+                    "operation": "run_daily_ingestion",
+                    "step": "detect_duplicates",
+                    "error": str(e),
+                    "run_id": run_id
+                }))
+            # Stored under the article's ID, or under its pre-canonicalization ID
+            already_stored = {
+                d["url"] for d in duplicates
+                if d["existing_id"] in (_generate_article_id(d["url"]), legacy_article_id(d["url"]))
+            }
+            articles_to_store = [a for a in top_articles if a.get("url") not in already_stored]
+            stats["duplicates_detected"] = stage["items"] = len(duplicates)
+            stats["articles_already_stored"] = len(top_articles) - len(articles_to_store)
+            stats["duplicate_check_reads"] = existence.reads
+
+        # Step 9: Store articles and brief (Agent 7)
         logger.info(json.dumps({
             "severity": "INFO",
             "tool": "agent_0",
@@ -324,10 +470,33 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
             "run_id": run_id
         }))
 
-        storage_result = store_articles(top_articles)
-        stats["articles_stored"] = storage_result.get("stored_count", 0)
+        with timer.stage("store_articles") as stage:
+            if not articles_to_store:
+                storage_result = {"stored_count": 0, "errors": []}
+            elif ASYNC_STORAGE:
+                storage_result = await store_articles_async(articles_to_store)
+            else:
+                storage_result = store_articles(articles_to_store)
+            stats["articles_stored"] = stage["items"] = storage_result.get("stored_count", 0)
+        if storage_result.get("batches"):
+            stats["storage"] = {
+                "backend": "async" if ASYNC_STORAGE else "sync",
+                "batches": storage_result["batches"],
+                "failed_ids": storage_result.get("failed_ids", []),
+                "dead_lettered": storage_result.get("dead_lettered", 0),
+            }
         if storage_result.get("errors"):
             errors.extend(storage_result["errors"])
+        # Remember what was stored; after errors only if the failed IDs are known
+        if not storage_result.get("errors") or "failed_ids" in storage_result:
+            failed_ids = set(storage_result.get("failed_ids", []))
+            if seen_index is not None:
+                _remember_stored_articles(top_articles, seen_index, failed_ids)
+            _record_near_duplicate_history(top_articles, failed_ids)
+            _advance_feed_watermarks([
+                article for article in top_articles
+                if article.get("url") and _generate_article_id(article["url"]) in failed_ids
+            ])
 
         logger.info(json.dumps({
             "severity": "INFO",
@@ -337,12 +506,14 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
             "run_id": run_id
         }))
 
-        brief_storage_result = store_brief(brief)
+        with timer.stage("store_brief") as stage:
+            brief_storage_result = store_brief(brief)
+            stage["items"] = 1
         if brief_storage_result.get("status") != "stored":
             error_msg = brief_storage_result.get("error", "Brief storage failed")
             errors.append(error_msg)
 
-        # Step 9: Update ingestion run with final status (Agent 7)
+        # Step 10: Update ingestion run with final status (Agent 7)
         final_status = "success" if not errors else "failed"
 
         logger.info(json.dumps({
@@ -354,6 +525,7 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
             "status": final_status
         }))
 
+        stats["stage_timings"] = timer.summary()
         update_ingestion_run(run_id, final_status, stats)
 
         return {
@@ -378,6 +550,7 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
 
         # Try to update run status even if pipeline failed
         try:
+            stats["stage_timings"] = timer.summary()
             update_ingestion_run(run_id, "failed", stats)
         except Exception:
             pass  # Best effort
@@ -389,3 +562,70 @@ async def run_daily_ingestion(user_id: Optional[str] = None, trigger: str = "sch
             "brief_id": None,
             "errors": errors
         }
+
+
+def _drop_seen_articles(articles: List[Dict[str, Any]], seen_index: SeenUrlIndex) -> List[Dict[str, Any]]:
+    """Articles whose canonical URL is not in the seen-article index."""
+    fresh = [
+        article for article in articles
+        if not article.get("url") or _generate_article_id(article["url"]) not in seen_index
+    ]
+
+    logger.info(json.dumps({
+        "severity": "INFO",
+        "tool": "agent_0",
+        "operation": "filter_seen_articles",
+        "input_count": len(articles),
+        "already_seen_count": len(articles) - len(fresh),
+        "index_size": len(seen_index)
+    }))
+    return fresh
+
+
+def _remember_stored_articles(
+    articles: List[Dict[str, Any]],
+    seen_index: SeenUrlIndex,
+    failed_ids: Optional[set] = None
+) -> None:
+    """Add stored articles (all but failed_ids) to the seen-article index and save it (best effort)."""
+    article_ids = (_generate_article_id(article["url"]) for article in articles if article.get("url"))
+    try:
+        seen_index.add_many(article_id for article_id in article_ids if article_id not in (failed_ids or ()))
+        seen_index.save()
+    except Exception as e:
+        logger.error(json.dumps({
+            "severity": "ERROR",
+            "tool": "agent_0",
+            "operation": "remember_stored_articles",
+            "error": f"Failed to update seen-article index: {e}"
+        }))
+
+
+def _record_near_duplicate_history(articles: List[Dict[str, Any]], failed_ids: set) -> None:
+    """Add stored articles (all but failed_ids) to the near-duplicate history (best effort)."""
+    try:
+        record_article_history(articles, failed_ids)
+    except Exception as e:
+        logger.error(json.dumps({
+            "severity": "ERROR",
+            "tool": "agent_0",
+            "operation": "record_near_duplicate_history",
+            "error": f"Failed to update near-duplicate history: {e}"
+        }))
+
+
+def _advance_feed_watermarks(failed_articles: List[Dict[str, Any]]) -> None:
+    """Move feed watermarks past this run's articles (not past failed_articles) and save them (best effort)."""
+    if not ADAPTIVE_HARVEST:
+        return
+    try:
+        scheduler = get_feed_scheduler()
+        if scheduler.advance_watermarks(failed_articles):
+            scheduler.save()
+    except Exception as e:
+        logger.error(json.dumps({
+            "severity": "ERROR",
+            "tool": "agent_0",
+            "operation": "advance_feed_watermarks",
+            "error": f"Failed to save feed schedule: {e}"
+        }))
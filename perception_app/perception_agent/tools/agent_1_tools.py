@@ -6,13 +6,22 @@ These functions fetch articles from configured news sources via MCP tools.
 Phase 5: Real MCP integration with fetch_rss_feed endpoint.
 """
 
-from typing import Any, Dict, List, Optional
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import os
 import csv
+import time
+import asyncio
 import httpx
 import logging
 import json
 from pathlib import Path
+from urllib.parse import urlparse
+
+from .feed_scheduler import get_feed_scheduler
+from .mcp_transport import MCPToolError, close_in_process_transport, get_in_process_transport
+from .source_health import get_source_health
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +30,183 @@ logger = logging.getLogger(__name__)
 # Production: https://perception-mcp-<hash>-uc.a.run.app (set via Agent Engine runtime config)
 MCP_BASE_URL = os.getenv("MCP_BASE_URL", "http://localhost:8080")
 
+# "http" (default) or "inprocess": call the MCP routers directly when the
+# agents and MCP service share a process (local dev, backfills)
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "http").lower()
+
+# Concurrent harvest limits (configurable via environment)
+# HARVEST_MAX_CONCURRENCY caps in-flight fetches across all sources;
+# HARVEST_PER_HOST_LIMIT caps in-flight fetches against a single feed host.
+HARVEST_MAX_CONCURRENCY = int(os.getenv("HARVEST_MAX_CONCURRENCY", "16"))
+HARVEST_PER_HOST_LIMIT = int(os.getenv("HARVEST_PER_HOST_LIMIT", "4"))
+# HARVEST_BATCH_SIZE is the number of feeds sent per fetch_rss_feeds call in batch mode.
+HARVEST_BATCH_SIZE = int(os.getenv("HARVEST_BATCH_SIZE", "32"))
+# Opt-in: send ETag/Last-Modified validators. The MCP service keeps them per
+# feed URL for the whole process, so a feed that answers 304 returns no
+# articles to every later caller, including a run retrying after a failure.
+HARVEST_CONDITIONAL_GET = os.getenv("HARVEST_CONDITIONAL_GET", "false").lower() == "true"
+
+# Shared MCP client pool sizing (configurable via environment)
+MCP_HTTP_MAX_CONNECTIONS = int(os.getenv("MCP_HTTP_MAX_CONNECTIONS", "32"))
+MCP_HTTP_MAX_KEEPALIVE = int(os.getenv("MCP_HTTP_MAX_KEEPALIVE", "16"))
+MCP_HTTP2 = os.getenv("MCP_HTTP2", "false").lower() == "true"
+
+
+class FeedFetchError(Exception):
+    """
+    Raised by fetch_rss(raise_on_error=True) when a feed could not be fetched.
+
+    `code` is the MCP error code; FEED_FETCH_FAILED means the feed itself
+    failed, None means the MCP service could not be reached.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, code: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+
+
+# Lazy-initialized process-wide MCP client
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_pool_stats = None
+
+# Per-host politeness limiter the harvester waits on before each RSS fetch.
+# In process this is the MCP router's own limiter, taken from the in-process
+# transport on first use so there is one per process. Over HTTP the MCP
+# service paces feed hosts itself and answers FEED_HOST_THROTTLED, so the
+# agent keeps none and never imports the MCP service modules for it.
+host_limiter = None
+
+
+def _get_pool_stats():
+    """Get or initialize the MCP client's pool counters."""
+    global _pool_stats
+    if _pool_stats is None:
+        from perception_app.mcp_service.routers.http_pool import PoolStats
+
+        _pool_stats = PoolStats()
+    return _pool_stats
+
+
+def _get_host_limiter():
+    """Get the per-host limiter shared with the MCP router (None over HTTP)."""
+    global host_limiter
+    if host_limiter is None and _in_process():
+        host_limiter = get_in_process_transport().host_limiter
+    return host_limiter
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """
+    Get or initialize the shared MCP client.
+
+    A client is tied to the event loop it was created on, so a new one is
+    built if called from a different loop.
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(
+                max_connections=MCP_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=MCP_HTTP_MAX_KEEPALIVE
+            ),
+            http2=MCP_HTTP2 and _http2_available()
+        )
+        _http_client_loop = loop
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared MCP client. Call once the harvester is done for the process.
+
+    With the in-process transport this also closes the routers' feed-host pool.
+    """
+    global _http_client, _http_client_loop
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
+    await close_in_process_transport()
+
+
+def http_pool_stats() -> Dict[str, Any]:
+    """
+    Report shared MCP client pool statistics.
+
+    Returns:
+        A dict with requests, connections_opened, connections_reused,
+        in_flight, waiting, peak_waiting and the configured pool limits.
+    """
+    return {
+        **_get_pool_stats().snapshot(),
+        "max_connections": MCP_HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": MCP_HTTP_MAX_KEEPALIVE,
+        "http2": MCP_HTTP2 and _http2_available()
+    }
+
+
+def _in_process() -> bool:
+    return MCP_TRANSPORT == "inprocess"
+
+
+def _mcp_endpoint(tool: str) -> str:
+    return f"inprocess://{tool}" if _in_process() else f"{MCP_BASE_URL}/mcp/tools/{tool}"
+
+
+async def _call_mcp_tool(tool: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Call an MCP tool over the configured transport (MCP_TRANSPORT).
+
+    Args:
+        tool: Tool name, e.g. "fetch_rss_feed"
+        payload: Request body
+
+    Returns:
+        The decoded response body.
+
+    Raises:
+        MCPToolError: if the tool returned an error status.
+    """
+    if _in_process():
+        return await get_in_process_transport().call(tool, payload)
+
+    trace, done = _get_pool_stats().tracer()
+    try:
+        client = _get_http_client()
+        response = await client.post(_mcp_endpoint(tool), json=payload, extensions={"trace": trace})
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            code, message = _mcp_error(response)
+            raise MCPToolError(response.status_code, code, message, response.headers.get("retry-after")) from e
+        return response.json()
+    finally:
+        done()
+
+
+def _mcp_error(response: httpx.Response) -> Tuple[Optional[str], str]:
+    """Pull (code, message) out of an MCP error response body."""
+    try:
+        error = response.json()["detail"]["error"]
+        return error.get("code"), error["message"]
+    except Exception:
+        return None, f"MCP returned HTTP {response.status_code}"
+
 
 def load_sources_from_csv() -> List[Dict[str, Any]]:
     """
@@ -105,7 +291,13 @@ def load_sources_from_firestore() -> List[Dict[str, Any]]:
     return []
 
 
-async def fetch_rss(feed_url: str, time_window_hours: int = 24, max_items: int = 50, request_id: Optional[str] = None) -> List[Dict[str, Any]]:
+async def fetch_rss(
+    feed_url: str,
+    time_window_hours: int = 24,
+    max_items: int = 50,
+    request_id: Optional[str] = None,
+    raise_on_error: bool = False
+) -> List[Dict[str, Any]]:
     """
     Call the MCP fetch_rss_feed endpoint to get articles from an RSS feed.
 
@@ -114,17 +306,22 @@ async def fetch_rss(feed_url: str, time_window_hours: int = 24, max_items: int =
         time_window_hours: Only return articles from last N hours
         max_items: Maximum articles to return
         request_id: Optional tracking ID
+        raise_on_error: Raise FeedFetchError instead of returning [] on failure
 
     Returns:
         List of normalized article dicts
     """
-    endpoint = f"{MCP_BASE_URL}/mcp/tools/fetch_rss_feed"
+    endpoint = _mcp_endpoint("fetch_rss_feed")
 
     payload = {
         "feed_url": feed_url,
         "time_window_hours": time_window_hours,
         "max_items": max_items,
-        "request_id": request_id
+        "request_id": request_id,
+        # Unchanged feeds answer 304 and return no articles (see HARVEST_CONDITIONAL_GET)
+        "conditional_get": HARVEST_CONDITIONAL_GET,
+        # Newest-first feeds stop scanning at the first entry past the window
+        "early_cutoff": True
     }
 
     logger.info(json.dumps({
@@ -136,30 +333,34 @@ async def fetch_rss(feed_url: str, time_window_hours: int = 24, max_items: int =
     }))
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(endpoint, json=payload)
-            response.raise_for_status()
-            data = response.json()
+        data = await _call_mcp_tool("fetch_rss_feed", payload)
 
-            logger.info(json.dumps({
-                "severity": "INFO",
-                "tool": "agent_1",
-                "operation": "fetch_rss",
-                "feed_url": feed_url,
-                "article_count": data.get('article_count', 0)
-            }))
+        logger.info(json.dumps({
+            "severity": "INFO",
+            "tool": "agent_1",
+            "operation": "fetch_rss",
+            "feed_url": feed_url,
+            "article_count": data.get('article_count', 0)
+        }))
 
-            return data.get('articles', [])
+        return data.get('articles', [])
 
-    except httpx.HTTPStatusError as e:
+    except MCPToolError as e:
+        limiter = _get_host_limiter()
+        if e.status_code == 429 and limiter is not None and not _in_process():
+            # The feed host (or the MCP service) asked us to back off. In
+            # process the router already penalized the shared limiter.
+            limiter.penalize(_url_host(feed_url), e.retry_after)
         logger.error(json.dumps({
             "severity": "ERROR",
             "tool": "agent_1",
             "operation": "fetch_rss",
             "feed_url": feed_url,
-            "http_status": e.response.status_code,
-            "error": e.response.text
+            "http_status": e.status_code,
+            "error": e.message
         }))
+        if raise_on_error:
+            raise FeedFetchError(e.message, e.status_code, e.code) from e
         return []
     except Exception as e:
         logger.error(json.dumps({
@@ -169,9 +370,100 @@ async def fetch_rss(feed_url: str, time_window_hours: int = 24, max_items: int =
             "feed_url": feed_url,
             "error": str(e)
         }))
+        if raise_on_error:
+            raise FeedFetchError(str(e) or type(e).__name__) from e
         return []
 
 
+async def fetch_rss_batch(
+    feeds: List[Dict[str, Any]],
+    max_concurrency: Optional[int] = None,
+    request_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Call the MCP fetch_rss_feeds batch endpoint for many feeds in one round trip.
+
+    Args:
+        feeds: List of dicts with feed_url and optional time_window_hours,
+               max_items and request_id
+        max_concurrency: Server-side fetch concurrency (default HARVEST_MAX_CONCURRENCY)
+        request_id: Optional tracking ID for the batch
+
+    Returns:
+        One dict per input feed, in input order, with:
+        - articles: list of article dicts ([] on failure)
+        - elapsed_ms: server-side fetch time for the feed
+        - error: error message, or None on success
+        - code: MCP error code for failed feeds (None if the batch call itself failed)
+    """
+    endpoint = _mcp_endpoint("fetch_rss_feeds")
+
+    payload = {
+        "feeds": [{**feed, "conditional_get": HARVEST_CONDITIONAL_GET, "early_cutoff": True} for feed in feeds],
+        "max_concurrency": min(64, max_concurrency or HARVEST_MAX_CONCURRENCY),
+        "request_id": request_id
+    }
+
+    logger.info(json.dumps({
+        "severity": "INFO",
+        "tool": "agent_1",
+        "operation": "fetch_rss_batch",
+        "feed_count": len(feeds),
+        "mcp_endpoint": endpoint
+    }))
+
+    try:
+        data = await _call_mcp_tool("fetch_rss_feeds", payload)
+    except Exception as e:
+        logger.error(json.dumps({
+            "severity": "ERROR",
+            "tool": "agent_1",
+            "operation": "fetch_rss_batch",
+            "feed_count": len(feeds),
+            "error": str(e)
+        }))
+        return [{"articles": [], "elapsed_ms": 0, "error": str(e), "code": None} for _ in feeds]
+
+    results = [{"articles": [], "elapsed_ms": 0, "error": "Missing from batch response"} for _ in feeds]
+    for item in data.get('results', []):
+        index = item.get('index')
+        if index is None or not 0 <= index < len(feeds):
+            continue
+
+        if item.get('status') == 'ok':
+            results[index] = {
+                "articles": (item.get('result') or {}).get('articles', []),
+                "elapsed_ms": item.get('elapsed_ms', 0),
+                "error": None
+            }
+        else:
+            error = (item.get('error') or {}).get('message', 'Unknown error')
+            logger.error(json.dumps({
+                "severity": "ERROR",
+                "tool": "agent_1",
+                "operation": "fetch_rss_batch",
+                "feed_url": item.get('feed_url'),
+                "error": error
+            }))
+            results[index] = {
+                "articles": [],
+                "elapsed_ms": item.get('elapsed_ms', 0),
+                "error": error,
+                "code": (item.get('error') or {}).get('code')
+            }
+
+    logger.info(json.dumps({
+        "severity": "INFO",
+        "tool": "agent_1",
+        "operation": "fetch_rss_batch",
+        "feed_count": len(feeds),
+        "succeeded": data.get('succeeded', 0),
+        "article_count": data.get('article_count', 0)
+    }))
+
+    return results
+
+
 def normalize_article(raw: Dict[str, Any], source_id: str, category: Optional[str] = None) -> Dict[str, Any]:
     """
     Normalize a raw article payload from an MCP tool into a standard structure.
@@ -208,7 +500,223 @@ def normalize_article(raw: Dict[str, Any], source_id: str, category: Optional[st
     }
 
 
-async def harvest_all_sources(time_window_hours: int = 24, max_items_per_source: int = 50) -> Dict[str, Any]:
+def _url_host(url: Optional[str]) -> str:
+    """Return the lowercase host of a URL (empty string if unparseable)."""
+    return (urlparse(url or "").hostname or "").lower()
+
+
+def _source_host(source: Dict[str, Any]) -> str:
+    """Return the lowercase host of a source URL (empty string if unparseable)."""
+    return _url_host(source.get('url'))
+
+
+async def _harvest_source(
+    source: Dict[str, Any],
+    time_window_hours: int,
+    max_items: int,
+    slot: Optional[asyncio.Semaphore] = None
+) -> Dict[str, Any]:
+    """
+    Fetch raw articles for a single source and time the fetch.
+
+    Waits for the source host's politeness token first, then for `slot` (the
+    global concurrency cap, if any), so a throttled host never holds a slot
+    that fetches for other hosts could use.
+
+    Returns:
+        A dict with source_id, raw_articles, elapsed_ms, throttled (True if
+        the host was backing us off and the source was skipped), and error /
+        error_code for failed fetches (None on success).
+    """
+    source_id = source.get('source_id')
+    raw_articles: List[Dict[str, Any]] = []
+    error = error_code = None
+
+    limiter = _get_host_limiter()
+    if source.get('type') == 'rss' and limiter is not None:
+        from perception_app.mcp_service.routers.host_limiter import HostThrottled
+
+        try:
+            # In process the router shares this limiter and takes the token itself
+            await limiter.acquire(_source_host(source), consume=not _in_process())
+        except HostThrottled as e:
+            logger.warning(json.dumps({
+                "severity": "WARNING",
+                "tool": "agent_1",
+                "operation": "harvest_source",
+                "source_id": source_id,
+                "host": e.host,
+                "retry_after_seconds": round(e.retry_after, 1),
+                "message": "Source host throttled, skipping"
+            }))
+            return {"source_id": source_id, "raw_articles": [], "elapsed_ms": 0, "throttled": True}
+
+    async with slot or nullcontext():
+        started = time.perf_counter()
+
+        if source.get('type') == 'rss':
+            # Fetch RSS feed via MCP
+            try:
+                raw_articles = await fetch_rss(
+                    feed_url=source.get('url'),
+                    time_window_hours=source.get('time_window_hours', time_window_hours),
+                    max_items=max_items,
+                    request_id=f"harvest_{source_id}",
+                    raise_on_error=True
+                )
+            except FeedFetchError as e:
+                error, error_code = str(e), e.code
+
+        # TODO Phase 6: Handle 'api' and 'web' source types
+        # elif source_type == 'api':
+        #     raw_articles = await fetch_api_feed(...)
+        # elif source_type == 'web':
+        #     raw_articles = await fetch_webpage(...)
+
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+
+    return {
+        "source_id": source_id,
+        "raw_articles": raw_articles,
+        "elapsed_ms": elapsed_ms,
+        # Over HTTP the MCP service's limiter does the skipping
+        "throttled": error_code == "FEED_HOST_THROTTLED",
+        "error": error,
+        "error_code": error_code
+    }
+
+
+async def _harvest_concurrently(
+    sources: List[Dict[str, Any]],
+    time_window_hours: int,
+    max_items: int,
+    max_concurrency: int,
+    per_host_limit: int,
+    on_result: Optional[Callable[[int, Dict[str, Any]], Awaitable[None]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch all sources concurrently with a global and a per-host concurrency cap.
+
+    Results are collected as fetches finish but returned in the same order as
+    ``sources`` so downstream normalization is identical to the sequential path.
+    ``on_result(index, result)``, if given, is awaited for each source as soon
+    as its fetch finishes.
+    """
+    global_limit = asyncio.Semaphore(max(1, max_concurrency))
+    host_limits: Dict[str, asyncio.Semaphore] = {}
+    for source in sources:
+        host = _source_host(source)
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(max(1, per_host_limit))
+
+    async def run(index: int, source: Dict[str, Any]):
+        async with host_limits[_source_host(source)]:
+            return index, await _harvest_source(source, time_window_hours, max_items, slot=global_limit)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(sources)
+    tasks = [asyncio.create_task(run(i, source)) for i, source in enumerate(sources)]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            index, result = await finished
+            results[index] = result
+            if on_result is not None:
+                await on_result(index, result)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return results
+
+
+async def _harvest_batched(
+    sources: List[Dict[str, Any]],
+    time_window_hours: int,
+    max_items: int,
+    max_concurrency: int,
+    on_result: Optional[Callable[[int, Dict[str, Any]], Awaitable[None]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch all RSS sources through the fetch_rss_feeds batch endpoint.
+
+    Sources are sent in chunks of HARVEST_BATCH_SIZE; results come back in
+    the same order as ``sources``. ``on_result(index, result)``, if given,
+    is awaited for each source once its chunk has returned.
+    """
+    results = [
+        {"source_id": source.get('source_id'), "raw_articles": [], "elapsed_ms": 0}
+        for source in sources
+    ]
+    rss_indexes = [i for i, source in enumerate(sources) if source.get('type') == 'rss']
+    chunks = [rss_indexes[i:i + HARVEST_BATCH_SIZE] for i in range(0, len(rss_indexes), HARVEST_BATCH_SIZE)]
+
+    async def run(chunk: List[int]):
+        feeds = [
+            {
+                "feed_url": sources[i].get('url'),
+                "time_window_hours": sources[i].get('time_window_hours', time_window_hours),
+                "max_items": max_items,
+                "request_id": f"harvest_{sources[i].get('source_id')}"
+            }
+            for i in chunk
+        ]
+        return chunk, await fetch_rss_batch(feeds, max_concurrency=max_concurrency)
+
+    for finished in asyncio.as_completed([run(chunk) for chunk in chunks]):
+        chunk, batch_results = await finished
+        for i, batch_result in zip(chunk, batch_results):
+            results[i]["raw_articles"] = batch_result["articles"]
+            results[i]["elapsed_ms"] = batch_result["elapsed_ms"]
+            results[i]["error"] = batch_result["error"]
+            results[i]["error_code"] = batch_result.get("code")
+            results[i]["throttled"] = batch_result.get("code") == "FEED_HOST_THROTTLED"
+            if on_result is not None:
+                await on_result(i, results[i])
+
+    if on_result is not None:
+        # Non-RSS sources are not fetched in batch mode
+        for i, source in enumerate(sources):
+            if source.get('type') != 'rss':
+                await on_result(i, results[i])
+
+    return results
+
+
+def _record_health(health, result: Dict[str, Any]) -> None:
+    """
+    Feed one harvest result into the source health tracker.
+
+    Only feed-side failures (MCP FEED_FETCH_FAILED: bad status, timeout,
+    unparseable feed) count against a source. Throttled fetches and errors
+    reaching the MCP service itself say nothing about the feed.
+    """
+    if result.get("throttled"):
+        return
+
+    source_id = result["source_id"]
+    if result.get("error") is None:
+        cutoff = datetime.now(tz=timezone.utc) - timedelta(hours=24)
+        recent = 0
+        for raw in result["raw_articles"]:
+            try:
+                if datetime.fromisoformat((raw.get('published_at') or '').replace('Z', '+00:00')) >= cutoff:
+                    recent += 1
+            except (TypeError, ValueError):
+                pass
+        health.record_success(source_id, result["elapsed_ms"], articles_last_24h=recent)
+    elif result.get("error_code") == "FEED_FETCH_FAILED":
+        health.record_failure(source_id, result["error"], result["elapsed_ms"])
+
+
+async def harvest_all_sources(
+    time_window_hours: int = 24,
+    max_items_per_source: int = 50,
+    concurrent: bool = False,
+    max_concurrency: Optional[int] = None,
+    per_host_limit: Optional[int] = None,
+    batch: bool = False,
+    adaptive: bool = False,
+    sink: Optional[Callable[[int, List[Dict[str, Any]]], Awaitable[None]]] = None
+) -> Dict[str, Any]:
     """
     High-level harvesting process.
 
@@ -217,19 +725,43 @@ async def harvest_all_sources(time_window_hours: int = 24, max_items_per_source:
     Args:
         time_window_hours: Only fetch articles from last N hours
         max_items_per_source: Max articles per source
+        concurrent: Fetch sources concurrently instead of one after another
+        max_concurrency: Max in-flight fetches (default HARVEST_MAX_CONCURRENCY)
+        per_host_limit: Max in-flight fetches per feed host (default HARVEST_PER_HOST_LIMIT)
+        batch: Fetch RSS sources through the fetch_rss_feeds batch endpoint
+               (HARVEST_BATCH_SIZE feeds per MCP call); takes precedence over concurrent
+        adaptive: Only fetch feeds the feed scheduler considers due, each with a
+                  window reaching back to its high-watermark, and drop articles
+                  stored by earlier runs (the caller advances the watermarks
+                  once articles are stored, see FeedScheduler.advance_watermarks)
+        sink: Awaited as ``sink(source_index, articles)`` with each source's
+              normalized articles as soon as that source is done, in completion
+              order; the articles are then not kept or returned. source_index
+              is the source's position in the run, for ordering downstream.
 
     Returns:
         A dict with:
-        - articles: List[Dict[str, Any]] of normalized article objects
+        - articles: List[Dict[str, Any]] of normalized article objects ([] with a sink)
+        - article_count: number of normalized articles
         - source_count: number of sources processed
         - total_fetched: total articles fetched before normalization
+        - source_timings: per-source fetch timing, in source order
+        - http_pool: shared MCP client pool statistics
+        - host_limiter: per-host politeness statistics (None over HTTP,
+          where the MCP service paces hosts)
+        - sources_skipped: sources the scheduler skipped as not yet due (adaptive only)
+        - sources_circuit_open: RSS sources skipped because their circuit is open
+        - source_health: circuit breaker summary for the harvested sources
     """
     logger.info(json.dumps({
         "severity": "INFO",
         "tool": "agent_1",
         "operation": "harvest_all_sources",
         "time_window_hours": time_window_hours,
-        "max_items_per_source": max_items_per_source
+        "max_items_per_source": max_items_per_source,
+        "concurrent": concurrent,
+        "batch": batch,
+        "adaptive": adaptive
     }))
 
     # Load sources from CSV (Phase 5)
@@ -245,41 +777,104 @@ async def harvest_all_sources(time_window_hours: int = 24, max_items_per_source:
         }))
         return {
             "articles": [],
+            "article_count": 0,
             "source_count": 0,
-            "total_fetched": 0
+            "total_fetched": 0,
+            "source_timings": []
         }
 
-    # Fetch from each source
-    all_articles = []
-    total_fetched = 0
+    # Skip feeds that are not due yet; due feeds get per-feed windows
+    scheduler = get_feed_scheduler() if adaptive else None
+    skipped: List[Dict[str, Any]] = []
+    if scheduler is not None:
+        sources, skipped = scheduler.plan(sources, time_window_hours)
+        logger.info(json.dumps({
+            "severity": "INFO",
+            "tool": "agent_1",
+            "operation": "harvest_all_sources",
+            "sources_due": len(sources),
+            "sources_skipped": len(skipped)
+        }))
 
-    for source in sources:
-        source_type = source.get('type')
-        source_id = source.get('source_id')
-        source_url = source.get('url')
-        category = source.get('category')
+    # Skip RSS sources whose circuit is open; the rest are fetched
+    health = get_source_health()
+    circuit_open = [
+        s for s in sources
+        if s.get('type') == 'rss' and not health.allow(s.get('source_id'))
+    ]
+    if circuit_open:
+        open_ids = {s.get('source_id') for s in circuit_open}
+        sources = [s for s in sources if s.get('source_id') not in open_ids]
+        logger.warning(json.dumps({
+            "severity": "WARNING",
+            "tool": "agent_1",
+            "operation": "harvest_all_sources",
+            "sources_circuit_open": sorted(open_ids)
+        }))
 
-        if source_type == 'rss':
-            # Fetch RSS feed via MCP
-            raw_articles = await fetch_rss(
-                feed_url=source_url,
-                time_window_hours=time_window_hours,
-                max_items=max_items_per_source,
-                request_id=f"harvest_{source_id}"
+    # Sources are post-processed as they finish; without a sink the
+    # articles are reassembled in source order so every mode gives the same output
+    per_source: List[List[Dict[str, Any]]] = [[] for _ in sources]
+    source_timings: List[Optional[Dict[str, Any]]] = [None] * len(sources)
+    total_fetched = 0
+
+    async def finish(index: int, result: Dict[str, Any]) -> None:
+        nonlocal total_fetched
+        source = sources[index]
+        total_fetched += len(result["raw_articles"])
+        if source.get('type') == 'rss':
+            _record_health(health, result)
+        # Throttled and failed fetches say nothing about how often the feed publishes
+        if scheduler is not None and not result.get("throttled") and result.get("error") is None:
+            result["raw_articles"] = scheduler.record(
+                source.get('source_id'),
+                result["raw_articles"],
+                source.get('time_window_hours', time_window_hours)
             )
 
-            # Normalize each article
-            for raw in raw_articles:
-                normalized = normalize_article(raw, source_id, category)
-                all_articles.append(normalized)
+        normalized = [
+            normalize_article(raw, source.get('source_id'), source.get('category'))
+            for raw in result["raw_articles"]
+        ]
+        source_timings[index] = {
+            "source_id": result["source_id"],
+            "elapsed_ms": result["elapsed_ms"],
+            "article_count": len(normalized),
+            "throttled": result.get("throttled", False),
+            "error": result.get("error")
+        }
+        # Drop raw payloads as soon as they are normalized
+        result["raw_articles"] = []
 
-            total_fetched += len(raw_articles)
+        if sink is not None:
+            await sink(index, normalized)
+        else:
+            per_source[index] = normalized
 
-        # TODO Phase 6: Handle 'api' and 'web' source types
-        # elif source_type == 'api':
-        #     raw_articles = await fetch_api_feed(...)
-        # elif source_type == 'web':
-        #     raw_articles = await fetch_webpage(...)
+    # Fetch from each source
+    if batch:
+        await _harvest_batched(
+            sources,
+            time_window_hours,
+            max_items_per_source,
+            max_concurrency or HARVEST_MAX_CONCURRENCY,
+            on_result=finish
+        )
+    elif concurrent:
+        await _harvest_concurrently(
+            sources,
+            time_window_hours,
+            max_items_per_source,
+            max_concurrency or HARVEST_MAX_CONCURRENCY,
+            per_host_limit or HARVEST_PER_HOST_LIMIT,
+            on_result=finish
+        )
+    else:
+        for index, source in enumerate(sources):
+            await finish(index, await _harvest_source(source, time_window_hours, max_items_per_source))
+
+    all_articles = [article for articles in per_source for article in articles]
+    article_count = sum(timing["article_count"] for timing in source_timings)
 
     logger.info(json.dumps({
         "severity": "INFO",
@@ -287,11 +882,30 @@ async def harvest_all_sources(time_window_hours: int = 24, max_items_per_source:
         "operation": "harvest_all_sources",
         "source_count": len(sources),
         "total_fetched": total_fetched,
-        "articles_after_normalization": len(all_articles)
+        "articles_after_normalization": article_count
     }))
 
+    if scheduler is not None:
+        try:
+            scheduler.save()
+        except OSError as e:
+            logger.error(json.dumps({
+                "severity": "ERROR",
+                "tool": "agent_1",
+                "operation": "harvest_all_sources",
+                "error": f"Failed to save feed schedule: {e}"
+            }))
+
+    limiter = _get_host_limiter()
     return {
         "articles": all_articles,
+        "article_count": article_count,
         "source_count": len(sources),
-        "total_fetched": total_fetched
+        "total_fetched": total_fetched,
+        "source_timings": source_timings,
+        "http_pool": http_pool_stats(),
+        "host_limiter": limiter.stats() if limiter is not None else None,
+        "sources_skipped": len(skipped),
+        "sources_circuit_open": len(circuit_open),
+        "source_health": health.summary(s.get('source_id') for s in sources + circuit_open)
     }
@@ -7,12 +7,66 @@ and filter by relevance thresholds.
 Phase E2E: Implements production-ready scoring with keyword matching + basic heuristics.
 """
 
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 import json
+import os
+import string
+
+from .keyword_matcher import KeywordMatcher
+from .top_k import TopKSelector
 
 logger = logging.getLogger(__name__)
 
+# "python" scores one article at a time; "numpy" uses batch_scoring.BatchScorer
+# (same scores in its default compatibility mode, needs numpy)
+SCORING_ENGINE = os.getenv("SCORING_ENGINE", "python").lower()
+
+# "heuristic" keyword-hit score, or "bm25" (see bm25) for relevance_score
+SCORING_MODE = os.getenv("SCORING_MODE", "heuristic").lower()
+
+# Weight of a keyword hit in the title / in the content; a keyword in both
+# counts only its title weight
+SCORING_TITLE_WEIGHT = float(os.getenv("SCORING_TITLE_WEIGHT", "3"))
+SCORING_CONTENT_WEIGHT = float(os.getenv("SCORING_CONTENT_WEIGHT", "1"))
+
+# Compiled topic sets kept for reuse (streaming scores one source at a time)
+TOPIC_MATCHER_CACHE_SIZE = 8
+
+
+class TopicMatcher:
+    """All topic keywords compiled into one KeywordMatcher, with postings."""
+
+    def __init__(self, topics: List[Dict[str, Any]]):
+        keywords = [keyword for topic in topics for keyword in topic.get("keywords", [])]
+        self.matcher = KeywordMatcher(keywords)
+        # lowercased keyword -> (topic index, keyword index) of each use
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        for topic_index, topic in enumerate(topics):
+            for keyword_index, keyword in enumerate(topic.get("keywords", [])):
+                self.postings.setdefault(keyword.lower(), []).append((topic_index, keyword_index))
+
+    def hits(self, found: set) -> List[Tuple[int, int]]:
+        """(topic index, keyword index) of every found keyword, in topic order."""
+        return sorted(hit for keyword in found for hit in self.postings.get(keyword, ()))
+
+
+_topic_matchers: "OrderedDict[Tuple, TopicMatcher]" = OrderedDict()
+
+
+def get_topic_matcher(topics: List[Dict[str, Any]]) -> TopicMatcher:
+    """Get the compiled matcher for a topic set, building it on first use."""
+    key = tuple(tuple(topic.get("keywords", [])) for topic in topics)
+    matcher = _topic_matchers.get(key)
+    if matcher is None:
+        matcher = _topic_matchers[key] = TopicMatcher(topics)
+        if len(_topic_matchers) > TOPIC_MATCHER_CACHE_SIZE:
+            _topic_matchers.popitem(last=False)
+    else:
+        _topic_matchers.move_to_end(key)
+    return matcher
+
 
 def score_articles(articles: List[Dict[str, Any]], topics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
@@ -27,6 +81,7 @@ def score_articles(articles: List[Dict[str, Any]], topics: List[Dict[str, Any]])
         - relevance_score (1-10)
         - ai_tags (list of strings)
         - section (str, e.g., "Tech", "Business", "General")
+        - section_confidence (0-1)
         - matched_topics (list of topic_ids)
     """
     scored_articles = []
@@ -39,12 +94,21 @@ def score_articles(articles: List[Dict[str, Any]], topics: List[Dict[str, Any]])
         "topic_count": len(topics)
     }))
 
-    for article in articles:
-        score_result = _score_single_article(article, topics)
+    if SCORING_ENGINE == "numpy" and _numpy_scoring_available():
+        from .batch_scoring import BatchScorer
 
-        # Merge score results into article
-        scored_article = {**article, **score_result}
-        scored_articles.append(scored_article)
+        scored_articles = BatchScorer(topics).score(articles)
+    else:
+        matcher = get_topic_matcher(topics)
+        for article in articles:
+            score_result = _score_single_article(article, topics, matcher)
+
+            # Merge score results into article
+            scored_article = {**article, **score_result}
+            scored_articles.append(scored_article)
+
+    if SCORING_MODE == "bm25":
+        _apply_bm25(scored_articles, topics)
 
     logger.info(json.dumps({
         "severity": "INFO",
@@ -57,51 +121,116 @@ def score_articles(articles: List[Dict[str, Any]], topics: List[Dict[str, Any]])
     return scored_articles
 
 
-def _score_single_article(article: Dict[str, Any], topics: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _apply_bm25(scored_articles: List[Dict[str, Any]], topics: List[Dict[str, Any]]) -> None:
+    """
+    Replace relevance_score with the BM25 score (1-10 scale).
+
+    The batch is counted into the corpus statistics first; ai_tags, section
+    and matched_topics stay as the keyword matcher found them.
+    """
+    from .bm25 import BM25Scorer, get_corpus_stats
+
+    stats = get_corpus_stats()
+    stats.add_articles(scored_articles)
+    scorer = BM25Scorer(stats, topics)
+    for article in scored_articles:
+        article["relevance_score"] = scorer.relevance(article)
+
+
+def save_scoring_stats() -> None:
+    """Persist BM25 corpus statistics after a run (no-op in heuristic mode)."""
+    if SCORING_MODE != "bm25":
+        return
+    from .bm25 import get_corpus_stats
+
+    try:
+        get_corpus_stats().save()
+    except OSError as e:
+        logger.error(json.dumps({
+            "severity": "ERROR",
+            "tool": "agent_3",
+            "operation": "save_scoring_stats",
+            "error": f"Failed to save BM25 corpus statistics: {e}"
+        }))
+
+
+def _numpy_scoring_available() -> bool:
+    """The numpy engine needs the optional `numpy` package."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        logger.warning(json.dumps({
+            "severity": "WARNING",
+            "tool": "agent_3",
+            "operation": "score_articles",
+            "message": "SCORING_ENGINE=numpy but numpy is not installed; using the python engine"
+        }))
+        return False
+    return True
+
+
+def _keyword_weights() -> Tuple[float, float]:
+    """(title, content) keyword weights; whole numbers as ints, so scores stay ints."""
+    return tuple(
+        int(weight) if weight.is_integer() else weight
+        for weight in (SCORING_TITLE_WEIGHT, SCORING_CONTENT_WEIGHT)
+    )
+
+
+def _score_single_article(
+    article: Dict[str, Any],
+    topics: List[Dict[str, Any]],
+    matcher: Optional[TopicMatcher] = None
+) -> Dict[str, Any]:
     """
     Score a single article against all topics.
 
+    The title and content are each scanned once for all topic keywords;
+    a keyword found in the title is worth SCORING_TITLE_WEIGHT (3), in the
+    content only SCORING_CONTENT_WEIGHT (1).
+
     Returns dict with:
     - relevance_score: 1-10
     - ai_tags: list of matched keywords
     - section: inferred section name
+    - section_confidence: share of the section signals that point to it
     - matched_topics: list of topic IDs
     """
-    title = article.get("title", "").lower()
-    content = article.get("content", "") or article.get("content_snippet", "") or article.get("summary", "")
-    content_lower = content.lower() if content else ""
-    category = article.get("category", "").lower()
+    title, content_lower, category = _article_texts(article)
 
     matched_topics = []
     matched_keywords = []
     topic_scores = {}
 
-    # Match against topics
-    for topic in topics:
-        topic_id = topic.get("topic_id", "")
-        keywords = topic.get("keywords", [])
-
-        matches = 0
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            if keyword_lower in title:
-                matches += 3  # Title match worth more
-                matched_keywords.append(keyword)
-            elif keyword_lower in content_lower:
-                matches += 1
-                matched_keywords.append(keyword)
-
-        if matches > 0:
-            # Score 1-10 based on matches
-            topic_score = min(10, matches + 3)  # At least 4 if any match
-            topic_scores[topic_id] = topic_score
-            matched_topics.append(topic_id)
+    # Match against topics: one scan per text for all keywords
+    matcher = matcher or get_topic_matcher(topics)
+    in_title = matcher.matcher.matches(title)
+    in_content = matcher.matcher.matches(content_lower)
+    title_weight, content_weight = _keyword_weights()
+
+    topic_matches: Dict[int, float] = {}
+    for topic_index, keyword_index in matcher.hits(in_title | in_content):
+        keyword = topics[topic_index]["keywords"][keyword_index]
+        keyword_lower = keyword.lower()
+        if keyword_lower in in_title:
+            topic_matches[topic_index] = topic_matches.get(topic_index, 0) + title_weight  # Title match worth more
+        else:
+            topic_matches[topic_index] = topic_matches.get(topic_index, 0) + content_weight
+        matched_keywords.append(keyword)
+
+    for topic_index, matches in topic_matches.items():
+        topic_id = topics[topic_index].get("topic_id", "")
+        # Score 1-10 based on matches
+        topic_score = min(10, matches + 3)  # At least 4 if any match
+        topic_scores[topic_id] = topic_score
+        matched_topics.append(topic_id)
 
     # Overall relevance score
     relevance_score = max(topic_scores.values()) if topic_scores else 5  # Default 5 if no topic match
 
     # Infer section based on category or content
-    section = _infer_section(category, title, content_lower, matched_keywords)
+    section_scores = classify_section(category, title, content_lower)
+    section = next(iter(section_scores))
 
     # Generate AI tags from matched keywords
     ai_tags = list(set(matched_keywords[:10]))  # Unique, max 10
@@ -110,67 +239,159 @@ def _score_single_article(article: Dict[str, Any], topics: List[Dict[str, Any]])
         "relevance_score": relevance_score,
         "ai_tags": ai_tags,
         "section": section,
+        "section_confidence": round(section_scores[section], 2),
         "matched_topics": matched_topics
     }
 
 
-def _infer_section(category: str, title: str, content: str, keywords: List[str]) -> str:
+def _article_texts(article: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Lowercased (title, content, category) that scoring matches against."""
+    title = article.get("title", "").lower()
+    content = article.get("content", "") or article.get("content_snippet", "") or article.get("summary", "")
+    content_lower = content.lower() if content else ""
+    category = article.get("category", "").lower()
+    return title, content_lower, category
+
+
+class _SignalIndex:
+    """Signal words -> section, looked up per distinct token of a text."""
+
+    def __init__(self, signals: Dict[str, List[str]]):
+        self._exact: Dict[str, str] = {}
+        self._prefixes: Dict[str, str] = {}
+        for section, words in signals.items():
+            for word in words:
+                if word.endswith("*"):
+                    self._prefixes[word[:-1]] = section
+                else:
+                    self._exact[word] = section
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._prefixes})
+        # Tokens classified so far, and the ones that are signals
+        self._classified: set = set()
+        self._signals: Dict[str, str] = {}
+
+    def _classify(self, token: str) -> Optional[str]:
+        section = self._exact.get(token)
+        if section is None:
+            for length in self._prefix_lengths:
+                if length > len(token):
+                    break
+                section = self._prefixes.get(token[:length])
+                if section is not None:
+                    break
+        return section
+
+    def sections(self, text: str) -> List[str]:
+        """Section of each distinct signal token in `text` (lowercased)."""
+        tokens = set(text.translate(_TOKEN_SEPARATORS).split())
+        unknown = tokens.difference(self._classified)
+        if unknown:
+            if len(self._classified) > SECTION_TOKEN_CACHE_SIZE:
+                self._classified.clear()
+                self._signals.clear()
+                unknown = tokens
+            for token in unknown:
+                section = self._classify(token)
+                if section is not None:
+                    self._signals[token] = section
+            self._classified.update(unknown)
+        return [self._signals[token] for token in tokens.intersection(self._signals)]
+
+
+# Section signal words. A trailing "*" matches any token starting with the
+# word ("market*" matches "markets"). Dict order is the tie-break order: on
+# equal scores the earlier section wins, as in the old first-match chain.
+SECTION_SIGNALS = {
+    "Tech": ["ai", "tech*", "software", "hardware", "startup*", "cloud", "data", "cyber*", "crypto*"],
+    "Business": ["business*", "ceo", "earnings", "revenue*", "market*", "acquisition*", "ipo", "investment*"],
+    "Politics": ["politic*", "government*", "congress*", "senate", "legislation", "regulation*", "policy", "policies"],
+    "Sports": ["sport*", "nfl", "nba", "mlb", "soccer", "football", "basketball"],
+}
+SECTION_CATEGORY_SIGNALS = {
+    "Tech": ["tech*", "ai", "software"],
+    "Business": ["business*", "financ*", "market*"],
+    "Politics": ["politic*", "government*"],
+    "Sports": ["sport*"],
+}
+# Weight of each distinct signal token by where it appears; the source
+# category outweighs a few stray content words
+SECTION_CATEGORY_WEIGHT = 6
+SECTION_TITLE_WEIGHT = 2
+SECTION_CONTENT_WEIGHT = 1
+# Distinct tokens remembered per index before the cache is reset
+SECTION_TOKEN_CACHE_SIZE = 100_000
+
+_TOKEN_SEPARATORS = str.maketrans({char: " " for char in string.punctuation + "\u201c\u201d\u2018\u2019\u2013\u2014\u2026\u00ab\u00bb"})
+_SECTION_ORDER = list(SECTION_SIGNALS)
+_CONTENT_SIGNALS = _SignalIndex(SECTION_SIGNALS)
+_CATEGORY_SIGNALS = _SignalIndex(SECTION_CATEGORY_SIGNALS)
+
+
+def classify_section(category: str, title: str, content: str) -> Dict[str, float]:
     """
-    Infer section name based on category and content.
+    Section confidence scores for an article.
+
+    Each text is split into tokens once and every distinct signal token
+    adds its weight (category > title > content) to its section.
+
+    Args:
+        category: Lowercased source category
+        title: Lowercased title
+        content: Lowercased content
 
-    Returns one of: Tech, Business, Politics, Sports, General
+    Returns:
+        {section: confidence} for every section with a signal, confidences
+        summing to 1, best first (ties in SECTION_SIGNALS order).
+        {"General": 1.0} if there is no signal at all.
     """
-    # Tech signals
-    tech_signals = ["ai", "tech", "software", "hardware", "startup", "cloud", "data", "cyber", "crypto"]
-    if any(sig in category for sig in ["tech", "ai", "software"]):
-        return "Tech"
-    if any(sig in title.lower() or sig in content for sig in tech_signals):
-        return "Tech"
-
-    # Business signals
-    business_signals = ["business", "ceo", "earnings", "revenue", "market", "acquisition", "ipo", "investment"]
-    if any(sig in category for sig in ["business", "finance", "market"]):
-        return "Business"
-    if any(sig in title.lower() or sig in content for sig in business_signals):
-        return "Business"
-
-    # Politics signals
-    politics_signals = ["politics", "government", "congress", "senate", "legislation", "regulation", "policy"]
-    if any(sig in category for sig in ["politics", "government"]):
-        return "Politics"
-    if any(sig in title.lower() or sig in content for sig in politics_signals):
-        return "Politics"
-
-    # Sports signals
-    sports_signals = ["sports", "nfl", "nba", "mlb", "soccer", "football", "basketball"]
-    if any(sig in category for sig in ["sports"]):
-        return "Sports"
-    if any(sig in title.lower() or sig in content for sig in sports_signals):
-        return "Sports"
-
-    return "General"
-
-
-def filter_top_articles(scored_articles: List[Dict[str, Any]], max_per_topic: int = 10, min_score: int = 5) -> List[Dict[str, Any]]:
+    scores: Dict[str, float] = {}
+    for index, text, weight in (
+        (_CATEGORY_SIGNALS, category, SECTION_CATEGORY_WEIGHT),
+        (_CONTENT_SIGNALS, title, SECTION_TITLE_WEIGHT),
+        (_CONTENT_SIGNALS, content, SECTION_CONTENT_WEIGHT),
+    ):
+        if text:
+            for section in index.sections(text):
+                scores[section] = scores.get(section, 0) + weight
+
+    total = sum(scores.values())
+    if not total:
+        return {"General": 1.0}
+    ranked = sorted(scores, key=lambda section: (-scores[section], _SECTION_ORDER.index(section)))
+    return {section: scores[section] / total for section in ranked}
+
+
+def filter_top_articles(
+    scored_articles: List[Dict[str, Any]],
+    max_per_topic: int = 10,
+    min_score: int = 5,
+    max_per_source: Optional[int] = None,
+    max_total: Optional[int] = None
+) -> List[Dict[str, Any]]:
     """
     Filter scored articles to keep only top articles.
 
     Args:
         scored_articles: List of scored articles
-        max_per_topic: Max articles to keep overall
+        max_per_topic: Max articles per topic (an article counts toward its
+            first matched topic; articles without a topic share one quota)
         min_score: Minimum relevance score to keep
+        max_per_source: Max articles per source_id (None: no cap)
+        max_total: Max articles overall (default max_per_topic * 5)
 
     Returns:
         Filtered list of top articles sorted by relevance_score descending
+        (ties keep input order)
     """
-    # Filter by minimum score
-    filtered = [a for a in scored_articles if a.get("relevance_score", 0) >= min_score]
-
-    # Sort by relevance score descending
-    filtered.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
-
-    # Take top N
-    top_articles = filtered[:max_per_topic * 5]  # max_per_topic * 5 for multiple topics
+    selector = TopKSelector(
+        max_total if max_total is not None else max_per_topic * 5,
+        min_score=min_score,
+        max_per_topic=max_per_topic,
+        max_per_source=max_per_source
+    )
+    for article in scored_articles:
+        selector.offer(article)
+    top_articles = selector.items()
 
     logger.info(json.dumps({
         "severity": "INFO",
@@ -178,7 +399,9 @@ def filter_top_articles(scored_articles: List[Dict[str, Any]], max_per_topic: in
         "operation": "filter_top_articles",
         "input_count": len(scored_articles),
         "output_count": len(top_articles),
-        "min_score": min_score
+        "min_score": min_score,
+        "max_per_topic": max_per_topic,
+        "max_per_source": max_per_source
     }))
 
     return top_articles
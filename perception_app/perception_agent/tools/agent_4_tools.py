@@ -13,6 +13,8 @@ import logging
 import json
 import hashlib
 
+from .near_duplicates import collapse_duplicates
+
 logger = logging.getLogger(__name__)
 
 
@@ -131,6 +133,10 @@ def build_brief_payload(scored_articles: List[Dict[str, Any]], run_id: str | Non
     """
     Build a complete brief payload ready for Firestore /briefs collection.
 
+    Near-duplicate articles (the same story from several outlets or URLs)
+    are collapsed into one entry: the best-scored copy, listing the others
+    under "duplicates".
+
     Args:
         scored_articles: List of scored and filtered articles from Agent 3
         run_id: Optional ingestion run ID
@@ -141,7 +147,7 @@ def build_brief_payload(scored_articles: List[Dict[str, Any]], run_id: str | Non
         - date: ISO date string
         - headline: Brief headline
         - sections: List of section dicts (name, key_points, top_articles)
-        - meta: Metadata (counts, run_id, created_at)
+        - meta: Metadata (counts, duplicates_collapsed, run_id, created_at)
     """
     today = date.today().isoformat()
     now = datetime.now(timezone.utc).isoformat()
@@ -149,8 +155,11 @@ def build_brief_payload(scored_articles: List[Dict[str, Any]], run_id: str | Non
     # Generate brief_id
     brief_id = _generate_brief_id(today)
 
+    # One entry per story: collapse syndicated copies and re-posted articles
+    articles = collapse_duplicates(scored_articles)
+
     # Group articles by section
-    sections_data = _group_articles_by_section(scored_articles)
+    sections_data = _group_articles_by_section(articles)
 
     # Build sections list
     sections = []
@@ -163,11 +172,12 @@ def build_brief_payload(scored_articles: List[Dict[str, Any]], run_id: str | Non
     sections.sort(key=lambda s: section_priority.get(s["section_name"], 99))
 
     # Generate headline
-    headline = _generate_headline(today, len(scored_articles), sections)
+    headline = _generate_headline(today, len(articles), sections)
 
     # Build meta
     meta = {
-        "article_count": len(scored_articles),
+        "article_count": len(articles),
+        "duplicates_collapsed": len(scored_articles) - len(articles),
         "section_count": len(sections),
         "run_id": run_id,
         "created_at": now
@@ -186,7 +196,7 @@ def build_brief_payload(scored_articles: List[Dict[str, Any]], run_id: str | Non
         "tool": "agent_4",
         "operation": "build_brief_payload",
         "brief_id": brief_id,
-        "article_count": len(scored_articles),
+        "article_count": len(articles),
         "section_count": len(sections)
     }))
 
@@ -241,8 +251,11 @@ def _build_section(section_name: str, articles: List[Dict[str, Any]]) -> Dict[st
             "title": article.get("title", "Untitled"),
             "url": article.get("url", ""),
             "source_id": article.get("source_id", ""),
-            "relevance_score": article.get("relevance_score", 0)
+            "relevance_score": article.get("relevance_score", 0),
+            "duplicate_count": len(article.get("duplicates", []))
         }
+        if article.get("duplicates"):
+            article_ref["duplicates"] = article["duplicates"]
         article_refs.append(article_ref)
 
     return {
@@ -7,13 +7,23 @@ before allowing storage to Firestore.
 Phase E2E: Implements production-ready validation with schema checking.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 import hashlib
 import logging
 import json
+import os
+
+from .agent_7_tools import _generate_article_id
+from .article_existence import ArticleExistenceChecker
+from .near_duplicates import MinHasher, NearDuplicateIndex, get_history_index
+from .url_canonicalizer import legacy_article_id
 
 logger = logging.getLogger(__name__)
 
+# Also look for documents stored under pre-canonicalization IDs; turn off
+# once scripts/migrate_article_ids.py has run
+LEGACY_ARTICLE_ID_CHECK = os.getenv("LEGACY_ARTICLE_ID_CHECK", "true").lower() == "true"
+
 
 def validate_article_schema(article: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -40,20 +50,125 @@ def validate_article_schema(article: Dict[str, Any]) -> Dict[str, Any]:
     return {"valid": len(errors) == 0, "errors": errors}
 
 
-def detect_duplicates(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def detect_duplicates(
+    articles: List[Dict[str, Any]],
+    existence: Optional[ArticleExistenceChecker] = None,
+    index: Optional[NearDuplicateIndex] = None,
+    record: bool = True,
+) -> List[Dict[str, Any]]:
     """
-    Stub: Detect duplicate articles by URL hash.
+    Detect articles that are already stored or nearly duplicate a recent one.
+
+    First, the articles' IDs are checked against the Firestore /articles
+    collection in batched get_all calls (see article_existence). With
+    LEGACY_ARTICLE_ID_CHECK, the ID an article had before URL
+    canonicalization is checked too. Then the
+    MinHash signature of each remaining article is looked up in the
+    recent-article index (see near_duplicates). This catches syndicated
+    copies and the same story behind a different URL. Articles are checked
+    in order, so one can also match an earlier article of the same batch.
+
+    Before storing, call with record=False and add the articles that were
+    actually stored with record_article_history afterwards, so the history
+    never points at documents that do not exist.
 
     Args:
         articles: List of articles to check.
+        existence: Checker to use; pass the run's checker so IDs are read
+            once per run (default: a new checker on the storage client).
+        index: Index of recent articles (default: the persisted history).
+        record: Add the articles to the index and save it afterwards
+            (otherwise the batch is only compared with itself in memory).
 
     Returns:
         List of duplicate article dicts with:
         - url
-        - existing_id (if found in Firestore)
+        - existing_id (ID of the stored or most similar recent article;
+          the article's own ID, or its legacy ID, if it is already in Firestore)
+        - similarity (1.0 if already stored, else the estimated Jaccard
+          similarity, 0-1)
+    """
+    existence = existence if existence is not None else ArticleExistenceChecker()
+    index = index if index is not None else get_history_index()
+    hasher = MinHasher()
+    duplicates: List[Dict[str, Any]] = []
+    # Earlier articles of this batch, when they are not added to the history
+    batch = None if record else NearDuplicateIndex(bands=index.bands, threshold=index.threshold)
+
+    article_ids = {article["url"]: _generate_article_id(article["url"]) for article in articles if article.get("url")}
+    legacy_ids = {}
+    if LEGACY_ARTICLE_ID_CHECK:
+        legacy_ids = {url: legacy_article_id(url) for url, article_id in article_ids.items()
+                      if legacy_article_id(url) != article_id}
+    stored = existence.existing(list(article_ids.values()) + list(legacy_ids.values()))
+
+    for article in articles:
+        url = article.get("url")
+        if not url:
+            continue
+        article_id = article_ids[url]
+        signature = hasher.signature(article)
+        if article_id in stored:
+            duplicates.append({"url": url, "existing_id": article_id, "similarity": 1.0})
+        elif legacy_ids.get(url) in stored:
+            duplicates.append({"url": url, "existing_id": legacy_ids[url], "similarity": 1.0})
+        else:
+            matches = index.query(signature)
+            if batch is not None:
+                matches = sorted(matches + batch.query(signature), key=lambda match: -match[1])
+            for existing_id, score in matches:
+                if existing_id != article_id:
+                    duplicates.append({"url": url, "existing_id": existing_id, "similarity": round(score, 3)})
+                    break
+        (index if record else batch).add(article_id, signature)
+
+    if record:
+        index.save()
+
+    logger.info(json.dumps({
+        "severity": "INFO",
+        "tool": "agent_6",
+        "operation": "detect_duplicates",
+        "article_count": len(articles),
+        "stored_count": len(stored),
+        "duplicate_count": len(duplicates),
+        "firestore_reads": existence.reads,
+        "history_size": len(index)
+    }))
+
+    return duplicates
+
+
+def record_article_history(
+    articles: List[Dict[str, Any]],
+    failed_ids: Optional[set] = None,
+    index: Optional[NearDuplicateIndex] = None,
+) -> int:
+    """
+    Add stored articles to the recent-article index and save it.
+
+    Args:
+        articles: Articles that were written (those in failed_ids are skipped).
+        failed_ids: Article IDs whose storage failed.
+        index: Index of recent articles (default: the persisted history).
+
+    Returns:
+        Number of articles added.
     """
-    # TODO: implement Firestore query to check for existing URLs
-    return []
+    index = index if index is not None else get_history_index()
+    hasher = MinHasher()
+    added = 0
+    for article in articles:
+        if not article.get("url"):
+            continue
+        article_id = _generate_article_id(article["url"])
+        signature = hasher.signature(article)
+        if article_id in (failed_ids or ()) or signature is None:
+            continue
+        index.add(article_id, signature)
+        added += 1
+    index.save()
+    return added
 
 
 def verify_data_quality(article: Dict[str, Any]) -> Dict[str, Any]:
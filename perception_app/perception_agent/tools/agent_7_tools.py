@@ -8,17 +8,39 @@ Phase E2E: Implements production-ready Firestore writes with batch operations
 and deduplication.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timezone
+import asyncio
 import logging
 import json
-import hashlib
+import os
+import time
 from google.cloud import firestore
 
+from .storage_retry import (
+    DeadLetterQueue,
+    StorageWriteError,
+    get_dead_letter_queue,
+    is_transient,
+    retry_call,
+    retry_call_async,
+)
+from .url_canonicalizer import canonical_article_id, canonicalize_url
+
 logger = logging.getLogger(__name__)
 
-# Lazy-initialized Firestore client
+# Store articles with the AsyncClient, committing batches concurrently
+ASYNC_STORAGE = os.getenv("ASYNC_STORAGE", "false").lower() == "true"
+# Batches committed at the same time by store_articles_async
+STORAGE_MAX_CONCURRENT_BATCHES = int(os.getenv("STORAGE_MAX_CONCURRENT_BATCHES", "4"))
+
+# Firestore batches limited to 500 operations
+STORAGE_BATCH_SIZE = 500
+
+# Lazy-initialized Firestore clients
 _db_client = None
+_async_db_client = None
+_async_db_loop = None
 
 
 def _get_db():
@@ -32,41 +54,49 @@ def _get_db():
     return _db_client
 
 
+def _get_async_db():
+    """
+    Get or initialize the async Firestore client.
+
+    The client's gRPC channel is tied to the event loop it was created on,
+    so a new one is built if called from a different loop (e.g. one
+    asyncio.run() per ingestion run).
+    """
+    global _async_db_client, _async_db_loop
+    loop = asyncio.get_running_loop()
+
+    if _async_db_client is None or _async_db_loop is not loop:
+        _async_db_client = firestore.AsyncClient(
+            project="perception-with-intent",
+            database="perception-db"
+        )
+        _async_db_loop = loop
+
+    return _async_db_client
+
+
 def _generate_article_id(url: str) -> str:
     """
     Generate deterministic article ID from URL.
 
+    The URL is canonicalized first, so tracking-parameter, AMP and
+    www/http variants of one article share an ID.
+
     Args:
         url: Article URL
 
     Returns:
-        SHA256 hash of URL (first 16 chars)
+        SHA256 hash of the canonical URL (first 16 chars)
     """
     if not url:
         # Fallback to timestamp-based ID if no URL
         return f"article-{datetime.now(timezone.utc).isoformat()}"
 
-    url_hash = hashlib.sha256(url.encode()).hexdigest()
-    return f"art-{url_hash[:16]}"
-
-
-def store_articles(articles: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """
-    Batch write articles to Firestore /articles collection with deduplication.
-
-    Args:
-        articles: List of validated article dicts.
+    return canonical_article_id(url)
 
-    Returns:
-        Storage result with:
-        - stored_count (int): Number of articles successfully stored
-        - errors (list): Any failed writes
-    """
-    db = _get_db()
-    errors = []
-    stored_count = 0
 
-    # Deduplicate by URL
+def _prepare_articles(articles: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Deduplicate by URL, assign document IDs and stamp stored_at."""
     unique_articles = deduplicate_by_url(articles)
 
     logger.info(json.dumps({
@@ -77,61 +107,209 @@ def store_articles(articles: List[Dict[str, Any]]) -> Dict[str, Any]:
         "unique_count": len(unique_articles)
     }))
 
-    # Firestore batches limited to 500 operations
-    batch_size = 500
-
-    for i in range(0, len(unique_articles), batch_size):
-        batch_articles = unique_articles[i:i + batch_size]
-        batch = db.batch()
-
-        try:
-            for article in batch_articles:
-                # Generate article ID from URL hash
-                article_id = _generate_article_id(article.get("url", ""))
-
-                # Add timestamp
-                article["stored_at"] = datetime.now(timezone.utc).isoformat()
-
-                # Write to Firestore
-                doc_ref = db.collection("articles").document(article_id)
-                batch.set(doc_ref, article, merge=True)  # merge=True for upsert behavior
-
-            # Commit batch
-            batch.commit()
-            stored_count += len(batch_articles)
-
-            logger.info(json.dumps({
-                "severity": "INFO",
-                "tool": "agent_7",
-                "operation": "store_articles_batch",
-                "batch_stored": len(batch_articles),
-                "total_stored": stored_count
-            }))
-
-        except Exception as e:
-            error_msg = f"Batch write failed: {str(e)}"
-            errors.append(error_msg)
-            logger.error(json.dumps({
-                "severity": "ERROR",
-                "tool": "agent_7",
-                "operation": "store_articles_batch",
-                "error": error_msg
-            }))
+    stored_at = datetime.now(timezone.utc).isoformat()
+    prepared = []
+    for article in unique_articles:
+        # Generate article ID from URL hash
+        article["stored_at"] = stored_at
+        prepared.append((_generate_article_id(article.get("url", "")), article))
+    return prepared
+
+
+def _batch_record(
+    index: int,
+    article_ids: List[str],
+    started: float,
+    attempts: int,
+    error: Exception | None
+) -> Dict[str, Any]:
+    """Per-batch metrics entry (logged and returned in the storage result)."""
+    record = {
+        "batch": index,
+        "size": len(article_ids),
+        "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        "attempts": attempts,
+        "status": "committed" if error is None else "failed",
+    }
+    if error is not None:
+        record["error"] = str(error)
+    logger.log(logging.INFO if error is None else logging.ERROR, json.dumps({
+        "severity": "INFO" if error is None else "ERROR",
+        "tool": "agent_7",
+        "operation": "store_articles_batch",
+        **record
+    }))
+    return record
+
+
+def _dead_letter_batch(
+    chunk: List[Tuple[str, Dict[str, Any]]],
+    error: StorageWriteError,
+    dead_letters: Optional[DeadLetterQueue]
+) -> int:
+    """Spool the writes of a batch that failed for good; returns how many were spooled."""
+    return handle_storage_errors([
+        {
+            "collection": "articles",
+            "doc_id": article_id,
+            "data": article,
+            "merge": True,
+            "error": str(error),
+            "attempts": error.attempts,
+        }
+        for article_id, article in chunk
+    ], dead_letters=dead_letters)
+
+
+def _storage_result(
+    prepared: List[Tuple[str, Dict[str, Any]]],
+    batch_ids: List[List[str]],
+    batches: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    failed_ids = [
+        article_id
+        for ids, record in zip(batch_ids, batches) if record["status"] == "failed"
+        for article_id in ids
+    ]
+    errors = [
+        f"Batch write failed: {record['error']} (article IDs: {', '.join(ids)})"
+        for ids, record in zip(batch_ids, batches) if record["status"] == "failed"
+    ]
+    stored_count = len(prepared) - len(failed_ids)
+    dead_lettered = sum(record.get("dead_lettered", 0) for record in batches)
 
     logger.info(json.dumps({
         "severity": "INFO",
         "tool": "agent_7",
         "operation": "store_articles",
         "stored_count": stored_count,
-        "error_count": len(errors)
+        "error_count": len(errors),
+        "failed_count": len(failed_ids),
+        "dead_lettered": dead_lettered,
+        "batch_latency_ms": [record["latency_ms"] for record in batches]
     }))
 
     return {
         "stored_count": stored_count,
-        "errors": errors
+        "errors": errors,
+        "failed_ids": failed_ids,
+        "dead_lettered": dead_lettered,
+        "batches": batches
     }
 
 
+def store_articles(
+    articles: List[Dict[str, Any]],
+    dead_letters: Optional[DeadLetterQueue] = None
+) -> Dict[str, Any]:
+    """
+    Batch write articles to Firestore /articles collection with deduplication.
+
+    Batches are committed one after another with the sync client; see
+    store_articles_async for concurrent commits. A batch commit is atomic,
+    so a failed batch fails exactly its own article IDs. Batch commits are
+    idempotent upserts, so transient failures are retried with backoff
+    (see storage_retry); batches that still fail go to the dead-letter
+    queue.
+
+    Args:
+        articles: List of validated article dicts.
+        dead_letters: Queue for failed writes (default: STORAGE_DLQ_PATH).
+
+    Returns:
+        Storage result with:
+        - stored_count (int): Number of articles successfully stored
+        - errors (list): Any failed writes
+        - failed_ids (list): Article IDs that were not written
+        - dead_lettered (int): Failed writes spooled for replay
+        - batches (list): Per-batch size, latency_ms, attempts, status
+          (and error, dead_lettered)
+    """
+    db = _get_db()
+    prepared = _prepare_articles(articles)
+    batch_ids: List[List[str]] = []
+    batches: List[Dict[str, Any]] = []
+
+    def commit(chunk: List[Tuple[str, Dict[str, Any]]]) -> None:
+        # A new batch per attempt
+        batch = db.batch()
+        for article_id, article in chunk:
+            doc_ref = db.collection("articles").document(article_id)
+            batch.set(doc_ref, article, merge=True)  # merge=True for upsert behavior
+        batch.commit()
+
+    for i in range(0, len(prepared), STORAGE_BATCH_SIZE):
+        chunk = prepared[i:i + STORAGE_BATCH_SIZE]
+        batch_ids.append([article_id for article_id, _ in chunk])
+        started = time.perf_counter()
+        dead_lettered = 0
+        try:
+            _, attempts = retry_call(lambda: commit(chunk), idempotent=True, operation="store_articles_batch")
+            error = None
+        except StorageWriteError as e:
+            attempts, error = e.attempts, e
+            dead_lettered = _dead_letter_batch(chunk, e, dead_letters)
+        batches.append(_batch_record(len(batches), batch_ids[-1], started, attempts, error))
+        if error is not None:
+            batches[-1]["dead_lettered"] = dead_lettered
+
+    return _storage_result(prepared, batch_ids, batches)
+
+
+async def store_articles_async(
+    articles: List[Dict[str, Any]],
+    max_concurrency: int = STORAGE_MAX_CONCURRENT_BATCHES,
+    dead_letters: Optional[DeadLetterQueue] = None,
+) -> Dict[str, Any]:
+    """
+    Batch write articles with the async Firestore client.
+
+    Same result, retries and dead-lettering as store_articles, but the
+    event loop is never blocked and up to max_concurrency batch commits
+    are in flight at once.
+
+    Args:
+        articles: List of validated article dicts.
+        max_concurrency: Batches committed at the same time.
+        dead_letters: Queue for failed writes (default: STORAGE_DLQ_PATH).
+
+    Returns:
+        Storage result as from store_articles.
+    """
+    db = _get_async_db()
+    prepared = _prepare_articles(articles)
+    chunks = [prepared[i:i + STORAGE_BATCH_SIZE] for i in range(0, len(prepared), STORAGE_BATCH_SIZE)]
+    batch_ids = [[article_id for article_id, _ in chunk] for chunk in chunks]
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def write(chunk: List[Tuple[str, Dict[str, Any]]]) -> None:
+        batch = db.batch()
+        for article_id, article in chunk:
+            batch.set(db.collection("articles").document(article_id), article, merge=True)
+        await batch.commit()
+
+    async def commit(index: int, chunk: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        async with semaphore:
+            started = time.perf_counter()
+            dead_lettered = 0
+            try:
+                _, attempts = await retry_call_async(
+                    lambda: write(chunk), idempotent=True, operation="store_articles_batch"
+                )
+                error = None
+            except StorageWriteError as e:
+                attempts, error = e.attempts, e
+                # The queue fsyncs; keep that off the event loop
+                dead_lettered = await asyncio.to_thread(_dead_letter_batch, chunk, e, dead_letters)
+            record = _batch_record(index, batch_ids[index], started, attempts, error)
+            if error is not None:
+                record["dead_lettered"] = dead_lettered
+            return record
+
+    batches = await asyncio.gather(*(commit(i, chunk) for i, chunk in enumerate(chunks)))
+    return _storage_result(prepared, batch_ids, list(batches))
+
+
 def store_brief(brief: Dict[str, Any]) -> Dict[str, Any]:
     """
     Write brief to Firestore /briefs collection.
@@ -255,9 +433,99 @@ def update_ingestion_run(run_id: str, status: str, stats: Dict[str, Any] | None
         }
 
 
+def load_source_health(source_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Read stored health fields from Firestore /sources documents.
+
+    Args:
+        source_ids: Sources to load.
+
+    Returns:
+        source_id -> document fields for sources that exist ({} on error).
+    """
+    if not source_ids:
+        return {}
+
+    try:
+        db = _get_db()
+        refs = [db.collection("sources").document(source_id) for source_id in source_ids]
+        records = {snapshot.id: snapshot.to_dict() for snapshot in db.get_all(refs) if snapshot.exists}
+
+        logger.info(json.dumps({
+            "severity": "INFO",
+            "tool": "agent_7",
+            "operation": "load_source_health",
+            "requested": len(source_ids),
+            "loaded": len(records)
+        }))
+        return records
+
+    except Exception as e:
+        logger.error(json.dumps({
+            "severity": "ERROR",
+            "tool": "agent_7",
+            "operation": "load_source_health",
+            "error": str(e)
+        }))
+        return {}
+
+
+def update_source_health(updates: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-source health fields into Firestore /sources documents.
+
+    Writes lastChecked, lastSuccess, lastError (the fields created by
+    scripts/load-initial-feeds.py) plus the circuit breaker fields.
+
+    Args:
+        updates: source_id -> fields, from SourceHealthTracker.pending_updates().
+
+    Returns:
+        Storage result with:
+        - updated_count (int): Number of source documents written
+        - errors (list): Any failed batch writes
+    """
+    errors = []
+    updated_count = 0
+    items = list(updates.items())
+
+    try:
+        db = _get_db()
+    except Exception as e:
+        return {"updated_count": 0, "errors": [str(e)]}
+
+    # Firestore batches limited to 500 operations
+    for i in range(0, len(items), 500):
+        batch = db.batch()
+        try:
+            for source_id, fields in items[i:i + 500]:
+                doc_ref = db.collection("sources").document(source_id)
+                batch.set(doc_ref, {**fields, "updatedAt": datetime.now(timezone.utc)}, merge=True)
+            batch.commit()
+            updated_count += len(items[i:i + 500])
+        except Exception as e:
+            error_msg = f"Source health batch write failed: {str(e)}"
+            errors.append(error_msg)
+            logger.error(json.dumps({
+                "severity": "ERROR",
+                "tool": "agent_7",
+                "operation": "update_source_health",
+                "error": error_msg
+            }))
+
+    logger.info(json.dumps({
+        "severity": "INFO",
+        "tool": "agent_7",
+        "operation": "update_source_health",
+        "updated_count": updated_count
+    }))
+
+    return {"updated_count": updated_count, "errors": errors}
+
+
 def deduplicate_by_url(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    Remove duplicate articles by URL before storage.
+    Remove duplicate articles by canonical URL before storage.
 
     Args:
         articles: List of articles.
@@ -270,24 +538,121 @@ def deduplicate_by_url(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
     for article in articles:
         url = article.get("url")
-        if url and url not in seen_urls:
-            seen_urls.add(url)
+        if not url:
+            continue
+        canonical = canonicalize_url(url)
+        if canonical not in seen_urls:
+            seen_urls.add(canonical)
             unique_articles.append(article)
 
     return unique_articles
 
 
-def handle_storage_errors(errors: List[Dict[str, Any]]) -> None:
+def handle_storage_errors(
+    errors: List[Dict[str, Any]],
+    dead_letters: Optional[DeadLetterQueue] = None
+) -> int:
     """
-    Stub: Handle storage errors with retry logic and logging.
+    Log writes that failed after retries and spool them to the dead-letter queue.
 
     Args:
-        errors: List of error dicts from failed writes.
+        errors: List of error dicts from failed writes, each with
+            collection, doc_id, data, merge, error and attempts.
+        dead_letters: Queue to spool to (default: STORAGE_DLQ_PATH).
+
+    Returns:
+        Number of writes spooled.
     """
-    # TODO: implement retry logic with exponential backoff
-    # TODO: log errors to Cloud Logging
-    # TODO: emit OpenTelemetry error events
-    pass
+    if not errors:
+        return 0
+    dead_letters = dead_letters if dead_letters is not None else get_dead_letter_queue()
+    try:
+        spooled = dead_letters.append(errors)
+    except OSError as e:
+        # The run still reports the failed IDs; only the replay copy is lost
+        logger.error(json.dumps({
+            "severity": "ERROR",
+            "tool": "agent_7",
+            "operation": "handle_storage_errors",
+            "doc_ids": [error.get("doc_id") for error in errors],
+            "error": f"Dead-letter queue write failed: {e}",
+            "dlq_path": str(dead_letters.path)
+        }))
+        return 0
+
+    logger.error(json.dumps({
+        "severity": "ERROR",
+        "tool": "agent_7",
+        "operation": "handle_storage_errors",
+        "dead_lettered": spooled,
+        "doc_ids": [error.get("doc_id") for error in errors],
+        "error": errors[0].get("error"),
+        "dlq_path": str(dead_letters.path)
+    }))
+    return spooled
+
+
+def replay_dead_letters(
+    dead_letters: Optional[DeadLetterQueue] = None,
+    batch_size: int = STORAGE_BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    Write the dead-letter queue's entries to Firestore again.
+
+    Entries are grouped into batches of up to batch_size writes and each
+    batch is retried like store_articles. A batch that fails with a
+    non-transient error (e.g. an oversized or invalid document) is written
+    one entry at a time, so only the bad entries fail. Failed entries go
+    back to the queue, or are parked for inspection if the error is not
+    transient or they ran out of replays (see DeadLetterQueue.replay).
+
+    Args:
+        dead_letters: Queue to drain (default: STORAGE_DLQ_PATH).
+        batch_size: Writes per batch commit (max 500).
+
+    Returns:
+        Counts of entries replayed, written, requeued and parked.
+    """
+    dead_letters = dead_letters if dead_letters is not None else get_dead_letter_queue()
+    batch_size = max(1, min(batch_size, STORAGE_BATCH_SIZE))
+
+    def write(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        db = _get_db()
+        failed: List[Dict[str, Any]] = []
+
+        def commit(chunk: List[Dict[str, Any]]) -> None:
+            batch = db.batch()
+            for entry in chunk:
+                doc_ref = db.collection(entry["collection"]).document(entry["doc_id"])
+                batch.set(doc_ref, entry["data"], merge=entry.get("merge", False))
+            batch.commit()
+
+        def failure(entry: Dict[str, Any], error: StorageWriteError) -> Dict[str, Any]:
+            return {
+                **entry,
+                "error": str(error),
+                "attempts": entry.get("attempts", 0) + error.attempts,
+                "replays": entry.get("replays", 0) + 1,
+                "permanent": not is_transient(error.error),
+            }
+
+        for i in range(0, len(entries), batch_size):
+            chunk = entries[i:i + batch_size]
+            try:
+                retry_call(lambda: commit(chunk), idempotent=True, operation="replay_dead_letters_batch")
+            except StorageWriteError as e:
+                if is_transient(e.error) or len(chunk) == 1:
+                    failed.extend(failure(entry, e) for entry in chunk)
+                    continue
+                # Find the entries the batch was rejected for
+                for entry in chunk:
+                    try:
+                        retry_call(lambda: commit([entry]), idempotent=True, operation="replay_dead_letters_entry")
+                    except StorageWriteError as entry_error:
+                        failed.append(failure(entry, entry_error))
+        return failed
+
+    return dead_letters.replay(write)
 
 
 def batch_write_articles(articles: List[Dict[str, Any]], batch_size: int = 500) -> List[Dict[str, Any]]:
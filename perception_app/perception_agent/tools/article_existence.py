@@ -0,0 +1,113 @@
+"""
+Batched Article Existence Checks
+
+Checks which article IDs already have a document in the Firestore
+/articles collection. One .get() per article costs one round trip each, so
+IDs are fetched with get_all (one BatchGetDocuments call per chunk of
+DUPLICATE_CHECK_CHUNK_SIZE IDs). Up to DUPLICATE_CHECK_CONCURRENCY chunks
+run at the same time on worker threads. The request masks out every field,
+so only the document names come back.
+
+A checker caches every answer, so create one per ingestion run and pass it
+to every check in that run. Each ID is then read at most once. `reads`
+counts the document reads spent. Firestore bills a lookup of a missing
+document as a read too, so that is one read per ID fetched.
+
+Configured via environment variables:
+
+- DUPLICATE_CHECK_CHUNK_SIZE: IDs per get_all call (default 100)
+- DUPLICATE_CHECK_CONCURRENCY: get_all calls in flight (default 4)
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .agent_7_tools import _get_db
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_CHECK_CHUNK_SIZE = int(os.getenv("DUPLICATE_CHECK_CHUNK_SIZE", "100"))
+DUPLICATE_CHECK_CONCURRENCY = int(os.getenv("DUPLICATE_CHECK_CONCURRENCY", "4"))
+
+
+class ArticleExistenceChecker:
+    """Cached, batched lookups of article IDs in one Firestore collection."""
+
+    def __init__(
+        self,
+        db: Optional[Any] = None,
+        collection: str = "articles",
+        chunk_size: int = DUPLICATE_CHECK_CHUNK_SIZE,
+        max_concurrency: int = DUPLICATE_CHECK_CONCURRENCY,
+    ):
+        """
+        Args:
+            db: Firestore client (default: the storage agent's client)
+            collection: Collection the article documents live in
+            chunk_size: IDs per get_all call
+            max_concurrency: get_all calls in flight at once
+        """
+        self._db = db
+        self.collection = collection
+        self.chunk_size = max(1, chunk_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self._cache: Dict[str, bool] = {}
+        self.reads = 0
+        self.calls = 0
+
+    def _fetch(self, article_ids: List[str]) -> Set[str]:
+        """IDs of one chunk that have a document."""
+        collection = self._db.collection(self.collection)
+        refs = [collection.document(article_id) for article_id in article_ids]
+        return {snapshot.id for snapshot in self._db.get_all(refs, field_paths=[]) if snapshot.exists}
+
+    def existing(self, article_ids: Iterable[str]) -> Set[str]:
+        """
+        The given IDs that already have a document.
+
+        Only IDs not looked up before by this checker are read.
+
+        Raises:
+            google.api_core.exceptions.GoogleAPICallError: if a get_all call
+                fails (answers of the chunks that succeeded are kept)
+        """
+        article_ids = list(article_ids)
+        pending = list(dict.fromkeys(i for i in article_ids if i not in self._cache))
+        if pending:
+            if self._db is None:
+                self._db = _get_db()
+            chunks = [pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)]
+            if len(chunks) == 1:
+                self._record(chunks[0], self._fetch(chunks[0]))
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks))) as executor:
+                    futures = [(chunk, executor.submit(self._fetch, chunk)) for chunk in chunks]
+                    errors = []
+                    for chunk, future in futures:
+                        try:
+                            self._record(chunk, future.result())
+                        except Exception as e:
+                            errors.append(e)
+                    if errors:
+                        raise errors[0]
+
+            logger.info(json.dumps({
+                "severity": "INFO",
+                "tool": "agent_6",
+                "operation": "check_articles_exist",
+                "requested_count": len(article_ids),
+                "fetched_count": len(pending),
+                "get_all_calls": len(chunks),
+                "total_reads": self.reads
+            }))
+
+        return {article_id for article_id in article_ids if self._cache.get(article_id)}
+
+    def _record(self, chunk: List[str], found: Set[str]) -> None:
+        for article_id in chunk:
+            self._cache[article_id] = article_id in found
+        self.reads += len(chunk)
+        self.calls += 1
@@ -0,0 +1,114 @@
+"""
+Article ID Migration
+
+Article document IDs are hashed from the canonical URL (see
+url_canonicalizer). Documents stored before that have IDs hashed from the
+raw feed URL, so a later write of the same article creates a second
+document. migrate_article_ids() moves every such document to its
+canonical ID:
+
+- no document has the canonical ID yet: the legacy document is copied to
+  it (the most recently stored one, if several URL variants were stored)
+- a document with the canonical ID exists: it is kept
+- either way, the legacy documents are deleted in the same batch commit
+
+Each copy and delete is an idempotent upsert or delete, so a migration
+that fails part way can simply be run again. Run it with
+scripts/migrate_article_ids.py. Once it is done, set
+LEGACY_ARTICLE_ID_CHECK=false.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from .agent_7_tools import STORAGE_BATCH_SIZE, _generate_article_id, _get_db
+from .article_existence import ArticleExistenceChecker
+from .seen_urls import SeenUrlIndex
+from .storage_retry import retry_call
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_article_ids(
+    db: Optional[Any] = None,
+    dry_run: bool = False,
+    seen_index: Optional[SeenUrlIndex] = None,
+) -> Dict[str, int]:
+    """
+    Move /articles documents stored under legacy IDs to their canonical IDs.
+
+    Args:
+        db: Firestore client (default: the storage agent's client)
+        dry_run: Only count what would change
+        seen_index: Seen-article index to backfill with the canonical ID of
+            every stored article (saved afterwards; not in a dry run)
+
+    Returns:
+        Counts of documents scanned, already canonical, moved to their
+        canonical ID, deleted as duplicates of a canonical document, and
+        skipped for having no URL.
+    """
+    db = db or _get_db()
+    collection = db.collection("articles")
+    counts = {"scanned": 0, "canonical": 0, "moved": 0, "duplicates_deleted": 0, "skipped": 0}
+
+    # canonical ID -> legacy (document ID, data) pairs
+    legacy: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+    canonical_ids: List[str] = []
+    for snapshot in collection.stream():
+        counts["scanned"] += 1
+        data = snapshot.to_dict() or {}
+        if not data.get("url"):
+            counts["skipped"] += 1
+            continue
+        article_id = _generate_article_id(data["url"])
+        canonical_ids.append(article_id)
+        if snapshot.id == article_id:
+            counts["canonical"] += 1
+        else:
+            legacy.setdefault(article_id, []).append((snapshot.id, data))
+
+    existing = ArticleExistenceChecker(db=db).existing(legacy.keys()) if legacy else set()
+
+    # (canonical ID or None, legacy ID, data); a None ID only deletes
+    operations: List[Tuple[Optional[str], str, Dict[str, Any]]] = []
+    for article_id, documents in legacy.items():
+        keep = None
+        if article_id not in existing:
+            keep = max(documents, key=lambda doc: str(doc[1].get("stored_at", "")))
+            counts["moved"] += 1
+        for document in documents:
+            legacy_id, data = document
+            operations.append((article_id if document is keep else None, legacy_id, data))
+            if document is not keep:
+                counts["duplicates_deleted"] += 1
+
+    if not dry_run:
+        # A move is two writes (set + delete), kept in one atomic batch
+        chunk_size = STORAGE_BATCH_SIZE // 2
+        for i in range(0, len(operations), chunk_size):
+            chunk = operations[i:i + chunk_size]
+
+            def commit() -> None:
+                batch = db.batch()
+                for article_id, legacy_id, data in chunk:
+                    if article_id is not None:
+                        batch.set(collection.document(article_id), data, merge=True)
+                    batch.delete(collection.document(legacy_id))
+                batch.commit()
+
+            retry_call(commit, idempotent=True, operation="migrate_article_ids_batch")
+
+        if seen_index is not None:
+            seen_index.add_many(canonical_ids)
+            seen_index.save()
+
+    logger.info(json.dumps({
+        "severity": "INFO",
+        "tool": "agent_7",
+        "operation": "migrate_article_ids",
+        "dry_run": dry_run,
+        **counts
+    }))
+    return counts
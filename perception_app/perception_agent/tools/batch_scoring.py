@@ -0,0 +1,221 @@
+"""
+Batch Relevance Scoring
+
+Scores many articles at once for backfills of hundreds of thousands of
+articles, where score_articles' per-article topic loop dominates.
+
+Articles become a sparse article x term matrix (term = distinct topic
+keyword; the value is the keyword's title or content weight), which is
+multiplied by a sparse topic x term matrix (how often each keyword
+appears in each topic) to get every topic score of a chunk in one NumPy
+operation. Terms are found with the same Aho-Corasick matcher as
+score_articles, so a "term" is a substring hit, not a token: "ai" still
+matches inside "maintain".
+
+In compatibility mode (the default) the result is identical to
+score_articles: it scores with the same title and content weights
+(SCORING_TITLE_WEIGHT / SCORING_CONTENT_WEIGHT, default 3 and 1), a
+keyword in the title counts only its title weight, and scores are ints
+when the weights are whole numbers. With compat=False any weights can be
+given, a keyword in both title and content counts both weights and
+scores are floats.
+
+NumPy is optional: install it with `pip install 'perception[scoring]'`.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .agent_3_tools import _article_texts, _keyword_weights, classify_section, get_topic_matcher
+
+logger = logging.getLogger(__name__)
+
+# Articles scored per matrix product
+SCORING_BATCH_SIZE = int(os.getenv("SCORING_BATCH_SIZE", "4096"))
+
+
+class BatchScorer:
+    """Scores article batches against one topic set with sparse matrix products."""
+
+    def __init__(
+        self,
+        topics: List[Dict[str, Any]],
+        title_weight: Optional[float] = None,
+        content_weight: Optional[float] = None,
+        compat: bool = True,
+        batch_size: int = SCORING_BATCH_SIZE,
+    ):
+        """
+        Args:
+            topics: Topic dicts with topic_id and keywords
+            title_weight: Weight of a keyword found in the title
+                (default: score_articles' SCORING_TITLE_WEIGHT)
+            content_weight: Weight of a keyword found in the content
+                (default: score_articles' SCORING_CONTENT_WEIGHT)
+            compat: Reproduce score_articles exactly (title hit shadows the
+                content hit, same weights and score type)
+            batch_size: Articles per matrix product
+
+        Raises:
+            RuntimeError: if numpy is not installed
+            ValueError: if compat is set with weights other than score_articles'
+        """
+        if np is None:
+            raise RuntimeError("Batch scoring needs numpy: pip install 'perception[scoring]'")
+
+        default_title, default_content = _keyword_weights()
+        self.title_weight = float(default_title if title_weight is None else title_weight)
+        self.content_weight = float(default_content if content_weight is None else content_weight)
+        if compat and (self.title_weight, self.content_weight) != (default_title, default_content):
+            raise ValueError(
+                "Compatibility mode scores with score_articles' weights "
+                "(SCORING_TITLE_WEIGHT / SCORING_CONTENT_WEIGHT)"
+            )
+        # score_articles' scores are ints for whole-number weights
+        self._int_scores = compat and isinstance(default_title, int) and isinstance(default_content, int)
+
+        self.topics = topics
+        self.topic_ids = [topic.get("topic_id", "") for topic in topics]
+        self.compat = compat
+        self.batch_size = max(1, batch_size)
+        self._matcher = get_topic_matcher(topics)
+        # Topics sharing a topic_id (score_articles keeps the last match's score)
+        columns: Dict[str, List[int]] = {}
+        for topic_index, topic_id in enumerate(self.topic_ids):
+            columns.setdefault(topic_id, []).append(topic_index)
+        self._shared_ids = [indexes for indexes in columns.values() if len(indexes) > 1]
+
+        # Topic x term weight matrix, stored by term (CSR of its transpose):
+        # term k appears in topics _term_topics[_term_ptr[k]:_term_ptr[k + 1]],
+        # _term_counts times each
+        self._terms: Dict[str, int] = {}
+        term_ptr, term_topics, term_counts = [0], [], []
+        for term, postings in sorted(self._matcher.postings.items()):
+            self._terms[term] = len(self._terms)
+            counts: Dict[int, int] = {}
+            for topic_index, _ in postings:
+                counts[topic_index] = counts.get(topic_index, 0) + 1
+            term_topics.extend(counts)
+            term_counts.extend(counts.values())
+            term_ptr.append(len(term_topics))
+        self._term_ptr = np.array(term_ptr, dtype=np.int64)
+        self._term_topics = np.array(term_topics, dtype=np.int64)
+        self._term_counts = np.array(term_counts, dtype=np.float64)
+
+    def score(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Score articles.
+
+        Args:
+            articles: Article dicts (not modified)
+
+        Returns:
+            Copies of the articles with relevance_score, ai_tags, section and
+            matched_topics, as score_articles returns them.
+        """
+        scored: List[Dict[str, Any]] = []
+        for start in range(0, len(articles), self.batch_size):
+            scored.extend(self._score_chunk(articles[start:start + self.batch_size]))
+
+        logger.info(json.dumps({
+            "severity": "INFO",
+            "tool": "agent_3",
+            "operation": "batch_score",
+            "article_count": len(articles),
+            "topic_count": len(self.topics),
+            "term_count": len(self._terms),
+            "compat": self.compat
+        }))
+        return scored
+
+    def _term_hits(self, title: str, content: str) -> Dict[str, float]:
+        """Weight of each topic keyword found in the article."""
+        keyword_matcher = self._matcher.matcher
+        in_title = keyword_matcher.matches(title)
+        in_content = keyword_matcher.matches(content)
+
+        hits = {term: self.content_weight for term in in_content}
+        for term in in_title:
+            if self.compat:
+                hits[term] = self.title_weight
+            else:
+                hits[term] = hits.get(term, 0.0) + self.title_weight
+        return hits
+
+    def _topic_scores(self, hits: List[Dict[str, float]]) -> "np.ndarray":
+        """Keyword-weight sum per article and topic: (article x term) @ (term x topic)."""
+        rows, cols, weights = [], [], []
+        for row, article_hits in enumerate(hits):
+            for term, weight in article_hits.items():
+                rows.append(row)
+                cols.append(self._terms[term])
+                weights.append(weight)
+
+        topic_count = len(self.topics)
+        if not rows or not topic_count:
+            return np.zeros((len(hits), topic_count))
+
+        rows_a = np.array(rows, dtype=np.int64)
+        cols_a = np.array(cols, dtype=np.int64)
+        weights_a = np.array(weights, dtype=np.float64)
+
+        # Expand each (article, term) entry to one entry per topic using the term
+        starts = self._term_ptr[cols_a]
+        lengths = self._term_ptr[cols_a + 1] - starts
+        entry = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+        topic = self._term_topics[entry]
+        values = np.repeat(weights_a, lengths) * self._term_counts[entry]
+
+        cells = np.repeat(rows_a, lengths) * topic_count + topic
+        return np.bincount(cells, weights=values, minlength=len(hits) * topic_count).reshape(len(hits), topic_count)
+
+    def _best_scores(self, matrix: "np.ndarray") -> "np.ndarray":
+        """Highest topic sum per article, counting one topic per topic_id."""
+        if not self._shared_ids:
+            return matrix.max(axis=1, initial=0.0)
+        effective = matrix.copy()
+        for indexes in self._shared_ids:
+            last = effective[:, indexes[0]]
+            for index in indexes[1:]:
+                last = np.where(matrix[:, index] > 0, matrix[:, index], last)
+                effective[:, index] = 0
+            effective[:, indexes[0]] = last
+        return effective.max(axis=1, initial=0.0)
+
+    def _score_chunk(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        texts = [_article_texts(article) for article in articles]
+        hits = [self._term_hits(title, content) for title, content, _ in texts]
+        matrix = self._topic_scores(hits)
+
+        best = self._best_scores(matrix)
+        relevance = np.where(best > 0, np.minimum(10, best + 3), 5).tolist()
+        matched_rows, matched_topics = np.nonzero(matrix > 0)
+        bounds = np.searchsorted(matched_rows, np.arange(len(articles) + 1)).tolist()
+        matched_topics = matched_topics.tolist()
+
+        scored = []
+        for i, article in enumerate(articles):
+            title, content_lower, category = texts[i]
+            matched_keywords = [
+                self.topics[topic_index]["keywords"][keyword_index]
+                for topic_index, keyword_index in self._matcher.hits(hits[i].keys())
+            ]
+            section_scores = classify_section(category, title, content_lower)
+            section = next(iter(section_scores))
+            scored_article = dict(article)
+            scored_article.update({
+                "relevance_score": int(relevance[i]) if self._int_scores else relevance[i],
+                "ai_tags": list(set(matched_keywords[:10])),
+                "section": section,
+                "section_confidence": round(section_scores[section], 2),
+                "matched_topics": [self.topic_ids[t] for t in matched_topics[bounds[i]:bounds[i + 1]]],
+            })
+            scored.append(scored_article)
+        return scored
@@ -0,0 +1,249 @@
+"""
+BM25 Relevance Scoring
+
+An alternative to the keyword-hit heuristic in agent_3_tools, which
+saturates at a handful of hits and treats every keyword alike. BM25 weighs
+each query term by how rare it is in the corpus (IDF) and dampens repeated
+hits and long articles.
+
+Each topic is a query made of its keywords' word tokens. An article is one
+document whose title tokens count BM25_TITLE_BOOST times (a simple BM25F).
+The best topic score is mapped onto the existing 1-10 relevance scale:
+articles that match no topic keep the heuristic's default of 5, and
+matching articles land in (5, 10] along 1 - exp(-score / BM25_SCORE_SCALE),
+so they always rank above unmatched ones.
+
+Corpus statistics (document count, total length, per-term document
+frequency) are updated incrementally with each batch that is scored: only
+the new articles are tokenized, and articles already counted (by URL) are
+skipped. They are kept in a JSON file so they accumulate across runs.
+The file stays bounded: it holds at most BM25_VOCAB_LIMIT terms and
+BM25_SEEN_LIMIT article keys. Past the vocabulary limit the rarest terms
+are dropped, oldest first. Most of them are one-off tokens (typos, IDs,
+numbers) whose IDF is near the maximum anyway.
+Configured via environment variables:
+
+- BM25_STATS_PATH (default data/bm25_stats.json)
+- BM25_K1 (default 1.2), BM25_B (default 0.75)
+- BM25_TITLE_BOOST (default 3)
+- BM25_SCORE_SCALE (default 5)
+- BM25_SEEN_LIMIT: most recent article keys remembered for de-duplication
+  (default 200000)
+- BM25_VOCAB_LIMIT: most terms kept in the document frequencies
+  (default 100000)
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BM25_STATS_PATH = os.getenv(
+    "BM25_STATS_PATH",
+    str(Path(__file__).parent.parent.parent.parent / "data" / "bm25_stats.json")
+)
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+BM25_TITLE_BOOST = int(os.getenv("BM25_TITLE_BOOST", "3"))
+BM25_SCORE_SCALE = float(os.getenv("BM25_SCORE_SCALE", "5"))
+# The stats file holds at most BM25_SEEN_LIMIT keys and BM25_VOCAB_LIMIT terms
+BM25_SEEN_LIMIT = int(os.getenv("BM25_SEEN_LIMIT", "200000"))
+BM25_VOCAB_LIMIT = int(os.getenv("BM25_VOCAB_LIMIT", "100000"))
+
+# relevance_score of an article that matches no topic (the heuristic's default)
+NO_MATCH_SCORE = 5
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased word tokens."""
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+def _article_key(article: Dict[str, Any]) -> str:
+    """Stable key for de-duplicating articles across runs."""
+    identity = article.get("url") or article.get("id") or article.get("title") or ""
+    return hashlib.sha1(str(identity).encode("utf-8")).hexdigest()[:16]
+
+
+def _document_terms(article: Dict[str, Any], title_boost: int) -> Counter:
+    """Term frequencies with title tokens counted title_boost times."""
+    content = article.get("content") or article.get("content_snippet") or article.get("summary") or ""
+    terms = Counter(tokenize(content))
+    for token in tokenize(article.get("title")):
+        terms[token] += title_boost
+    return terms
+
+
+class CorpusStats:
+    """Document frequencies and lengths of every article scored so far."""
+
+    def __init__(
+        self,
+        state_path: Optional[str] = BM25_STATS_PATH,
+        title_boost: int = BM25_TITLE_BOOST,
+        seen_limit: int = BM25_SEEN_LIMIT,
+        vocab_limit: int = BM25_VOCAB_LIMIT,
+    ):
+        self.state_path = Path(state_path) if state_path else None
+        self.title_boost = title_boost
+        self.seen_limit = seen_limit
+        self.vocab_limit = vocab_limit
+        self.doc_count = 0
+        self.total_length = 0
+        self.df: Dict[str, int] = {}
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._loaded = False
+        self.dirty = False
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(json.dumps({
+                "severity": "WARNING",
+                "tool": "agent_3",
+                "operation": "bm25_stats_load",
+                "state_path": str(self.state_path),
+                "error": str(e)
+            }))
+            return
+        self.doc_count = state.get("doc_count", 0)
+        self.total_length = state.get("total_length", 0)
+        self.df = state.get("df", {})
+        self._seen = OrderedDict.fromkeys(state.get("seen", []))
+
+    def save(self) -> None:
+        """Write the statistics atomically if they changed (no-op without a path)."""
+        if self.state_path is None or not self.dirty:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "doc_count": self.doc_count,
+                "total_length": self.total_length,
+                "df": self.df,
+                "seen": list(self._seen),
+            }, f, separators=(",", ":"))
+        os.replace(tmp_path, self.state_path)
+        self.dirty = False
+
+    @property
+    def avg_length(self) -> float:
+        self._ensure_loaded()
+        return self.total_length / self.doc_count if self.doc_count else 0.0
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency (always positive)."""
+        self._ensure_loaded()
+        n = self.df.get(term, 0)
+        return math.log(1 + (self.doc_count - n + 0.5) / (n + 0.5))
+
+    def add_articles(self, articles: Iterable[Dict[str, Any]]) -> int:
+        """
+        Count articles not seen before into the statistics.
+
+        Returns:
+            Number of articles added.
+        """
+        self._ensure_loaded()
+        added = 0
+        for article in articles:
+            key = _article_key(article)
+            if key in self._seen:
+                continue
+            self._seen[key] = None
+            if len(self._seen) > self.seen_limit:
+                self._seen.popitem(last=False)
+
+            terms = _document_terms(article, self.title_boost)
+            self.doc_count += 1
+            self.total_length += sum(terms.values())
+            for term in terms:
+                self.df[term] = self.df.get(term, 0) + 1
+            added += 1
+
+        if added:
+            self._prune_vocabulary()
+            self.dirty = True
+        return added
+
+    def _prune_vocabulary(self) -> None:
+        """Drop the rarest terms, oldest first, down to vocab_limit."""
+        excess = len(self.df) - self.vocab_limit
+        if excess <= 0:
+            return
+        # Stable sort: df dicts keep first-seen order, also across save/load
+        for term in sorted(self.df, key=self.df.get)[:excess]:
+            del self.df[term]
+
+
+class BM25Scorer:
+    """Scores articles against topics with BM25 over the corpus statistics."""
+
+    def __init__(
+        self,
+        stats: CorpusStats,
+        topics: List[Dict[str, Any]],
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        scale: float = BM25_SCORE_SCALE,
+    ):
+        self.stats = stats
+        self.k1 = k1
+        self.b = b
+        self.scale = scale
+        self.queries = [
+            sorted({token for keyword in topic.get("keywords", []) for token in tokenize(keyword)})
+            for topic in topics
+        ]
+
+    def topic_scores(self, article: Dict[str, Any]) -> List[float]:
+        """Raw BM25 score of the article for each topic."""
+        terms = _document_terms(article, self.stats.title_boost)
+        avg_length = self.stats.avg_length or 1.0
+        norm = self.k1 * (1 - self.b + self.b * sum(terms.values()) / avg_length)
+
+        scores = []
+        for query in self.queries:
+            score = 0.0
+            for token in query:
+                tf = terms.get(token)
+                if tf:
+                    score += self.stats.idf(token) * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+    def relevance(self, article: Dict[str, Any]) -> float:
+        """Best topic score on the 1-10 relevance scale."""
+        best = max(self.topic_scores(article), default=0.0)
+        if best <= 0:
+            return NO_MATCH_SCORE
+        return round(NO_MATCH_SCORE + (10 - NO_MATCH_SCORE) * (1 - math.exp(-best / self.scale)), 2)
+
+
+# Lazy-initialized process-wide statistics
+_corpus_stats: Optional[CorpusStats] = None
+
+
+def get_corpus_stats() -> CorpusStats:
+    """Get or initialize the process-wide corpus statistics (at BM25_STATS_PATH)."""
+    global _corpus_stats
+    if _corpus_stats is None:
+        _corpus_stats = CorpusStats()
+    return _corpus_stats
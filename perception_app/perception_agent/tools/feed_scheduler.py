@@ -0,0 +1,310 @@
+"""
+Adaptive Feed Scheduler
+
+Learns how often each feed publishes and decides which feeds are due on a
+harvest run, so slow feeds (weekly engineering blogs) are not fetched on
+every run while busy ones (wire services) still are.
+
+Per feed (keyed by source_id) it keeps:
+- high_watermark: newest published_at stored so far. The next fetch only
+  asks for entries newer than it, and anything at or before it is dropped.
+  record() only notes a harvest's entries; advance_watermarks() moves the
+  watermark once the run has stored them, so entries of a run that fails
+  are harvested again.
+- interval_hours: moving average of the gap between the feed's entries.
+  Silence counts too: a feed with nothing new for N hours is treated as
+  publishing at most every N hours.
+- last_checked: when the feed was last harvested.
+
+A feed is due once interval_hours * FEED_SCHEDULE_POLL_FRACTION (clamped to
+the min/max interval) has passed since last_checked. Feeds without history
+are always due.
+
+State is a JSON file so it survives between runs. Configured via
+environment variables:
+
+- FEED_SCHEDULE_STATE_PATH (default data/feed_schedule.json)
+- FEED_SCHEDULE_MIN_INTERVAL_HOURS (default 0.25)
+- FEED_SCHEDULE_MAX_INTERVAL_HOURS (default 168)
+- FEED_SCHEDULE_POLL_FRACTION (default 0.5)
+- FEED_SCHEDULE_OVERLAP_HOURS: extra window before the watermark, for
+  entries that show up late with older timestamps (default 1)
+"""
+
+import json
+import logging
+import math
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FEED_SCHEDULE_STATE_PATH = os.getenv(
+    "FEED_SCHEDULE_STATE_PATH",
+    str(Path(__file__).parent.parent.parent.parent / "data" / "feed_schedule.json")
+)
+FEED_SCHEDULE_MIN_INTERVAL_HOURS = float(os.getenv("FEED_SCHEDULE_MIN_INTERVAL_HOURS", "0.25"))
+FEED_SCHEDULE_MAX_INTERVAL_HOURS = float(os.getenv("FEED_SCHEDULE_MAX_INTERVAL_HOURS", "168"))
+FEED_SCHEDULE_POLL_FRACTION = float(os.getenv("FEED_SCHEDULE_POLL_FRACTION", "0.5"))
+FEED_SCHEDULE_OVERLAP_HOURS = float(os.getenv("FEED_SCHEDULE_OVERLAP_HOURS", "1"))
+
+# Weight of the newest observation in the publish-interval moving average
+INTERVAL_EMA_ALPHA = 0.3
+
+# fetch_rss_feed accepts windows of 1..720 hours
+MAX_WINDOW_HOURS = 720
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _hours(delta: timedelta) -> float:
+    return delta.total_seconds() / 3600
+
+
+class FeedScheduler:
+    """Per-feed publish-rate tracking, due-feed selection and high-watermarks."""
+
+    def __init__(
+        self,
+        state_path: Optional[str] = FEED_SCHEDULE_STATE_PATH,
+        min_interval_hours: float = FEED_SCHEDULE_MIN_INTERVAL_HOURS,
+        max_interval_hours: float = FEED_SCHEDULE_MAX_INTERVAL_HOURS,
+        poll_fraction: float = FEED_SCHEDULE_POLL_FRACTION,
+        overlap_hours: float = FEED_SCHEDULE_OVERLAP_HOURS,
+    ):
+        self.state_path = Path(state_path) if state_path else None
+        self.min_interval_hours = min_interval_hours
+        self.max_interval_hours = max_interval_hours
+        self.poll_fraction = poll_fraction
+        self.overlap_hours = overlap_hours
+        self._feeds: Optional[Dict[str, Dict[str, Any]]] = None
+        # published_at of entries recorded since plan(), per feed, until advance_watermarks()
+        self._pending: Dict[str, List[datetime]] = {}
+
+    @property
+    def feeds(self) -> Dict[str, Dict[str, Any]]:
+        """Per-feed state, loaded from disk on first use."""
+        if self._feeds is None:
+            self._feeds = self._load()
+        return self._feeds
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self.state_path is None or not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f).get("feeds", {})
+        except (OSError, ValueError) as e:
+            logger.warning(json.dumps({
+                "severity": "WARNING",
+                "tool": "agent_1",
+                "operation": "feed_scheduler_load",
+                "state_path": str(self.state_path),
+                "error": str(e)
+            }))
+            return {}
+
+    def save(self) -> None:
+        """Write state to disk atomically (no-op without a state path)."""
+        if self.state_path is None:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"feeds": self.feeds}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def poll_interval_hours(self, source_id: str) -> Optional[float]:
+        """Hours between polls for a feed (None if it has no history yet)."""
+        interval = self.feeds.get(source_id, {}).get("interval_hours")
+        if interval is None:
+            return None
+        return min(self.max_interval_hours, max(self.min_interval_hours, interval * self.poll_fraction))
+
+    def next_due(self, source_id: str) -> Optional[datetime]:
+        """When a feed is next due (None: due now, no history)."""
+        last_checked = _parse_time(self.feeds.get(source_id, {}).get("last_checked"))
+        interval = self.poll_interval_hours(source_id)
+        if last_checked is None or interval is None:
+            return None
+        return last_checked + timedelta(hours=interval)
+
+    def is_due(self, source_id: str, now: Optional[datetime] = None) -> bool:
+        """True if the feed should be harvested on a run at `now`."""
+        due_at = self.next_due(source_id)
+        return due_at is None or (now or datetime.now(tz=timezone.utc)) >= due_at
+
+    def plan(
+        self,
+        sources: List[Dict[str, Any]],
+        default_window_hours: int,
+        now: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Split sources into due and skipped.
+
+        Due sources are returned as copies with a per-feed time_window_hours
+        that reaches back to the feed's high-watermark.
+
+        Returns:
+            (due sources, skipped sources), each in input order.
+        """
+        now = now or datetime.now(tz=timezone.utc)
+        # A new harvest: entries of an earlier one that never advanced are dropped
+        self._pending.clear()
+        due, skipped = [], []
+        for source in sources:
+            source_id = source.get("source_id")
+            if not self.is_due(source_id, now):
+                skipped.append(source)
+                continue
+            due.append({**source, "time_window_hours": self.window_hours(source_id, default_window_hours, now)})
+        return due, skipped
+
+    def window_hours(self, source_id: str, default_hours: int, now: Optional[datetime] = None) -> int:
+        """Time window that covers everything newer than the feed's last harvest."""
+        state = self.feeds.get(source_id, {})
+        since = _parse_time(state.get("high_watermark")) or _parse_time(state.get("last_checked"))
+        if since is None:
+            return default_hours
+        hours = _hours((now or datetime.now(tz=timezone.utc)) - since) + self.overlap_hours
+        return min(MAX_WINDOW_HOURS, max(1, math.ceil(hours)))
+
+    def record(
+        self,
+        source_id: str,
+        articles: List[Dict[str, Any]],
+        window_hours: int,
+        now: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Update a feed's state after a harvest and drop already-seen articles.
+
+        The returned articles' times are held until advance_watermarks();
+        the high-watermark itself is not moved here.
+
+        Args:
+            source_id: Feed source ID
+            articles: Raw articles returned for the feed
+            window_hours: Time window the feed was fetched with
+            now: Harvest time
+
+        Returns:
+            The articles newer than the previous high-watermark (articles
+            without a parseable published_at are kept).
+        """
+        now = now or datetime.now(tz=timezone.utc)
+        state = self.feeds.setdefault(source_id, {
+            # Nothing older than the first window is known about the feed
+            "observed_since": (now - timedelta(hours=window_hours)).isoformat(),
+            "interval_hours": None,
+            "high_watermark": None,
+            "items_seen": 0,
+            "empty_polls": 0,
+        })
+        watermark = _parse_time(state.get("high_watermark"))
+
+        fresh, fresh_times = [], []
+        for article in articles:
+            published = _parse_time(article.get("published_at"))
+            if published is not None and watermark is not None and published <= watermark:
+                continue
+            fresh.append(article)
+            if published is not None and published <= now:
+                fresh_times.append(published)
+
+        if fresh_times:
+            fresh_times.sort()
+            points = ([watermark] if watermark else []) + fresh_times
+            gaps = [_hours(later - earlier) for earlier, later in zip(points, points[1:])]
+            if gaps:
+                self._observe_interval(state, max(sum(gaps) / len(gaps), self.min_interval_hours))
+            self._pending[source_id] = self._pending.get(source_id, []) + fresh_times
+            state["items_seen"] += len(fresh_times)
+            state["empty_polls"] = 0
+        else:
+            state["empty_polls"] += 1
+            # Silence is a lower bound on the interval
+            quiet_since = watermark or _parse_time(state.get("observed_since")) or now
+            quiet_hours = min(_hours(now - quiet_since), self.max_interval_hours / self.poll_fraction)
+            if state["interval_hours"] is None or quiet_hours > state["interval_hours"]:
+                state["interval_hours"] = round(quiet_hours, 4)
+
+        state["last_checked"] = now.isoformat()
+        return fresh
+
+    def advance_watermarks(self, unstored: Optional[List[Dict[str, Any]]] = None) -> int:
+        """
+        Move feeds' high-watermarks past the entries recorded since plan().
+
+        Call once the harvested articles are stored. Recorded entries are
+        then forgotten.
+
+        Args:
+            unstored: Harvested articles (with source_id and published_at)
+                that failed to store; each feed's watermark stays below its
+                oldest one, so they are harvested again.
+
+        Returns:
+            Number of feeds whose watermark moved.
+        """
+        held_back: Dict[str, datetime] = {}
+        for article in unstored or []:
+            published = _parse_time(article.get("published_at"))
+            source_id = article.get("source_id")
+            if published is not None and (source_id not in held_back or published < held_back[source_id]):
+                held_back[source_id] = published
+
+        advanced = 0
+        for source_id, times in self._pending.items():
+            limit = held_back.get(source_id)
+            eligible = [t for t in times if limit is None or t < limit]
+            state = self.feeds.get(source_id)
+            if not eligible or state is None:
+                continue
+            watermark = _parse_time(state.get("high_watermark"))
+            newest = max(eligible)
+            if watermark is None or newest > watermark:
+                state["high_watermark"] = newest.isoformat()
+                advanced += 1
+        self._pending.clear()
+        return advanced
+
+    def _observe_interval(self, state: Dict[str, Any], hours: float) -> None:
+        hours = min(hours, self.max_interval_hours / self.poll_fraction)
+        previous = state.get("interval_hours")
+        state["interval_hours"] = round(
+            hours if previous is None else INTERVAL_EMA_ALPHA * hours + (1 - INTERVAL_EMA_ALPHA) * previous, 4
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of tracked feeds and their median poll interval."""
+        intervals = sorted(
+            i for i in (self.poll_interval_hours(source_id) for source_id in self.feeds) if i is not None
+        )
+        return {
+            "feeds_tracked": len(self.feeds),
+            "median_poll_interval_hours": round(intervals[len(intervals) // 2], 2) if intervals else None,
+        }
+
+
+# Lazy-initialized process-wide scheduler
+_scheduler: Optional[FeedScheduler] = None
+
+
+def get_feed_scheduler() -> FeedScheduler:
+    """Get or initialize the process-wide scheduler (state at FEED_SCHEDULE_STATE_PATH)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = FeedScheduler()
+    return _scheduler
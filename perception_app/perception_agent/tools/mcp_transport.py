@@ -0,0 +1,159 @@
+"""
+In-Process MCP Transport
+
+When the agents run in the same process as the MCP routers (local dev,
+scripts/run_ingestion_once.py, batch backfills) there is no need to
+serialize every article to JSON, POST it over localhost and validate it
+again on the way back. InProcessTransport calls the router functions
+directly and turns the response models into plain dicts, skipping the
+JSON round trip.
+
+It returns the same payload shape as the HTTP endpoints and raises
+MCPToolError where the HTTP transport would get an error response, so
+agent_1_tools is indifferent to which one is used. Select it with
+MCP_TRANSPORT=inprocess; HTTP stays the default (Cloud Run).
+
+The router modules are imported on first use, so HTTP-only deployments of
+the agent do not need the MCP service dependencies.
+"""
+
+from typing import Any, Dict, FrozenSet, Optional
+
+
+class MCPToolError(Exception):
+    """An MCP tool call that returned an error (HTTP status >= 400)."""
+
+    def __init__(self, status_code: int, code: Optional[str], message: str, retry_after: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+        self.retry_after = retry_after
+
+
+def _article_dict(article: Any, fields: FrozenSet[str]) -> Dict[str, Any]:
+    """Article model -> dict with only `fields`."""
+    values = {k: v for k, v in article.__dict__.items() if k in fields}
+    if "categories" in values:
+        # Models can be shared through the router's result cache; do not
+        # hand out the cached list
+        values["categories"] = list(values["categories"])
+    return values
+
+
+class InProcessTransport:
+    """Calls MCP router functions directly instead of over HTTP."""
+
+    def __init__(self):
+        from fastapi import HTTPException
+        from pydantic import ValidationError
+        from perception_app.mcp_service.routers import http_pool, rss
+
+        self._rss = rss
+        self._http_pool = http_pool
+        self._http_exception = HTTPException
+        # The router's per-host limiter, so the harvester paces hosts with
+        # the same instance the router fetches through
+        self.host_limiter = rss.host_limiter
+        self._validation_error = ValidationError
+        self._tools = {
+            "fetch_rss_feed": self._fetch_rss_feed,
+            "fetch_rss_feeds": self._fetch_rss_feeds,
+        }
+        self.calls = 0
+
+    async def call(self, tool: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run an MCP tool in-process.
+
+        Args:
+            tool: Tool name, as in /mcp/tools/{tool}
+            payload: Request body the HTTP endpoint would receive
+
+        Returns:
+            The response body the HTTP endpoint would return, as dicts.
+
+        Raises:
+            MCPToolError: if the tool fails or the payload is invalid.
+        """
+        handler = self._tools.get(tool)
+        if handler is None:
+            raise MCPToolError(404, "TOOL_NOT_FOUND", f"Tool {tool} is not available in-process")
+
+        self.calls += 1
+        try:
+            return await handler(payload)
+        except self._validation_error as e:
+            raise MCPToolError(422, "INVALID_REQUEST", str(e)) from e
+        except self._http_exception as e:
+            error = e.detail.get("error", {}) if isinstance(e.detail, dict) else {}
+            raise MCPToolError(
+                e.status_code,
+                error.get("code"),
+                error.get("message", str(e.detail)),
+                (e.headers or {}).get("Retry-After")
+            ) from e
+
+    async def close(self) -> None:
+        """Close the routers' pooled feed-host client."""
+        await self._http_pool.close_client()
+
+    async def _fetch_rss_feed(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        rss = self._rss
+        request = rss.FetchRSSFeedRequest(**payload)
+        result = await rss.load_rss_feed(request)
+        return self._feed_dict(result, rss.projected_fields(request))
+
+    async def _fetch_rss_feeds(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        rss = self._rss
+        request = rss.FetchRSSFeedsRequest(**payload)
+        response = await rss.load_rss_feeds(request)
+
+        results = []
+        for item in response.results:
+            entry = {
+                "index": item.index,
+                "feed_url": item.feed_url,
+                "status": item.status,
+                "elapsed_ms": item.elapsed_ms,
+                "result": None,
+                "error": item.error.model_dump() if item.error else None,
+            }
+            if item.result is not None:
+                entry["result"] = self._feed_dict(item.result, rss.projected_fields(request.feeds[item.index]))
+            results.append(entry)
+
+        return {
+            "fetched_at": response.fetched_at,
+            "feed_count": response.feed_count,
+            "succeeded": response.succeeded,
+            "failed": response.failed,
+            "article_count": response.article_count,
+            "results": results,
+        }
+
+    def _feed_dict(self, result: Any, fields: FrozenSet[str]) -> Dict[str, Any]:
+        """FetchRSSFeedResponse -> response body dict, articles projected to `fields`."""
+        values = {k: v for k, v in result.__dict__.items() if k != "articles"}
+        values["articles"] = [_article_dict(a, fields) for a in result.articles]
+        return values
+
+
+# Lazy-initialized process-wide transport
+_in_process_transport: Optional[InProcessTransport] = None
+
+
+def get_in_process_transport() -> InProcessTransport:
+    """Get or initialize the in-process transport (imports the MCP routers)."""
+    global _in_process_transport
+    if _in_process_transport is None:
+        _in_process_transport = InProcessTransport()
+    return _in_process_transport
+
+
+async def close_in_process_transport() -> None:
+    """Close the in-process transport's resources, if it was ever used."""
+    global _in_process_transport
+    if _in_process_transport is not None:
+        await _in_process_transport.close()
+        _in_process_transport = None
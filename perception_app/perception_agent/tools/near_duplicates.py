@@ -0,0 +1,375 @@
+"""
+Near-Duplicate Article Detection
+
+URL de-duplication only catches exact repeats. The same wire story
+syndicated to several outlets, or the same article behind different
+tracking URLs, gets through. This module finds articles whose text is
+nearly the same.
+
+Each article becomes a set of word shingles: runs of NEAR_DUP_SHINGLE_SIZE
+consecutive tokens of its title and content. A MinHash signature of
+NEAR_DUP_NUM_PERM values summarizes the set. The share of equal values
+between two signatures estimates the Jaccard similarity of their shingle
+sets. Signatures are cut into NEAR_DUP_BANDS bands and indexed by band
+(LSH). A lookup only compares signatures that share at least one band
+with the query, so it does not grow with the size of the index. Two
+articles are duplicates when their estimated similarity is at least
+NEAR_DUP_THRESHOLD.
+
+Two modes:
+
+- Batch: find_clusters() / collapse_duplicates() group the articles of one
+  run. The brief builder keeps one entry per cluster.
+- Incremental: a NearDuplicateIndex of recent articles, bounded to
+  NEAR_DUP_HISTORY_LIMIT entries (oldest evicted first) and kept in a JSON
+  file between runs. detect_duplicates() checks new articles against it.
+  The file records NEAR_DUP_NUM_PERM and NEAR_DUP_BANDS; history saved
+  with other values cannot be compared and is dropped on load.
+
+Configured via environment variables:
+
+- NEAR_DUP_NUM_PERM (default 64), NEAR_DUP_BANDS (default 16)
+- NEAR_DUP_SHINGLE_SIZE: words per shingle (default 3)
+- NEAR_DUP_THRESHOLD: minimum estimated similarity (default 0.7)
+- NEAR_DUP_HISTORY_PATH (default data/near_dup_history.json)
+- NEAR_DUP_HISTORY_LIMIT (default 5000)
+
+Signatures are computed with NumPy when it is installed and in pure
+Python otherwise. Both give the same values.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .bm25 import tokenize
+
+logger = logging.getLogger(__name__)
+
+NEAR_DUP_NUM_PERM = int(os.getenv("NEAR_DUP_NUM_PERM", "64"))
+NEAR_DUP_BANDS = int(os.getenv("NEAR_DUP_BANDS", "16"))
+NEAR_DUP_SHINGLE_SIZE = int(os.getenv("NEAR_DUP_SHINGLE_SIZE", "3"))
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.7"))
+NEAR_DUP_HISTORY_PATH = os.getenv(
+    "NEAR_DUP_HISTORY_PATH",
+    str(Path(__file__).parent.parent.parent.parent / "data" / "near_dup_history.json")
+)
+NEAR_DUP_HISTORY_LIMIT = int(os.getenv("NEAR_DUP_HISTORY_LIMIT", "5000"))
+
+# Multiply-shift hash family over 32-bit shingle hashes: the high 32 bits
+# of (a * h + b) mod 2**64, with a odd. NumPy uint64 arithmetic wraps
+# modulo 2**64 by itself; pure Python masks.
+_MASK64 = (1 << 64) - 1
+
+Signature = Tuple[int, ...]
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+class MinHasher:
+    """MinHash signatures of article title + content word shingles."""
+
+    def __init__(
+        self,
+        num_perm: int = NEAR_DUP_NUM_PERM,
+        shingle_size: int = NEAR_DUP_SHINGLE_SIZE,
+        seed: int = 1,
+    ):
+        self.num_perm = num_perm
+        self.shingle_size = max(1, shingle_size)
+        rng = random.Random(seed)
+        self._a = [rng.getrandbits(64) | 1 for _ in range(num_perm)]
+        self._b = [rng.getrandbits(64) for _ in range(num_perm)]
+        if np is not None:
+            self._a_np = np.array(self._a, dtype=np.uint64)
+            self._b_np = np.array(self._b, dtype=np.uint64)
+
+    def shingles(self, article: Dict[str, Any]) -> Set[str]:
+        """Word shingles of the article (a text shorter than one shingle is one shingle)."""
+        content = article.get("content") or article.get("content_snippet") or article.get("summary") or ""
+        tokens = tokenize(article.get("title")) + tokenize(content)
+        if not tokens:
+            return set()
+        size = min(self.shingle_size, len(tokens))
+        return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+    def signature(self, article: Dict[str, Any]) -> Optional[Signature]:
+        """MinHash signature, or None for an article without text."""
+        hashes = [_shingle_hash(shingle) for shingle in self.shingles(article)]
+        if not hashes:
+            return None
+        if np is not None:
+            values = np.array(hashes, dtype=np.uint64)
+            mins = ((np.multiply.outer(values, self._a_np) + self._b_np) >> np.uint64(32)).min(axis=0)
+            return tuple(mins.tolist())
+        return tuple(
+            min(((a * h + b) & _MASK64) >> 32 for h in hashes)
+            for a, b in zip(self._a, self._b)
+        )
+
+
+def similarity(sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    if not sig_a or len(sig_a) != len(sig_b):
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class NearDuplicateIndex:
+    """LSH index of MinHash signatures, optionally bounded and persisted."""
+
+    def __init__(
+        self,
+        bands: int = NEAR_DUP_BANDS,
+        threshold: float = NEAR_DUP_THRESHOLD,
+        max_entries: Optional[int] = None,
+        state_path: Optional[str] = None,
+        num_perm: int = NEAR_DUP_NUM_PERM,
+    ):
+        """
+        Args:
+            bands: LSH bands per signature (must divide the signature length)
+            threshold: Minimum estimated similarity of a duplicate
+            max_entries: Keep only this many most recent entries (None: all)
+            state_path: JSON file the entries are loaded from and saved to
+            num_perm: Signature length of the persisted entries
+        """
+        self.bands = bands
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.state_path = Path(state_path) if state_path else None
+        self._signatures: "OrderedDict[str, Signature]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+        self._loaded = False
+        self.dirty = False
+
+    def _band_keys(self, signature: Signature) -> List[Tuple[int, Tuple[int, ...]]]:
+        if len(signature) % self.bands:
+            raise ValueError(f"Signature length {len(signature)} is not divisible into {self.bands} bands")
+        rows = len(signature) // self.bands
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(json.dumps({
+                "severity": "WARNING",
+                "tool": "agent_6",
+                "operation": "near_dup_history_load",
+                "state_path": str(self.state_path),
+                "error": str(e)
+            }))
+            return
+        saved = (state.get("num_perm"), state.get("bands"))
+        if saved != (self.num_perm, self.bands):
+            # Signatures of another length or banding never match (or do not
+            # band at all); start a new history rather than fail every lookup
+            logger.warning(json.dumps({
+                "severity": "WARNING",
+                "tool": "agent_6",
+                "operation": "near_dup_history_load",
+                "state_path": str(self.state_path),
+                "saved_num_perm": saved[0],
+                "saved_bands": saved[1],
+                "num_perm": self.num_perm,
+                "bands": self.bands,
+                "message": "Discarding history saved with other MinHash settings"
+            }))
+            self.dirty = True
+            return
+        for key, signature in state.get("entries", []):
+            self._insert(key, tuple(signature))
+
+    def save(self) -> None:
+        """Write the entries atomically if they changed (no-op without a path)."""
+        if self.state_path is None or not self.dirty:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "num_perm": self.num_perm,
+                "bands": self.bands,
+                "entries": [[key, list(sig)] for key, sig in self._signatures.items()],
+            }, f, separators=(",", ":"))
+        os.replace(tmp_path, self.state_path)
+        self.dirty = False
+
+    def _insert(self, key: str, signature: Signature) -> None:
+        if key in self._signatures:
+            self._remove(key)
+        self._signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+        if self.max_entries is not None:
+            while len(self._signatures) > self.max_entries:
+                self._remove(next(iter(self._signatures)))
+
+    def _remove(self, key: str) -> None:
+        signature = self._signatures.pop(key)
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets[band_key]
+            bucket.remove(key)
+            if not bucket:
+                del self._buckets[band_key]
+
+    def add(self, key: str, signature: Optional[Signature]) -> None:
+        """Index a signature under key (replacing the key's previous one)."""
+        if signature is None:
+            return
+        self._ensure_loaded()
+        self._insert(key, signature)
+        self.dirty = True
+
+    def query(self, signature: Optional[Signature]) -> List[Tuple[str, float]]:
+        """
+        Indexed entries similar to the signature.
+
+        Returns:
+            (key, estimated similarity) pairs at or above the threshold,
+            most similar first.
+        """
+        if signature is None:
+            return []
+        self._ensure_loaded()
+        candidates: Dict[str, None] = {}
+        for band_key in self._band_keys(signature):
+            for key in self._buckets.get(band_key, ()):
+                candidates[key] = None
+
+        matches = []
+        for key in candidates:
+            score = similarity(signature, self._signatures[key])
+            if score >= self.threshold:
+                matches.append((key, score))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        self._ensure_loaded()
+        return key in self._signatures
+
+
+def find_clusters(
+    articles: List[Dict[str, Any]],
+    hasher: Optional[MinHasher] = None,
+    bands: int = NEAR_DUP_BANDS,
+    threshold: float = NEAR_DUP_THRESHOLD,
+) -> List[List[int]]:
+    """
+    Group the articles of one batch into near-duplicate clusters.
+
+    Args:
+        articles: Article dicts
+        hasher: MinHasher to use (default settings if None)
+        bands: LSH bands
+        threshold: Minimum estimated similarity of a duplicate pair
+
+    Returns:
+        Clusters of two or more article indexes, in article order; a
+        cluster is closed under "is a duplicate of", so A~B and B~C put A,
+        B and C in one cluster.
+    """
+    hasher = hasher or MinHasher()
+    index = NearDuplicateIndex(bands=bands, threshold=threshold)
+    parent = list(range(len(articles)))
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, article in enumerate(articles):
+        signature = hasher.signature(article)
+        for key, _ in index.query(signature):
+            a, b = root(i), root(int(key))
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+        index.add(str(i), signature)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(articles)):
+        clusters.setdefault(root(i), []).append(i)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def collapse_duplicates(
+    articles: List[Dict[str, Any]],
+    hasher: Optional[MinHasher] = None,
+    threshold: float = NEAR_DUP_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    Keep one article per near-duplicate cluster.
+
+    The kept article is the cluster's highest relevance_score (the earliest
+    on ties). It is returned as a copy with a "duplicates" list of the
+    others' title, url and source_id. Articles without duplicates are
+    returned unchanged, and the input order is preserved.
+    """
+    clusters = find_clusters(articles, hasher=hasher, threshold=threshold)
+    dropped: Set[int] = set()
+    kept: Dict[int, Dict[str, Any]] = {}
+    for members in clusters:
+        best = max(members, key=lambda i: (articles[i].get("relevance_score", 0), -i))
+        representative = dict(articles[best])
+        representative["duplicates"] = [
+            {
+                "title": articles[i].get("title", "Untitled"),
+                "url": articles[i].get("url", ""),
+                "source_id": articles[i].get("source_id", ""),
+            }
+            for i in members if i != best
+        ]
+        kept[best] = representative
+        dropped.update(i for i in members if i != best)
+
+    if clusters:
+        logger.info(json.dumps({
+            "severity": "INFO",
+            "tool": "agent_4",
+            "operation": "collapse_duplicates",
+            "article_count": len(articles),
+            "cluster_count": len(clusters),
+            "collapsed_count": len(dropped)
+        }))
+    return [kept.get(i, article) for i, article in enumerate(articles) if i not in dropped]
+
+
+# Lazy-initialized process-wide history of recent articles
+_history_index: Optional[NearDuplicateIndex] = None
+
+
+def get_history_index() -> NearDuplicateIndex:
+    """Get or initialize the recent-article index (at NEAR_DUP_HISTORY_PATH)."""
+    global _history_index
+    if _history_index is None:
+        _history_index = NearDuplicateIndex(
+            max_entries=NEAR_DUP_HISTORY_LIMIT,
+            state_path=NEAR_DUP_HISTORY_PATH
+        )
+    return _history_index
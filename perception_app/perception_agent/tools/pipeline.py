@@ -0,0 +1,272 @@
+"""
+Streaming Ingestion Pipeline
+
+Runs harvest -> dedupe -> score -> top-k as concurrent stages connected by
+bounded asyncio queues, instead of harvesting everything before scoring
+anything. Each source's articles are scored while other feeds are still
+being fetched, and only the top-k candidates (see top_k; provisional
+ones too, below) plus the canonical IDs seen in the run stay in memory.
+
+Queues hold one source's articles per item. When a downstream stage falls
+behind, the queue fills up and the harvester waits before handing over
+more, so memory stays bounded by PIPELINE_QUEUE_SIZE sources per queue.
+
+The selection matches filter_top_articles, including its per-topic and
+per-source caps: articles below min_score are dropped and ties on
+relevance_score keep source order, whatever order the feeds finish in.
+Unlike the staged path, articles whose canonical URL was already seen in
+the run are dropped before scoring. Of several copies, the one from the
+lowest source index is kept, whatever order the feeds finish in. Articles
+of a source that finished before a lower-index source are offered to the
+top-k as provisional: the lower source may still carry the same article,
+in which case the later copy is withdrawn without losing any candidate.
+They are settled once every lower-index source has been deduplicated.
+Both paths drop articles stored by earlier runs (see seen_urls) before
+scoring.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .seen_urls import SeenUrlIndex
+from .top_k import TopKSelector
+from .url_canonicalizer import canonical_article_id
+
+logger = logging.getLogger(__name__)
+
+# Max sources waiting between two stages
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+
+_DONE = object()
+
+
+class StageMetrics:
+    """Throughput counters for one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def stats(self) -> Dict[str, Any]:
+        wall = (self.finished or time.perf_counter()) - self.started if self.started else 0.0
+        return {
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "batches": self.batches,
+            "busy_ms": round(self.busy_seconds * 1000, 2),
+            "wall_ms": round(wall * 1000, 2),
+            "items_per_second": round(self.items_in / self.busy_seconds, 1) if self.busy_seconds else None,
+        }
+
+
+class MeteredQueue:
+    """Bounded queue that records depth and producer wait (backpressure)."""
+
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.puts = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        self.put_wait_seconds = 0.0
+
+    async def put(self, item: Any) -> None:
+        started = time.perf_counter()
+        await self._queue.put(item)
+        self.put_wait_seconds += time.perf_counter() - started
+        depth = self._queue.qsize()
+        self.puts += 1
+        self.depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+
+    async def get(self) -> Any:
+        return await self._queue.get()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "maxsize": self.maxsize,
+            "puts": self.puts,
+            "max_depth": self.max_depth,
+            "avg_depth": round(self.depth_total / self.puts, 2) if self.puts else 0.0,
+            "put_wait_ms": round(self.put_wait_seconds * 1000, 2),
+        }
+
+
+class StreamingPipeline:
+    """One streaming ingestion run: harvest -> dedupe -> score -> top-k."""
+
+    def __init__(
+        self,
+        topics: List[Dict[str, Any]],
+        score: Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], List[Dict[str, Any]]],
+        top_k: int,
+        min_score: float = 5,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        max_per_topic: Optional[int] = None,
+        max_per_source: Optional[int] = None,
+        seen_index: Optional[SeenUrlIndex] = None,
+    ):
+        """
+        Args:
+            topics: Active topics to score against
+            score: Batch scorer with score_articles' signature
+            top_k: Number of articles to keep
+            min_score: Minimum relevance_score to keep
+            queue_size: Max sources waiting between two stages
+            max_per_topic: Max articles kept per topic (None: no cap)
+            max_per_source: Max articles kept per source (None: no cap)
+            seen_index: Articles stored by earlier runs, dropped before
+                scoring (None: keep them)
+        """
+        self.topics = topics
+        self.score = score
+        self.top = TopKSelector(top_k, min_score, max_per_topic, max_per_source)
+        self.stages = {name: StageMetrics(name) for name in ("harvest", "dedupe", "score", "top_k")}
+        self.queues = {name: MeteredQueue(name, max(1, queue_size)) for name in ("dedupe", "score", "top_k")}
+        self.seen_index = seen_index
+        # canonical article ID -> (source index, position) of the copy kept
+        self._owners: Dict[str, Tuple[int, int]] = {}
+        # Copies passed on before an earlier source's copy arrived
+        self._superseded: set = set()
+        # Sources below this index have all been deduplicated; their
+        # articles can no longer be superseded
+        self._settled_sources = 0
+        self._deduped_sources: set = set()
+        self.already_seen = 0
+
+    async def run(
+        self,
+        harvest: Callable[[Callable[[int, List[Dict[str, Any]]], Awaitable[None]]], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Run the pipeline to completion.
+
+        Args:
+            harvest: Called with a sink, e.g.
+                ``lambda sink: harvest_all_sources(..., sink=sink)``
+
+        Returns:
+            The harvest result. Selected articles are in top_articles().
+        """
+        result: Dict[str, Any] = {}
+
+        async def harvest_stage() -> None:
+            metrics = self.stages["harvest"]
+            metrics.started = time.perf_counter()
+
+            async def sink(index: int, articles: List[Dict[str, Any]]) -> None:
+                metrics.items_out += len(articles)
+                metrics.batches += 1
+                # Empty sources too: dedupe tracks which sources have arrived
+                await self.queues["dedupe"].put((index, list(enumerate(articles))))
+
+            result.update(await harvest(sink))
+            metrics.finished = time.perf_counter()
+            await self.queues["dedupe"].put(_DONE)
+
+        async with asyncio.TaskGroup() as group:
+            group.create_task(harvest_stage())
+            group.create_task(self._stage("dedupe", self._dedupe, "score"))
+            group.create_task(self._stage("score", self._score, "top_k"))
+            group.create_task(self._stage("top_k", self._select, None))
+
+        logger.info(json.dumps({
+            "severity": "INFO",
+            "tool": "agent_0",
+            "operation": "streaming_pipeline",
+            **self.metrics()
+        }))
+        return result
+
+    async def _stage(
+        self,
+        name: str,
+        process: Callable[[int, List[Tuple[int, Dict[str, Any]]]], List[Tuple[int, Dict[str, Any]]]],
+        downstream: Optional[str]
+    ) -> None:
+        metrics = self.stages[name]
+        metrics.started = time.perf_counter()
+        while True:
+            item = await self.queues[name].get()
+            if item is _DONE:
+                break
+            index, batch = item
+            started = time.perf_counter()
+            out = process(index, batch)
+            metrics.busy_seconds += time.perf_counter() - started
+            metrics.items_in += len(batch)
+            metrics.items_out += len(out)
+            metrics.batches += 1
+            if downstream is not None and out:
+                await self.queues[downstream].put((index, out))
+        metrics.finished = time.perf_counter()
+        if downstream is not None:
+            await self.queues[downstream].put(_DONE)
+
+    def _dedupe(self, index: int, batch: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        fresh = []
+        for position, article in batch:
+            url = article.get("url")
+            if url:
+                article_id = canonical_article_id(url)
+                owner = self._owners.get(article_id)
+                if owner is not None and owner < (index, position):
+                    continue
+                self._owners[article_id] = (index, position)
+                if self.seen_index is not None and article_id in self.seen_index:
+                    if owner is None:
+                        self.already_seen += 1
+                    continue
+                if owner is not None:
+                    # A later source's copy got here first; keep this one
+                    self._superseded.add(owner)
+                    self.top.discard(owner)
+            fresh.append((position, article))
+
+        self._deduped_sources.add(index)
+        settled = self._settled_sources
+        while self._settled_sources in self._deduped_sources:
+            self._deduped_sources.remove(self._settled_sources)
+            self._settled_sources += 1
+        if self._settled_sources > settled:
+            self.top.settle(lambda seq: seq[0] < self._settled_sources)
+        return fresh
+
+    def _score(self, index: int, batch: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        scored = self.score([article for _, article in batch], self.topics)
+        return [(position, article) for (position, _), article in zip(batch, scored)]
+
+    def _select(self, index: int, batch: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        for position, article in batch:
+            if (index, position) not in self._superseded:
+                self.top.offer(article, (index, position), provisional=index >= self._settled_sources)
+        return []
+
+    def top_articles(self) -> List[Dict[str, Any]]:
+        """Selected articles sorted by relevance_score descending."""
+        return self.top.items()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Per-stage throughput, queue depths and article counts."""
+        return {
+            "articles_harvested": self.stages["harvest"].items_out,
+            "duplicates_dropped": (
+                self.stages["dedupe"].items_in - self.stages["dedupe"].items_out - self.already_seen
+                + len(self._superseded)
+            ),
+            "already_seen_dropped": self.already_seen,
+            "articles_scored": self.stages["score"].items_out,
+            "articles_selected": len(self.top),
+            "stages": {name: stage.stats() for name, stage in self.stages.items()},
+            "queues": {name: queue.stats() for name, queue in self.queues.items()},
+        }
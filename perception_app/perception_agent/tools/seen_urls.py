@@ -0,0 +1,184 @@
+"""
+Seen-Article Index
+
+Remembers the IDs (canonical_article_id) of articles already stored, across
+runs, so later runs drop them right after harvest instead of scoring them
+again and re-upserting them into Firestore.
+
+The index is a Bloom filter: a fixed-size bit array that answers "maybe
+seen" or "definitely not seen". A false positive (a new article taken for
+a seen one) happens at a rate of about SEEN_URL_ERROR_RATE. Articles are
+never missed. To forget old articles, the filter has two generations: when
+the current one holds SEEN_URL_CAPACITY IDs it becomes the previous one
+and the oldest generation is discarded. An article is therefore
+remembered for at least SEEN_URL_CAPACITY later additions.
+
+The filter is kept in a small binary file (about 1 MB at the defaults),
+loaded on first use and replaced atomically on save. Configured via
+environment variables:
+
+- SEEN_URL_FILTER: drop already stored articles before scoring (default true)
+- SEEN_URL_INDEX_PATH (default data/seen_urls.bin)
+- SEEN_URL_CAPACITY: IDs per generation (default 200000)
+- SEEN_URL_ERROR_RATE: false-positive rate per generation (default 0.0001)
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+SEEN_URL_FILTER = os.getenv("SEEN_URL_FILTER", "true").lower() == "true"
+SEEN_URL_INDEX_PATH = os.getenv(
+    "SEEN_URL_INDEX_PATH",
+    str(Path(__file__).parent.parent.parent.parent / "data" / "seen_urls.bin")
+)
+SEEN_URL_CAPACITY = int(os.getenv("SEEN_URL_CAPACITY", "200000"))
+SEEN_URL_ERROR_RATE = float(os.getenv("SEEN_URL_ERROR_RATE", "0.0001"))
+
+# magic, version, hash count, bit count, IDs in current, IDs in previous
+_HEADER = struct.Struct("<4sHHQQQ")
+_MAGIC = b"SEEN"
+_VERSION = 1
+
+
+class SeenUrlIndex:
+    """Two-generation Bloom filter of stored article IDs."""
+
+    def __init__(
+        self,
+        state_path: Optional[str] = SEEN_URL_INDEX_PATH,
+        capacity: int = SEEN_URL_CAPACITY,
+        error_rate: float = SEEN_URL_ERROR_RATE,
+    ):
+        """
+        Args:
+            state_path: File the filter is loaded from and saved to (None:
+                in memory only)
+            capacity: IDs per generation
+            error_rate: False-positive rate of a full generation
+        """
+        self.state_path = Path(state_path) if state_path else None
+        self.capacity = max(1, capacity)
+        # Optimal Bloom filter size and hash count for capacity / error_rate
+        bits = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_bits = (bits + 7) // 8 * 8
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self._current = bytearray(self.num_bits // 8)
+        self._previous = bytearray(self.num_bits // 8)
+        self.current_count = 0
+        self.previous_count = 0
+        self._loaded = False
+        self.dirty = False
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    @staticmethod
+    def _test(bits: bytearray, positions: Iterable[int]) -> bool:
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            data = self.state_path.read_bytes()
+            magic, version, num_hashes, num_bits, current_count, previous_count = _HEADER.unpack_from(data)
+        except (OSError, struct.error) as e:
+            self._log_discarded(str(e))
+            return
+        size = num_bits // 8
+        if (magic, version, num_hashes, num_bits) != (_MAGIC, _VERSION, self.num_hashes, self.num_bits) \
+                or len(data) != _HEADER.size + 2 * size:
+            # Written with another capacity / error rate: start over
+            self._log_discarded("index format or size does not match the configuration")
+            return
+        self._current = bytearray(data[_HEADER.size:_HEADER.size + size])
+        self._previous = bytearray(data[_HEADER.size + size:])
+        self.current_count = current_count
+        self.previous_count = previous_count
+
+    def _log_discarded(self, error: str) -> None:
+        logger.warning(json.dumps({
+            "severity": "WARNING",
+            "tool": "agent_0",
+            "operation": "seen_url_index_load",
+            "state_path": str(self.state_path),
+            "error": error
+        }))
+
+    def save(self) -> None:
+        """Write the filter atomically if it changed (no-op without a path)."""
+        if self.state_path is None or not self.dirty:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(
+                _MAGIC, _VERSION, self.num_hashes, self.num_bits, self.current_count, self.previous_count
+            ))
+            f.write(self._current)
+            f.write(self._previous)
+        os.replace(tmp_path, self.state_path)
+        self.dirty = False
+
+    def __contains__(self, key: str) -> bool:
+        self._ensure_loaded()
+        positions = self._positions(key)
+        return self._test(self._current, positions) or self._test(self._previous, positions)
+
+    def add(self, key: str) -> bool:
+        """
+        Remember an ID.
+
+        Returns:
+            True if it was not (as far as the filter knows) seen before.
+        """
+        self._ensure_loaded()
+        positions = self._positions(key)
+        if self._test(self._current, positions):
+            return False
+        is_new = not self._test(self._previous, positions)
+        if self.current_count >= self.capacity:
+            self._previous = self._current
+            self.previous_count = self.current_count
+            self._current = bytearray(self.num_bits // 8)
+            self.current_count = 0
+        for p in positions:
+            self._current[p >> 3] |= 1 << (p & 7)
+        self.current_count += 1
+        self.dirty = True
+        return is_new
+
+    def add_many(self, keys: Iterable[str]) -> int:
+        """Remember IDs; returns how many were new."""
+        return sum(1 for key in keys if self.add(key))
+
+    def __len__(self) -> int:
+        """Approximate number of IDs remembered."""
+        self._ensure_loaded()
+        return self.current_count + self.previous_count
+
+
+# Lazy-initialized process-wide index
+_seen_url_index: Optional[SeenUrlIndex] = None
+
+
+def get_seen_url_index() -> SeenUrlIndex:
+    """Get or initialize the process-wide seen-article index (at SEEN_URL_INDEX_PATH)."""
+    global _seen_url_index
+    if _seen_url_index is None:
+        _seen_url_index = SeenUrlIndex()
+    return _seen_url_index
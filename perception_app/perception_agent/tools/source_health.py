@@ -0,0 +1,174 @@
+"""
+Source Health and Circuit Breaker
+
+Tracks per-source fetch health and stops harvesting sources that keep
+failing, so a dead feed costs one timeout per backoff period instead of
+one per run.
+
+Per source it keeps consecutive failures, last check / success / error
+and an EWMA of fetch latency. After SOURCE_CIRCUIT_FAILURE_THRESHOLD
+consecutive failures the circuit opens and the source is skipped until
+the backoff passes. The first fetch after that is a probe (half-open):
+success closes the circuit, failure reopens it with double the backoff
+(SOURCE_CIRCUIT_BASE_BACKOFF_MINUTES, capped at
+SOURCE_CIRCUIT_MAX_BACKOFF_HOURS).
+
+The state maps onto the Firestore /sources documents created by
+scripts/load-initial-feeds.py (lastChecked, lastSuccess, lastError plus
+the breaker fields); agent_7_tools loads and persists it.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+SOURCE_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("SOURCE_CIRCUIT_FAILURE_THRESHOLD", "3"))
+SOURCE_CIRCUIT_BASE_BACKOFF_MINUTES = float(os.getenv("SOURCE_CIRCUIT_BASE_BACKOFF_MINUTES", "30"))
+SOURCE_CIRCUIT_MAX_BACKOFF_HOURS = float(os.getenv("SOURCE_CIRCUIT_MAX_BACKOFF_HOURS", "24"))
+SOURCE_LATENCY_EWMA_ALPHA = float(os.getenv("SOURCE_LATENCY_EWMA_ALPHA", "0.3"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _new_record() -> Dict[str, Any]:
+    return {
+        "consecutiveFailures": 0,
+        "lastChecked": None,
+        "lastSuccess": None,
+        "lastError": None,
+        "latencyEwmaMs": None,
+        "circuitState": CLOSED,
+        "circuitOpenUntil": None,
+        "circuitOpens": 0,
+    }
+
+
+class SourceHealthTracker:
+    """Per-source health records with a consecutive-failure circuit breaker."""
+
+    def __init__(
+        self,
+        failure_threshold: int = SOURCE_CIRCUIT_FAILURE_THRESHOLD,
+        base_backoff_minutes: float = SOURCE_CIRCUIT_BASE_BACKOFF_MINUTES,
+        max_backoff_hours: float = SOURCE_CIRCUIT_MAX_BACKOFF_HOURS,
+        latency_alpha: float = SOURCE_LATENCY_EWMA_ALPHA,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_backoff = timedelta(minutes=base_backoff_minutes)
+        self.max_backoff = timedelta(hours=max_backoff_hours)
+        self.latency_alpha = latency_alpha
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._dirty: set = set()
+        self.loaded = False
+
+    def load(self, records: Dict[str, Dict[str, Any]]) -> None:
+        """Seed state from stored source documents (unknown fields are ignored)."""
+        for source_id, stored in records.items():
+            record = _new_record()
+            record.update({k: stored[k] for k in record if stored.get(k) is not None})
+            self.records[source_id] = record
+        self.loaded = True
+
+    def _record(self, source_id: str) -> Dict[str, Any]:
+        return self.records.setdefault(source_id, _new_record())
+
+    def allow(self, source_id: str, now: Optional[datetime] = None) -> bool:
+        """
+        True if the source may be fetched now.
+
+        An open circuit whose backoff has passed moves to half-open and lets
+        this one probe through.
+        """
+        record = self.records.get(source_id)
+        if record is None or record["circuitState"] == CLOSED:
+            return True
+
+        now = now or datetime.now(tz=timezone.utc)
+        if record["circuitState"] == OPEN and now >= record["circuitOpenUntil"]:
+            record["circuitState"] = HALF_OPEN
+            self._dirty.add(source_id)
+        return record["circuitState"] == HALF_OPEN
+
+    def record_success(self, source_id: str, latency_ms: float, now: Optional[datetime] = None,
+                       articles_last_24h: Optional[int] = None) -> None:
+        """Record a successful fetch; closes the circuit."""
+        now = now or datetime.now(tz=timezone.utc)
+        record = self._record(source_id)
+        self._observe_latency(record, latency_ms)
+        record.update({
+            "consecutiveFailures": 0,
+            "lastChecked": now,
+            "lastSuccess": now,
+            "circuitState": CLOSED,
+            "circuitOpenUntil": None,
+            "circuitOpens": 0,
+        })
+        if articles_last_24h is not None:
+            record["articlesLast24h"] = articles_last_24h
+        self._dirty.add(source_id)
+
+    def record_failure(self, source_id: str, error: str, latency_ms: float,
+                       now: Optional[datetime] = None) -> None:
+        """Record a failed fetch; opens (or reopens) the circuit past the threshold."""
+        now = now or datetime.now(tz=timezone.utc)
+        record = self._record(source_id)
+        self._observe_latency(record, latency_ms)
+        record["consecutiveFailures"] += 1
+        record["lastChecked"] = now
+        record["lastError"] = error
+
+        if record["circuitState"] == HALF_OPEN or record["consecutiveFailures"] >= self.failure_threshold:
+            record["circuitOpens"] += 1
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** (record["circuitOpens"] - 1))
+            record["circuitState"] = OPEN
+            record["circuitOpenUntil"] = now + backoff
+        self._dirty.add(source_id)
+
+    def _observe_latency(self, record: Dict[str, Any], latency_ms: float) -> None:
+        previous = record["latencyEwmaMs"]
+        record["latencyEwmaMs"] = round(
+            latency_ms if previous is None
+            else self.latency_alpha * latency_ms + (1 - self.latency_alpha) * previous, 1
+        )
+
+    def pending_updates(self, clear: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Return Firestore field updates for sources changed since the last call.
+
+        Returns:
+            source_id -> fields for a merge write to /sources/{source_id}
+        """
+        updates = {source_id: dict(self.records[source_id]) for source_id in self._dirty}
+        if clear:
+            self._dirty.clear()
+        return updates
+
+    def summary(self, source_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Return open/half-open circuit counts and the slowest sources by latency EWMA."""
+        ids = list(self.records) if source_ids is None else [i for i in source_ids if i in self.records]
+        records = [(i, self.records[i]) for i in ids]
+        slowest = sorted(
+            ((i, r["latencyEwmaMs"]) for i, r in records if r["latencyEwmaMs"] is not None),
+            key=lambda item: item[1], reverse=True
+        )[:5]
+        return {
+            "tracked": len(records),
+            "open": [i for i, r in records if r["circuitState"] == OPEN],
+            "half_open": [i for i, r in records if r["circuitState"] == HALF_OPEN],
+            "failing": sum(1 for _, r in records if r["consecutiveFailures"] > 0),
+            "slowest_ms": dict(slowest),
+        }
+
+
+# Lazy-initialized process-wide tracker
+_tracker: Optional[SourceHealthTracker] = None
+
+
+def get_source_health() -> SourceHealthTracker:
+    """Get or initialize the process-wide source health tracker."""
+    global _tracker
+    if _tracker is None:
+        _tracker = SourceHealthTracker()
+    return _tracker
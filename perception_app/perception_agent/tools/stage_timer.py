@@ -0,0 +1,78 @@
+"""
+Ingestion Stage Timing
+
+Records wall time, CPU time, peak RSS and item counts for each step of an
+ingestion run, so runs can be compared for performance regressions.
+
+CPU time and peak RSS are process-wide: CPU time counts every thread of
+the process, and peak RSS is the process high-water mark after the stage
+(it only grows, so a jump shows which stage pushed it up). Peak RSS is
+None where the `resource` module is unavailable (Windows).
+"""
+
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Process peak resident set size in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class StageTimer:
+    """Per-stage wall/CPU time, peak RSS and item counts for one run."""
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.run_id = run_id
+        self.stages: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Time a stage.
+
+        Yields the stage record; set record["items"] to the number of items
+        the stage produced. The record is kept even if the stage raises.
+        """
+        record: Dict[str, Any] = {"stage": name, "items": None}
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_ms"] = round((time.perf_counter() - wall_started) * 1000, 1)
+            record["cpu_ms"] = round((time.process_time() - cpu_started) * 1000, 1)
+            record["peak_rss_mb"] = peak_rss_mb()
+            self.stages.append(record)
+
+            logger.info(json.dumps({
+                "severity": "INFO",
+                "tool": "agent_0",
+                "operation": "stage_timing",
+                "run_id": self.run_id,
+                **record
+            }))
+
+    def summary(self) -> Dict[str, Any]:
+        """Stage records in run order plus totals."""
+        return {
+            "stages": [dict(record) for record in self.stages],
+            "total_wall_ms": round(sum(r["wall_ms"] for r in self.stages), 1),
+            "total_cpu_ms": round(sum(r["cpu_ms"] for r in self.stages), 1),
+            "peak_rss_mb": peak_rss_mb(),
+        }
@@ -0,0 +1,329 @@
+"""
+Storage Retries and Dead-Letter Queue
+
+Firestore rejects some writes for transient reasons: contention (ABORTED),
+overload (UNAVAILABLE, RESOURCE_EXHAUSTED) or a deadline. Before this
+module, one such error lost a whole 500-article batch. Now:
+
+- retry_call / retry_call_async retry a write with exponential backoff
+  and full jitter: attempt n waits a random time up to
+  min(STORAGE_RETRY_MAX_SECONDS, STORAGE_RETRY_BASE_SECONDS * 2**(n-1)).
+  Only idempotent writes are retried, such as upserts to deterministic
+  document IDs. Only transient errors are retried.
+- Writes that still fail are appended to a dead-letter queue: a JSONL
+  file with one document write per line. replay() drains it later (see
+  agent_7.replay_dead_letters and scripts/replay_dead_letters.py).
+  Entries that fail a replay with a non-transient error, or have been
+  replayed STORAGE_DLQ_MAX_REPLAYS times, are parked in a separate file
+  (<STORAGE_DLQ_PATH>.parked) for inspection instead of being requeued.
+
+Configured via environment variables:
+
+- STORAGE_RETRY_ATTEMPTS: attempts per write, including the first (default 4)
+- STORAGE_RETRY_BASE_SECONDS (default 0.5), STORAGE_RETRY_MAX_SECONDS (default 8)
+- STORAGE_DLQ_PATH (default data/storage_dlq.jsonl)
+- STORAGE_DLQ_MAX_REPLAYS: failed replays before an entry is parked (default 5)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from google.api_core import exceptions as api_exceptions
+
+logger = logging.getLogger(__name__)
+
+STORAGE_RETRY_ATTEMPTS = int(os.getenv("STORAGE_RETRY_ATTEMPTS", "4"))
+STORAGE_RETRY_BASE_SECONDS = float(os.getenv("STORAGE_RETRY_BASE_SECONDS", "0.5"))
+STORAGE_RETRY_MAX_SECONDS = float(os.getenv("STORAGE_RETRY_MAX_SECONDS", "8"))
+STORAGE_DLQ_PATH = os.getenv(
+    "STORAGE_DLQ_PATH",
+    str(Path(__file__).parent.parent.parent.parent / "data" / "storage_dlq.jsonl")
+)
+STORAGE_DLQ_MAX_REPLAYS = int(os.getenv("STORAGE_DLQ_MAX_REPLAYS", "5"))
+
+# JSON tag for datetimes, so replayed documents keep Firestore timestamps
+_DATETIME_TAG = "$datetime"
+
+# Errors worth another attempt: contention, overload, timeouts, lost connections
+TRANSIENT_ERRORS: Tuple[type, ...] = (
+    api_exceptions.Aborted,
+    api_exceptions.DeadlineExceeded,
+    api_exceptions.InternalServerError,
+    api_exceptions.ResourceExhausted,
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.TooManyRequests,
+    ConnectionError,
+    TimeoutError,
+)
+
+T = TypeVar("T")
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed write may succeed if tried again."""
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+class StorageWriteError(Exception):
+    """A write that failed for good: not retryable, or out of attempts."""
+
+    def __init__(self, error: BaseException, attempts: int):
+        super().__init__(str(error))
+        self.error = error
+        self.attempts = attempts
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(
+        self,
+        max_attempts: int = STORAGE_RETRY_ATTEMPTS,
+        base_delay: float = STORAGE_RETRY_BASE_SECONDS,
+        max_delay: float = STORAGE_RETRY_MAX_SECONDS,
+        rng: Optional[random.Random] = None,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt number `attempt` (1-based)."""
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def should_retry(self, error: BaseException, attempt: int, idempotent: bool) -> bool:
+        return idempotent and attempt < self.max_attempts and is_transient(error)
+
+
+def _log_retry(operation: str, attempt: int, delay: float, error: BaseException) -> None:
+    logger.warning(json.dumps({
+        "severity": "WARNING",
+        "tool": "agent_7",
+        "operation": operation,
+        "attempt": attempt,
+        "retry_in_seconds": round(delay, 3),
+        "error": str(error)
+    }))
+
+
+def retry_call(
+    write: Callable[[], T],
+    idempotent: bool,
+    policy: Optional[RetryPolicy] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    operation: str = "storage_write",
+) -> Tuple[T, int]:
+    """
+    Run a write, retrying transient failures of idempotent writes.
+
+    Args:
+        write: Performs the write; called once per attempt
+        idempotent: Whether repeating the write is safe (never retried if not)
+        policy: Backoff settings (default RetryPolicy())
+        sleep: Sleep function (for tests)
+        operation: Name used in retry logs
+
+    Returns:
+        (write result, attempts used)
+
+    Raises:
+        StorageWriteError: with the last error, once the write is not retried
+    """
+    policy = policy or RetryPolicy()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return write(), attempt
+        except Exception as e:
+            if not policy.should_retry(e, attempt, idempotent):
+                raise StorageWriteError(e, attempt) from e
+            delay = policy.backoff(attempt)
+            _log_retry(operation, attempt, delay, e)
+            sleep(delay)
+
+
+async def retry_call_async(
+    write: Callable[[], Awaitable[T]],
+    idempotent: bool,
+    policy: Optional[RetryPolicy] = None,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    operation: str = "storage_write",
+) -> Tuple[T, int]:
+    """Async version of retry_call; `write` returns a new awaitable per attempt."""
+    policy = policy or RetryPolicy()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return await write(), attempt
+        except Exception as e:
+            if not policy.should_retry(e, attempt, idempotent):
+                raise StorageWriteError(e, attempt) from e
+            delay = policy.backoff(attempt)
+            _log_retry(operation, attempt, delay, e)
+            await sleep(delay)
+
+
+def _encode(value: Any) -> Any:
+    """JSON fallback: datetimes are tagged (and restored on read), anything else becomes a string."""
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    return str(value)
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and _DATETIME_TAG in obj:
+        return datetime.fromisoformat(obj[_DATETIME_TAG])
+    return obj
+
+
+class DeadLetterQueue:
+    """
+    Document writes that failed for good, spooled to a JSONL file.
+
+    Each line is one write: collection, doc_id, data, merge, error,
+    attempts and failed_at, plus replays and permanent once a replay has
+    failed. Datetimes in the data are restored as datetimes when read
+    back. Other values JSON cannot hold (e.g. Firestore references or
+    GeoPoints) are stored, and replayed, as strings.
+    """
+
+    def __init__(self, path: str = STORAGE_DLQ_PATH, max_replays: int = STORAGE_DLQ_MAX_REPLAYS):
+        self.path = Path(path)
+        self.max_replays = max(1, max_replays)
+        # Entries taken by a replay that has not finished
+        self.replay_path = self.path.with_suffix(self.path.suffix + ".replay")
+        # Entries that will not be replayed again
+        self.parked_path = self.path.with_suffix(self.path.suffix + ".parked")
+        self._lock = threading.Lock()
+
+    def append(self, entries: List[Dict[str, Any]]) -> int:
+        """Spool writes to the queue; returns how many were added."""
+        return self._append(self.path, entries)
+
+    def _append(self, path: Path, entries: List[Dict[str, Any]]) -> int:
+        if not entries:
+            return 0
+        failed_at = datetime.now(timezone.utc).isoformat()
+        lines = [
+            json.dumps({"failed_at": failed_at, **entry}, default=_encode, separators=(",", ":")) + "\n"
+            for entry in entries
+        ]
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a") as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+        return len(lines)
+
+    def _read(self, path: Path) -> List[Dict[str, Any]]:
+        if not path.exists():
+            return []
+        entries = []
+        with open(path, "r") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line, object_hook=_decode))
+                except ValueError:
+                    # A torn final line from a crash mid-append
+                    logger.warning(json.dumps({
+                        "severity": "WARNING",
+                        "tool": "agent_7",
+                        "operation": "dead_letter_read",
+                        "path": str(path),
+                        "line": line_number,
+                        "error": "Unreadable dead-letter entry skipped"
+                    }))
+        return entries
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Entries waiting for replay (without removing them)."""
+        with self._lock:
+            return self._read(self.replay_path) + self._read(self.path)
+
+    def __len__(self) -> int:
+        return len(self.pending())
+
+    def parked(self) -> List[Dict[str, Any]]:
+        """Entries that are no longer replayed."""
+        with self._lock:
+            return self._read(self.parked_path)
+
+    def replay(self, write: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]) -> Dict[str, int]:
+        """
+        Drain the queue through `write`.
+
+        The queued entries are first moved aside, so writes that fail while
+        the replay runs are queued normally. If a replay is interrupted, the
+        entries it had taken are picked up by the next one.
+
+        Failed entries are re-queued, unless they are marked permanent
+        (non-transient error) or have failed max_replays replays; those
+        are parked.
+
+        Args:
+            write: Writes entries and returns the ones that failed again,
+                with an updated replays count and permanent flag
+
+        Returns:
+            Counts of entries replayed, written, re-queued and parked.
+        """
+        with self._lock:
+            if self.path.exists():
+                if self.replay_path.exists():
+                    with open(self.replay_path, "a") as taken, open(self.path, "r") as queued:
+                        taken.write(queued.read())
+                    self.path.unlink()
+                else:
+                    os.replace(self.path, self.replay_path)
+            entries = self._read(self.replay_path)
+
+        failed = write(entries) if entries else []
+        park, requeue = [], []
+        for entry in failed:
+            parked = entry.get("permanent") or entry.get("replays", 0) >= self.max_replays
+            (park if parked else requeue).append(entry)
+        self._append(self.parked_path, park)
+        self.append(requeue)
+        with self._lock:
+            if self.replay_path.exists():
+                self.replay_path.unlink()
+
+        result = {
+            "replayed": len(entries),
+            "written": len(entries) - len(failed),
+            "requeued": len(requeue),
+            "parked": len(park),
+        }
+        logger.info(json.dumps({
+            "severity": "INFO",
+            "tool": "agent_7",
+            "operation": "replay_dead_letters",
+            **result
+        }))
+        return result
+
+
+# Lazy-initialized process-wide queue
+_dead_letter_queue: Optional[DeadLetterQueue] = None
+
+
+def get_dead_letter_queue() -> DeadLetterQueue:
+    """Get or initialize the process-wide dead-letter queue (at STORAGE_DLQ_PATH)."""
+    global _dead_letter_queue
+    if _dead_letter_queue is None:
+        _dead_letter_queue = DeadLetterQueue()
+    return _dead_letter_queue
@@ -0,0 +1,198 @@
+"""
+Streaming Top-K Selection
+
+Picks the best articles by relevance_score under an overall limit and
+per-topic / per-source diversity caps, taking articles one at a time so
+the streaming pipeline can feed it as sources finish.
+
+The selection is the greedy one: walk the articles best first (ties in
+arrival order) and keep each one whose topic, source and the overall
+limit all still have room. An article counts toward its first matched
+topic; articles without a topic share one quota.
+
+Only candidates that can still make that cut are kept. They sit in one
+bounded min-heap per (topic, source) cell, holding the cell's best
+min(k, max_per_topic, max_per_source) articles. If an article is pushed
+out of its cell, that many better articles from the same topic and
+source exist. Whether they are all kept or one is blocked, the limit
+that stops them stops this article too. Each offer is O(log k). items()
+runs the greedy pass over the retained candidates. Their number is bounded
+by cells x cell size, not by how many articles were offered.
+
+An article can be offered as provisional: it may still be withdrawn with
+discard() (the streaming pipeline does this when an earlier source turns
+out to carry the same article). Only non-provisional articles push others
+out of a cell, so a cell keeps its best cell-size settled articles plus
+every provisional article better than them, and withdrawing one never
+loses a candidate. settle() makes provisional articles final.
+"""
+
+import heapq
+import itertools
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (score, negated arrival sequence, article); the root is the cell's worst
+_Entry = Tuple[float, Tuple[int, ...], Dict[str, Any]]
+
+
+class TopKSelector:
+    """Running top-k articles with per-topic and per-source caps."""
+
+    def __init__(
+        self,
+        k: int,
+        min_score: float = 5,
+        max_per_topic: Optional[int] = None,
+        max_per_source: Optional[int] = None,
+    ):
+        """
+        Args:
+            k: Max articles selected overall
+            min_score: Minimum relevance_score to be considered
+            max_per_topic: Max articles per topic (None: no cap)
+            max_per_source: Max articles per source_id (None: no cap)
+        """
+        self.k = k
+        self.min_score = min_score
+        self.max_per_topic = max_per_topic
+        self.max_per_source = max_per_source
+        self._cell_size = min(cap for cap in (k, max_per_topic, max_per_source) if cap is not None)
+        self._cells: Dict[Tuple[Any, Any], List[_Entry]] = {}
+        # Settled (non-provisional) articles per cell
+        self._settled: Dict[Tuple[Any, Any], int] = {}
+        # Negated sequence of each provisional article -> its cell
+        self._provisional: Dict[Tuple[int, ...], Tuple[Any, Any]] = {}
+        self._arrivals = itertools.count()
+        self._selected: Optional[List[Dict[str, Any]]] = None
+        self.offered = 0
+
+    def offer(
+        self,
+        article: Dict[str, Any],
+        seq: Optional[Tuple[int, ...]] = None,
+        provisional: bool = False,
+    ) -> None:
+        """
+        Consider one article.
+
+        Args:
+            article: Scored article
+            seq: Arrival order used to break score ties (earlier wins);
+                defaults to the order offer() is called in
+            provisional: The article may still be discard()ed
+        """
+        self.offered += 1
+        score = article.get("relevance_score", 0)
+        if score < self.min_score or self._cell_size <= 0:
+            return
+
+        if seq is None:
+            seq = (next(self._arrivals),)
+        cell = (
+            _topic(article) if self.max_per_topic is not None else None,
+            article.get("source_id") if self.max_per_source is not None else None,
+        )
+        heap = self._cells.setdefault(cell, [])
+        entry = (score, tuple(-part for part in seq), article)
+        if provisional:
+            self._provisional[entry[1]] = cell
+        else:
+            if self._settled.get(cell, 0) >= self._cell_size and entry[:2] < heap[0][:2]:
+                return
+            self._settled[cell] = self._settled.get(cell, 0) + 1
+        heapq.heappush(heap, entry)
+        self._prune(cell)
+        self._selected = None
+
+    def discard(self, seq: Tuple[int, ...]) -> bool:
+        """
+        Withdraw the provisional article offered with `seq` (e.g. a
+        duplicate superseded by an earlier copy). O(cell size).
+
+        Returns:
+            True if the article was still a candidate.
+        """
+        key = tuple(-part for part in seq)
+        cell = self._provisional.pop(key, None)
+        if cell is None:
+            return False
+        heap = self._cells[cell]
+        heap[:] = [entry for entry in heap if entry[1] != key]
+        heapq.heapify(heap)
+        self._selected = None
+        return True
+
+    def settle(self, final: Callable[[Tuple[int, ...]], bool]) -> int:
+        """
+        Make the provisional articles whose sequence satisfies `final`
+        permanent, dropping the candidates they now push out.
+
+        Returns:
+            Number of articles settled.
+        """
+        settled = [key for key in self._provisional if final(tuple(-part for part in key))]
+        cells = set()
+        for key in settled:
+            cell = self._provisional.pop(key)
+            self._settled[cell] = self._settled.get(cell, 0) + 1
+            cells.add(cell)
+        for cell in cells:
+            self._prune(cell)
+        if settled:
+            self._selected = None
+        return len(settled)
+
+    def _prune(self, cell: Tuple[Any, Any]) -> None:
+        """Drop the cell's worst articles while cell-size settled articles beat them."""
+        heap = self._cells[cell]
+        settled = self._settled.get(cell, 0)
+        while heap:
+            worst_settled = heap[0][1] not in self._provisional
+            if settled - worst_settled < self._cell_size:
+                break
+            _, key, _ = heapq.heappop(heap)
+            if worst_settled:
+                settled -= 1
+            else:
+                del self._provisional[key]
+        self._settled[cell] = settled
+
+    @property
+    def candidate_count(self) -> int:
+        """Articles currently retained as candidates."""
+        return sum(len(heap) for heap in self._cells.values())
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Selected articles, best first."""
+        if self._selected is None:
+            candidates = sorted(
+                (entry for heap in self._cells.values() for entry in heap),
+                key=lambda entry: entry[:2],
+                reverse=True
+            )
+            per_topic: Dict[Any, int] = {}
+            per_source: Dict[Any, int] = {}
+            selected = []
+            for _, _, article in candidates:
+                if len(selected) >= self.k:
+                    break
+                topic = _topic(article)
+                source = article.get("source_id")
+                if self.max_per_topic is not None and per_topic.get(topic, 0) >= self.max_per_topic:
+                    continue
+                if self.max_per_source is not None and per_source.get(source, 0) >= self.max_per_source:
+                    continue
+                per_topic[topic] = per_topic.get(topic, 0) + 1
+                per_source[source] = per_source.get(source, 0) + 1
+                selected.append(article)
+            self._selected = selected
+        return list(self._selected)
+
+    def __len__(self) -> int:
+        return len(self.items())
+
+
+def _topic(article: Dict[str, Any]) -> Optional[str]:
+    """The topic an article counts toward: its first matched topic."""
+    matched = article.get("matched_topics")
+    return matched[0] if matched else None
@@ -0,0 +1,131 @@
+"""
+URL Canonicalization
+
+Feeds link the same article under many URLs: with utm_* and click-ID
+tracking parameters, with or without "www.", over http or https, as an AMP
+page or through the Google AMP cache. canonicalize_url() maps these
+variants to one URL, and canonical_article_id() derives the Firestore
+document ID from it, so every variant is stored, de-duplicated and
+remembered as the same article.
+
+Articles stored before canonicalization have IDs hashed from the raw feed
+URL (legacy_article_id). Until scripts/migrate_article_ids.py has moved
+them to their canonical IDs, duplicate checks also look for the legacy ID.
+
+Rules:
+
+- scheme: http becomes https; the fragment is dropped
+- host: lowercased, "www." / "amp." prefixes and default ports removed;
+  AMP cache URLs (*.cdn.ampproject.org/c/s/host/path) are unwrapped
+- path: AMP variants (/amp, /amp/, .amp, .amp.html) are reduced to the
+  regular page, and a trailing slash is removed
+- query: tracking parameters (utm_*, fbclid, gclid, ...) and AMP flags
+  (amp, outputType=amp) are removed; the rest are sorted
+
+URLs that are not http(s) are returned unchanged, apart from surrounding
+whitespace.
+"""
+
+import hashlib
+from typing import List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the click, never select content
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "ocid", "cmpid",
+})
+TRACKING_PREFIXES = ("utm_",)
+
+_HOST_PREFIXES = ("www.", "amp.")
+_AMP_CACHE_SUFFIX = ".cdn.ampproject.org"
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _unwrap_amp_cache(path: str) -> Tuple[str, str]:
+    """(host, path) of the page behind an AMP cache path like /c/s/host/path."""
+    segments = path.lstrip("/").split("/")
+    if segments and segments[0] in ("c", "v"):
+        segments = segments[1:]
+    if segments and segments[0] == "s":
+        segments = segments[1:]
+    if not segments or not segments[0]:
+        return "", path
+    return segments[0].lower(), "/" + "/".join(segments[1:])
+
+
+def _strip_amp_path(path: str) -> str:
+    if path.endswith(".amp.html"):
+        return path[:-len(".amp.html")] + ".html"
+    if path.endswith(".amp"):
+        return path[:-len(".amp")]
+    stripped = path.rstrip("/")
+    if stripped.endswith("/amp"):
+        return stripped[:-len("/amp")] or "/"
+    return path
+
+
+def _keep_param(name: str, value: str) -> bool:
+    lowered = name.lower()
+    if lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES):
+        return False
+    if lowered == "amp" or (lowered == "outputtype" and value.lower() == "amp"):
+        return False
+    return True
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of an article URL.
+
+    Args:
+        url: Article URL as found in the feed
+
+    Returns:
+        The canonical URL (see module docstring for the rules).
+    """
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname.lower()
+    path = parts.path
+    if host.endswith(_AMP_CACHE_SUFFIX):
+        unwrapped_host, unwrapped_path = _unwrap_amp_cache(path)
+        if unwrapped_host:
+            host, path, port = unwrapped_host, unwrapped_path, None
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+    netloc = host if port is None or port == _DEFAULT_PORTS[scheme] else f"{host}:{port}"
+
+    path = _strip_amp_path(path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    params: List[Tuple[str, str]] = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if _keep_param(name, value)
+    ]
+    query = urlencode(sorted(params))
+
+    return urlunsplit(("https", netloc, path or "/", query, ""))
+
+
+def canonical_article_id(url: str) -> str:
+    """Firestore document ID of an article: art-<sha256(canonical URL)[:16]>."""
+    url_hash = hashlib.sha256(canonicalize_url(url).encode()).hexdigest()
+    return f"art-{url_hash[:16]}"
+
+
+def legacy_article_id(url: str) -> str:
+    """Document ID of an article stored before canonicalization: art-<sha256(raw URL)[:16]>."""
+    url_hash = hashlib.sha256(url.encode()).hexdigest()
+    return f"art-{url_hash[:16]}"
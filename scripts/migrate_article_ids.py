@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Perception With Intent - Article ID Migration
+
+Moves /articles documents stored before URL canonicalization (IDs hashed
+from the raw feed URL) to their canonical IDs, deleting the legacy
+documents, and backfills the seen-article index. Safe to run again.
+Afterwards set LEGACY_ARTICLE_ID_CHECK=false.
+
+Usage:
+    python scripts/migrate_article_ids.py [--dry-run] [--no-seen-index]
+
+Requirements:
+    - Virtual environment activated
+    - Firestore emulator (optional, will use production if not set)
+"""
+
+import sys
+import argparse
+import logging
+import json
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from perception_app.perception_agent.tools.article_id_migration import migrate_article_ids
+from perception_app.perception_agent.tools.seen_urls import get_seen_url_index
+
+# Configure structured logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'  # JSON logs
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Migrate legacy article IDs."""
+    parser = argparse.ArgumentParser(
+        description="Move articles stored under pre-canonicalization IDs to their canonical IDs"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only count the documents that would change"
+    )
+    parser.add_argument(
+        "--no-seen-index",
+        action="store_true",
+        help="Do not backfill the seen-article index"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        counts = migrate_article_ids(
+            dry_run=args.dry_run,
+            seen_index=None if args.no_seen_index else get_seen_url_index()
+        )
+    except Exception as e:
+        logger.error(json.dumps({
+            "severity": "ERROR",
+            "message": "Article ID migration failed",
+            "error": str(e)
+        }))
+        print(f"\n❌ FATAL ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print("Dry run:" if args.dry_run else "Migrated:")
+    for key, value in counts.items():
+        print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
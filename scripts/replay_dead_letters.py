@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Perception With Intent - Dead-Letter Replay
+
+Writes Firestore writes that failed after all retries (spooled to the
+dead-letter queue by agent_7) to Firestore again. Writes that fail again
+stay in the queue, unless they failed with a non-transient error or ran
+out of replays (STORAGE_DLQ_MAX_REPLAYS): those are parked in
+<dlq path>.parked for inspection.
+
+Usage:
+    python scripts/replay_dead_letters.py [--dlq-path PATH] [--dry-run]
+
+Requirements:
+    - Virtual environment activated
+    - Firestore emulator (optional, will use production if not set)
+"""
+
+import sys
+import argparse
+import logging
+import json
+from collections import Counter
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from perception_app.perception_agent.tools.agent_7_tools import replay_dead_letters
+from perception_app.perception_agent.tools.storage_retry import DeadLetterQueue, get_dead_letter_queue
+
+# Configure structured logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'  # JSON logs
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Replay the dead-letter queue."""
+    parser = argparse.ArgumentParser(
+        description="Replay Firestore writes from the storage dead-letter queue"
+    )
+    parser.add_argument(
+        "--dlq-path",
+        help="Dead-letter queue file (default: STORAGE_DLQ_PATH)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only list the queued writes"
+    )
+
+    args = parser.parse_args()
+    dead_letters = DeadLetterQueue(args.dlq_path) if args.dlq_path else get_dead_letter_queue()
+
+    if args.dry_run:
+        pending = dead_letters.pending()
+        print(f"{len(pending)} queued write(s) in {dead_letters.path}")
+        for collection, count in sorted(Counter(e.get("collection") for e in pending).items()):
+            print(f"  {collection}: {count}")
+        sys.exit(0)
+
+    try:
+        result = replay_dead_letters(dead_letters)
+    except Exception as e:
+        logger.error(json.dumps({
+            "severity": "ERROR",
+            "message": "Dead-letter replay failed",
+            "error": str(e)
+        }))
+        print(f"\n❌ FATAL ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(
+        f"Replayed: {result['replayed']}  Written: {result['written']}  "
+        f"Requeued: {result['requeued']}  Parked: {result['parked']}"
+    )
+    if result["parked"]:
+        print(f"Parked writes are in {dead_letters.parked_path}")
+    sys.exit(0 if result["requeued"] == 0 and result["parked"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
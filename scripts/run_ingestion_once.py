@@ -5,10 +5,11 @@ Perception With Intent - Dev Ingestion Runner
 Runs a single ingestion cycle locally for testing the E2E pipeline.
 
 Usage:
-    python scripts/run_ingestion_once.py [--user-id USER_ID] [--trigger TRIGGER]
+    python scripts/run_ingestion_once.py [--user-id USER_ID] [--trigger TRIGGER] [--transport inprocess]
 
 Requirements:
-    - MCP service running on http://localhost:8080 (or set MCP_BASE_URL)
+    - MCP service running on http://localhost:8080 (or set MCP_BASE_URL),
+      unless run with --transport inprocess
     - Virtual environment activated
     - Firestore emulator (optional, will use production if not set)
 
@@ -27,6 +28,8 @@ from datetime import datetime, timezone
 sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
 
 from perception_agent.tools.agent_0_tools import run_daily_ingestion
+from perception_agent.tools import agent_1_tools
+from perception_agent.tools.agent_1_tools import close_http_client
 
 # Configure structured logging
 logging.basicConfig(
@@ -36,6 +39,24 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def print_stage_timings(timings: dict) -> None:
+    """Print the per-stage timing table recorded by run_daily_ingestion."""
+    def cell(value):
+        return "-" if value is None else value
+
+    print("\nStage timings:")
+    print(f"  {'stage':<24} {'wall ms':>10} {'cpu ms':>10} {'peak RSS MB':>12} {'items':>8}")
+    for stage in timings.get("stages", []):
+        print(
+            f"  {stage['stage']:<24} {stage['wall_ms']:>10} {stage['cpu_ms']:>10} "
+            f"{cell(stage['peak_rss_mb']):>12} {cell(stage['items']):>8}"
+        )
+    print(
+        f"  {'total':<24} {timings.get('total_wall_ms'):>10} {timings.get('total_cpu_ms'):>10} "
+        f"{cell(timings.get('peak_rss_mb')):>12}"
+    )
+
+
 async def main():
     """Run a single ingestion cycle."""
     parser = argparse.ArgumentParser(
@@ -51,6 +72,13 @@ async def main():
         default="manual_dev",
         help="Trigger type for this run (default: manual_dev)"
     )
+    parser.add_argument(
+        "--transport",
+        choices=["http", "inprocess"],
+        default=agent_1_tools.MCP_TRANSPORT,
+        help="How agents reach the MCP tools: http, or inprocess to call the routers "
+             "directly without a running MCP service (default: MCP_TRANSPORT or http)"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -62,11 +90,14 @@ async def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
+    agent_1_tools.MCP_TRANSPORT = args.transport
+
     logger.info(json.dumps({
         "severity": "INFO",
         "message": "Starting dev ingestion run",
         "user_id": args.user_id,
         "trigger": args.trigger,
+        "mcp_transport": args.transport,
         "timestamp": datetime.now(tz=timezone.utc).isoformat()
     }))
 
@@ -87,7 +118,11 @@ async def main():
         print("\nStats:")
         stats = result.get('stats', {})
         for key, value in stats.items():
-            print(f"  {key}: {value}")
+            if not isinstance(value, dict):
+                print(f"  {key}: {value}")
+
+        if stats.get("stage_timings"):
+            print_stage_timings(stats["stage_timings"])
 
         errors = result.get('errors', [])
         if errors:
@@ -114,6 +149,9 @@ async def main():
         }))
         print(f"\n❌ FATAL ERROR: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        # Release pooled MCP connections before the event loop shuts down
+        await close_http_client()
 
 
 if __name__ == "__main__":
@@ -14,6 +14,38 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+TOOLS = "perception_app.perception_agent.tools.agent_0_tools"
+
+
+@pytest.fixture(autouse=True)
+def source_health_store():
+    """Keep source health I/O off Firestore; fresh tracker per test."""
+    from perception_app.perception_agent.tools.source_health import SourceHealthTracker
+
+    tracker = SourceHealthTracker()
+    with patch(f"{TOOLS}.get_source_health", return_value=tracker), \
+            patch(f"{TOOLS}.load_source_health", return_value={}) as mock_load, \
+            patch(f"{TOOLS}.update_source_health") as mock_update:
+        yield {"tracker": tracker, "load": mock_load, "update": mock_update}
+
+
+@pytest.fixture(autouse=True)
+def seen_url_index():
+    """Keep the seen-article index in memory; empty per test."""
+    from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+
+    index = SeenUrlIndex(state_path=None)
+    with patch(f"{TOOLS}.get_seen_url_index", return_value=index):
+        yield index
+
+
+@pytest.fixture(autouse=True)
+def duplicate_check():
+    """Keep duplicate detection off Firestore and the history file."""
+    with patch(f"{TOOLS}.detect_duplicates", return_value=[]) as mock_detect, \
+            patch(f"{TOOLS}.record_article_history"):
+        yield mock_detect
+
 
 class TestStartIngestionRun:
     """Tests for start_ingestion_run function."""
@@ -202,6 +234,33 @@ class TestRunDailyIngestion:
         assert "run_id" in result
         assert "stats" in result
 
+    @pytest.mark.asyncio
+    @patch('perception_app.perception_agent.tools.agent_0_tools.harvest_all_sources')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.get_active_topics')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.update_ingestion_run')
+    async def test_stage_timings_persisted(
+        self,
+        mock_update,
+        mock_topics,
+        mock_harvest
+    ):
+        """Per-stage timings are written to the run document, even when validation stops it."""
+        from perception_app.perception_agent.tools.agent_0_tools import run_daily_ingestion
+
+        mock_topics.return_value = [{"topic_id": "tech"}]
+        mock_harvest.return_value = {"articles": [{"title": "Test", "url": "https://example.com/1"}]}
+
+        await run_daily_ingestion()
+
+        timings = mock_update.call_args.args[2]["stage_timings"]
+        stages = {stage["stage"]: stage for stage in timings["stages"]}
+        assert timings["stages"][0]["stage"] == "get_active_topics"
+        assert {"harvest_all_sources", "score_articles", "build_brief_payload", "validate"} <= set(stages)
+        assert "store_articles" not in stages
+        assert stages["harvest_all_sources"]["items"] == 1
+        assert all(stage["wall_ms"] >= 0 and stage["cpu_ms"] >= 0 for stage in timings["stages"])
+        assert timings["total_wall_ms"] >= 0
+
     @pytest.mark.asyncio
     @patch('perception_app.perception_agent.tools.agent_0_tools.harvest_all_sources')
     @patch('perception_app.perception_agent.tools.agent_0_tools.get_active_topics')
@@ -223,6 +282,87 @@ class TestRunDailyIngestion:
         assert result["status"] == "success"
         assert result["stats"]["articles_harvested"] == 0
 
+    @pytest.mark.asyncio
+    @patch('perception_app.perception_agent.tools.agent_0_tools.harvest_all_sources')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.get_active_topics')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.update_ingestion_run')
+    async def test_source_health_loaded_and_persisted(
+        self,
+        mock_update,
+        mock_topics,
+        mock_harvest,
+        source_health_store
+    ):
+        """Health is loaded once before the harvest and changes are written back."""
+        from perception_app.perception_agent.tools.agent_0_tools import run_daily_ingestion
+
+        tracker = source_health_store["tracker"]
+
+        async def harvest(**kwargs):
+            tracker.record_failure("dead_feed", "HTTP 404", 120.0)
+            return {"articles": [], "sources_circuit_open": 2}
+
+        mock_topics.return_value = [{"topic_id": "tech"}]
+        mock_harvest.side_effect = harvest
+
+        result = await run_daily_ingestion()
+        await run_daily_ingestion()
+
+        assert source_health_store["load"].call_count == 1
+        assert result["stats"]["sources_circuit_open"] == 2
+        written = source_health_store["update"].call_args_list[0].args[0]
+        assert written["dead_feed"]["lastError"] == "HTTP 404"
+        assert written["dead_feed"]["consecutiveFailures"] == 1
+
+    @pytest.mark.asyncio
+    @patch('perception_app.perception_agent.tools.agent_0_tools.harvest_all_sources')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.get_active_topics')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.filter_top_articles')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.build_brief_payload')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.validate_articles')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.validate_brief')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.store_articles')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.store_brief')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.update_ingestion_run')
+    async def test_already_stored_articles_not_rewritten(
+        self,
+        mock_update,
+        mock_store_brief,
+        mock_store_articles,
+        mock_validate_brief,
+        mock_validate_articles,
+        mock_build_brief,
+        mock_filter,
+        mock_topics,
+        mock_harvest,
+        duplicate_check
+    ):
+        """Articles found in Firestore are skipped; near-duplicates are still stored."""
+        from perception_app.perception_agent.tools.agent_0_tools import run_daily_ingestion
+        from perception_app.perception_agent.tools.agent_7_tools import _generate_article_id
+
+        top = [{"title": t, "url": f"https://example.com/{t}"} for t in ("old", "near", "new")]
+        mock_topics.return_value = [{"topic_id": "tech"}]
+        mock_harvest.return_value = {"articles": top}
+        mock_filter.return_value = top
+        mock_build_brief.return_value = {"brief_id": "brief_123"}
+        mock_validate_articles.return_value = {"valid": True, "errors": []}
+        mock_validate_brief.return_value = {"valid": True, "errors": []}
+        mock_store_articles.return_value = {"stored_count": 2, "errors": []}
+        mock_store_brief.return_value = {"status": "stored"}
+        duplicate_check.return_value = [
+            {"url": "https://example.com/old", "existing_id": _generate_article_id("https://example.com/old"), "similarity": 1.0},
+            {"url": "https://example.com/near", "existing_id": "art-0000000000000000", "similarity": 0.9},
+        ]
+
+        result = await run_daily_ingestion()
+
+        assert result["status"] == "success"
+        assert [a["title"] for a in mock_store_articles.call_args.args[0]] == ["near", "new"]
+        assert result["stats"]["articles_already_stored"] == 1
+        assert result["stats"]["duplicates_detected"] == 2
+        assert "duplicate_check_reads" in result["stats"]
+
     @pytest.mark.asyncio
     @patch('perception_app.perception_agent.tools.agent_0_tools.harvest_all_sources')
     @patch('perception_app.perception_agent.tools.agent_0_tools.get_active_topics')
@@ -301,6 +441,50 @@ class TestRunDailyIngestion:
         assert result["status"] == "failed"
         assert "Invalid article" in result["errors"]
 
+    @pytest.mark.asyncio
+    @patch('perception_app.perception_agent.tools.agent_0_tools.harvest_all_sources')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.get_active_topics')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.score_articles')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.filter_top_articles')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.build_brief_payload')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.validate_articles')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.validate_brief')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.store_articles')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.store_brief')
+    @patch('perception_app.perception_agent.tools.agent_0_tools.update_ingestion_run')
+    async def test_bookkeeping_failure_after_storage_is_best_effort(
+        self,
+        mock_update,
+        mock_store_brief,
+        mock_store_articles,
+        mock_validate_brief,
+        mock_validate_articles,
+        mock_build_brief,
+        mock_filter,
+        mock_score,
+        mock_topics,
+        mock_harvest
+    ):
+        """A failing history update after storage still stores the brief and succeeds."""
+        from perception_app.perception_agent.tools.agent_0_tools import run_daily_ingestion
+
+        article = {"title": "Test", "url": "https://example.com/a", "score": 8}
+        mock_topics.return_value = [{"topic_id": "tech", "name": "Tech"}]
+        mock_harvest.return_value = {"articles": [article], "stats": {}}
+        mock_score.return_value = [article]
+        mock_filter.return_value = [article]
+        mock_build_brief.return_value = {"brief_id": "brief_123"}
+        mock_validate_articles.return_value = {"valid": True, "errors": []}
+        mock_validate_brief.return_value = {"valid": True, "errors": []}
+        mock_store_articles.return_value = {"stored_count": 1, "errors": []}
+        mock_store_brief.return_value = {"status": "stored"}
+
+        with patch(f"{TOOLS}.record_article_history", side_effect=ValueError("bad bands")):
+            result = await run_daily_ingestion()
+
+        assert result["status"] == "success"
+        mock_store_brief.assert_called_once()
+
 
 class TestIngestionRunIdFormat:
     """Tests for ingestion run ID format."""
@@ -0,0 +1,544 @@
+"""
+Agent 1 Source Harvester Tests
+==============================
+
+Tests for the source harvester agent tools.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+TOOLS = "perception_app.perception_agent.tools.agent_1_tools"
+
+
+def _sources(count, hosts=("a.example.com", "b.example.com")):
+    return [
+        {
+            "source_id": f"src_{i}",
+            "name": f"Source {i}",
+            "type": "rss",
+            "url": f"https://{hosts[i % len(hosts)]}/feed/{i}",
+            "category": "tech",
+            "enabled": True,
+        }
+        for i in range(count)
+    ]
+
+
+def _fake_fetch(delays=None, tracker=None):
+    """Build a fetch_rss stand-in that returns one article per feed."""
+
+    async def fetch(feed_url, time_window_hours=24, max_items=50, request_id=None, raise_on_error=False):
+        index = int(feed_url.rsplit("/", 1)[-1])
+        if tracker is not None:
+            tracker["active"] += 1
+            tracker["peak"] = max(tracker["peak"], tracker["active"])
+            host = feed_url.split("/")[2]
+            tracker["hosts"][host] = tracker["hosts"].get(host, 0) + 1
+            tracker["host_peak"][host] = max(tracker["host_peak"].get(host, 0), tracker["hosts"][host])
+        await asyncio.sleep((delays or {}).get(index, 0.001))
+        if tracker is not None:
+            tracker["active"] -= 1
+            tracker["hosts"][feed_url.split("/")[2]] -= 1
+        return [{"title": f"Article {index}", "url": f"https://example.com/{index}"}]
+
+    return fetch
+
+
+def _tracker():
+    return {"active": 0, "peak": 0, "hosts": {}, "host_peak": {}}
+
+
+@pytest.fixture(autouse=True)
+def permissive_host_limiter():
+    """Fresh limiter per test that never paces fake fetches."""
+    from perception_app.mcp_service.routers.host_limiter import HostRateLimiter
+
+    limiter = HostRateLimiter(rate_per_second=10000, burst=10000)
+    with patch(f"{TOOLS}.host_limiter", limiter):
+        yield limiter
+
+
+@pytest.fixture(autouse=True)
+def fresh_source_health():
+    """Fresh circuit breaker state per test."""
+    from perception_app.perception_agent.tools.source_health import SourceHealthTracker
+
+    tracker = SourceHealthTracker()
+    with patch(f"{TOOLS}.get_source_health", return_value=tracker):
+        yield tracker
+
+
+class TestHarvestAllSources:
+    """Tests for harvest_all_sources."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_matches_sequential_order(self):
+        """Concurrent mode returns the same articles in the same order."""
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+
+        sources = _sources(6)
+        # Reverse completion order: first source finishes last
+        delays = {i: 0.001 * (6 - i) for i in range(6)}
+
+        with patch(f"{TOOLS}.load_sources_from_csv", return_value=sources):
+            with patch(f"{TOOLS}.fetch_rss", side_effect=_fake_fetch(delays)):
+                sequential = await harvest_all_sources()
+                concurrent = await harvest_all_sources(concurrent=True)
+
+        assert concurrent["articles"] == sequential["articles"]
+        assert [a["title"] for a in concurrent["articles"]] == [f"Article {i}" for i in range(6)]
+        assert concurrent["total_fetched"] == 6
+
+    @pytest.mark.asyncio
+    async def test_sink_receives_sources_as_they_finish(self):
+        """With a sink, each source's articles are handed over on completion and not returned."""
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+
+        delays = {i: 0.002 * (4 - i) for i in range(4)}
+        received = []
+
+        async def sink(index, articles):
+            received.append((index, [a["title"] for a in articles]))
+
+        with patch(f"{TOOLS}.load_sources_from_csv", return_value=_sources(4)):
+            with patch(f"{TOOLS}.fetch_rss", side_effect=_fake_fetch(delays)):
+                result = await harvest_all_sources(concurrent=True, sink=sink)
+
+        assert received == [(i, [f"Article {i}"]) for i in (3, 2, 1, 0)]
+        assert result["articles"] == []
+        assert result["article_count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_respects_global_concurrency_limit(self):
+        """No more than max_concurrency fetches are in flight."""
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+
+        tracker = _tracker()
+        hosts = tuple(f"h{i}.example.com" for i in range(10))
+
+        with patch(f"{TOOLS}.load_sources_from_csv", return_value=_sources(10, hosts)):
+            with patch(f"{TOOLS}.fetch_rss", side_effect=_fake_fetch(tracker=tracker)):
+                await harvest_all_sources(concurrent=True, max_concurrency=3, per_host_limit=10)
+
+        assert tracker["peak"] <= 3
+
+    @pytest.mark.asyncio
+    async def test_respects_per_host_limit(self):
+        """No more than per_host_limit fetches hit one host at a time."""
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+
+        tracker = _tracker()
+
+        with patch(f"{TOOLS}.load_sources_from_csv", return_value=_sources(8)):
+            with patch(f"{TOOLS}.fetch_rss", side_effect=_fake_fetch(tracker=tracker)):
+                await harvest_all_sources(concurrent=True, max_concurrency=8, per_host_limit=1)
+
+        assert all(peak == 1 for peak in tracker["host_peak"].values())
+
+    @pytest.mark.asyncio
+    async def test_source_timings_in_source_order(self):
+        """Per-source timings are reported for every source."""
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+
+        sources = _sources(4)
+
+        with patch(f"{TOOLS}.load_sources_from_csv", return_value=sources):
+            with patch(f"{TOOLS}.fetch_rss", side_effect=_fake_fetch()):
+                result = await harvest_all_sources(concurrent=True)
+
+        timings = result["source_timings"]
+        assert [t["source_id"] for t in timings] == [s["source_id"] for s in sources]
+        assert all(t["elapsed_ms"] >= 0 and t["article_count"] == 1 for t in timings)
+
+    @pytest.mark.asyncio
+    async def test_no_sources(self):
+        """Empty source list returns an empty result."""
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+
+        with patch(f"{TOOLS}.load_sources_from_csv", return_value=[]):
+            result = await harvest_all_sources(concurrent=True)
+
+        assert result["articles"] == []
+        assert result["source_timings"] == []
+
+
+class TestHostPoliteness:
+    """Tests for per-host politeness in the harvester."""
+
+    @pytest.mark.asyncio
+    async def test_throttled_host_skipped_without_blocking_others(self, permissive_host_limiter):
+        """Sources on a backed-off host are skipped; other hosts are fetched."""
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+
+        permissive_host_limiter.max_wait = 0.1
+        permissive_host_limiter.penalize("a.example.com", 300)
+
+        with patch(f"{TOOLS}.load_sources_from_csv", return_value=_sources(4)):
+            with patch(f"{TOOLS}.fetch_rss", side_effect=_fake_fetch()):
+                result = await harvest_all_sources(concurrent=True)
+
+        throttled = [t["throttled"] for t in result["source_timings"]]
+        assert throttled == [True, False, True, False]
+        assert [a["title"] for a in result["articles"]] == ["Article 1", "Article 3"]
+        assert result["host_limiter"]["rejected"] == 2
+
+    @pytest.mark.asyncio
+    async def test_fetch_rss_429_blocks_host(self, permissive_host_limiter):
+        """A 429 from the MCP service blocks the feed host for Retry-After."""
+        import httpx
+        import respx
+        from perception_app.perception_agent.tools import agent_1_tools
+
+        try:
+            with respx.mock:
+                respx.post(f"{agent_1_tools.MCP_BASE_URL}/mcp/tools/fetch_rss_feed").mock(
+                    return_value=httpx.Response(429, headers={"Retry-After": "45"}, json={})
+                )
+                assert await agent_1_tools.fetch_rss("https://b.example.com/feed") == []
+        finally:
+            await agent_1_tools.close_http_client()
+
+        assert 40 < permissive_host_limiter.retry_after("b.example.com") <= 45
+
+    @pytest.mark.asyncio
+    async def test_http_mode_relies_on_mcp_throttling(self):
+        """Over HTTP the agent keeps no limiter; FEED_HOST_THROTTLED marks the source throttled."""
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+
+        failing_fetch = TestSourceHealth._failing_fetch({0}, code="FEED_HOST_THROTTLED")
+        with patch(f"{TOOLS}.host_limiter", None):
+            with patch(f"{TOOLS}.load_sources_from_csv", return_value=_sources(2)):
+                with patch(f"{TOOLS}.fetch_rss", side_effect=failing_fetch):
+                    result = await harvest_all_sources(concurrent=True)
+
+        assert [t["throttled"] for t in result["source_timings"]] == [True, False]
+        assert result["host_limiter"] is None
+
+    def test_in_process_shares_router_limiter(self, monkeypatch):
+        """In process the harvester paces hosts with the router's own limiter."""
+        from perception_app.mcp_service.routers import rss
+        from perception_app.perception_agent.tools import agent_1_tools
+
+        monkeypatch.setattr(f"{TOOLS}.MCP_TRANSPORT", "inprocess")
+        monkeypatch.setattr(f"{TOOLS}.host_limiter", None)
+
+        assert agent_1_tools._get_host_limiter() is rss.host_limiter
+
+
+class TestSourceHealth:
+    """Tests for the per-source circuit breaker in the harvester."""
+
+    @staticmethod
+    def _failing_fetch(failing, code="FEED_FETCH_FAILED"):
+        from perception_app.perception_agent.tools.agent_1_tools import FeedFetchError
+
+        fetch = _fake_fetch()
+
+        async def failing_fetch(feed_url, **kwargs):
+            if int(feed_url.rsplit("/", 1)[-1]) in failing:
+                raise FeedFetchError("Feed returned HTTP 500", 502, code)
+            return await fetch(feed_url, **kwargs)
+
+        return failing_fetch
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_source(self, fresh_source_health):
+        """A source that keeps failing is skipped once its circuit opens."""
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+
+        fresh_source_health.failure_threshold = 2
+        with patch(f"{TOOLS}.load_sources_from_csv", return_value=_sources(3)):
+            with patch(f"{TOOLS}.fetch_rss", side_effect=self._failing_fetch({1})) as mock_fetch:
+                for _ in range(3):
+                    result = await harvest_all_sources(concurrent=True)
+
+        fetched = [c.kwargs["feed_url"].rsplit("/", 1)[-1] for c in mock_fetch.call_args_list]
+        assert fetched.count("1") == 2
+        assert result["sources_circuit_open"] == 1
+        assert result["source_health"]["open"] == ["src_1"]
+        assert [t["source_id"] for t in result["source_timings"]] == ["src_0", "src_2"]
+
+        record = fresh_source_health.records["src_1"]
+        assert record["consecutiveFailures"] == 2
+        assert record["lastError"] == "Feed returned HTTP 500"
+        assert fresh_source_health.records["src_0"]["lastSuccess"] is not None
+
+    @pytest.mark.asyncio
+    async def test_mcp_errors_do_not_count_against_source(self, fresh_source_health):
+        """Failures without a feed-side error code never open a circuit."""
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+
+        fresh_source_health.failure_threshold = 1
+        with patch(f"{TOOLS}.load_sources_from_csv", return_value=_sources(2)):
+            with patch(f"{TOOLS}.fetch_rss", side_effect=self._failing_fetch({0, 1}, code=None)):
+                result = await harvest_all_sources()
+
+        assert result["sources_circuit_open"] == 0
+        assert fresh_source_health.records == {}
+        assert [t["error"] for t in result["source_timings"]] == ["Feed returned HTTP 500"] * 2
+
+
+class TestFetchRSS:
+    """Tests for fetch_rss and the shared MCP client."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_pooled_connection(self):
+        """Consecutive MCP calls reuse one keep-alive connection."""
+        from perception_app.perception_agent.tools import agent_1_tools
+
+        body = b'{"article_count": 1, "articles": [{"title": "A"}]}'
+
+        async def handle(reader, writer):
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+                await reader.readexactly(length)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+                await writer.drain()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        before = agent_1_tools.http_pool_stats()
+
+        try:
+            with patch(f"{TOOLS}.MCP_BASE_URL", f"http://127.0.0.1:{port}"):
+                for _ in range(3):
+                    articles = await agent_1_tools.fetch_rss("https://example.com/rss")
+                    assert articles == [{"title": "A"}]
+        finally:
+            await agent_1_tools.close_http_client()
+            server.close()
+
+        after = agent_1_tools.http_pool_stats()
+        assert after["connections_opened"] - before["connections_opened"] == 1
+        assert after["connections_reused"] - before["connections_reused"] == 2
+        assert after["waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_returns_empty_list_on_connection_error(self):
+        """Unreachable MCP service yields no articles instead of raising."""
+        from perception_app.perception_agent.tools import agent_1_tools
+
+        try:
+            with patch(f"{TOOLS}.MCP_BASE_URL", "http://127.0.0.1:1"):
+                assert await agent_1_tools.fetch_rss("https://example.com/rss") == []
+        finally:
+            await agent_1_tools.close_http_client()
+
+        assert agent_1_tools.http_pool_stats()["waiting"] == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("enabled", [False, True])
+    async def test_conditional_get_is_opt_in(self, enabled):
+        """Validators are only requested with HARVEST_CONDITIONAL_GET."""
+        import json
+        import httpx
+        import respx
+        from perception_app.perception_agent.tools import agent_1_tools
+
+        try:
+            with patch(f"{TOOLS}.HARVEST_CONDITIONAL_GET", enabled), respx.mock:
+                single = respx.post(f"{agent_1_tools.MCP_BASE_URL}/mcp/tools/fetch_rss_feed").mock(
+                    return_value=httpx.Response(200, json={"articles": []})
+                )
+                batch = respx.post(f"{agent_1_tools.MCP_BASE_URL}/mcp/tools/fetch_rss_feeds").mock(
+                    return_value=httpx.Response(200, json={"results": []})
+                )
+                await agent_1_tools.fetch_rss("https://example.com/rss")
+                await agent_1_tools.fetch_rss_batch([{"feed_url": "https://example.com/rss"}])
+        finally:
+            await agent_1_tools.close_http_client()
+
+        assert json.loads(single.calls[0].request.content)["conditional_get"] is enabled
+        assert json.loads(batch.calls[0].request.content)["feeds"][0]["conditional_get"] is enabled
+
+
+def _rss_body(count):
+    from datetime import datetime, timedelta, timezone
+
+    now = datetime.now(tz=timezone.utc)
+    items = "".join(
+        f"<item><title>Item {i}</title><link>https://example.com/{i}</link><category>tech</category>"
+        f"<pubDate>{(now - timedelta(hours=i + 1)).strftime('%a, %d %b %Y %H:%M:%S GMT')}</pubDate></item>"
+        for i in range(count)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>{items}</channel></rss>'
+
+
+class TestInProcessTransport:
+    """Tests for MCP_TRANSPORT=inprocess (router functions called directly)."""
+
+    @pytest.fixture
+    def in_process(self, monkeypatch):
+        """In-process transport with router result caching off and one shared limiter."""
+        from perception_app.mcp_service.routers import rss
+        from perception_app.mcp_service.routers.host_limiter import HostRateLimiter
+        from perception_app.mcp_service.routers.result_cache import result_cache
+
+        limiter = HostRateLimiter(rate_per_second=10000, burst=10000)
+        monkeypatch.setattr(result_cache, "ttl_seconds", 0)
+        monkeypatch.setattr(f"{TOOLS}.MCP_TRANSPORT", "inprocess")
+        monkeypatch.setattr(f"{TOOLS}.host_limiter", limiter)
+        monkeypatch.setattr(rss, "host_limiter", limiter)
+        return limiter
+
+    @pytest.mark.asyncio
+    async def test_fetch_rss_without_http_hop(self, in_process):
+        """Articles come straight from the router; nothing is POSTed to the MCP service."""
+        import httpx
+        import respx
+        from perception_app.mcp_service.routers import http_pool
+        from perception_app.perception_agent.tools import agent_1_tools
+
+        try:
+            with respx.mock:
+                mcp = respx.post(url__startswith=agent_1_tools.MCP_BASE_URL)
+                respx.get("https://inproc.example.com/rss").mock(
+                    return_value=httpx.Response(200, text=_rss_body(3))
+                )
+                articles = await agent_1_tools.fetch_rss("https://inproc.example.com/rss")
+        finally:
+            await http_pool.close_client()
+
+        assert mcp.call_count == 0
+        assert [a["title"] for a in articles] == ["Item 0", "Item 1", "Item 2"]
+        assert articles[0]["categories"] == ["tech"]
+
+    @pytest.mark.asyncio
+    async def test_feed_errors_keep_mcp_codes(self, in_process):
+        """Router HTTP errors surface as FeedFetchError with the MCP error code."""
+        import httpx
+        import respx
+        from perception_app.mcp_service.routers import http_pool
+        from perception_app.perception_agent.tools import agent_1_tools
+
+        try:
+            with respx.mock:
+                respx.get("https://gone.example.com/rss").mock(return_value=httpx.Response(404))
+                with pytest.raises(agent_1_tools.FeedFetchError) as exc:
+                    await agent_1_tools.fetch_rss("https://gone.example.com/rss", raise_on_error=True)
+        finally:
+            await http_pool.close_client()
+
+        assert exc.value.status_code == 404
+        assert exc.value.code == "FEED_FETCH_FAILED"
+        assert str(exc.value) == "Feed returned HTTP 404"
+
+    @pytest.mark.asyncio
+    async def test_batch_and_single_host_token(self, in_process):
+        """Batch results map by index, and each feed takes one host token, not two."""
+        import httpx
+        import respx
+        from perception_app.mcp_service.routers import http_pool
+        from perception_app.perception_agent.tools import agent_1_tools
+
+        sources = [
+            {"source_id": "ok", "type": "rss", "url": "https://ok.example.com/rss", "category": "tech"},
+            {"source_id": "bad", "type": "rss", "url": "https://bad.example.com/rss", "category": "tech"},
+        ]
+        try:
+            with respx.mock:
+                respx.get("https://ok.example.com/rss").mock(return_value=httpx.Response(200, text=_rss_body(2)))
+                respx.get("https://bad.example.com/rss").mock(return_value=httpx.Response(500))
+                with patch(f"{TOOLS}.load_sources_from_csv", return_value=sources):
+                    single = await agent_1_tools.harvest_all_sources(concurrent=True)
+                    results = await agent_1_tools.fetch_rss_batch([{"feed_url": s["url"]} for s in sources])
+        finally:
+            await http_pool.close_client()
+
+        assert [a["title"] for a in single["articles"]] == ["Item 0", "Item 1"]
+        assert in_process.stats()["acquired"] == 4
+        assert [a["title"] for a in results[0]["articles"]] == ["Item 0", "Item 1"]
+        assert results[1]["code"] == "FEED_FETCH_FAILED"
+
+
+class TestBatchHarvest:
+    """Tests for batch harvesting through fetch_rss_feeds."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_rss_batch_maps_results_by_index(self):
+        """Batch results come back in input order with per-feed errors."""
+        import httpx
+        import respx
+        from perception_app.perception_agent.tools import agent_1_tools
+
+        batch_response = {
+            "succeeded": 1,
+            "article_count": 1,
+            "results": [
+                {"index": 1, "feed_url": "https://b/rss", "status": "error", "elapsed_ms": 3,
+                 "error": {"code": "FEED_FETCH_FAILED", "message": "Feed returned HTTP 404"}},
+                {"index": 0, "feed_url": "https://a/rss", "status": "ok", "elapsed_ms": 5,
+                 "result": {"articles": [{"title": "A"}]}},
+            ]
+        }
+
+        try:
+            with respx.mock:
+                route = respx.post(f"{agent_1_tools.MCP_BASE_URL}/mcp/tools/fetch_rss_feeds").mock(
+                    return_value=httpx.Response(200, json=batch_response)
+                )
+                results = await agent_1_tools.fetch_rss_batch([
+                    {"feed_url": "https://a/rss"},
+                    {"feed_url": "https://b/rss"},
+                ])
+        finally:
+            await agent_1_tools.close_http_client()
+
+        assert route.call_count == 1
+        assert results[0] == {"articles": [{"title": "A"}], "elapsed_ms": 5, "error": None}
+        assert results[1]["articles"] == []
+        assert results[1]["error"] == "Feed returned HTTP 404"
+        assert results[1]["code"] == "FEED_FETCH_FAILED"
+
+    @pytest.mark.asyncio
+    async def test_batch_mode_matches_sequential(self):
+        """Batch harvesting yields the same articles as per-feed harvesting."""
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+
+        sources = _sources(5)
+
+        async def fake_batch(feeds, max_concurrency=None, request_id=None):
+            fetch = _fake_fetch()
+            return [
+                {"articles": await fetch(feed["feed_url"]), "elapsed_ms": 1, "error": None}
+                for feed in feeds
+            ]
+
+        with patch(f"{TOOLS}.load_sources_from_csv", return_value=sources):
+            with patch(f"{TOOLS}.fetch_rss", side_effect=_fake_fetch()):
+                sequential = await harvest_all_sources()
+            with patch(f"{TOOLS}.HARVEST_BATCH_SIZE", 2):
+                with patch(f"{TOOLS}.fetch_rss_batch", side_effect=fake_batch) as mock_batch:
+                    batched = await harvest_all_sources(batch=True)
+
+        assert batched["articles"] == sequential["articles"]
+        assert mock_batch.call_count == 3
+        assert [t["elapsed_ms"] for t in batched["source_timings"]] == [1] * 5
+
+
+def test_mcp_service_imported_on_first_use():
+    """Importing the harvester, or harvesting over HTTP, does not load the MCP service routers."""
+    import subprocess
+
+    code = (
+        "import asyncio, sys\n"
+        "from unittest.mock import patch\n"
+        "from perception_app.perception_agent.tools import agent_1_tools\n"
+        "assert not [m for m in sys.modules if m.startswith('perception_app.mcp_service')]\n"
+        "async def fetch(**kwargs):\n"
+        "    return [{'title': 'Article', 'url': 'https://example.com/1'}]\n"
+        "source = {'source_id': 's', 'type': 'rss', 'url': 'https://a.example.com/feed'}\n"
+        "with patch.object(agent_1_tools, 'fetch_rss', side_effect=fetch):\n"
+        "    result = asyncio.run(agent_1_tools._harvest_source(source, 24, 10))\n"
+        "assert len(result['raw_articles']) == 1\n"
+        "assert not [m for m in sys.modules if m.startswith('perception_app.mcp_service')]\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parent.parent.parent)
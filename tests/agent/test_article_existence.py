@@ -0,0 +1,165 @@
+"""
+Article Existence Check Tests
+=============================
+
+Tests for batched, cached Firestore existence checks and their use in
+detect_duplicates. The emulator test runs only when a Firestore emulator
+is reachable at FIRESTORE_EMULATOR_HOST.
+"""
+
+import os
+import socket
+import threading
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+class _Snapshot:
+    def __init__(self, article_id, exists):
+        self.id = article_id
+        self.exists = exists
+
+
+class _FakeDb:
+    """Records get_all calls; documents in `stored` exist."""
+
+    def __init__(self, stored=(), fail_on=None):
+        self.stored = set(stored)
+        self.fail_on = fail_on
+        self.calls = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def collection(self, name):
+        assert name == "articles"
+        return self
+
+    def document(self, article_id):
+        return article_id
+
+    def get_all(self, refs, field_paths=None):
+        with self._lock:
+            self.calls.append((list(refs), field_paths))
+            self.threads.add(threading.get_ident())
+        if self.fail_on is not None and self.fail_on in refs:
+            raise RuntimeError("unavailable")
+        return [_Snapshot(ref, ref in self.stored) for ref in refs]
+
+
+class TestArticleExistenceChecker:
+    """Tests for ArticleExistenceChecker."""
+
+    def test_chunks_and_counts_reads(self):
+        from perception_app.perception_agent.tools.article_existence import ArticleExistenceChecker
+
+        db = _FakeDb(stored={"art-3", "art-7"})
+        checker = ArticleExistenceChecker(db=db, chunk_size=4, max_concurrency=2)
+        ids = [f"art-{i}" for i in range(10)]
+
+        assert checker.existing(ids) == {"art-3", "art-7"}
+        assert sorted(len(refs) for refs, _ in db.calls) == [2, 4, 4]
+        assert all(field_paths == [] for _, field_paths in db.calls)
+        assert checker.reads == 10
+        assert checker.calls == 3
+
+    def test_results_cached_per_checker(self):
+        from perception_app.perception_agent.tools.article_existence import ArticleExistenceChecker
+
+        db = _FakeDb(stored={"art-1"})
+        checker = ArticleExistenceChecker(db=db)
+        checker.existing(["art-1", "art-2"])
+        assert checker.existing(["art-2", "art-1", "art-3"]) == {"art-1"}
+
+        assert [refs for refs, _ in db.calls] == [["art-1", "art-2"], ["art-3"]]
+        assert checker.reads == 3
+
+    def test_duplicate_ids_read_once(self):
+        from perception_app.perception_agent.tools.article_existence import ArticleExistenceChecker
+
+        db = _FakeDb()
+        checker = ArticleExistenceChecker(db=db)
+        checker.existing(["art-1", "art-1"])
+        assert checker.reads == 1
+
+    def test_no_ids_no_client(self):
+        """Nothing to look up: the Firestore client is never created."""
+        from perception_app.perception_agent.tools.article_existence import ArticleExistenceChecker
+
+        checker = ArticleExistenceChecker()
+        assert checker.existing([]) == set()
+        assert checker.reads == 0
+
+    def test_failed_chunk_raises_and_keeps_others(self):
+        from perception_app.perception_agent.tools.article_existence import ArticleExistenceChecker
+
+        db = _FakeDb(stored={"art-0"}, fail_on="art-2")
+        checker = ArticleExistenceChecker(db=db, chunk_size=2)
+
+        with pytest.raises(RuntimeError):
+            checker.existing(["art-0", "art-1", "art-2", "art-3"])
+        assert checker.reads == 2
+
+        db.fail_on = None
+        assert checker.existing(["art-0", "art-1", "art-2", "art-3"]) == {"art-0"}
+        assert checker.reads == 4
+
+
+class TestDetectDuplicatesStored:
+    """detect_duplicates reports articles already in Firestore."""
+
+    def test_stored_article_reported_with_own_id(self):
+        from perception_app.perception_agent.tools.agent_6_tools import detect_duplicates
+        from perception_app.perception_agent.tools.agent_7_tools import _generate_article_id
+        from perception_app.perception_agent.tools.article_existence import ArticleExistenceChecker
+        from perception_app.perception_agent.tools.near_duplicates import NearDuplicateIndex
+
+        stored_url = "https://example.com/stored?utm_source=rss"
+        db = _FakeDb(stored={_generate_article_id(stored_url)})
+        checker = ArticleExistenceChecker(db=db)
+        articles = [
+            {"url": stored_url, "title": "Stored story", "content": "already in the collection"},
+            {"url": "https://example.com/new", "title": "New story", "content": "not stored anywhere yet"},
+        ]
+
+        duplicates = detect_duplicates(articles, existence=checker, index=NearDuplicateIndex(), record=False)
+
+        assert duplicates == [{"url": stored_url, "existing_id": _generate_article_id(stored_url), "similarity": 1.0}]
+        # Both canonical IDs, plus the legacy ID of the tracking URL
+        assert checker.reads == 3
+        assert len(db.calls) == 1
+
+
+def _emulator_available() -> bool:
+    host = os.getenv("FIRESTORE_EMULATOR_HOST", "")
+    if ":" not in host:
+        return False
+    name, port = host.rsplit(":", 1)
+    try:
+        with socket.create_connection((name, int(port)), timeout=0.5):
+            return True
+    except (OSError, ValueError):
+        return False
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not _emulator_available(), reason="Firestore emulator not running")
+class TestFirestoreEmulator:
+    """Existence checks against the Firestore emulator."""
+
+    def test_get_all_against_emulator(self):
+        import uuid
+        from google.cloud import firestore
+        from perception_app.perception_agent.tools.article_existence import ArticleExistenceChecker
+
+        db = firestore.Client(project="perception-test")
+        collection = f"articles-{uuid.uuid4().hex[:8]}"
+        db.collection(collection).document("art-stored").set({"title": "Stored"})
+
+        checker = ArticleExistenceChecker(db=db, collection=collection, chunk_size=2)
+        ids = ["art-stored", "art-a", "art-b", "art-c"]
+        assert checker.existing(ids) == {"art-stored"}
+        assert checker.reads == 4
+        assert checker.calls == 2
@@ -0,0 +1,227 @@
+"""
+Article Storage Tests
+=====================
+
+Tests for store_articles (sync client, serial batches) and
+store_articles_async (AsyncClient, concurrent batches): per-batch metrics
+and exact failed article IDs.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+TOOLS = "perception_app.perception_agent.tools.agent_7_tools"
+
+
+class _Batch:
+    def __init__(self, db):
+        self.db = db
+        self.writes = []
+
+    def set(self, ref, data, merge=False):
+        assert merge is True
+        self.writes.append(ref)
+
+    def _check(self):
+        if self.db.fail_id in self.writes:
+            raise RuntimeError("contention")
+        self.db.committed.extend(self.writes)
+
+
+class _SyncBatch(_Batch):
+    def commit(self):
+        self._check()
+
+
+class _AsyncBatch(_Batch):
+    async def commit(self):
+        self.db.in_flight += 1
+        self.db.max_in_flight = max(self.db.max_in_flight, self.db.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            self._check()
+        finally:
+            self.db.in_flight -= 1
+
+
+class _FakeDb:
+    """Firestore stand-in; the batch holding fail_id fails to commit."""
+
+    def __init__(self, batch_class, fail_id=None):
+        self.batch_class = batch_class
+        self.fail_id = fail_id
+        self.committed = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def batch(self):
+        return self.batch_class(self)
+
+    def collection(self, name):
+        assert name == "articles"
+        return self
+
+    def document(self, article_id):
+        return article_id
+
+
+def _articles(count):
+    return [{"url": f"https://example.com/{i}", "title": f"Article {i}"} for i in range(count)]
+
+
+def _ids(articles):
+    from perception_app.perception_agent.tools.agent_7_tools import _generate_article_id
+
+    return [_generate_article_id(a["url"]) for a in articles]
+
+
+class TestStoreArticles:
+    """Tests for the sync storage path."""
+
+    def test_partial_failure_reports_failed_ids(self, tmp_path):
+        from perception_app.perception_agent.tools.agent_7_tools import store_articles
+        from perception_app.perception_agent.tools.storage_retry import DeadLetterQueue
+
+        articles = _articles(1200)
+        ids = _ids(articles)
+        db = _FakeDb(_SyncBatch, fail_id=ids[700])
+        dead_letters = DeadLetterQueue(str(tmp_path / "dlq.jsonl"))
+
+        with patch(f"{TOOLS}._get_db", return_value=db):
+            result = store_articles(articles, dead_letters=dead_letters)
+
+        assert result["stored_count"] == 700
+        assert result["failed_ids"] == ids[500:1000]
+        assert [b["status"] for b in result["batches"]] == ["committed", "failed", "committed"]
+        assert [b["size"] for b in result["batches"]] == [500, 500, 200]
+        assert all(b["latency_ms"] >= 0 for b in result["batches"])
+        assert len(result["errors"]) == 1
+        assert ids[500] in result["errors"][0]
+        assert db.committed == ids[:500] + ids[1000:]
+        # Not transient: no retries, straight to the dead-letter queue
+        assert [b["attempts"] for b in result["batches"]] == [1, 1, 1]
+        assert result["dead_lettered"] == 500
+        assert [e["doc_id"] for e in dead_letters.pending()] == ids[500:1000]
+
+    def test_deduplicates_and_stamps(self):
+        from perception_app.perception_agent.tools.agent_7_tools import store_articles
+
+        articles = _articles(2) + [{"url": "https://www.example.com/0?utm_source=x"}]
+        db = _FakeDb(_SyncBatch)
+
+        with patch(f"{TOOLS}._get_db", return_value=db):
+            result = store_articles(articles)
+
+        assert result["stored_count"] == 2
+        assert result["errors"] == result["failed_ids"] == []
+        assert all("stored_at" in a for a in articles[:2])
+
+
+class TestStoreArticlesAsync:
+    """Tests for the AsyncClient storage path."""
+
+    @pytest.mark.asyncio
+    async def test_commits_batches_concurrently_up_to_limit(self):
+        from perception_app.perception_agent.tools.agent_7_tools import store_articles_async
+
+        articles = _articles(2600)
+        db = _FakeDb(_AsyncBatch)
+
+        with patch(f"{TOOLS}._get_async_db", return_value=db):
+            result = await store_articles_async(articles, max_concurrency=2)
+
+        assert result["stored_count"] == 2600
+        assert result["failed_ids"] == []
+        assert len(result["batches"]) == 6
+        assert [b["batch"] for b in result["batches"]] == list(range(6))
+        assert db.max_in_flight == 2
+        assert sorted(db.committed) == sorted(_ids(articles))
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_reports_failed_ids(self, tmp_path):
+        from perception_app.perception_agent.tools.agent_7_tools import store_articles_async
+        from perception_app.perception_agent.tools.storage_retry import DeadLetterQueue
+
+        articles = _articles(1100)
+        ids = _ids(articles)
+        db = _FakeDb(_AsyncBatch, fail_id=ids[1050])
+        dead_letters = DeadLetterQueue(str(tmp_path / "dlq.jsonl"))
+
+        with patch(f"{TOOLS}._get_async_db", return_value=db):
+            result = await store_articles_async(articles, dead_letters=dead_letters)
+
+        assert result["stored_count"] == 1000
+        assert result["failed_ids"] == ids[1000:]
+        assert result["batches"][2]["status"] == "failed"
+        assert result["batches"][2]["error"] == "contention"
+        assert len(result["errors"]) == 1
+        assert result["dead_lettered"] == len(dead_letters) == 100
+
+    def test_async_client_cached_per_event_loop(self):
+        import asyncio
+        from perception_app.perception_agent.tools import agent_7_tools
+
+        async def client_pair():
+            return agent_7_tools._get_async_db(), agent_7_tools._get_async_db()
+
+        with patch(f"{TOOLS}.firestore.AsyncClient", side_effect=lambda **_: object()), \
+                patch(f"{TOOLS}._async_db_client", None), patch(f"{TOOLS}._async_db_loop", None):
+            first, again = asyncio.run(client_pair())
+            second, _ = asyncio.run(client_pair())
+
+        assert first is again
+        assert second is not first
+
+
+class TestOrchestratorStorage:
+    """run_daily_ingestion with the async backend and partial failures."""
+
+    @pytest.mark.asyncio
+    async def test_async_backend_and_failed_ids_not_remembered(self):
+        from perception_app.perception_agent.tools.agent_0_tools import run_daily_ingestion
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+        from perception_app.perception_agent.tools.source_health import SourceHealthTracker
+
+        articles = [dict(a, source_id="src", relevance_score=8) for a in _articles(2)]
+        ids = _ids(articles)
+        failed = {
+            "stored_count": 1, "errors": ["Batch write failed"], "failed_ids": [ids[1]],
+            "batches": [{"batch": 0, "size": 2, "latency_ms": 1.0, "status": "failed"}]
+        }
+        index = SeenUrlIndex(state_path=None)
+
+        async def store_async(to_store):
+            return failed
+
+        agent_0 = "perception_app.perception_agent.tools.agent_0_tools"
+        with patch(f"{agent_0}.ASYNC_STORAGE", True), \
+                patch(f"{agent_0}.store_articles_async", side_effect=store_async) as mock_async, \
+                patch(f"{agent_0}.store_articles") as mock_sync, \
+                patch(f"{agent_0}.harvest_all_sources", return_value={"articles": articles}), \
+                patch(f"{agent_0}.get_active_topics", return_value=[{"topic_id": "t"}]), \
+                patch(f"{agent_0}.filter_top_articles", return_value=articles), \
+                patch(f"{agent_0}.build_brief_payload", return_value={"brief_id": "b"}), \
+                patch(f"{agent_0}.validate_articles", return_value={"valid": True, "errors": []}), \
+                patch(f"{agent_0}.validate_brief", return_value={"valid": True, "errors": []}), \
+                patch(f"{agent_0}.detect_duplicates", return_value=[]), \
+                patch(f"{agent_0}.record_article_history"), \
+                patch(f"{agent_0}.store_brief", return_value={"status": "stored"}), \
+                patch(f"{agent_0}.update_ingestion_run"), \
+                patch(f"{agent_0}.get_seen_url_index", return_value=index), \
+                patch(f"{agent_0}.get_source_health", return_value=SourceHealthTracker()), \
+                patch(f"{agent_0}.load_source_health", return_value={}), \
+                patch(f"{agent_0}.update_source_health"):
+            result = await run_daily_ingestion()
+
+        assert mock_async.call_count == 1
+        assert mock_sync.call_count == 0
+        assert result["status"] == "failed"
+        assert result["stats"]["storage"]["backend"] == "async"
+        assert result["stats"]["storage"]["failed_ids"] == [ids[1]]
+        assert ids[0] in index
+        assert ids[1] not in index
@@ -0,0 +1,114 @@
+"""
+Batch Scoring Tests
+===================
+
+Tests for the NumPy batch scoring engine.
+"""
+
+import random
+import pytest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+pytest.importorskip("numpy")
+
+WORDS = ["ai", "maintain", "cloud", "data", "ceo", "earnings", "senate", "nba", "model", "models"]
+
+
+def _corpus(seed=13, topic_count=12, article_count=400):
+    rng = random.Random(seed)
+    topics = [
+        {"topic_id": f"t{i % 10}", "keywords": rng.sample(WORDS, 3) + [rng.choice(WORDS).title()]}
+        for i in range(topic_count)
+    ]
+    articles = [
+        {
+            "id": i,
+            "title": " ".join(rng.sample(WORDS, rng.randint(0, 3))),
+            "content": " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12))),
+            "category": rng.choice(["", "tech", "sports"]),
+        }
+        for i in range(article_count)
+    ]
+    return topics, articles
+
+
+class TestBatchScorer:
+    """Tests for BatchScorer."""
+
+    def test_compat_mode_matches_score_articles(self):
+        """Compatibility mode reproduces score_articles exactly."""
+        from perception_app.perception_agent.tools.agent_3_tools import score_articles
+        from perception_app.perception_agent.tools.batch_scoring import BatchScorer
+
+        topics, articles = _corpus()
+        expected = score_articles(articles, topics)
+        actual = BatchScorer(topics, batch_size=64).score(articles)
+
+        assert actual == expected
+        assert all(type(a["relevance_score"]) is int for a in actual)
+        assert [list(a) for a in actual] == [list(a) for a in expected]
+
+    def test_configurable_weights(self):
+        """Additive mode counts title and content weights for the same keyword."""
+        from perception_app.perception_agent.tools.batch_scoring import BatchScorer
+
+        topics = [{"topic_id": "ai", "keywords": ["llm", "gpu"]}]
+        article = {"title": "LLM news", "content": "llm on a gpu"}
+
+        compat = BatchScorer(topics).score([article])[0]
+        additive = BatchScorer(topics, title_weight=2.5, content_weight=0.5, compat=False).score([article])[0]
+
+        assert compat["relevance_score"] == 3 + 1 + 3
+        assert additive["relevance_score"] == pytest.approx(2.5 + 0.5 + 0.5 + 3)
+
+    def test_compat_rejects_other_weights(self):
+        """Weights other than score_articles' cannot reproduce it."""
+        from perception_app.perception_agent.tools.batch_scoring import BatchScorer
+
+        with pytest.raises(ValueError):
+            BatchScorer([], title_weight=2.5)
+        with pytest.raises(ValueError):
+            BatchScorer([], title_weight=4, content_weight=1)
+        assert BatchScorer([], title_weight=3, content_weight=1).compat
+
+    @pytest.mark.parametrize("weights", [(5, 2), (2.5, 0.5)])
+    def test_compat_mode_follows_configured_weights(self, weights):
+        """score_articles and compatibility mode both use SCORING_*_WEIGHT."""
+        from perception_app.perception_agent.tools import agent_3_tools
+        from perception_app.perception_agent.tools.batch_scoring import BatchScorer
+
+        topics, articles = _corpus(article_count=100)
+        default = agent_3_tools.score_articles(articles, topics)
+
+        with patch.object(agent_3_tools, "SCORING_TITLE_WEIGHT", float(weights[0])), \
+                patch.object(agent_3_tools, "SCORING_CONTENT_WEIGHT", float(weights[1])):
+            expected = agent_3_tools.score_articles(articles, topics)
+            actual = BatchScorer(topics, batch_size=32).score(articles)
+
+        assert expected != default
+        assert actual == expected
+        if all(float(w).is_integer() for w in weights):
+            assert all(type(a["relevance_score"]) is int for a in actual)
+
+    def test_no_topics_or_articles(self):
+        """Empty inputs score like score_articles."""
+        from perception_app.perception_agent.tools.batch_scoring import BatchScorer
+
+        assert BatchScorer([]).score([{"title": "x"}])[0]["relevance_score"] == 5
+        assert BatchScorer([{"topic_id": "a", "keywords": ["x"]}]).score([]) == []
+
+    def test_score_articles_numpy_engine(self):
+        """SCORING_ENGINE=numpy routes score_articles through the batch engine."""
+        from perception_app.perception_agent.tools import agent_3_tools
+
+        topics, articles = _corpus(article_count=50)
+        expected = agent_3_tools.score_articles(articles, topics)
+
+        with patch.object(agent_3_tools, "SCORING_ENGINE", "numpy"), \
+                patch.object(agent_3_tools, "_score_single_article") as per_article:
+            assert agent_3_tools.score_articles(articles, topics) == expected
+        per_article.assert_not_called()
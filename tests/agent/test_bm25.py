@@ -0,0 +1,146 @@
+"""
+BM25 Scoring Tests
+==================
+
+Tests for BM25 relevance scoring and its incremental corpus statistics.
+"""
+
+import pytest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+TOPICS = [{"topic_id": "ai", "keywords": ["LLM", "inference", "machine learning"]}]
+
+
+def _articles():
+    return [
+        {"url": "https://example.com/1", "title": "LLM inference costs fall", "content": "llm inference llm benchmark"},
+        {"url": "https://example.com/2", "title": "Weather update", "content": "rain and llm mentions"},
+        {"url": "https://example.com/3", "title": "Markets", "content": "stocks rally on earnings"},
+        {"url": "https://example.com/4", "title": "Sports", "content": "the match ended in a draw"},
+    ]
+
+
+class TestCorpusStats:
+    """Tests for CorpusStats."""
+
+    def test_incremental_counts_skip_seen_articles(self):
+        """Only articles not counted before update the statistics."""
+        from perception_app.perception_agent.tools.bm25 import CorpusStats
+
+        stats = CorpusStats(state_path=None)
+        assert stats.add_articles(_articles()) == 4
+        assert stats.add_articles(_articles()[:2]) == 0
+
+        assert stats.doc_count == 4
+        assert stats.df["llm"] == 2
+        assert stats.df["earnings"] == 1
+        assert stats.idf("earnings") > stats.idf("llm") > 0
+
+    def test_persists_across_instances(self, tmp_path):
+        """Statistics saved by one run are picked up by the next."""
+        from perception_app.perception_agent.tools.bm25 import CorpusStats
+
+        path = tmp_path / "bm25_stats.json"
+        first = CorpusStats(state_path=str(path))
+        first.add_articles(_articles()[:2])
+        first.save()
+
+        second = CorpusStats(state_path=str(path))
+        assert second.add_articles(_articles()) == 2
+        assert second.doc_count == 4
+        assert second.df["llm"] == 2
+
+    def test_seen_limit_evicts_oldest(self):
+        """Article keys beyond seen_limit are forgotten oldest first."""
+        from perception_app.perception_agent.tools.bm25 import CorpusStats
+
+        stats = CorpusStats(state_path=None, seen_limit=2)
+        stats.add_articles(_articles()[:3])
+
+        assert stats.add_articles(_articles()[:1]) == 1
+        assert stats.add_articles(_articles()[2:3]) == 0
+
+    def test_vocab_limit_drops_rarest_oldest_terms(self, tmp_path):
+        """Past vocab_limit the rarest terms go first, oldest first, and the file stays bounded."""
+        import json
+        from perception_app.perception_agent.tools.bm25 import CorpusStats
+
+        path = tmp_path / "bm25_stats.json"
+        stats = CorpusStats(state_path=str(path), vocab_limit=4)
+        stats.add_articles([{"url": "https://example.com/a", "title": "", "content": "llm old1 old2"}])
+        stats.add_articles([
+            {"url": f"https://example.com/{i}", "title": "", "content": f"llm inference new{i}"}
+            for i in range(3)
+        ])
+        stats.save()
+
+        assert stats.df == {"llm": 4, "inference": 3, "new1": 1, "new2": 1}
+        assert stats.doc_count == 4
+        assert len(json.loads(path.read_text())["df"]) == 4
+
+
+class TestBM25Scorer:
+    """Tests for BM25Scorer."""
+
+    def test_relevance_scale(self):
+        """Unmatched articles get 5; matches land in (5, 10], stronger ones higher."""
+        from perception_app.perception_agent.tools.bm25 import BM25Scorer, CorpusStats
+
+        stats = CorpusStats(state_path=None)
+        stats.add_articles(_articles())
+        scorer = BM25Scorer(stats, TOPICS)
+        strong, weak, unmatched, _ = (scorer.relevance(a) for a in _articles())
+
+        assert unmatched == 5
+        assert 5 < weak < strong <= 10
+
+    def test_does_not_saturate(self):
+        """Articles the heuristic caps at 10 are still told apart."""
+        from perception_app.perception_agent.tools.agent_3_tools import _score_single_article
+        from perception_app.perception_agent.tools.bm25 import BM25Scorer, CorpusStats
+
+        topics = [{"topic_id": "ai", "keywords": ["llm", "gpu", "inference", "training"]}]
+        richer = {"url": "a", "title": "LLM GPU inference and training", "content": "llm gpu inference training"}
+        leaner = {"url": "b", "title": "LLM GPU inference", "content": "about chips"}
+        stats = CorpusStats(state_path=None)
+        stats.add_articles([richer, leaner] + _articles())
+
+        assert _score_single_article(richer, topics)["relevance_score"] == 10
+        assert _score_single_article(leaner, topics)["relevance_score"] == 10
+        scorer = BM25Scorer(stats, topics)
+        assert scorer.relevance(richer) > scorer.relevance(leaner)
+
+
+class TestBM25Mode:
+    """Tests for SCORING_MODE=bm25 in score_articles."""
+
+    def test_score_articles_bm25_mode(self, tmp_path):
+        """BM25 replaces relevance_score and the statistics are saved after the run."""
+        from perception_app.perception_agent.tools import agent_3_tools, bm25
+
+        stats = bm25.CorpusStats(state_path=str(tmp_path / "stats.json"))
+        with patch.object(agent_3_tools, "SCORING_MODE", "bm25"), \
+                patch.object(bm25, "_corpus_stats", stats):
+            scored = agent_3_tools.score_articles(_articles(), TOPICS)
+            top = agent_3_tools.filter_top_articles(scored, max_per_topic=10, min_score=5)
+            agent_3_tools.save_scoring_stats()
+
+        assert [a["url"] for a in top][:2] == ["https://example.com/1", "https://example.com/2"]
+        assert all(1 <= a["relevance_score"] <= 10 for a in scored)
+        assert scored[0]["matched_topics"] == ["ai"]
+        assert (tmp_path / "stats.json").exists()
+        assert stats.doc_count == 4
+
+    def test_heuristic_mode_leaves_stats_alone(self):
+        """The default mode neither scores with BM25 nor writes statistics."""
+        from perception_app.perception_agent.tools import agent_3_tools
+
+        with patch("perception_app.perception_agent.tools.bm25.get_corpus_stats") as get_stats:
+            agent_3_tools.score_articles(_articles(), TOPICS)
+            agent_3_tools.save_scoring_stats()
+
+        get_stats.assert_not_called()
@@ -0,0 +1,258 @@
+"""
+Feed Scheduler Tests
+====================
+
+Tests for the adaptive per-feed polling scheduler.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+TOOLS = "perception_app.perception_agent.tools.agent_1_tools"
+NOW = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _articles(*hours_ago, now=NOW):
+    return [
+        {"title": f"Post {h}", "url": f"https://example.com/{h}",
+         "published_at": (now - timedelta(hours=h)).isoformat()}
+        for h in hours_ago
+    ]
+
+
+class TestFeedScheduler:
+    """Tests for FeedScheduler."""
+
+    def test_unknown_feed_is_due_with_default_window(self):
+        """Feeds without history are always due."""
+        from perception_app.perception_agent.tools.feed_scheduler import FeedScheduler
+
+        scheduler = FeedScheduler(state_path=None)
+        due, skipped = scheduler.plan([{"source_id": "new"}], 24, now=NOW)
+
+        assert skipped == []
+        assert due == [{"source_id": "new", "time_window_hours": 24}]
+
+    def test_busy_feed_stays_due_and_slow_feed_is_skipped(self):
+        """Publish cadence decides whether a feed is due on the next run."""
+        from perception_app.perception_agent.tools.feed_scheduler import FeedScheduler
+
+        scheduler = FeedScheduler(state_path=None)
+        scheduler.record("wire", _articles(0.5, 1, 1.5, 2, 2.5), 24, now=NOW)
+        scheduler.record("blog", [], 24, now=NOW)
+        scheduler.record("blog", [], 24, now=NOW + timedelta(days=2))
+
+        next_run = NOW + timedelta(days=3)
+        due, skipped = scheduler.plan([{"source_id": "wire"}, {"source_id": "blog"}], 24, now=next_run)
+
+        assert [s["source_id"] for s in due] == ["wire"]
+        assert [s["source_id"] for s in skipped] == ["blog"]
+        assert scheduler.poll_interval_hours("wire") == scheduler.min_interval_hours
+        assert scheduler.poll_interval_hours("blog") == 36
+
+    def test_high_watermark_drops_seen_articles_and_sets_window(self):
+        """Only entries newer than the last harvest are returned and requested."""
+        from perception_app.perception_agent.tools.feed_scheduler import FeedScheduler
+
+        scheduler = FeedScheduler(state_path=None, overlap_hours=1)
+        first = scheduler.record("feed", _articles(3, 5), 24, now=NOW)
+        assert scheduler.advance_watermarks() == 1
+        later = NOW + timedelta(hours=10)
+
+        assert len(first) == 2
+        assert scheduler.window_hours("feed", 24, now=later) == 14
+
+        second = scheduler.record("feed", _articles(1, 13, 15, now=later), 14, now=later)
+        assert [a["title"] for a in second] == ["Post 1"]
+
+    def test_interval_is_moving_average_of_gaps(self):
+        """New entry gaps, including from the watermark, update the interval."""
+        from perception_app.perception_agent.tools.feed_scheduler import FeedScheduler
+
+        scheduler = FeedScheduler(state_path=None)
+        scheduler.record("feed", _articles(4, 8), 24, now=NOW)
+        scheduler.advance_watermarks()
+        assert scheduler.feeds["feed"]["interval_hours"] == 4
+
+        later = NOW + timedelta(hours=12)
+        scheduler.record("feed", _articles(2, now=later), 24, now=later)
+        # gap from watermark (4h before NOW) to new entry (10h after NOW) is 14h
+        assert scheduler.feeds["feed"]["interval_hours"] == pytest.approx(0.3 * 14 + 0.7 * 4)
+
+    def test_watermark_moves_only_when_advanced(self):
+        """Entries of a run that never stored them are returned again."""
+        from perception_app.perception_agent.tools.feed_scheduler import FeedScheduler
+
+        scheduler = FeedScheduler(state_path=None)
+        scheduler.record("feed", _articles(3, 5), 24, now=NOW)
+        assert scheduler.feeds["feed"]["high_watermark"] is None
+
+        # The next harvest starts without advancing: nothing is dropped
+        scheduler.plan([{"source_id": "feed"}], 24, now=NOW)
+        assert len(scheduler.record("feed", _articles(3, 5), 24, now=NOW)) == 2
+        assert scheduler.advance_watermarks() == 1
+        assert scheduler.record("feed", _articles(3, 5), 24, now=NOW) == []
+
+    def test_watermark_held_below_unstored_articles(self):
+        from perception_app.perception_agent.tools.feed_scheduler import FeedScheduler
+
+        scheduler = FeedScheduler(state_path=None)
+        harvested = scheduler.record("feed", _articles(1, 3, 5), 24, now=NOW)
+        unstored = [dict(harvested[1], source_id="feed")]
+
+        assert scheduler.advance_watermarks(unstored) == 1
+        assert scheduler.feeds["feed"]["high_watermark"] == (NOW - timedelta(hours=5)).isoformat()
+        assert [a["title"] for a in scheduler.record("feed", _articles(1, 3, 5), 24, now=NOW)] == ["Post 1", "Post 3"]
+
+    def test_state_round_trips_through_disk(self, tmp_path):
+        """State saved by one scheduler is loaded by the next."""
+        from perception_app.perception_agent.tools.feed_scheduler import FeedScheduler
+
+        path = tmp_path / "schedule.json"
+        scheduler = FeedScheduler(state_path=str(path))
+        scheduler.record("feed", _articles(1, 2), 24, now=NOW)
+        scheduler.save()
+
+        reloaded = FeedScheduler(state_path=str(path))
+        assert reloaded.feeds == scheduler.feeds
+        assert reloaded.next_due("feed") == scheduler.next_due("feed")
+
+    def test_corrupt_state_starts_fresh(self, tmp_path):
+        """An unreadable state file is ignored."""
+        from perception_app.perception_agent.tools.feed_scheduler import FeedScheduler
+
+        path = tmp_path / "schedule.json"
+        path.write_text("{not json")
+
+        assert FeedScheduler(state_path=str(path)).feeds == {}
+
+
+class TestAdaptiveHarvest:
+    """Tests for harvest_all_sources(adaptive=True)."""
+
+    @pytest.mark.asyncio
+    async def test_skips_idle_feeds_and_filters_seen_articles(self):
+        """Adaptive harvests fetch due feeds with per-feed windows only."""
+        from perception_app.mcp_service.routers.host_limiter import HostRateLimiter
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+        from perception_app.perception_agent.tools.feed_scheduler import FeedScheduler
+        from perception_app.perception_agent.tools.source_health import SourceHealthTracker
+
+        now = datetime.now(tz=timezone.utc)
+        scheduler = FeedScheduler(state_path=None)
+        scheduler.record("idle", [], 24, now=now - timedelta(days=3))
+        scheduler.record("idle", [], 24, now=now - timedelta(hours=1))
+        scheduler.record("busy", _articles(2, now=now), 24, now=now - timedelta(hours=1))
+        scheduler.advance_watermarks()
+
+        sources = [
+            {"source_id": sid, "name": sid, "type": "rss", "url": f"https://{sid}.example.com/rss",
+             "category": "tech", "enabled": True}
+            for sid in ("busy", "idle", "new")
+        ]
+        calls = {}
+
+        async def fake_fetch(feed_url, time_window_hours=24, max_items=50, request_id=None, raise_on_error=False):
+            calls[feed_url] = time_window_hours
+            return _articles(2, 0.5, now=now)
+
+        with patch(f"{TOOLS}.host_limiter", HostRateLimiter(rate_per_second=1000, burst=1000)):
+            with patch(f"{TOOLS}.get_feed_scheduler", return_value=scheduler), \
+                    patch(f"{TOOLS}.get_source_health", return_value=SourceHealthTracker()):
+                with patch(f"{TOOLS}.load_sources_from_csv", return_value=sources):
+                    with patch(f"{TOOLS}.fetch_rss", side_effect=fake_fetch):
+                        result = await harvest_all_sources(concurrent=True, adaptive=True)
+
+        assert calls == {"https://busy.example.com/rss": 4, "https://new.example.com/rss": 24}
+        assert result["sources_skipped"] == 1
+        assert result["total_fetched"] == 4
+        # busy already had the 2h-old post; new returns both
+        assert [(a["source_id"], a["title"]) for a in result["articles"]] == [
+            ("busy", "Post 0.5"), ("new", "Post 2"), ("new", "Post 0.5")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_and_throttled_fetches_not_recorded(self):
+        """A failing feed is not treated as an empty poll."""
+        from perception_app.perception_agent.tools.agent_1_tools import harvest_all_sources
+        from perception_app.perception_agent.tools.feed_scheduler import FeedScheduler
+        from perception_app.perception_agent.tools.source_health import SourceHealthTracker
+
+        scheduler = FeedScheduler(state_path=None)
+        sources = [
+            {"source_id": sid, "name": sid, "type": "rss", "url": f"https://{sid}.example.com/rss",
+             "category": "tech", "enabled": True}
+            for sid in ("down", "throttled", "ok")
+        ]
+
+        async def fake_batch(feeds, max_concurrency=None, request_id=None):
+            return [
+                {"articles": [], "elapsed_ms": 5, "error": "HTTP 500", "code": "FEED_FETCH_FAILED"},
+                {"articles": [], "elapsed_ms": 0, "error": "Host throttled", "code": "FEED_HOST_THROTTLED"},
+                {"articles": _articles(1, now=datetime.now(tz=timezone.utc)), "elapsed_ms": 5, "error": None},
+            ]
+
+        with patch(f"{TOOLS}.get_feed_scheduler", return_value=scheduler), \
+                patch(f"{TOOLS}.get_source_health", return_value=SourceHealthTracker()), \
+                patch(f"{TOOLS}.load_sources_from_csv", return_value=sources), \
+                patch(f"{TOOLS}.fetch_rss_batch", side_effect=fake_batch):
+            result = await harvest_all_sources(batch=True, adaptive=True)
+
+        assert set(scheduler.feeds) == {"ok"}
+        assert [t["throttled"] for t in result["source_timings"]] == [False, True, False]
+
+
+
+class TestWatermarksInRun:
+    """run_daily_ingestion advances watermarks only past stored articles."""
+
+    @pytest.mark.asyncio
+    async def test_failed_storage_keeps_watermark(self):
+        from perception_app.perception_agent.tools.agent_0_tools import run_daily_ingestion
+        from perception_app.perception_agent.tools.agent_7_tools import _generate_article_id
+        from perception_app.perception_agent.tools.feed_scheduler import FeedScheduler
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+        from perception_app.perception_agent.tools.source_health import SourceHealthTracker
+
+        now = datetime.now(tz=timezone.utc)
+        scheduler = FeedScheduler(state_path=None)
+        articles = [
+            dict(a, source_id="feed", relevance_score=8, content="ai news")
+            for a in _articles(1, 3, 5, now=now)
+        ]
+
+        async def harvest(**kwargs):
+            scheduler.plan([{"source_id": "feed"}], 24, now=now)
+            return {"articles": scheduler.record("feed", articles, 24, now=now)}
+
+        storage = {
+            "stored_count": 2, "errors": ["Batch write failed"],
+            "failed_ids": [_generate_article_id(articles[1]["url"])], "batches": []
+        }
+        agent_0 = "perception_app.perception_agent.tools.agent_0_tools"
+        with patch(f"{agent_0}.ADAPTIVE_HARVEST", True), \
+                patch(f"{agent_0}.get_feed_scheduler", return_value=scheduler), \
+                patch(f"{agent_0}.harvest_all_sources", side_effect=harvest), \
+                patch(f"{agent_0}.get_active_topics", return_value=[{"topic_id": "t"}]), \
+                patch(f"{agent_0}.filter_top_articles", return_value=articles), \
+                patch(f"{agent_0}.build_brief_payload", return_value={"brief_id": "b"}), \
+                patch(f"{agent_0}.validate_articles", return_value={"valid": True, "errors": []}), \
+                patch(f"{agent_0}.validate_brief", return_value={"valid": True, "errors": []}), \
+                patch(f"{agent_0}.detect_duplicates", return_value=[]), \
+                patch(f"{agent_0}.record_article_history"), \
+                patch(f"{agent_0}.store_articles", return_value=storage), \
+                patch(f"{agent_0}.store_brief", return_value={"status": "stored"}), \
+                patch(f"{agent_0}.update_ingestion_run"), \
+                patch(f"{agent_0}.get_seen_url_index", return_value=SeenUrlIndex(state_path=None)), \
+                patch(f"{agent_0}.get_source_health", return_value=SourceHealthTracker()), \
+                patch(f"{agent_0}.load_source_health", return_value={}), \
+                patch(f"{agent_0}.update_source_health"):
+            await run_daily_ingestion()
+
+        # Below the 3h-old article that failed to store
+        assert scheduler.feeds["feed"]["high_watermark"] == (now - timedelta(hours=5)).isoformat()
@@ -0,0 +1,111 @@
+"""
+Keyword Matcher Tests
+=====================
+
+Tests for the one-pass multi-keyword matcher and the relevance scoring
+built on it.
+"""
+
+import random
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+WORDS = ["ai", "maintain", "cloud", "data", "database", "model", "models", "c++", "markets", "ceo"]
+
+
+def _legacy_topic_matches(article, topics):
+    """The per-keyword substring loop the matcher replaced."""
+    title = article.get("title", "").lower()
+    content_lower = (article.get("content", "") or "").lower()
+    matched_topics, matched_keywords, topic_scores = [], [], {}
+    for topic in topics:
+        matches = 0
+        for keyword in topic.get("keywords", []):
+            if keyword.lower() in title:
+                matches += 3
+                matched_keywords.append(keyword)
+            elif keyword.lower() in content_lower:
+                matches += 1
+                matched_keywords.append(keyword)
+        if matches > 0:
+            topic_scores[topic.get("topic_id", "")] = min(10, matches + 3)
+            matched_topics.append(topic.get("topic_id", ""))
+    return {
+        "relevance_score": max(topic_scores.values()) if topic_scores else 5,
+        "matched_topics": matched_topics,
+        "ai_tags": sorted(set(matched_keywords[:10])),
+    }
+
+
+class TestKeywordMatcher:
+    """Tests for KeywordMatcher."""
+
+    def test_finds_all_occurrences_with_positions(self):
+        """Overlapping and nested keywords are all reported."""
+        from perception_app.perception_agent.tools.keyword_matcher import KeywordMatcher
+
+        matcher = KeywordMatcher(["AI", "data", "database", "base", "tab"])
+        hits = matcher.find_all("New AI database: data tables")
+
+        assert hits == [
+            (4, "ai"), (7, "data"), (9, "tab"), (7, "database"), (11, "base"),
+            (17, "data"), (22, "tab"),
+        ]
+
+    def test_substring_semantics(self):
+        """Matches inside words, like the `in` test it replaces."""
+        from perception_app.perception_agent.tools.keyword_matcher import KeywordMatcher
+
+        matcher = KeywordMatcher(["ai", "c++", "u.s."])
+
+        assert matcher.matches("Maintaining C++ code in the U.S.") == {"ai", "c++", "u.s."}
+        assert matcher.matches("other text") == set()
+        assert matcher.matches("") == set()
+
+    def test_empty_keywords(self):
+        """No keywords matches nothing; an empty keyword matches everything."""
+        from perception_app.perception_agent.tools.keyword_matcher import KeywordMatcher
+
+        assert KeywordMatcher([]).matches("anything") == set()
+        assert KeywordMatcher(["", "x"]).matches("abc") == {""}
+        assert KeywordMatcher(["", "x"]).find_all("abc") == []
+
+
+class TestScoringWithMatcher:
+    """score_articles gives the same results as the per-keyword loop."""
+
+    def test_matches_legacy_scoring(self):
+        """Random articles and topics score identically."""
+        from perception_app.perception_agent.tools.agent_3_tools import score_articles
+
+        rng = random.Random(11)
+        topics = [
+            {"topic_id": f"t{i}", "keywords": rng.sample(WORDS, 3) + [rng.choice(WORDS).upper()]}
+            for i in range(15)
+        ]
+        articles = [
+            {
+                "title": " ".join(rng.sample(WORDS, 2)),
+                "content": " ".join(rng.choice(WORDS) for _ in range(8)),
+                "category": "",
+            }
+            for _ in range(300)
+        ]
+
+        for article, scored in zip(articles, score_articles(articles, topics)):
+            expected = _legacy_topic_matches(article, topics)
+            assert scored["relevance_score"] == expected["relevance_score"]
+            assert scored["matched_topics"] == expected["matched_topics"]
+            assert sorted(scored["ai_tags"]) == expected["ai_tags"]
+
+    def test_matcher_reused_for_same_topics(self):
+        """The compiled matcher is built once per topic set."""
+        from perception_app.perception_agent.tools.agent_3_tools import get_topic_matcher
+
+        topics = [{"topic_id": "ai", "keywords": ["ai", "llm"]}]
+
+        assert get_topic_matcher(topics) is get_topic_matcher([dict(t) for t in topics])
+        assert get_topic_matcher(topics) is not get_topic_matcher([{"topic_id": "ai", "keywords": ["ai"]}])
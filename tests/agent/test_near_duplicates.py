@@ -0,0 +1,298 @@
+"""
+Near-Duplicate Detection Tests
+==============================
+
+Tests for MinHash signatures, the LSH index, batch clustering, the brief
+collapse and incremental detection against recent history.
+"""
+
+import pytest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+STORY = (
+    "The central bank raised interest rates by a quarter point on Wednesday, "
+    "citing persistent inflation in services and a tight labor market. Officials "
+    "signalled that further increases remain possible if price pressures do not "
+    "ease over the coming months, while markets had largely expected the move."
+)
+OTHER = (
+    "A new open source compiler release improves build times for large projects "
+    "and adds support for incremental linking, according to the maintainers who "
+    "published benchmarks comparing it with the previous version last week."
+)
+
+
+def _article(url, title, content, score=7, source="src"):
+    return {"url": url, "title": title, "content": content, "relevance_score": score, "source_id": source}
+
+
+def _nothing_stored():
+    """Existence checker stand-in for an empty /articles collection."""
+    from perception_app.perception_agent.tools.article_existence import ArticleExistenceChecker
+
+    return ArticleExistenceChecker(db=_EmptyDb())
+
+
+class _EmptyDb:
+    def collection(self, name):
+        return self
+
+    def document(self, article_id):
+        return article_id
+
+    def get_all(self, refs, field_paths=None):
+        return []
+
+
+def _syndicated():
+    return [
+        _article("https://wire.example/rates", "Central bank raises rates", STORY, score=8, source="wire"),
+        _article("https://other.example/tech", "Compiler release speeds builds", OTHER, source="tech"),
+        _article("https://paper.example/rates?utm_source=x", "Central bank raises rates", STORY + " Reporting by staff.",
+                 score=9, source="paper"),
+        _article("https://blog.example/rates", "Central bank raises rates again", STORY, score=6, source="blog"),
+    ]
+
+
+class TestMinHasher:
+    """Tests for MinHash signatures."""
+
+    def test_identical_text_identical_signature(self):
+        from perception_app.perception_agent.tools.near_duplicates import MinHasher, similarity
+
+        hasher = MinHasher()
+        a = hasher.signature(_article("u1", "Title", STORY))
+        b = hasher.signature(_article("u2", "Title", STORY))
+        assert len(a) == hasher.num_perm
+        assert a == b
+        assert similarity(a, b) == 1.0
+
+    def test_similarity_tracks_jaccard(self):
+        """Near copies score high, unrelated texts low."""
+        from perception_app.perception_agent.tools.near_duplicates import MinHasher, similarity
+
+        hasher = MinHasher()
+        base = hasher.signature(_article("u1", "Rates", STORY))
+        near = hasher.signature(_article("u2", "Rates", STORY + " Reporting by staff."))
+        far = hasher.signature(_article("u3", "Compiler", OTHER))
+        assert similarity(base, near) >= 0.7
+        assert similarity(base, far) < 0.2
+
+    def test_no_text_has_no_signature(self):
+        from perception_app.perception_agent.tools.near_duplicates import MinHasher
+
+        assert MinHasher().signature({"url": "u"}) is None
+
+    def test_short_text_is_one_shingle(self):
+        from perception_app.perception_agent.tools.near_duplicates import MinHasher
+
+        assert MinHasher(shingle_size=3).shingles({"title": "AI"}) == {"ai"}
+
+    def test_pure_python_matches_numpy(self):
+        """Both code paths produce the same signature."""
+        pytest.importorskip("numpy")
+        from perception_app.perception_agent.tools import near_duplicates
+
+        article = _article("u", "Rates", STORY)
+        expected = near_duplicates.MinHasher().signature(article)
+        with patch.object(near_duplicates, "np", None):
+            assert near_duplicates.MinHasher().signature(article) == expected
+
+
+class TestNearDuplicateIndex:
+    """Tests for the LSH index."""
+
+    def test_query_finds_near_duplicates_only(self):
+        from perception_app.perception_agent.tools.near_duplicates import MinHasher, NearDuplicateIndex
+
+        hasher = MinHasher()
+        index = NearDuplicateIndex()
+        index.add("rates", hasher.signature(_article("u1", "Rates", STORY)))
+        index.add("tech", hasher.signature(_article("u2", "Compiler", OTHER)))
+
+        matches = index.query(hasher.signature(_article("u3", "Rates", STORY + " Reporting by staff.")))
+        assert [key for key, _ in matches] == ["rates"]
+        assert index.query(None) == []
+
+    def test_bounded_history_evicts_oldest(self):
+        from perception_app.perception_agent.tools.near_duplicates import MinHasher, NearDuplicateIndex
+
+        hasher = MinHasher()
+        index = NearDuplicateIndex(max_entries=1)
+        index.add("rates", hasher.signature(_article("u1", "Rates", STORY)))
+        index.add("tech", hasher.signature(_article("u2", "Compiler", OTHER)))
+
+        assert len(index) == 1
+        assert "rates" not in index
+        assert index.query(hasher.signature(_article("u3", "Rates", STORY))) == []
+
+    def test_band_count_must_divide_signature(self):
+        from perception_app.perception_agent.tools.near_duplicates import NearDuplicateIndex
+
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(bands=5).add("k", tuple(range(64)))
+
+    def test_save_and_reload(self, tmp_path):
+        from perception_app.perception_agent.tools.near_duplicates import MinHasher, NearDuplicateIndex
+
+        hasher = MinHasher()
+        path = tmp_path / "history.json"
+        index = NearDuplicateIndex(state_path=str(path))
+        index.add("rates", hasher.signature(_article("u1", "Rates", STORY)))
+        index.save()
+
+        reloaded = NearDuplicateIndex(state_path=str(path))
+        assert len(reloaded) == 1
+        assert reloaded.query(hasher.signature(_article("u2", "Rates", STORY)))[0][0] == "rates"
+
+    @pytest.mark.parametrize("settings", [{"bands": 8}, {"num_perm": 48, "bands": 24}])
+    def test_history_with_other_settings_discarded(self, tmp_path, settings):
+        """History saved with other MinHash settings is dropped, not fatal."""
+        from perception_app.perception_agent.tools.near_duplicates import MinHasher, NearDuplicateIndex
+
+        path = tmp_path / "history.json"
+        index = NearDuplicateIndex(state_path=str(path))
+        index.add("rates", MinHasher().signature(_article("u1", "Rates", STORY)))
+        index.save()
+
+        reloaded = NearDuplicateIndex(state_path=str(path), **settings)
+        hasher = MinHasher(num_perm=reloaded.num_perm)
+        assert reloaded.query(hasher.signature(_article("u2", "Rates", STORY))) == []
+        assert len(reloaded) == 0
+
+        reloaded.add("tech", hasher.signature(_article("u3", "Compiler", OTHER)))
+        reloaded.save()
+        assert len(NearDuplicateIndex(state_path=str(path), **settings)) == 1
+
+
+class TestBatchMode:
+    """Tests for find_clusters and collapse_duplicates."""
+
+    def test_find_clusters(self):
+        from perception_app.perception_agent.tools.near_duplicates import find_clusters
+
+        assert find_clusters(_syndicated()) == [[0, 2, 3]]
+
+    def test_collapse_keeps_best_scored_copy(self):
+        from perception_app.perception_agent.tools.near_duplicates import collapse_duplicates
+
+        articles = _syndicated()
+        collapsed = collapse_duplicates(articles)
+
+        assert [a["url"] for a in collapsed] == ["https://other.example/tech", "https://paper.example/rates?utm_source=x"]
+        assert [d["source_id"] for d in collapsed[1]["duplicates"]] == ["wire", "blog"]
+        assert "duplicates" not in articles[2]
+        assert "duplicates" not in collapsed[0]
+
+    def test_brief_collapses_clusters(self):
+        from perception_app.perception_agent.tools.agent_4_tools import build_brief_payload
+
+        articles = [dict(a, section="Business") for a in _syndicated()]
+        brief = build_brief_payload(articles, run_id="run-1")
+
+        refs = brief["sections"][0]["top_articles"]
+        assert len(refs) == 2
+        assert refs[0]["url"] == "https://paper.example/rates?utm_source=x"
+        assert refs[0]["duplicate_count"] == 2
+        assert refs[1]["duplicate_count"] == 0
+        assert brief["meta"]["article_count"] == 2
+        assert brief["meta"]["duplicates_collapsed"] == 2
+
+
+class TestDetectDuplicates:
+    """Tests for incremental detection against recent history."""
+
+    def test_detects_against_history_and_within_batch(self):
+        from perception_app.perception_agent.tools.agent_6_tools import detect_duplicates
+        from perception_app.perception_agent.tools.near_duplicates import NearDuplicateIndex
+
+        index = NearDuplicateIndex()
+        articles = _syndicated()
+        assert [d["url"] for d in detect_duplicates(articles[:2], existence=_nothing_stored(), index=index)] == []
+
+        duplicates = detect_duplicates(articles[2:], existence=_nothing_stored(), index=index)
+        assert [d["url"] for d in duplicates] == [articles[2]["url"], articles[3]["url"]]
+        assert all(d["existing_id"].startswith("art-") for d in duplicates)
+        assert len(index) == 4
+
+    def test_same_url_is_not_its_own_duplicate(self):
+        from perception_app.perception_agent.tools.agent_6_tools import detect_duplicates
+        from perception_app.perception_agent.tools.near_duplicates import NearDuplicateIndex
+
+        index = NearDuplicateIndex()
+        detect_duplicates(_syndicated()[:1], existence=_nothing_stored(), index=index)
+        assert detect_duplicates(_syndicated()[:1], existence=_nothing_stored(), index=index) == []
+
+    def test_record_false_leaves_history_unchanged(self):
+        from perception_app.perception_agent.tools.agent_6_tools import detect_duplicates
+        from perception_app.perception_agent.tools.near_duplicates import NearDuplicateIndex
+
+        index = NearDuplicateIndex()
+        detect_duplicates(_syndicated(), existence=_nothing_stored(), index=index, record=False)
+        assert len(index) == 0
+
+    def test_record_false_still_matches_within_batch(self):
+        from perception_app.perception_agent.tools.agent_6_tools import detect_duplicates
+        from perception_app.perception_agent.tools.near_duplicates import NearDuplicateIndex
+
+        articles = _syndicated()
+        duplicates = detect_duplicates(articles, existence=_nothing_stored(), index=NearDuplicateIndex(), record=False)
+        assert [d["url"] for d in duplicates] == [articles[2]["url"], articles[3]["url"]]
+
+    def test_record_article_history_skips_failed(self):
+        from perception_app.perception_agent.tools.agent_6_tools import record_article_history
+        from perception_app.perception_agent.tools.agent_7_tools import _generate_article_id
+        from perception_app.perception_agent.tools.near_duplicates import NearDuplicateIndex
+
+        index = NearDuplicateIndex()
+        articles = _syndicated()[:2]
+        failed = {_generate_article_id(articles[0]["url"])}
+
+        assert record_article_history(articles, failed, index=index) == 1
+        assert _generate_article_id(articles[1]["url"]) in index
+        assert _generate_article_id(articles[0]["url"]) not in index
+
+
+class TestHistoryInRun:
+    """run_daily_ingestion records only stored articles in the history."""
+
+    @pytest.mark.asyncio
+    async def test_failed_articles_not_recorded(self):
+        from perception_app.perception_agent.tools.agent_0_tools import run_daily_ingestion
+        from perception_app.perception_agent.tools.agent_7_tools import _generate_article_id
+        from perception_app.perception_agent.tools.near_duplicates import NearDuplicateIndex
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+        from perception_app.perception_agent.tools.source_health import SourceHealthTracker
+
+        articles = _syndicated()[:2]
+        failed_id = _generate_article_id(articles[0]["url"])
+        index = NearDuplicateIndex()
+        storage = {"stored_count": 1, "errors": ["Batch write failed"], "failed_ids": [failed_id], "batches": []}
+
+        agent_0 = "perception_app.perception_agent.tools.agent_0_tools"
+        agent_6 = "perception_app.perception_agent.tools.agent_6_tools"
+        with patch(f"{agent_6}.get_history_index", return_value=index), \
+                patch(f"{agent_6}.ArticleExistenceChecker", return_value=_nothing_stored()), \
+                patch(f"{agent_0}.ArticleExistenceChecker", side_effect=_nothing_stored), \
+                patch(f"{agent_0}.harvest_all_sources", return_value={"articles": articles}), \
+                patch(f"{agent_0}.get_active_topics", return_value=[{"topic_id": "t"}]), \
+                patch(f"{agent_0}.filter_top_articles", return_value=articles), \
+                patch(f"{agent_0}.build_brief_payload", return_value={"brief_id": "b"}), \
+                patch(f"{agent_0}.validate_articles", return_value={"valid": True, "errors": []}), \
+                patch(f"{agent_0}.validate_brief", return_value={"valid": True, "errors": []}), \
+                patch(f"{agent_0}.store_articles", return_value=storage), \
+                patch(f"{agent_0}.store_brief", return_value={"status": "stored"}), \
+                patch(f"{agent_0}.update_ingestion_run"), \
+                patch(f"{agent_0}.get_seen_url_index", return_value=SeenUrlIndex(state_path=None)), \
+                patch(f"{agent_0}.get_source_health", return_value=SourceHealthTracker()), \
+                patch(f"{agent_0}.load_source_health", return_value={}), \
+                patch(f"{agent_0}.update_source_health"):
+            await run_daily_ingestion()
+
+        assert failed_id not in index
+        assert _generate_article_id(articles[1]["url"]) in index
+        assert len(index) == 1
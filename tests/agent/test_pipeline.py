@@ -0,0 +1,249 @@
+"""
+Streaming Pipeline Tests
+========================
+
+Tests for the streaming harvest -> dedupe -> score -> top-k pipeline.
+"""
+
+import asyncio
+import random
+import pytest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+TOPICS = [
+    {"topic_id": "ai", "keywords": ["ai", "llm", "model"]},
+    {"topic_id": "cloud", "keywords": ["cloud", "kubernetes"]},
+]
+WORDS = ["ai", "llm", "model", "cloud", "kubernetes", "markets", "weather", "sports"]
+
+
+def _source_articles(source_count=12, per_source=15, seed=7):
+    rng = random.Random(seed)
+    return [
+        [
+            {
+                "title": " ".join(rng.sample(WORDS, 2)),
+                "url": f"https://example.com/{s}/{i}",
+                "content": " ".join(rng.sample(WORDS, 3)),
+                "category": "tech",
+                "source_id": f"src_{s}",
+            }
+            for i in range(per_source)
+        ]
+        for s in range(source_count)
+    ]
+
+
+def _fake_harvest(per_source, delays=None):
+    """harvest_all_sources stand-in feeding the sink in completion order."""
+
+    async def harvest(sink):
+        async def one(index, articles):
+            await asyncio.sleep((delays or {}).get(index, 0))
+            await sink(index, articles)
+
+        await asyncio.gather(*(one(i, articles) for i, articles in enumerate(per_source)))
+        return {"source_count": len(per_source)}
+
+    return harvest
+
+
+class TestStreamingPipeline:
+    """Tests for StreamingPipeline."""
+
+    @pytest.mark.asyncio
+    async def test_matches_staged_selection(self):
+        """Out-of-order arrival gives the staged pipeline's top articles."""
+        from perception_app.perception_agent.tools.agent_3_tools import filter_top_articles, score_articles
+        from perception_app.perception_agent.tools.pipeline import StreamingPipeline
+
+        per_source = _source_articles()
+        delays = {i: 0.001 * (len(per_source) - i) for i in range(len(per_source))}
+
+        pipeline = StreamingPipeline(TOPICS, score_articles, top_k=20, min_score=5, max_per_topic=8, max_per_source=3)
+        result = await pipeline.run(_fake_harvest(per_source, delays))
+
+        staged = filter_top_articles(
+            score_articles([a for articles in per_source for a in articles], TOPICS),
+            max_per_topic=8, min_score=5, max_per_source=3, max_total=20
+        )
+        assert result == {"source_count": len(per_source)}
+        assert [a["url"] for a in pipeline.top_articles()] == [a["url"] for a in staged]
+
+        metrics = pipeline.metrics()
+        assert metrics["articles_harvested"] == metrics["articles_scored"] == 180
+        assert metrics["stages"]["score"]["batches"] == len(per_source)
+        assert set(metrics["queues"]) == {"dedupe", "score", "top_k"}
+
+    @pytest.mark.asyncio
+    async def test_drops_duplicate_urls(self):
+        """An article seen earlier in the run is not scored again."""
+        from perception_app.perception_agent.tools.agent_3_tools import score_articles
+        from perception_app.perception_agent.tools.pipeline import StreamingPipeline
+
+        per_source = _source_articles(source_count=2, per_source=3)
+        per_source[1][0] = dict(per_source[0][0])
+
+        pipeline = StreamingPipeline(TOPICS, score_articles, top_k=10, min_score=1)
+        await pipeline.run(_fake_harvest(per_source))
+
+        metrics = pipeline.metrics()
+        assert metrics["duplicates_dropped"] == 1
+        assert metrics["articles_scored"] == 5
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("delays", [None, {0: 0.01}])
+    async def test_duplicate_kept_from_lowest_source_index(self, delays):
+        """The first source's copy is kept even if a later source finishes first."""
+        from perception_app.perception_agent.tools.agent_3_tools import score_articles
+        from perception_app.perception_agent.tools.pipeline import StreamingPipeline
+
+        per_source = _source_articles(source_count=3, per_source=3)
+        per_source[2][1] = {**per_source[0][1], "source_id": "src_2"}
+
+        pipeline = StreamingPipeline(TOPICS, score_articles, top_k=10, min_score=1)
+        await pipeline.run(_fake_harvest(per_source, delays))
+
+        kept = [a for a in pipeline.top_articles() if a["url"] == per_source[0][1]["url"]]
+        assert [a["source_id"] for a in kept] == ["src_0"]
+        assert len(pipeline.top_articles()) == 8
+        assert pipeline.metrics()["duplicates_dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_selection_independent_of_finish_order(self):
+        """A withdrawn later copy does not cost its source a pushed-out article."""
+        from perception_app.perception_agent.tools.pipeline import StreamingPipeline
+
+        def article(url, score, source):
+            return {"url": url, "title": url, "score": score, "source_id": source}
+
+        per_source = [
+            [article("https://example.com/d", 9, "src_0")],
+            [
+                article("https://example.com/d?utm_source=x", 9, "src_1"),
+                article("https://example.com/a", 8, "src_1"),
+                article("https://example.com/x", 7, "src_1"),
+            ],
+        ]
+
+        def score(articles, topics):
+            return [{**a, "relevance_score": a["score"], "matched_topics": []} for a in articles]
+
+        selected = []
+        for delays in ({1: 0.01}, {0: 0.01}):
+            pipeline = StreamingPipeline(TOPICS, score, top_k=10, min_score=1, max_per_source=2)
+            await pipeline.run(_fake_harvest(per_source, delays))
+            selected.append([(a["url"], a["source_id"]) for a in pipeline.top_articles()])
+
+        assert selected[0] == selected[1] == [
+            ("https://example.com/d", "src_0"),
+            ("https://example.com/a", "src_1"),
+            ("https://example.com/x", "src_1"),
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("seed", range(5))
+    async def test_random_finish_orders_give_same_selection(self, seed):
+        """Shuffled finish orders with cross-source duplicates give one result."""
+        from perception_app.perception_agent.tools.agent_3_tools import score_articles
+        from perception_app.perception_agent.tools.pipeline import StreamingPipeline
+
+        rng = random.Random(seed)
+        per_source = _source_articles(source_count=8, per_source=10, seed=seed)
+        for _ in range(12):
+            s, i = rng.randrange(1, 8), rng.randrange(10)
+            copy_of = per_source[rng.randrange(s)][rng.randrange(10)]
+            per_source[s][i] = {**per_source[s][i], "url": copy_of["url"] + "?utm_source=feed"}
+
+        results = []
+        for delays in (None, {i: 0.001 * rng.randrange(10) for i in range(8)}):
+            pipeline = StreamingPipeline(TOPICS, score_articles, top_k=15, min_score=1, max_per_source=2)
+            await pipeline.run(_fake_harvest(per_source, delays))
+            results.append([(a["url"], a["source_id"]) for a in pipeline.top_articles()])
+
+        assert results[0] == results[1]
+
+    @pytest.mark.asyncio
+    async def test_bounded_queues_apply_backpressure(self):
+        """A slow scorer makes the harvester wait instead of buffering sources."""
+        import time
+        from perception_app.perception_agent.tools.agent_3_tools import score_articles
+        from perception_app.perception_agent.tools.pipeline import StreamingPipeline
+
+        def slow_score(articles, topics):
+            time.sleep(0.002)
+            return score_articles(articles, topics)
+
+        pipeline = StreamingPipeline(TOPICS, slow_score, top_k=5, queue_size=1)
+        await pipeline.run(_fake_harvest(_source_articles(source_count=20, per_source=2)))
+
+        queues = pipeline.metrics()["queues"]
+        assert all(q["max_depth"] <= 1 for q in queues.values())
+        assert queues["dedupe"]["put_wait_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_stage_failure_cancels_harvest(self):
+        """A failing stage stops the run instead of leaving the harvest blocked."""
+        from perception_app.perception_agent.tools.pipeline import StreamingPipeline
+
+        def broken_score(articles, topics):
+            raise ValueError("scorer failed")
+
+        harvest_cancelled = asyncio.Event()
+
+        async def harvest(sink):
+            try:
+                for i in range(100):
+                    await sink(i, [{"url": f"https://example.com/{i}"}])
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                harvest_cancelled.set()
+                raise
+
+        pipeline = StreamingPipeline(TOPICS, broken_score, top_k=5, queue_size=1)
+        with pytest.raises(ExceptionGroup) as exc:
+            await asyncio.wait_for(pipeline.run(harvest), timeout=5)
+
+        assert exc.group_contains(ValueError)
+        assert harvest_cancelled.is_set()
+
+
+class TestStreamingIngestion:
+    """Tests for run_daily_ingestion(streaming=True)."""
+
+    @pytest.mark.asyncio
+    async def test_stores_streamed_top_articles(self):
+        """The streamed top articles are stored and pipeline metrics recorded."""
+        from perception_app.perception_agent.tools.agent_0_tools import run_daily_ingestion
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+        from perception_app.perception_agent.tools.source_health import SourceHealthTracker
+
+        per_source = _source_articles(source_count=4, per_source=5)
+
+        async def harvest_all_sources(**kwargs):
+            return await _fake_harvest(per_source)(kwargs["sink"])
+
+        tools = "perception_app.perception_agent.tools.agent_0_tools"
+        with patch(f"{tools}.harvest_all_sources", side_effect=harvest_all_sources), \
+                patch(f"{tools}.get_active_topics", return_value=TOPICS), \
+                patch(f"{tools}.get_source_health", return_value=SourceHealthTracker()), \
+                patch(f"{tools}.load_source_health", return_value={}), \
+                patch(f"{tools}.update_source_health"), \
+                patch(f"{tools}.get_seen_url_index", return_value=SeenUrlIndex(state_path=None)), \
+                patch(f"{tools}.detect_duplicates", return_value=[]), \
+                patch(f"{tools}.record_article_history"), \
+                patch(f"{tools}.store_articles", return_value={"stored_count": 0, "errors": []}) as store, \
+                patch(f"{tools}.store_brief", return_value={"status": "stored"}), \
+                patch(f"{tools}.update_ingestion_run"):
+            result = await run_daily_ingestion(streaming=True)
+
+        stored = store.call_args.args[0]
+        assert result["status"] == "success"
+        assert result["stats"]["articles_harvested"] == 20
+        assert result["stats"]["articles_selected"] == len(stored)
+        assert all(a["relevance_score"] >= 5 for a in stored)
+        assert result["stats"]["pipeline"]["stages"]["score"]["items_in"] == 20
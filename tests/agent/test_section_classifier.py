@@ -0,0 +1,64 @@
+"""
+Section Classifier Tests
+========================
+
+Tests for section inference with confidence scores.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+class TestClassifySection:
+    """Tests for classify_section."""
+
+    def test_scores_every_section(self):
+        """All sections with signals get a confidence; they sum to 1."""
+        from perception_app.perception_agent.tools.agent_3_tools import classify_section
+
+        scores = classify_section("", "senate passes ai bill", "the policy affects cloud software and markets")
+
+        assert list(scores) == ["Tech", "Politics", "Business"]
+        assert scores["Tech"] == 4 / 8
+        assert sum(scores.values()) == pytest.approx(1.0)
+
+    def test_whole_words_only(self):
+        """Signals match tokens, not substrings: "rain" is not "ai"."""
+        from perception_app.perception_agent.tools.agent_3_tools import classify_section
+
+        assert classify_section("news", "heavy rain said to continue", "details remain sparse") == {"General": 1.0}
+
+    def test_prefix_signals_and_punctuation(self):
+        """Starred signals match inflections; punctuation does not hide a token."""
+        from perception_app.perception_agent.tools.agent_3_tools import classify_section
+
+        scores = classify_section("", "", "“markets” rallied; investments, regulations—and sports.")
+
+        assert scores == {"Business": 0.5, "Politics": 0.25, "Sports": 0.25}
+
+    def test_category_outweighs_content(self):
+        """The source category beats a few stray content signals."""
+        from perception_app.perception_agent.tools.agent_3_tools import classify_section
+
+        scores = classify_section("sports", "", "the ceo talked about revenue and earnings")
+
+        assert next(iter(scores)) == "Sports"
+
+    def test_ties_follow_section_order(self):
+        """Equal scores go to the section listed first in SECTION_SIGNALS."""
+        from perception_app.perception_agent.tools.agent_3_tools import classify_section
+
+        assert list(classify_section("", "", "nba ceo")) == ["Business", "Sports"]
+        assert list(classify_section("", "", "senate data")) == ["Tech", "Politics"]
+
+    def test_score_output_includes_confidence(self):
+        """Scored articles carry the section and its confidence."""
+        from perception_app.perception_agent.tools.agent_3_tools import score_articles
+
+        scored = score_articles([{"title": "NBA finals", "content": "basketball tonight", "category": ""}], [])[0]
+
+        assert scored["section"] == "Sports"
+        assert scored["section_confidence"] == 1.0
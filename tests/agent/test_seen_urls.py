@@ -0,0 +1,150 @@
+"""
+Seen-Article Index Tests
+========================
+
+Tests for the persistent Bloom filter of stored article IDs and its use
+before scoring.
+"""
+
+import pytest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+TOOLS = "perception_app.perception_agent.tools.agent_0_tools"
+
+
+class TestSeenUrlIndex:
+    """Tests for SeenUrlIndex."""
+
+    def test_add_and_contains(self):
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+
+        index = SeenUrlIndex(state_path=None, capacity=1000)
+        assert index.add("art-1") is True
+        assert index.add("art-1") is False
+        assert "art-1" in index
+        assert "art-2" not in index
+        assert len(index) == 1
+
+    def test_false_positive_rate_near_target(self):
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+
+        index = SeenUrlIndex(state_path=None, capacity=5000, error_rate=0.01)
+        index.add_many(f"art-{i}" for i in range(5000))
+        false_positives = sum(1 for i in range(5000, 25000) if f"art-{i}" in index)
+        assert false_positives / 20000 < 0.02
+
+    def test_generations_forget_oldest(self):
+        """IDs survive one rotation and are dropped at the second."""
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+
+        index = SeenUrlIndex(state_path=None, capacity=2, error_rate=0.0001)
+        index.add_many(["a", "b"])
+        index.add_many(["c", "d"])
+        assert "a" in index and "d" in index
+
+        index.add_many(["e"])
+        assert "a" not in index
+        assert "c" in index and "e" in index
+
+    def test_save_and_reload(self, tmp_path):
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+
+        path = tmp_path / "seen.bin"
+        index = SeenUrlIndex(state_path=str(path), capacity=100)
+        index.add_many(["art-1", "art-2"])
+        index.save()
+        assert not index.dirty
+
+        reloaded = SeenUrlIndex(state_path=str(path), capacity=100)
+        assert "art-1" in reloaded and "art-2" in reloaded
+        assert len(reloaded) == 2
+
+    def test_mismatched_file_starts_empty(self, tmp_path):
+        """A file written with another capacity is discarded."""
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+
+        path = tmp_path / "seen.bin"
+        index = SeenUrlIndex(state_path=str(path), capacity=100)
+        index.add("art-1")
+        index.save()
+
+        assert "art-1" not in SeenUrlIndex(state_path=str(path), capacity=5000)
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+
+        path = tmp_path / "seen.bin"
+        path.write_bytes(b"xx")
+        index = SeenUrlIndex(state_path=str(path), capacity=100)
+        assert len(index) == 0
+
+
+class TestSeenArticlesInRun:
+    """run_daily_ingestion drops stored articles and remembers new ones."""
+
+    @pytest.mark.asyncio
+    @patch(f"{TOOLS}.update_ingestion_run")
+    @patch(f"{TOOLS}.record_article_history")
+    @patch(f"{TOOLS}.detect_duplicates", return_value=[])
+    @patch(f"{TOOLS}.store_brief", return_value={"status": "stored"})
+    @patch(f"{TOOLS}.store_articles", return_value={"stored_count": 1, "errors": []})
+    @patch(f"{TOOLS}.get_active_topics", return_value=[{"topic_id": "ai", "keywords": ["ai"]}])
+    @patch(f"{TOOLS}.harvest_all_sources")
+    @patch(f"{TOOLS}.update_source_health")
+    @patch(f"{TOOLS}.load_source_health", return_value={})
+    async def test_second_run_skips_stored_articles(
+        self, mock_load, mock_update_health, mock_harvest, mock_topics, mock_store, mock_brief, mock_detect,
+        mock_history, mock_update
+    ):
+        from perception_app.perception_agent.tools.agent_0_tools import run_daily_ingestion
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+        from perception_app.perception_agent.tools.source_health import SourceHealthTracker
+
+        article = {
+            "title": "AI model released", "url": "https://example.com/ai?utm_source=rss",
+            "source_id": "src", "content": "A new ai model was released today with better benchmarks."
+        }
+        mock_harvest.return_value = {"articles": [article]}
+        index = SeenUrlIndex(state_path=None)
+
+        with patch(f"{TOOLS}.get_seen_url_index", return_value=index), \
+                patch(f"{TOOLS}.get_source_health", return_value=SourceHealthTracker()):
+            first = await run_daily_ingestion()
+            assert first["status"] == "success"
+            assert first["stats"]["articles_already_seen"] == 0
+
+            # Same article under another tracking URL
+            mock_harvest.return_value = {"articles": [dict(article, url="https://www.example.com/ai")]}
+            second = await run_daily_ingestion()
+
+        assert second["status"] == "success"
+        assert second["stats"]["articles_already_seen"] == 1
+        assert second["brief_id"] is None
+        assert mock_store.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_streaming_pipeline_drops_seen_articles(self):
+        from perception_app.perception_agent.tools.agent_3_tools import score_articles
+        from perception_app.perception_agent.tools.pipeline import StreamingPipeline
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+        from perception_app.perception_agent.tools.url_canonicalizer import canonical_article_id
+
+        index = SeenUrlIndex(state_path=None)
+        index.add(canonical_article_id("https://example.com/1"))
+        articles = [{"url": f"https://example.com/{i}?utm_source=x", "title": "AI"} for i in range(3)]
+
+        async def harvest(sink):
+            await sink(0, articles)
+            return {}
+
+        pipeline = StreamingPipeline([{"topic_id": "ai", "keywords": ["ai"]}], score_articles, top_k=5, seen_index=index)
+        await pipeline.run(harvest)
+
+        metrics = pipeline.metrics()
+        assert metrics["already_seen_dropped"] == 1
+        assert metrics["duplicates_dropped"] == 0
+        assert metrics["articles_scored"] == 2
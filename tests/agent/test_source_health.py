@@ -0,0 +1,127 @@
+"""
+Source Health Tests
+===================
+
+Tests for the per-source health tracker and circuit breaker.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _tracker(**kwargs):
+    from perception_app.perception_agent.tools.source_health import SourceHealthTracker
+
+    settings = {"failure_threshold": 3, "base_backoff_minutes": 30, "max_backoff_hours": 2}
+    settings.update(kwargs)
+    return SourceHealthTracker(**settings)
+
+
+def _fail(tracker, times, now=NOW):
+    for _ in range(times):
+        tracker.record_failure("feed", "HTTP 500", 100.0, now=now)
+
+
+class TestCircuitBreaker:
+    """Tests for SourceHealthTracker circuit transitions."""
+
+    def test_opens_after_threshold(self):
+        """The circuit stays closed below the threshold and opens at it."""
+        tracker = _tracker()
+
+        _fail(tracker, 2)
+        assert tracker.allow("feed", NOW)
+
+        _fail(tracker, 1)
+        record = tracker.records["feed"]
+        assert record["circuitState"] == "open"
+        assert record["circuitOpenUntil"] == NOW + timedelta(minutes=30)
+        assert not tracker.allow("feed", NOW + timedelta(minutes=29))
+
+    def test_probe_after_backoff_closes_on_success(self):
+        """Once the backoff passes one probe is allowed; success closes the circuit."""
+        tracker = _tracker()
+        _fail(tracker, 3)
+
+        probe_at = NOW + timedelta(minutes=30)
+        assert tracker.allow("feed", probe_at)
+        assert tracker.records["feed"]["circuitState"] == "half_open"
+
+        tracker.record_success("feed", 80.0, now=probe_at, articles_last_24h=4)
+        record = tracker.records["feed"]
+        assert record["circuitState"] == "closed"
+        assert record["consecutiveFailures"] == 0
+        assert record["lastSuccess"] == probe_at
+        assert record["articlesLast24h"] == 4
+
+    def test_failed_probe_doubles_backoff_up_to_cap(self):
+        """Each failed probe reopens with twice the backoff, capped at the max."""
+        tracker = _tracker()
+        _fail(tracker, 3)
+
+        now = NOW
+        backoffs = []
+        for _ in range(4):
+            now = tracker.records["feed"]["circuitOpenUntil"]
+            assert tracker.allow("feed", now)
+            _fail(tracker, 1, now=now)
+            backoffs.append(tracker.records["feed"]["circuitOpenUntil"] - now)
+
+        assert backoffs == [timedelta(hours=1), timedelta(hours=2), timedelta(hours=2), timedelta(hours=2)]
+
+    def test_latency_ewma(self):
+        """Latency is an exponentially weighted moving average."""
+        tracker = _tracker(latency_alpha=0.5)
+        tracker.record_success("feed", 100.0, now=NOW)
+        tracker.record_success("feed", 300.0, now=NOW)
+
+        assert tracker.records["feed"]["latencyEwmaMs"] == 200.0
+
+
+class TestPersistence:
+    """Tests for loading and exporting health records."""
+
+    def test_load_restores_open_circuit(self):
+        """Stored breaker fields are honoured; unrelated document fields are ignored."""
+        tracker = _tracker()
+        tracker.load({"feed": {
+            "name": "Feed",
+            "consecutiveFailures": 5,
+            "circuitState": "open",
+            "circuitOpenUntil": NOW + timedelta(hours=1),
+            "circuitOpens": 1,
+        }})
+
+        assert tracker.loaded
+        assert not tracker.allow("feed", NOW)
+        assert "name" not in tracker.records["feed"]
+
+    def test_pending_updates_only_changed_sources(self):
+        """Only sources touched since the last call are returned."""
+        tracker = _tracker()
+        tracker.record_success("a", 50.0, now=NOW)
+        tracker.record_failure("b", "timeout", 10000.0, now=NOW)
+
+        updates = tracker.pending_updates()
+        assert set(updates) == {"a", "b"}
+        assert updates["b"]["lastError"] == "timeout"
+        assert updates["b"]["lastChecked"] == NOW
+        assert tracker.pending_updates() == {}
+
+    def test_summary(self):
+        """Summary lists open circuits and the slowest sources."""
+        tracker = _tracker(failure_threshold=1)
+        tracker.record_success("fast", 50.0, now=NOW)
+        tracker.record_failure("dead", "HTTP 404", 900.0, now=NOW)
+
+        summary = tracker.summary(["fast", "dead", "unknown"])
+        assert summary["tracked"] == 2
+        assert summary["open"] == ["dead"]
+        assert summary["failing"] == 1
+        assert list(summary["slowest_ms"]) == ["dead", "fast"]
@@ -0,0 +1,59 @@
+"""
+Stage Timer Tests
+=================
+
+Tests for the per-stage timing records written to ingestion runs.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+class TestStageTimer:
+    """Tests for StageTimer."""
+
+    def test_records_stage(self):
+        """A stage records wall time, CPU time, peak RSS and items."""
+        from perception_app.perception_agent.tools.stage_timer import StageTimer
+
+        timer = StageTimer("run_test")
+        with timer.stage("score_articles") as stage:
+            sum(i * i for i in range(20000))
+            stage["items"] = 42
+
+        record = timer.stages[0]
+        assert record["stage"] == "score_articles"
+        assert record["items"] == 42
+        assert record["wall_ms"] >= 0
+        assert record["cpu_ms"] >= 0
+        assert record["peak_rss_mb"] > 0
+
+    def test_keeps_record_when_stage_raises(self):
+        """A failing stage is still recorded."""
+        from perception_app.perception_agent.tools.stage_timer import StageTimer
+
+        timer = StageTimer()
+        with pytest.raises(RuntimeError):
+            with timer.stage("store_articles"):
+                raise RuntimeError("firestore down")
+
+        assert [r["stage"] for r in timer.stages] == ["store_articles"]
+        assert timer.stages[0]["items"] is None
+
+    def test_summary_totals(self):
+        """Summary lists stages in order with wall and CPU totals."""
+        from perception_app.perception_agent.tools.stage_timer import StageTimer
+
+        timer = StageTimer()
+        for name in ("a", "b", "c"):
+            with timer.stage(name):
+                pass
+
+        summary = timer.summary()
+        assert [s["stage"] for s in summary["stages"]] == ["a", "b", "c"]
+        assert summary["total_wall_ms"] == pytest.approx(sum(s["wall_ms"] for s in summary["stages"]), abs=0.2)
+        assert summary["total_cpu_ms"] == pytest.approx(sum(s["cpu_ms"] for s in summary["stages"]), abs=0.2)
+        assert summary["peak_rss_mb"] >= max(s["peak_rss_mb"] for s in summary["stages"])
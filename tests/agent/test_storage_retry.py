@@ -0,0 +1,331 @@
+"""
+Storage Retry Tests
+===================
+
+Tests for exponential backoff with jitter, the transient/idempotent retry
+rules, the dead-letter queue and replaying it into Firestore.
+"""
+
+import asyncio
+import json
+import random
+import pytest
+from functools import partial
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+TOOLS = "perception_app.perception_agent.tools.agent_7_tools"
+
+
+class _Flaky:
+    """Write stand-in that raises the queued errors, then succeeds."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class _Batch:
+    def __init__(self, db):
+        self.db = db
+        self.writes = []
+
+    def set(self, ref, data, merge=False):
+        self.writes.append((ref, data, merge))
+
+    def commit(self):
+        self.db.commits += 1
+        if self.db.failures:
+            raise self.db.failures.pop(0)
+        self.db.written.extend(self.writes)
+
+
+class _FakeDb:
+    """Firestore stand-in; commits raise the queued failures first."""
+
+    def __init__(self, *failures):
+        self.failures = list(failures)
+        self.commits = 0
+        self.written = []
+        self._collection = None
+
+    def batch(self):
+        return _Batch(self)
+
+    def collection(self, name):
+        self._collection = name
+        return self
+
+    def document(self, doc_id):
+        return f"{self._collection}/{doc_id}"
+
+
+def _no_sleep(delays):
+    from perception_app.perception_agent.tools.storage_retry import retry_call
+
+    return partial(retry_call, sleep=delays.append)
+
+
+class TestRetryPolicy:
+    """Tests for backoff and retry decisions."""
+
+    def test_backoff_is_jittered_and_capped(self):
+        from perception_app.perception_agent.tools.storage_retry import RetryPolicy
+
+        policy = RetryPolicy(base_delay=0.5, max_delay=4, rng=random.Random(7))
+        for attempt, cap in [(1, 0.5), (2, 1.0), (3, 2.0), (4, 4.0), (10, 4.0)]:
+            delays = [policy.backoff(attempt) for _ in range(200)]
+            assert all(0 <= d <= cap for d in delays)
+            assert max(delays) > cap / 2
+
+    def test_retries_only_transient_errors_of_idempotent_writes(self):
+        from google.api_core import exceptions
+        from perception_app.perception_agent.tools.storage_retry import RetryPolicy
+
+        policy = RetryPolicy(max_attempts=3)
+        aborted = exceptions.Aborted("contention")
+        assert policy.should_retry(aborted, 1, idempotent=True)
+        assert not policy.should_retry(aborted, 3, idempotent=True)
+        assert not policy.should_retry(aborted, 1, idempotent=False)
+        assert not policy.should_retry(exceptions.InvalidArgument("bad"), 1, idempotent=True)
+
+
+class TestRetryCall:
+    """Tests for retry_call and retry_call_async."""
+
+    def test_recovers_from_transient_errors(self):
+        from google.api_core import exceptions
+        from perception_app.perception_agent.tools.storage_retry import RetryPolicy, retry_call
+
+        write = _Flaky(exceptions.ServiceUnavailable("down"), exceptions.Aborted("contention"))
+        delays = []
+
+        result = retry_call(write, idempotent=True, policy=RetryPolicy(max_attempts=4), sleep=delays.append)
+
+        assert result == ("ok", 3)
+        assert len(delays) == 2
+
+    def test_gives_up_after_max_attempts(self):
+        from google.api_core import exceptions
+        from perception_app.perception_agent.tools.storage_retry import RetryPolicy, StorageWriteError, retry_call
+
+        write = _Flaky(*[exceptions.DeadlineExceeded("slow")] * 5)
+
+        with pytest.raises(StorageWriteError) as info:
+            retry_call(write, idempotent=True, policy=RetryPolicy(max_attempts=3), sleep=lambda _: None)
+
+        assert info.value.attempts == write.calls == 3
+        assert isinstance(info.value.error, exceptions.DeadlineExceeded)
+
+    def test_non_idempotent_write_not_retried(self):
+        from google.api_core import exceptions
+        from perception_app.perception_agent.tools.storage_retry import StorageWriteError, retry_call
+
+        write = _Flaky(exceptions.Aborted("contention"))
+
+        with pytest.raises(StorageWriteError):
+            retry_call(write, idempotent=False, sleep=lambda _: None)
+        assert write.calls == 1
+
+    def test_async_retry(self):
+        from google.api_core import exceptions
+        from perception_app.perception_agent.tools.storage_retry import retry_call_async
+
+        flaky = _Flaky(exceptions.TooManyRequests("slow down"))
+        delays = []
+
+        async def write():
+            return flaky()
+
+        async def sleep(delay):
+            delays.append(delay)
+
+        assert asyncio.run(retry_call_async(write, idempotent=True, sleep=sleep)) == ("ok", 2)
+        assert len(delays) == 1
+
+
+class TestDeadLetterQueue:
+    """Tests for the JSONL dead-letter queue."""
+
+    def test_append_and_pending(self, tmp_path):
+        from datetime import datetime, timezone
+        from perception_app.perception_agent.tools.storage_retry import DeadLetterQueue
+
+        dead_letters = DeadLetterQueue(str(tmp_path / "dlq" / "dlq.jsonl"))
+        when = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        assert dead_letters.append([{"collection": "articles", "doc_id": "art-1", "data": {"at": when}}]) == 1
+        assert dead_letters.append([]) == 0
+
+        [entry] = dead_letters.pending()
+        assert entry["doc_id"] == "art-1"
+        assert entry["data"]["at"] == when
+        assert "failed_at" in entry
+
+    def test_other_values_stored_as_strings(self, tmp_path):
+        from perception_app.perception_agent.tools.storage_retry import DeadLetterQueue
+
+        dead_letters = DeadLetterQueue(str(tmp_path / "dlq.jsonl"))
+        dead_letters.append([{"doc_id": "art-1", "data": {"tags": {"a"}}}])
+
+        assert dead_letters.pending()[0]["data"]["tags"] == str({"a"})
+
+    def test_torn_line_skipped(self, tmp_path):
+        from perception_app.perception_agent.tools.storage_retry import DeadLetterQueue
+
+        path = tmp_path / "dlq.jsonl"
+        path.write_text(json.dumps({"doc_id": "art-1"}) + "\n{\"doc_id\": \"art-")
+        assert [e["doc_id"] for e in DeadLetterQueue(str(path)).pending()] == ["art-1"]
+
+    def test_replay_requeues_failures(self, tmp_path):
+        from perception_app.perception_agent.tools.storage_retry import DeadLetterQueue
+
+        dead_letters = DeadLetterQueue(str(tmp_path / "dlq.jsonl"))
+        dead_letters.append([{"doc_id": f"art-{i}"} for i in range(3)])
+
+        result = dead_letters.replay(lambda entries: [e for e in entries if e["doc_id"] == "art-1"])
+
+        assert result == {"replayed": 3, "written": 2, "requeued": 1, "parked": 0}
+        assert [e["doc_id"] for e in dead_letters.pending()] == ["art-1"]
+        assert not dead_letters.replay_path.exists()
+
+    def test_replay_parks_permanent_and_exhausted_failures(self, tmp_path):
+        from perception_app.perception_agent.tools.storage_retry import DeadLetterQueue
+
+        dead_letters = DeadLetterQueue(str(tmp_path / "dlq.jsonl"), max_replays=3)
+        dead_letters.append([{"doc_id": f"art-{i}"} for i in range(3)])
+        failed = [
+            {"doc_id": "art-0", "replays": 1, "permanent": True},
+            {"doc_id": "art-1", "replays": 3, "permanent": False},
+            {"doc_id": "art-2", "replays": 2, "permanent": False},
+        ]
+
+        result = dead_letters.replay(lambda entries: failed)
+
+        assert result == {"replayed": 3, "written": 0, "requeued": 1, "parked": 2}
+        assert [e["doc_id"] for e in dead_letters.pending()] == ["art-2"]
+        assert [e["doc_id"] for e in dead_letters.parked()] == ["art-0", "art-1"]
+        assert dead_letters.parked_path == tmp_path / "dlq.jsonl.parked"
+
+    def test_interrupted_replay_picked_up_next_time(self, tmp_path):
+        from perception_app.perception_agent.tools.storage_retry import DeadLetterQueue
+
+        dead_letters = DeadLetterQueue(str(tmp_path / "dlq.jsonl"))
+        dead_letters.append([{"doc_id": "art-1"}])
+
+        def crash(entries):
+            raise RuntimeError("killed")
+
+        with pytest.raises(RuntimeError):
+            dead_letters.replay(crash)
+        dead_letters.append([{"doc_id": "art-2"}])
+
+        written = []
+        assert dead_letters.replay(lambda entries: written.extend(entries) or [])["written"] == 2
+        assert [e["doc_id"] for e in written] == ["art-1", "art-2"]
+        assert len(dead_letters) == 0
+
+
+class TestStorageWithRetries:
+    """store_articles retries transient failures and dead-letters the rest."""
+
+    def test_transient_failure_retried(self, tmp_path):
+        from google.api_core import exceptions
+        from perception_app.perception_agent.tools.agent_7_tools import store_articles
+        from perception_app.perception_agent.tools.storage_retry import DeadLetterQueue
+
+        db = _FakeDb(exceptions.Aborted("contention"))
+        dead_letters = DeadLetterQueue(str(tmp_path / "dlq.jsonl"))
+        delays = []
+
+        with patch(f"{TOOLS}._get_db", return_value=db), patch(f"{TOOLS}.retry_call", _no_sleep(delays)):
+            result = store_articles([{"url": "https://example.com/a"}], dead_letters=dead_letters)
+
+        assert result["stored_count"] == 1
+        assert result["dead_lettered"] == 0
+        assert result["batches"][0]["attempts"] == 2
+        assert db.commits == 2 and len(delays) == 1
+        assert len(dead_letters) == 0
+
+    def test_exhausted_retries_dead_lettered_and_replayed(self, tmp_path):
+        from google.api_core import exceptions
+        from perception_app.perception_agent.tools.agent_7_tools import (
+            _generate_article_id,
+            replay_dead_letters,
+            store_articles,
+        )
+        from perception_app.perception_agent.tools.storage_retry import STORAGE_RETRY_ATTEMPTS, DeadLetterQueue
+
+        url = "https://example.com/a"
+        db = _FakeDb(*[exceptions.ServiceUnavailable("down")] * STORAGE_RETRY_ATTEMPTS)
+        dead_letters = DeadLetterQueue(str(tmp_path / "dlq.jsonl"))
+
+        with patch(f"{TOOLS}._get_db", return_value=db), patch(f"{TOOLS}.retry_call", _no_sleep([])):
+            result = store_articles([{"url": url, "title": "A"}], dead_letters=dead_letters)
+
+            assert result["stored_count"] == 0
+            assert result["batches"][0]["attempts"] == STORAGE_RETRY_ATTEMPTS
+            assert result["dead_lettered"] == 1
+            [entry] = dead_letters.pending()
+            assert entry["collection"] == "articles"
+            assert entry["doc_id"] == _generate_article_id(url)
+            assert entry["merge"] is True
+            assert entry["attempts"] == STORAGE_RETRY_ATTEMPTS
+
+            assert replay_dead_letters(dead_letters) == {"replayed": 1, "written": 1, "requeued": 0, "parked": 0}
+
+        [(ref, data, merge)] = db.written
+        assert ref == f"articles/{_generate_article_id(url)}"
+        assert data["title"] == "A" and merge is True
+        assert len(dead_letters) == 0
+
+    def test_replay_transient_failure_requeued(self, tmp_path):
+        from google.api_core import exceptions
+        from perception_app.perception_agent.tools.agent_7_tools import replay_dead_letters
+        from perception_app.perception_agent.tools.storage_retry import DeadLetterQueue, RetryPolicy
+
+        dead_letters = DeadLetterQueue(str(tmp_path / "dlq.jsonl"))
+        dead_letters.append([
+            {"collection": "articles", "doc_id": f"art-{i}", "data": {}, "merge": True, "attempts": 4}
+            for i in range(3)
+        ])
+        db = _FakeDb(*[exceptions.ServiceUnavailable("down")] * 2)
+        retry = partial(_no_sleep([]), policy=RetryPolicy(max_attempts=2))
+
+        with patch(f"{TOOLS}._get_db", return_value=db), patch(f"{TOOLS}.retry_call", retry):
+            result = replay_dead_letters(dead_letters, batch_size=2)
+
+        assert result == {"replayed": 3, "written": 1, "requeued": 2, "parked": 0}
+        requeued = dead_letters.pending()
+        assert [e["doc_id"] for e in requeued] == ["art-0", "art-1"]
+        assert all(e["attempts"] == 6 and e["replays"] == 1 for e in requeued)
+
+    def test_replay_permanent_failure_isolated_and_parked(self, tmp_path):
+        from google.api_core import exceptions
+        from perception_app.perception_agent.tools.agent_7_tools import replay_dead_letters
+        from perception_app.perception_agent.tools.storage_retry import DeadLetterQueue
+
+        dead_letters = DeadLetterQueue(str(tmp_path / "dlq.jsonl"))
+        dead_letters.append([
+            {"collection": "articles", "doc_id": f"art-{i}", "data": {}, "merge": True, "attempts": 4}
+            for i in range(2)
+        ])
+        # The batch is rejected, then art-0 alone is rejected again
+        db = _FakeDb(exceptions.InvalidArgument("too big"), exceptions.InvalidArgument("too big"))
+
+        with patch(f"{TOOLS}._get_db", return_value=db):
+            result = replay_dead_letters(dead_letters, batch_size=2)
+
+        assert result == {"replayed": 2, "written": 1, "requeued": 0, "parked": 1}
+        assert [ref for ref, _, _ in db.written] == ["articles/art-1"]
+        assert len(dead_letters) == 0
+        [parked] = dead_letters.parked()
+        assert parked["doc_id"] == "art-0" and parked["permanent"] is True
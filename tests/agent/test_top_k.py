@@ -0,0 +1,132 @@
+"""
+Top-K Selection Tests
+=====================
+
+Tests for the streaming top-k selector with per-topic and per-source caps.
+"""
+
+import random
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+def _articles(count=2000, seed=1):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "relevance_score": rng.randint(1, 10),
+            "matched_topics": rng.sample(["ai", "cloud", "chips", "policy"], rng.randint(0, 2)),
+            "source_id": f"src_{rng.randint(0, 14)}",
+        }
+        for i in range(count)
+    ]
+
+
+def _greedy(articles, k, min_score, max_per_topic, max_per_source):
+    """Reference: full sort, then take articles while their caps allow."""
+    ranked = sorted(
+        (a for a in articles if a["relevance_score"] >= min_score),
+        key=lambda a: a["relevance_score"],
+        reverse=True
+    )
+    per_topic, per_source, selected = {}, {}, []
+    for article in ranked:
+        topic = article["matched_topics"][0] if article["matched_topics"] else None
+        if len(selected) == k:
+            break
+        if per_topic.get(topic, 0) >= max_per_topic or per_source.get(article["source_id"], 0) >= max_per_source:
+            continue
+        per_topic[topic] = per_topic.get(topic, 0) + 1
+        per_source[article["source_id"]] = per_source.get(article["source_id"], 0) + 1
+        selected.append(article)
+    return selected
+
+
+class TestTopKSelector:
+    """Tests for TopKSelector."""
+
+    @pytest.mark.parametrize("k,max_per_topic,max_per_source", [(50, 10, 5), (20, 3, 8), (100, 40, 2), (5, 10, 10)])
+    def test_matches_greedy_selection(self, k, max_per_topic, max_per_source):
+        """Streaming selection equals sort-then-greedy under the same caps."""
+        from perception_app.perception_agent.tools.top_k import TopKSelector
+
+        articles = _articles()
+        selector = TopKSelector(k, min_score=5, max_per_topic=max_per_topic, max_per_source=max_per_source)
+        for article in articles:
+            selector.offer(article)
+
+        assert selector.items() == _greedy(articles, k, 5, max_per_topic, max_per_source)
+
+    def test_arrival_order_breaks_ties(self):
+        """Out-of-order offers with explicit sequences give the in-order result."""
+        from perception_app.perception_agent.tools.top_k import TopKSelector
+
+        articles = _articles(500, seed=4)
+        in_order = TopKSelector(30, max_per_topic=10, max_per_source=4)
+        shuffled = TopKSelector(30, max_per_topic=10, max_per_source=4)
+        for article in articles:
+            in_order.offer(article)
+        for i in random.Random(9).sample(range(len(articles)), len(articles)):
+            shuffled.offer(articles[i], (i,))
+
+        assert shuffled.items() == in_order.items()
+
+    def test_discard_restores_pushed_out_candidates(self):
+        """Withdrawing a provisional article loses no candidate it outranked."""
+        from perception_app.perception_agent.tools.top_k import TopKSelector
+
+        articles = _articles(400, seed=5)
+        withdrawn = set(random.Random(2).sample(range(len(articles)), 60))
+        selector = TopKSelector(20, max_per_topic=6, max_per_source=2)
+        for i, article in enumerate(articles):
+            selector.offer(article, (i,), provisional=i % 3 == 0 or i in withdrawn)
+
+        for i in withdrawn:
+            selector.discard((i,))
+        settled = next(i for i in range(1, len(articles)) if i % 3 and i not in withdrawn)
+        assert not selector.discard((settled,))
+        assert selector.settle(lambda seq: True) > 0
+        assert selector.items() == _greedy(
+            [a for i, a in enumerate(articles) if i not in withdrawn], 20, 5, 6, 2
+        )
+
+    def test_caps_enforced(self):
+        """No topic or source exceeds its quota."""
+        from perception_app.perception_agent.tools.top_k import TopKSelector
+
+        selector = TopKSelector(50, max_per_topic=6, max_per_source=3)
+        for article in _articles():
+            selector.offer(article)
+        selected = selector.items()
+
+        topics = [a["matched_topics"][0] if a["matched_topics"] else None for a in selected]
+        sources = [a["source_id"] for a in selected]
+        assert max(topics.count(t) for t in set(topics)) <= 6
+        assert max(sources.count(s) for s in set(sources)) <= 3
+
+    def test_candidates_stay_bounded(self):
+        """Memory depends on topics x sources x cap, not on articles offered."""
+        from perception_app.perception_agent.tools.top_k import TopKSelector
+
+        selector = TopKSelector(50, max_per_topic=10, max_per_source=2)
+        for article in _articles(20000):
+            selector.offer(article)
+
+        assert selector.offered == 20000
+        assert selector.candidate_count <= 5 * 15 * 2
+
+    def test_filter_top_articles_applies_topic_quota(self):
+        """filter_top_articles no longer lets one topic fill the brief."""
+        from perception_app.perception_agent.tools.agent_3_tools import filter_top_articles
+
+        articles = [{"relevance_score": 9, "matched_topics": ["ai"]} for _ in range(30)]
+        articles += [{"relevance_score": 6, "matched_topics": ["cloud"]} for _ in range(30)]
+
+        top = filter_top_articles(articles, max_per_topic=10, min_score=5)
+
+        assert len(top) == 20
+        assert [a["matched_topics"][0] for a in top] == ["ai"] * 10 + ["cloud"] * 10
@@ -0,0 +1,195 @@
+"""
+URL Canonicalization Tests
+==========================
+
+Tests for canonicalize_url and the article IDs derived from it.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+class TestCanonicalizeUrl:
+    """Tests for canonicalize_url."""
+
+    @pytest.mark.parametrize("variant", [
+        "https://example.com/news/story",
+        "http://example.com/news/story",
+        "https://www.example.com/news/story",
+        "https://EXAMPLE.com/news/story/",
+        "https://example.com:443/news/story",
+        "https://example.com/news/story#comments",
+        "https://example.com/news/story?utm_source=rss&utm_medium=feed",
+        "https://example.com/news/story?fbclid=abc&gclid=def",
+        "https://example.com/news/story/amp",
+        "https://example.com/news/story/amp/",
+        "https://example.com/news/story.amp",
+        "https://amp.example.com/news/story",
+        "https://example.com/news/story?amp=1",
+        "https://example.com/news/story?outputType=amp",
+        "https://example-com.cdn.ampproject.org/c/s/example.com/news/story",
+        "  https://example.com/news/story  ",
+    ])
+    def test_variants_share_canonical_form(self, variant):
+        from perception_app.perception_agent.tools.url_canonicalizer import canonicalize_url
+
+        assert canonicalize_url(variant) == "https://example.com/news/story"
+
+    def test_content_parameters_kept_and_sorted(self):
+        from perception_app.perception_agent.tools.url_canonicalizer import canonicalize_url
+
+        url = "https://example.com/article?p=2&id=17&utm_campaign=x"
+        assert canonicalize_url(url) == "https://example.com/article?id=17&p=2"
+
+    def test_amp_html_suffix(self):
+        from perception_app.perception_agent.tools.url_canonicalizer import canonicalize_url
+
+        assert canonicalize_url("https://example.com/a/story.amp.html") == "https://example.com/a/story.html"
+
+    def test_path_case_and_custom_port_kept(self):
+        from perception_app.perception_agent.tools.url_canonicalizer import canonicalize_url
+
+        assert canonicalize_url("http://Example.com:8080/Path") == "https://example.com:8080/Path"
+
+    def test_root_path(self):
+        from perception_app.perception_agent.tools.url_canonicalizer import canonicalize_url
+
+        assert canonicalize_url("http://www.example.com") == "https://example.com/"
+
+    def test_bare_www_host_not_stripped(self):
+        from perception_app.perception_agent.tools.url_canonicalizer import canonicalize_url
+
+        assert canonicalize_url("https://www.com/a") == "https://www.com/a"
+
+    @pytest.mark.parametrize("url", ["", "not a url", "mailto:news@example.com", "https://example.com:bad/x"])
+    def test_non_http_urls_unchanged(self, url):
+        from perception_app.perception_agent.tools.url_canonicalizer import canonicalize_url
+
+        assert canonicalize_url(url) == url
+
+
+class TestArticleIds:
+    """Article IDs follow the canonical URL."""
+
+    def test_variants_share_article_id(self):
+        from perception_app.perception_agent.tools.agent_7_tools import _generate_article_id
+
+        assert _generate_article_id("http://www.example.com/story?utm_source=x") == \
+            _generate_article_id("https://example.com/story")
+        assert _generate_article_id("https://example.com/story").startswith("art-")
+
+    def test_deduplicate_by_url_uses_canonical_url(self):
+        from perception_app.perception_agent.tools.agent_7_tools import deduplicate_by_url
+
+        articles = [
+            {"url": "https://example.com/story?utm_source=a"},
+            {"url": "https://www.example.com/story/"},
+            {"url": "https://example.com/other"},
+        ]
+        assert deduplicate_by_url(articles) == [articles[0], articles[2]]
+
+
+class _Snapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = True
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class _Batch:
+    def __init__(self, db):
+        self.db = db
+        self.ops = []
+
+    def set(self, ref, data, merge=False):
+        self.ops.append(("set", ref, data))
+
+    def delete(self, ref):
+        self.ops.append(("delete", ref, None))
+
+    def commit(self):
+        for op, ref, data in self.ops:
+            if op == "set":
+                self.db.docs[ref] = dict(self.db.docs.get(ref, {}), **data)
+            else:
+                self.db.docs.pop(ref, None)
+
+
+class _FakeDb:
+    """In-memory /articles collection."""
+
+    def __init__(self, docs):
+        self.docs = dict(docs)
+
+    def collection(self, name):
+        assert name == "articles"
+        return self
+
+    def document(self, doc_id):
+        return doc_id
+
+    def stream(self):
+        return [_Snapshot(doc_id, data) for doc_id, data in list(self.docs.items())]
+
+    def get_all(self, refs, field_paths=None):
+        return [_Snapshot(ref, self.docs[ref]) for ref in refs if ref in self.docs]
+
+    def batch(self):
+        return _Batch(self)
+
+
+class TestLegacyArticleIds:
+    """Articles stored under pre-canonicalization IDs."""
+
+    def test_detect_duplicates_finds_legacy_document(self):
+        from perception_app.perception_agent.tools.agent_6_tools import detect_duplicates
+        from perception_app.perception_agent.tools.article_existence import ArticleExistenceChecker
+        from perception_app.perception_agent.tools.near_duplicates import NearDuplicateIndex
+        from perception_app.perception_agent.tools.url_canonicalizer import legacy_article_id
+
+        url = "https://www.example.com/story?utm_source=rss"
+        db = _FakeDb({legacy_article_id(url): {"url": url}})
+
+        duplicates = detect_duplicates(
+            [{"url": url, "title": "Story"}], existence=ArticleExistenceChecker(db=db),
+            index=NearDuplicateIndex(), record=False
+        )
+
+        assert duplicates == [{"url": url, "existing_id": legacy_article_id(url), "similarity": 1.0}]
+
+    def test_migration_moves_legacy_documents(self):
+        from perception_app.perception_agent.tools.article_id_migration import migrate_article_ids
+        from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+        from perception_app.perception_agent.tools.url_canonicalizer import canonical_article_id, legacy_article_id
+
+        old = "https://www.example.com/a?utm_source=rss"
+        older = "http://example.com/a"
+        dup = "https://example.com/b/"
+        db = _FakeDb({
+            legacy_article_id(old): {"url": old, "title": "A new", "stored_at": "2025-02-01"},
+            legacy_article_id(older): {"url": older, "title": "A old", "stored_at": "2025-01-01"},
+            legacy_article_id(dup): {"url": dup, "title": "B legacy"},
+            canonical_article_id(dup): {"url": "https://example.com/b", "title": "B"},
+            "no-url": {"title": "?"},
+        })
+        index = SeenUrlIndex(state_path=None)
+
+        assert migrate_article_ids(db=db, dry_run=True)["moved"] == 1
+        assert len(db.docs) == 5
+
+        counts = migrate_article_ids(db=db, seen_index=index)
+
+        assert counts == {"scanned": 5, "canonical": 1, "moved": 1, "duplicates_deleted": 2, "skipped": 1}
+        assert set(db.docs) == {canonical_article_id(old), canonical_article_id(dup), "no-url"}
+        assert db.docs[canonical_article_id(old)]["title"] == "A new"
+        assert db.docs[canonical_article_id(dup)]["title"] == "B"
+        assert canonical_article_id(old) in index and canonical_article_id(dup) in index
+
+        # Nothing left to move
+        assert migrate_article_ids(db=db)["moved"] == 0
@@ -101,8 +101,8 @@ class TestDocsEndpoint:
 class TestFetchRSSFeedEndpoint:
     """Tests for the fetch_rss_feed endpoint."""
 
-    @patch('httpx.AsyncClient')
-    def test_fetch_rss_feed_valid_request(self, mock_client, client):
+    @patch('routers.http_pool.request', new_callable=AsyncMock)
+    def test_fetch_rss_feed_valid_request(self, mock_request, client):
         """Test fetching RSS feed with valid request."""
         # Mock HTTP response
         mock_response = MagicMock()
@@ -117,11 +117,11 @@ class TestFetchRSSFeedEndpoint:
                 </item>
             </channel>
         </rss>"""
+        mock_response.content = mock_response.text.encode()
+        mock_response.status_code = 200
+        mock_response.headers = {}
         mock_response.raise_for_status = MagicMock()
-
-        async_mock = AsyncMock()
-        async_mock.__aenter__.return_value.get.return_value = mock_response
-        mock_client.return_value = async_mock
+        mock_request.return_value = mock_response
 
         response = client.post(
             "/mcp/tools/fetch_rss_feed",
@@ -154,17 +154,17 @@ class TestFetchRSSFeedEndpoint:
         )
         assert response.status_code == 422
 
-    @patch('httpx.AsyncClient')
-    def test_fetch_rss_feed_with_request_id(self, mock_client, client):
+    @patch('routers.http_pool.request', new_callable=AsyncMock)
+    def test_fetch_rss_feed_with_request_id(self, mock_request, client):
         """Test fetch_rss_feed with request_id tracking."""
         mock_response = MagicMock()
         mock_response.text = """<?xml version="1.0"?>
         <rss version="2.0"><channel><title>Test</title></channel></rss>"""
+        mock_response.content = mock_response.text.encode()
+        mock_response.status_code = 200
+        mock_response.headers = {}
         mock_response.raise_for_status = MagicMock()
-
-        async_mock = AsyncMock()
-        async_mock.__aenter__.return_value.get.return_value = mock_response
-        mock_client.return_value = async_mock
+        mock_request.return_value = mock_response
 
         response = client.post(
             "/mcp/tools/fetch_rss_feed",
@@ -177,6 +177,110 @@ class TestFetchRSSFeedEndpoint:
         assert response.status_code == 200
 
 
+def _feed_xml(title):
+    pub_date = datetime.now(tz=timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")
+    return f"""<?xml version="1.0"?>
+    <rss version="2.0"><channel><title>Feed</title>
+    <item><title>{title}</title><link>https://example.com/{title}</link>
+    <pubDate>{pub_date}</pubDate></item></channel></rss>"""
+
+
+class TestFetchRSSFeedsBatchEndpoint:
+    """Tests for the fetch_rss_feeds batch endpoint."""
+
+    def _mock_feeds(self, respx_mock):
+        import httpx
+        respx_mock.get("https://a.example.com/rss").mock(return_value=httpx.Response(200, text=_feed_xml("a")))
+        respx_mock.get("https://b.example.com/rss").mock(return_value=httpx.Response(404))
+        respx_mock.get("https://c.example.com/rss").mock(return_value=httpx.Response(200, text=_feed_xml("c")))
+
+    def test_returns_per_feed_results_and_errors(self, client):
+        """One failing feed does not fail the batch."""
+        import respx
+
+        with respx.mock as respx_mock:
+            self._mock_feeds(respx_mock)
+            response = client.post("/mcp/tools/fetch_rss_feeds", json={"feeds": [
+                {"feed_url": "https://a.example.com/rss"},
+                {"feed_url": "https://b.example.com/rss"},
+                {"feed_url": "https://c.example.com/rss", "max_items": 1, "time_window_hours": 48},
+            ]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["feed_count"], data["succeeded"], data["failed"]) == (3, 2, 1)
+        assert [r["index"] for r in data["results"]] == [0, 1, 2]
+        assert data["results"][0]["result"]["articles"][0]["title"] == "a"
+        assert data["results"][1]["status"] == "error"
+        assert data["results"][1]["error"]["details"]["http_status"] == 404
+        assert data["article_count"] == 2
+
+    def test_streams_ndjson(self, client):
+        """stream=true returns one JSON result per line."""
+        import respx
+
+        with respx.mock as respx_mock:
+            self._mock_feeds(respx_mock)
+            response = client.post("/mcp/tools/fetch_rss_feeds", json={"stream": True, "feeds": [
+                {"feed_url": "https://a.example.com/rss"},
+                {"feed_url": "https://b.example.com/rss"},
+            ]})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines() if line]
+        assert sorted(line["index"] for line in lines) == [0, 1]
+
+    def test_applies_per_feed_projection(self, client):
+        """Each feed's field projection is applied to its result."""
+        import respx
+
+        with respx.mock as respx_mock:
+            self._mock_feeds(respx_mock)
+            response = client.post("/mcp/tools/fetch_rss_feeds", json={"feeds": [
+                {"feed_url": "https://a.example.com/rss", "fields": ["title", "url"]},
+                {"feed_url": "https://c.example.com/rss"},
+            ]})
+
+        results = response.json()["results"]
+        assert set(results[0]["result"]["articles"][0]) == {"title", "url"}
+        assert "raw_content" in results[1]["result"]["articles"][0]
+
+    def test_rejects_empty_batch(self, client):
+        """A batch needs at least one feed."""
+        response = client.post("/mcp/tools/fetch_rss_feeds", json={"feeds": []})
+        assert response.status_code == 422
+
+
+class TestMetricsEndpoint:
+    """Tests for the runtime metrics endpoint."""
+
+    def test_fetch_rss_feed_projects_fields(self, client):
+        """fields limits the article keys in the response."""
+        import httpx
+        import respx
+
+        with respx.mock:
+            respx.get("https://proj.example.com/rss").mock(return_value=httpx.Response(200, text=_feed_xml("p")))
+            response = client.post("/mcp/tools/fetch_rss_feed", json={
+                "feed_url": "https://proj.example.com/rss",
+                "exclude_fields": ["raw_content", "summary", "content_snippet"]
+            })
+
+        article = response.json()["articles"][0]
+        assert "raw_content" not in article
+        assert article["title"] == "p"
+        assert client.get("/metrics").json()["rss_serialization"]["responses"] >= 1
+
+    def test_metrics_reports_http_pool(self, client):
+        """Test metrics endpoint exposes connection pool statistics."""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        pool = response.json()["http_pool"]
+        for key in ["requests", "connections_opened", "connections_reused", "waiting"]:
+            assert key in pool
+
+
 class TestMiddleware:
     """Tests for middleware functionality."""
 
@@ -0,0 +1,7 @@
+"""
+Benchmarks
+==========
+
+Micro-benchmarks for hot paths in the ingestion pipeline.
+Run with: pytest tests/benchmarks --benchmark-only
+"""
@@ -0,0 +1,46 @@
+"""
+Batch Scoring Benchmarks
+========================
+
+Backfill-sized scoring (10k articles x 200 topics): score_articles'
+per-article topic loop versus the NumPy batch engine.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+pytest.importorskip("numpy")
+
+from tests.benchmarks.test_keyword_matching import ARTICLES, TOPICS  # noqa: E402
+
+
+def _per_article():
+    from perception_app.perception_agent.tools.agent_3_tools import score_articles
+
+    return score_articles(ARTICLES, TOPICS)
+
+
+def _batch():
+    from perception_app.perception_agent.tools.batch_scoring import BatchScorer
+
+    return BatchScorer(TOPICS).score(ARTICLES)
+
+
+def test_batch_matches_per_article():
+    """The batch engine's compatibility mode gives identical results."""
+    assert _batch() == _per_article()
+
+
+@pytest.mark.benchmark(group="scoring-10k-x-200")
+def test_benchmark_per_article(benchmark):
+    """score_articles: per-article topic loop and dict merges."""
+    benchmark.pedantic(_per_article, rounds=3)
+
+
+@pytest.mark.benchmark(group="scoring-10k-x-200")
+def test_benchmark_batch(benchmark):
+    """BatchScorer: sparse matrix product per 4096-article chunk."""
+    benchmark.pedantic(_batch, rounds=3)
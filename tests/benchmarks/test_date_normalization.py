@@ -0,0 +1,82 @@
+"""
+Date Normalization Benchmarks
+=============================
+
+Compares the memoized DateNormalizer against generic dateutil parsing on
+date strings as they appear in real feeds.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from datetime import timezone
+from types import SimpleNamespace
+
+from dateutil import parser as date_parser
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# (feed, raw date string) pairs in the shapes our sources publish
+REAL_FEED_DATES = [
+    ("bbc", "Mon, 15 Jan 2024 10:30:00 GMT"),
+    ("bbc", "Tue, 16 Jan 2024 07:02:41 GMT"),
+    ("techcrunch", "Mon, 15 Jan 2024 18:45:12 +0000"),
+    ("techcrunch", "Wed, 17 Jan 2024 01:00:59 +0000"),
+    ("theverge", "2024-01-15T10:30:00-05:00"),
+    ("theverge", "2024-01-16T22:11:05-05:00"),
+    ("github", "2024-01-15T17:00:27Z"),
+    ("github", "2024-01-18T09:12:00Z"),
+    ("medium", "Mon, 15 Jan 2024 14:03:22 GMT"),
+    ("aws", "Fri, 12 Jan 2024 23:59:59 +0000"),
+    ("hn", "Sat, 13 Jan 2024 04:20:00 +0000"),
+    ("arxiv", "Mon, 15 Jan 2024 00:00:00 -0500"),
+    ("atom", "2024-01-15T10:30:00.000Z"),
+    ("atom", "2024-01-15T10:30:00.123456+00:00"),
+    ("wire", "15 Jan 2024 10:30:00 +0100"),
+] * 200
+
+
+def _dateutil_iso(value):
+    dt = date_parser.parse(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.isoformat()
+
+
+def _normalizer_iso(normalizers, feed, value):
+    return normalizers[feed].normalize(SimpleNamespace(published_parsed=None, published=value))[0]
+
+
+def test_matches_dateutil_on_corpus():
+    """The fast path yields the same timestamps as dateutil."""
+    from perception_app.mcp_service.routers.date_normalizer import DateNormalizer
+
+    normalizers = {feed: DateNormalizer(24, feed_key=f"bench:{feed}") for feed, _ in REAL_FEED_DATES}
+    for feed, value in REAL_FEED_DATES[:15]:
+        assert _normalizer_iso(normalizers, feed, value) == _dateutil_iso(value)
+
+
+@pytest.mark.benchmark(group="date-normalization")
+def test_benchmark_dateutil(benchmark):
+    """Baseline: generic dateutil parsing for every entry."""
+    benchmark(lambda: [_dateutil_iso(value) for _, value in REAL_FEED_DATES])
+
+
+@pytest.mark.benchmark(group="date-normalization")
+def test_benchmark_date_normalizer(benchmark):
+    """Memoized per-feed formats with a precomputed cutoff."""
+    from perception_app.mcp_service.routers.date_normalizer import DateNormalizer
+
+    normalizers = {feed: DateNormalizer(24, feed_key=f"bench:{feed}") for feed, _ in REAL_FEED_DATES}
+    benchmark(lambda: [_normalizer_iso(normalizers, feed, value) for feed, value in REAL_FEED_DATES])
+
+
+@pytest.mark.benchmark(group="date-normalization-struct")
+def test_benchmark_struct_time_window(benchmark):
+    """struct_time entries compared directly against the cutoff."""
+    import time
+    from perception_app.mcp_service.routers.date_normalizer import DateNormalizer
+
+    entries = [SimpleNamespace(published_parsed=time.gmtime(1705314600 + i * 60)) for i in range(3000)]
+    normalizer = DateNormalizer(24)
+    benchmark(lambda: [normalizer.normalize(entry) for entry in entries])
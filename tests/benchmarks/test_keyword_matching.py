@@ -0,0 +1,89 @@
+"""
+Keyword Matching Benchmarks
+===========================
+
+Relevance scoring of 10k articles against 200 topics: the per-keyword
+substring loop versus one compiled matcher scan per title and content.
+"""
+
+import random
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+ARTICLE_COUNT = 10_000
+TOPIC_COUNT = 200
+KEYWORDS_PER_TOPIC = 5
+
+
+def _vocabulary(rng, size=3000):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+
+
+def _corpus(seed=5):
+    rng = random.Random(seed)
+    words = _vocabulary(rng)
+    topics = [
+        {"topic_id": f"topic_{i}", "keywords": rng.sample(words, KEYWORDS_PER_TOPIC)}
+        for i in range(TOPIC_COUNT)
+    ]
+    articles = [
+        {
+            "title": " ".join(rng.choices(words, k=10)),
+            "content": " ".join(rng.choices(words, k=80)),
+            "category": "news",
+        }
+        for _ in range(ARTICLE_COUNT)
+    ]
+    return topics, articles
+
+
+TOPICS, ARTICLES = _corpus()
+
+
+def _legacy_score(articles, topics):
+    """Topic matching as done before: one `in` test per keyword per text."""
+    results = []
+    for article in articles:
+        title = article["title"].lower()
+        content_lower = article["content"].lower()
+        topic_scores = {}
+        for topic in topics:
+            matches = 0
+            for keyword in topic["keywords"]:
+                keyword_lower = keyword.lower()
+                if keyword_lower in title:
+                    matches += 3
+                elif keyword_lower in content_lower:
+                    matches += 1
+            if matches > 0:
+                topic_scores[topic["topic_id"]] = min(10, matches + 3)
+        results.append(max(topic_scores.values()) if topic_scores else 5)
+    return results
+
+
+def _matcher_score(articles, topics):
+    from perception_app.perception_agent.tools.agent_3_tools import score_articles
+
+    return [a["relevance_score"] for a in score_articles(articles, topics)]
+
+
+def test_scores_agree():
+    """Both implementations give every article the same score."""
+    sample = ARTICLES[:1000]
+    assert _matcher_score(sample, TOPICS) == _legacy_score(sample, TOPICS)
+
+
+@pytest.mark.benchmark(group="keyword-matching-10k-x-200")
+def test_benchmark_legacy_loop(benchmark):
+    """Per-keyword substring tests: topics x keywords x 2 scans per article."""
+    benchmark.pedantic(_legacy_score, args=(ARTICLES, TOPICS), rounds=3)
+
+
+@pytest.mark.benchmark(group="keyword-matching-10k-x-200")
+def test_benchmark_compiled_matcher(benchmark):
+    """score_articles with the compiled matcher: one scan per text."""
+    benchmark.pedantic(_matcher_score, args=(ARTICLES, TOPICS), rounds=3)
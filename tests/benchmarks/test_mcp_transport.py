@@ -0,0 +1,77 @@
+"""
+MCP Transport Benchmarks
+========================
+
+Per-article cost of handing a fetch_rss_feed result to the agent: JSON
+serialization plus decoding (the HTTP transport, minus the socket) versus
+the in-process transport's direct model-to-dict conversion.
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+ARTICLE_COUNT = 500
+
+
+def _feed_response():
+    from perception_app.mcp_service.routers.rss import Article, FetchRSSFeedResponse
+
+    now = datetime.now(tz=timezone.utc)
+    articles = [
+        Article(
+            title=f"Article {i}: model release notes",
+            url=f"https://example.com/posts/{i}",
+            published_at=(now - timedelta(minutes=10 * i)).isoformat(),
+            summary="Summary text. " * 20,
+            author=f"Author {i % 17}",
+            content_snippet="Body paragraph. " * 30,
+            raw_content="<p>" + "Body paragraph. " * 120 + "</p>",
+            categories=["AI", "Research"],
+        )
+        for i in range(ARTICLE_COUNT)
+    ]
+    return FetchRSSFeedResponse(
+        feed_id="",
+        feed_url="bench:large",
+        fetched_at=now.isoformat(),
+        article_count=len(articles),
+        articles=articles,
+    )
+
+
+RESPONSE = _feed_response()
+
+
+def _http_body():
+    from perception_app.mcp_service.routers.rss import ARTICLE_FIELDS, serialize_feed_response
+
+    return json.loads(serialize_feed_response(RESPONSE, ARTICLE_FIELDS))
+
+
+def _in_process_body():
+    from perception_app.mcp_service.routers.rss import ARTICLE_FIELDS
+    from perception_app.perception_agent.tools.mcp_transport import get_in_process_transport
+
+    return get_in_process_transport()._feed_dict(RESPONSE, ARTICLE_FIELDS)
+
+
+def test_transports_return_same_body():
+    """The in-process body equals the decoded HTTP JSON body."""
+    assert _in_process_body() == _http_body()
+
+
+@pytest.mark.benchmark(group="mcp-transport")
+def test_benchmark_http_serialization(benchmark):
+    """HTTP transport: model_dump_json on the server, json.loads in the agent."""
+    benchmark(_http_body)
+
+
+@pytest.mark.benchmark(group="mcp-transport")
+def test_benchmark_in_process(benchmark):
+    """In-process transport: models converted straight to dicts."""
+    benchmark(_in_process_body)
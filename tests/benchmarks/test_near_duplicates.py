@@ -0,0 +1,75 @@
+"""
+Near-Duplicate Detection Benchmarks
+===================================
+
+Clustering 2000 articles (with 200 syndicated copies): LSH candidate
+lookup versus comparing every pair of signatures.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from tests.benchmarks.test_keyword_matching import ARTICLES  # noqa: E402
+
+BASE = ARTICLES[:1800]
+# Syndicated copies: same story, another URL and a byline appended
+COPIES = [
+    dict(article, url=article.get("url", "") + "?utm_source=wire", content=(article.get("content") or "") + " Reporting by staff.")
+    for article in ARTICLES[:200]
+]
+CORPUS = BASE + COPIES
+
+
+def _signatures():
+    from perception_app.perception_agent.tools.near_duplicates import MinHasher
+
+    hasher = MinHasher()
+    return [hasher.signature(article) for article in CORPUS]
+
+
+SIGNATURES = _signatures()
+
+
+def _lsh():
+    from perception_app.perception_agent.tools.near_duplicates import NearDuplicateIndex
+
+    index = NearDuplicateIndex()
+    pairs = 0
+    for i, signature in enumerate(SIGNATURES):
+        pairs += len(index.query(signature))
+        index.add(str(i), signature)
+    return pairs
+
+
+def _all_pairs():
+    from perception_app.perception_agent.tools.near_duplicates import NEAR_DUP_THRESHOLD, similarity
+
+    pairs = 0
+    for i, signature in enumerate(SIGNATURES):
+        for other in SIGNATURES[:i]:
+            if signature and other and similarity(signature, other) >= NEAR_DUP_THRESHOLD:
+                pairs += 1
+    return pairs
+
+
+def test_lsh_finds_syndicated_copies():
+    from perception_app.perception_agent.tools.near_duplicates import find_clusters
+
+    clusters = find_clusters(CORPUS)
+    copied = {members[0] for members in clusters if any(i >= len(BASE) for i in members)}
+    assert len(copied) >= 190
+
+
+@pytest.mark.benchmark(group="near-duplicates-2000")
+def test_benchmark_lsh(benchmark):
+    """LSH: compare only signatures sharing a band."""
+    benchmark.pedantic(_lsh, rounds=3)
+
+
+@pytest.mark.benchmark(group="near-duplicates-2000")
+def test_benchmark_all_pairs(benchmark):
+    """Baseline: compare every pair of signatures."""
+    benchmark.pedantic(_all_pairs, rounds=1)
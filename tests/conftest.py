@@ -62,6 +62,8 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(pytest.mark.mcp)
         elif "/agent/" in test_path:
             item.add_marker(pytest.mark.agent)
+        elif "/benchmarks/" in test_path:
+            item.add_marker(pytest.mark.slow)
 
 
 # =============================================================================
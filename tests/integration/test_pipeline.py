@@ -14,6 +14,36 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 
+@pytest.fixture(autouse=True)
+def source_health_store():
+    """Keep source health I/O off Firestore."""
+    from perception_app.perception_agent.tools.source_health import SourceHealthTracker
+
+    tools = "perception_app.perception_agent.tools.agent_0_tools"
+    with patch(f"{tools}.get_source_health", return_value=SourceHealthTracker()), \
+            patch(f"{tools}.load_source_health", return_value={}), \
+            patch(f"{tools}.update_source_health"):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def seen_url_index():
+    """Keep the seen-article index in memory."""
+    from perception_app.perception_agent.tools.seen_urls import SeenUrlIndex
+
+    tools = "perception_app.perception_agent.tools.agent_0_tools"
+    with patch(f"{tools}.get_seen_url_index", return_value=SeenUrlIndex(state_path=None)):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def duplicate_check():
+    """Keep duplicate detection off Firestore and the history file."""
+    tools = "perception_app.perception_agent.tools.agent_0_tools"
+    with patch(f"{tools}.detect_duplicates", return_value=[]), patch(f"{tools}.record_article_history"):
+        yield
+
+
 class TestPipelineFlow:
     """Tests for pipeline flow integration."""
 
@@ -69,6 +69,553 @@ class TestRSSRouter:
         assert request.max_items == 100
 
 
+class TestHttpPool:
+    """Tests for the shared HTTP client pool."""
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self):
+        """Sequential requests to one host share a keep-alive connection."""
+        import asyncio
+        from routers import http_pool
+
+        async def handle(reader, writer):
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        before = http_pool.pool_stats()
+
+        try:
+            for _ in range(3):
+                response = await http_pool.request("GET", f"http://127.0.0.1:{port}/feed")
+                assert response.text == "ok"
+        finally:
+            await http_pool.close_client()
+            server.close()
+
+        after = http_pool.pool_stats()
+        assert after["requests"] - before["requests"] == 3
+        assert after["connections_opened"] - before["connections_opened"] == 1
+        assert after["connections_reused"] - before["connections_reused"] == 2
+        assert after["waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_client_is_shared(self):
+        """The same client is returned within one event loop."""
+        from routers import http_pool
+
+        try:
+            assert http_pool.get_client() is http_pool.get_client()
+        finally:
+            await http_pool.close_client()
+
+
+RSS_BODY = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed</title>
+<item><title>Fresh Article</title><link>https://example.com/fresh</link>
+<pubDate>{pub_date}</pubDate></item>
+</channel></rss>"""
+
+
+def _rss_body():
+    now = datetime.now(tz=timezone.utc)
+    return RSS_BODY.format(pub_date=now.strftime("%a, %d %b %Y %H:%M:%S GMT"))
+
+
+class TestConditionalGet:
+    """Tests for ETag / Last-Modified conditional fetches."""
+
+    @pytest.fixture(autouse=True)
+    def reset_cache(self, monkeypatch):
+        from routers.feed_cache import validator_cache
+        from routers.result_cache import result_cache
+        # Every fetch must reach the (mocked) network
+        monkeypatch.setattr(result_cache, "ttl_seconds", 0)
+        validator_cache.clear()
+        yield
+        validator_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_sends_validators_and_short_circuits_on_304(self):
+        """Second fetch sends validators and skips parsing on 304."""
+        import respx
+        import httpx
+        from routers import http_pool
+        from routers.rss import load_rss_feed, FetchRSSFeedRequest
+
+        seen_headers = []
+
+        def responder(request):
+            seen_headers.append(dict(request.headers))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text=_rss_body(), headers={
+                "ETag": '"v1"', "Last-Modified": "Mon, 15 Jan 2024 10:30:00 GMT"
+            })
+
+        request = FetchRSSFeedRequest(feed_url="https://feeds.example.com/rss", conditional_get=True)
+        try:
+            with respx.mock:
+                respx.get("https://feeds.example.com/rss").mock(side_effect=responder)
+                first = await load_rss_feed(request)
+                with patch("routers.rss.feedparser.parse") as mock_parse:
+                    second = await load_rss_feed(request)
+                    mock_parse.assert_not_called()
+        finally:
+            await http_pool.close_client()
+
+        assert first.not_modified is False
+        assert first.article_count == 1
+        assert second.not_modified is True
+        assert second.articles == []
+        assert seen_headers[1]["if-none-match"] == '"v1"'
+        assert seen_headers[1]["if-modified-since"] == "Mon, 15 Jan 2024 10:30:00 GMT"
+        assert (second.cache_hits, second.cache_misses) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_unconditional_requests_skip_cache(self):
+        """Requests without conditional_get never send validators."""
+        import respx
+        import httpx
+        from routers import http_pool
+        from routers.rss import load_rss_feed, FetchRSSFeedRequest
+
+        try:
+            with respx.mock:
+                route = respx.get("https://feeds.example.com/rss").mock(
+                    return_value=httpx.Response(200, text=_rss_body(), headers={"ETag": '"v1"'})
+                )
+                await load_rss_feed(FetchRSSFeedRequest(feed_url="https://feeds.example.com/rss"))
+                result = await load_rss_feed(FetchRSSFeedRequest(feed_url="https://feeds.example.com/rss"))
+        finally:
+            await http_pool.close_client()
+
+        assert "if-none-match" not in route.calls.last.request.headers
+        assert result.not_modified is False
+        assert (result.cache_hits, result.cache_misses) == (0, 0)
+
+    def test_cache_is_bounded(self):
+        """Least recently used feeds are evicted beyond max_entries."""
+        from routers.feed_cache import ValidatorCache
+
+        cache = ValidatorCache(max_entries=2)
+        cache.store("a", {"etag": "1"})
+        cache.store("b", {"etag": "2"})
+        cache.conditional_headers("a")
+        cache.store("c", {"etag": "3"})
+
+        assert cache.get("b") is None
+        assert cache.conditional_headers("a") == {"If-None-Match": "1"}
+        assert cache.stats()["entries"] == 2
+
+
+class TestFeedCharset:
+    """The response's Content-Type charset reaches the parser."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("engine", ["feedparser", "stream"])
+    async def test_header_only_charset_decoded(self, monkeypatch, engine):
+        """A KOI8-R feed whose charset is only in the header is decoded correctly."""
+        import respx
+        import httpx
+        from routers import http_pool, rss
+        from routers.result_cache import result_cache
+        from routers.rss import load_rss_feed, FetchRSSFeedRequest
+
+        monkeypatch.setattr(result_cache, "ttl_seconds", 0)
+        monkeypatch.setattr(rss, "RSS_PARSER_ENGINE", engine)
+        body = _rss_body().replace("Fresh Article", "\u041f\u0440\u0438\u0432\u0435\u0442 \u043c\u0438\u0440")
+
+        try:
+            with respx.mock:
+                respx.get("https://koi8.example.com/rss").mock(return_value=httpx.Response(
+                    200, content=body.encode("koi8-r"),
+                    headers={"Content-Type": "application/rss+xml; charset=koi8-r"}
+                ))
+                result = await load_rss_feed(FetchRSSFeedRequest(feed_url="https://koi8.example.com/rss"))
+        finally:
+            await http_pool.close_client()
+
+        assert [a.title for a in result.articles] == ["\u041f\u0440\u0438\u0432\u0435\u0442 \u043c\u0438\u0440"]
+
+
+class TestParseExecutor:
+    """Tests for off-loop feed parsing."""
+
+    def test_parse_feed_normalizes_entries(self):
+        """parse_feed returns Article models within the time window."""
+        from routers.rss import parse_feed, Article
+
+        parsed = parse_feed(_rss_body(), 24, 50)
+
+        assert parsed["malformed"] is False
+        assert len(parsed["articles"]) == 1
+        assert isinstance(parsed["articles"][0], Article)
+
+    def test_parse_feed_flags_malformed(self):
+        """Malformed feeds without entries are flagged."""
+        from routers.rss import parse_feed
+
+        parsed = parse_feed("<not-a-feed", 24, 50)
+
+        assert parsed["malformed"] is True
+        assert parsed["articles"] == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+    async def test_modes_run_job(self, mode):
+        """Every execution mode runs the job and records timing."""
+        from routers.parse_executor import ParseExecutor
+
+        executor = ParseExecutor(mode=mode, max_workers=1)
+        try:
+            assert await executor.run(pow, 2, 10) == 1024
+        finally:
+            executor.shutdown()
+
+        stats = executor.stats()
+        assert stats["jobs"] == 1
+        assert stats["pending"] == 0
+
+    def test_rejects_unknown_mode(self):
+        """Unknown modes are a configuration error."""
+        from routers.parse_executor import ParseExecutor
+
+        with pytest.raises(ValueError):
+            ParseExecutor(mode="gpu")
+
+    @pytest.mark.asyncio
+    async def test_backpressure_rejects_when_queue_full(self):
+        """Jobs beyond max_pending wait, then fail with ParseQueueFull."""
+        import asyncio
+        import threading
+        from routers.parse_executor import ParseExecutor, ParseQueueFull
+
+        release = threading.Event()
+        executor = ParseExecutor(mode="thread", max_workers=1, max_pending=1, queue_timeout=0.05)
+        try:
+            blocker = asyncio.ensure_future(executor.run(release.wait, 5))
+            await asyncio.sleep(0.01)
+            with pytest.raises(ParseQueueFull):
+                await executor.run(pow, 2, 2)
+            release.set()
+            await blocker
+        finally:
+            release.set()
+            executor.shutdown()
+
+        assert executor.stats()["rejected"] == 1
+        assert executor.stats()["peak_pending"] == 2
+
+    @pytest.mark.asyncio
+    async def test_loop_lag_monitor_detects_blocking(self):
+        """A synchronous stall on the loop shows up as lag."""
+        import asyncio
+        import time
+        from routers.parse_executor import LoopLagMonitor
+
+        monitor = LoopLagMonitor(interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.05)
+        await asyncio.sleep(0.02)
+        await monitor.stop()
+
+        assert monitor.stats()["samples"] >= 1
+        assert monitor.stats()["max_ms"] >= 30
+
+
+def _dated_rss(hours_ago):
+    """RSS body with one item per entry in hours_ago, in the given order."""
+    from datetime import timedelta
+    now = datetime.now(tz=timezone.utc)
+    items = "".join(
+        f"<item><title>Item {i}</title><link>https://example.com/{i}</link>"
+        f"<description>Summary {i}</description><category>tech</category>"
+        f"<pubDate>{(now - timedelta(hours=h)).strftime('%a, %d %b %Y %H:%M:%S GMT')}</pubDate></item>"
+        for i, h in enumerate(hours_ago)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>{items}</channel></rss>'
+
+
+class TestProjectionAndEarlyCutoff:
+    """Tests for field projection and early time-window cutoff."""
+
+    def test_projection_skips_unrequested_fields(self):
+        """Only requested fields are materialized."""
+        from routers.rss import parse_feed
+
+        parsed = parse_feed(_dated_rss([1, 2]), 24, 50, fields=frozenset({"title", "url", "published_at"}))
+
+        article = parsed["articles"][0]
+        assert article.title == "Item 0"
+        assert article.summary is None
+        assert article.content_snippet is None
+        assert article.categories == []
+
+    def test_early_cutoff_stops_on_newest_first_feed(self):
+        """A newest-first feed stops at the first out-of-window entry."""
+        from routers.rss import parse_feed
+
+        parsed = parse_feed(_dated_rss([1, 2, 30, 5]), 24, 50, early_cutoff=True)
+
+        assert parsed["stopped_early"] is True
+        assert [a.title for a in parsed["articles"]] == ["Item 0", "Item 1"]
+
+    def test_early_cutoff_ignores_unsorted_feed(self):
+        """Feeds that are not newest-first are scanned fully."""
+        from routers.rss import parse_feed
+
+        parsed = parse_feed(_dated_rss([2, 1, 30, 5]), 24, 50, early_cutoff=True)
+
+        assert parsed["stopped_early"] is False
+        assert [a.title for a in parsed["articles"]] == ["Item 0", "Item 1", "Item 3"]
+
+    def test_early_cutoff_skips_stale_pinned_first_entry(self):
+        """An old entry before any in-window entry does not stop the scan."""
+        from routers.rss import parse_feed
+
+        parsed = parse_feed(_dated_rss([100, 1, 2]), 24, 50, early_cutoff=True)
+
+        assert [a.title for a in parsed["articles"]] == ["Item 1", "Item 2"]
+
+    def test_projected_fields(self):
+        """fields and exclude_fields combine into one projection."""
+        from routers.rss import projected_fields, FetchRSSFeedRequest, ARTICLE_FIELDS
+
+        assert projected_fields(FetchRSSFeedRequest(feed_url="u")) == ARTICLE_FIELDS
+        assert projected_fields(
+            FetchRSSFeedRequest(feed_url="u", exclude_fields=["raw_content"])
+        ) == ARTICLE_FIELDS - {"raw_content"}
+        assert projected_fields(
+            FetchRSSFeedRequest(feed_url="u", fields=["title", "url"], exclude_fields=["url"])
+        ) == {"title"}
+
+    def test_unknown_field_rejected(self):
+        """Unknown field names fail validation."""
+        from pydantic import ValidationError
+        from routers.rss import FetchRSSFeedRequest
+
+        with pytest.raises(ValidationError):
+            FetchRSSFeedRequest(feed_url="u", fields=["body"])
+
+    def test_serialization_excludes_fields_and_records_size(self):
+        """Serialized responses omit excluded fields and are measured."""
+        import json
+        from routers.rss import serialize_feed_response, serialization_metrics, parse_feed, FetchRSSFeedResponse
+
+        result = FetchRSSFeedResponse(
+            feed_id="", feed_url="u", fetched_at="now", article_count=1,
+            articles=parse_feed(_dated_rss([1]), 24, 50)["articles"]
+        )
+        full = serialize_feed_response(result, frozenset(result.articles[0].model_fields))
+        slim = serialize_feed_response(result, frozenset({"title", "url", "published_at"}))
+
+        assert set(json.loads(slim)["articles"][0]) == {"title", "url", "published_at"}
+        assert len(slim) < len(full)
+        assert serialization_metrics()["responses"] >= 2
+
+
+class TestHostLimiter:
+    """Tests for per-host politeness and Retry-After handling."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_paced(self):
+        """A host gets `burst` immediate tokens, then one per 1/rate seconds."""
+        from routers.host_limiter import HostRateLimiter
+
+        limiter = HostRateLimiter(rate_per_second=50, burst=2)
+        waits = [await limiter.acquire("a.example.com") for _ in range(3)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] > 0
+        assert limiter.stats()["delayed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_throttled_host_does_not_delay_other_hosts(self):
+        """A blocked host only affects its own fetches."""
+        from routers.host_limiter import HostRateLimiter, HostThrottled
+
+        limiter = HostRateLimiter(rate_per_second=1, burst=1, max_wait=0.5)
+        limiter.penalize("slow.example.com", "120")
+
+        with pytest.raises(HostThrottled) as exc_info:
+            await limiter.acquire("slow.example.com")
+        assert exc_info.value.retry_after > 100
+
+        assert await limiter.acquire("fast.example.com") == 0.0
+        assert "slow.example.com" in limiter.stats()["blocked_hosts"]
+
+    @pytest.mark.asyncio
+    async def test_waits_out_short_retry_after(self):
+        """Retry-After shorter than max_wait is waited out."""
+        from routers.host_limiter import HostRateLimiter
+
+        limiter = HostRateLimiter(rate_per_second=1000, burst=1)
+        limiter.penalize("a.example.com", 0.05)
+
+        assert await limiter.acquire("a.example.com") >= 0.04
+
+    def test_parse_retry_after(self):
+        """Retry-After accepts delta-seconds and HTTP-dates."""
+        from email.utils import format_datetime
+        from datetime import timedelta
+        from routers.host_limiter import parse_retry_after
+
+        in_two_minutes = format_datetime(datetime.now(tz=timezone.utc) + timedelta(seconds=120), usegmt=True)
+
+        assert parse_retry_after("30") == 30
+        assert 100 < parse_retry_after(in_two_minutes) <= 120
+        assert parse_retry_after("soon", default=7) == 7
+        assert parse_retry_after(None, default=7) == 7
+
+    @pytest.mark.asyncio
+    async def test_router_honours_429_retry_after(self, monkeypatch):
+        """A 429 blocks the host; later fetches fail fast without hitting it."""
+        import respx
+        import httpx
+        from fastapi import HTTPException
+        from routers import http_pool
+        from routers.host_limiter import host_limiter
+        from routers.result_cache import result_cache
+        from routers.rss import load_rss_feed, FetchRSSFeedRequest
+
+        monkeypatch.setattr(result_cache, "ttl_seconds", 0)
+        monkeypatch.setattr(host_limiter, "max_wait", 1)
+        host_limiter.clear()
+        try:
+            with respx.mock:
+                route = respx.get("https://busy.example.com/rss").mock(
+                    return_value=httpx.Response(429, headers={"Retry-After": "90"})
+                )
+                with pytest.raises(HTTPException) as first:
+                    await load_rss_feed(FetchRSSFeedRequest(feed_url="https://busy.example.com/rss"))
+                with pytest.raises(HTTPException) as second:
+                    await load_rss_feed(FetchRSSFeedRequest(feed_url="https://busy.example.com/rss?page=2"))
+        finally:
+            await http_pool.close_client()
+            host_limiter.clear()
+
+        assert route.call_count == 1
+        assert first.value.status_code == 429
+        assert 85 <= int(first.value.headers["Retry-After"]) <= 90
+        assert second.value.detail["error"]["code"] == "FEED_HOST_THROTTLED"
+
+
+class TestResultCache:
+    """Tests for single-flight coalescing and the TTL result cache."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_fetches_share_one_call(self):
+        """Concurrent callers for one key trigger a single fetch."""
+        import asyncio
+        from routers.result_cache import SingleFlightCache
+
+        cache = SingleFlightCache(ttl_seconds=60)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"articles": []}
+
+        results = await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert cache.stats()["coalesced"] == 4
+
+        await cache.get_or_fetch("k", fetch)
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_are_shared_but_not_cached(self):
+        """Waiters see the error and the next call retries."""
+        import asyncio
+        from routers.result_cache import SingleFlightCache
+
+        cache = SingleFlightCache(ttl_seconds=60)
+        calls = []
+
+        async def fail():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            cache.get_or_fetch("k", fail), cache.get_or_fetch("k", fail), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch("k", fail)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_refetch(self):
+        """Entries expire after ttl_seconds."""
+        from routers.result_cache import SingleFlightCache
+
+        cache = SingleFlightCache(ttl_seconds=60)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return len(calls)
+
+        with patch("routers.result_cache.time.monotonic", return_value=1000.0):
+            assert await cache.get_or_fetch("k", fetch) == 1
+        with patch("routers.result_cache.time.monotonic", return_value=1061.0):
+            assert await cache.get_or_fetch("k", fetch) == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """The least recently used key is evicted beyond max_entries."""
+        from routers.result_cache import SingleFlightCache
+
+        cache = SingleFlightCache(ttl_seconds=60, max_entries=2)
+
+        async def value(v):
+            return v
+
+        await cache.get_or_fetch("a", lambda: value(1))
+        await cache.get_or_fetch("b", lambda: value(2))
+        await cache.get_or_fetch("a", lambda: value(1))
+        await cache.get_or_fetch("c", lambda: value(3))
+
+        assert await cache.get_or_fetch("b", lambda: value(20)) == 20
+        assert cache.stats()["evictions"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_load_rss_feed_coalesces_duplicate_requests(self):
+        """Duplicate feed requests hit the feed host once."""
+        import asyncio
+        import httpx
+        import respx
+        from routers import http_pool
+        from routers.result_cache import result_cache
+        from routers.rss import load_rss_feed, FetchRSSFeedRequest
+
+        result_cache.clear()
+        request = FetchRSSFeedRequest(feed_url="https://dup.example.com/rss")
+        try:
+            with respx.mock:
+                route = respx.get("https://dup.example.com/rss").mock(
+                    return_value=httpx.Response(200, text=_rss_body())
+                )
+                results = await asyncio.gather(*(load_rss_feed(request) for _ in range(4)))
+                await load_rss_feed(request)
+        finally:
+            await http_pool.close_client()
+            result_cache.clear()
+
+        assert route.call_count == 1
+        assert all(r.article_count == 1 for r in results)
+
+
 class TestStorageRouter:
     """Tests for storage router."""
 
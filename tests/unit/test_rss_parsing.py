@@ -226,6 +226,93 @@ class TestIsWithinTimeWindow:
         assert result is True
 
 
+class TestDateNormalizer:
+    """Tests for the per-fetch DateNormalizer."""
+
+    def test_now_computed_once_per_fetch(self):
+        """The cutoff is computed once, not per entry."""
+        from perception_app.mcp_service.routers import date_normalizer
+
+        with patch.object(date_normalizer, "datetime", wraps=datetime) as mock_dt:
+            normalizer = date_normalizer.DateNormalizer(24)
+            for hour in range(10):
+                entry = MagicMock()
+                entry.published_parsed = (2024, 1, 15, hour, 0, 0, 0, 0, 0)
+                normalizer.normalize(entry)
+
+        assert mock_dt.now.call_count == 1
+
+    def test_struct_time_window_comparison(self):
+        """struct_time entries are filtered against the cutoff."""
+        from perception_app.mcp_service.routers.date_normalizer import DateNormalizer
+
+        now = datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+        normalizer = DateNormalizer(24, now=now)
+
+        recent, old = MagicMock(), MagicMock()
+        recent.published_parsed = (2024, 1, 15, 1, 0, 0, 0, 0, 0)
+        old.published_parsed = (2024, 1, 14, 11, 59, 59, 0, 0, 0)
+
+        assert normalizer.normalize(recent) == ("2024-01-15T01:00:00+00:00", True)
+        assert normalizer.normalize(old) == ("2024-01-14T11:59:59+00:00", False)
+
+    def test_learns_feed_date_format(self):
+        """The format that parsed a feed's date is remembered for that feed."""
+        from perception_app.mcp_service.routers.date_normalizer import parse_date_string, learned_format
+
+        parse_date_string("Mon, 15 Jan 2024 10:30:00 GMT", feed_key="https://learn.example.com/rss")
+
+        assert learned_format("https://learn.example.com/rss") == "%a, %d %b %Y %H:%M:%S GMT"
+
+    def test_falls_back_to_dateutil(self):
+        """Unknown formats still parse through dateutil."""
+        from perception_app.mcp_service.routers.date_normalizer import parse_date_string, learned_format
+
+        result = parse_date_string("January 15, 2024", feed_key="https://odd.example.com/rss")
+
+        assert result == datetime(2024, 1, 15, tzinfo=timezone.utc)
+        assert learned_format("https://odd.example.com/rss") is None
+
+    def test_learned_formats_shared_across_threads(self):
+        """Parser threads can learn formats while the table is being evicted."""
+        from concurrent.futures import ThreadPoolExecutor
+        from perception_app.mcp_service.routers import date_normalizer
+
+        dates = ["Mon, 15 Jan 2024 10:30:00 GMT", "2024-01-15T10:30:00+00:00"]
+
+        def parse(i):
+            feed_key = f"https://threads.example.com/{i % 50}"
+            return date_normalizer.parse_date_string(dates[i % 2], feed_key=feed_key)
+
+        with patch.object(date_normalizer, "MAX_LEARNED_FORMATS", 20):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(parse, range(2000)))
+
+            assert {r.isoformat() for r in results} == {"2024-01-15T10:30:00+00:00"}
+            assert len(date_normalizer._learned_formats) <= 20
+
+    @pytest.mark.parametrize("date_string", [
+        "Mon, 15 Jan 2024 10:30:00 GMT",
+        "Mon, 15 Jan 2024 10:30:00 +0000",
+        "Mon, 15 Jan 2024 10:30:00 -0500",
+        "2024-01-15T10:30:00Z",
+        "2024-01-15T10:30:00.250+02:00",
+        "15 Jan 2024 10:30:00",
+    ])
+    def test_fast_path_matches_dateutil(self, date_string):
+        """Known formats produce the same result as dateutil."""
+        from dateutil import parser as date_parser
+        from perception_app.mcp_service.routers.date_normalizer import parse_date_string
+
+        expected = date_parser.parse(date_string)
+        if expected.tzinfo is None:
+            expected = expected.replace(tzinfo=timezone.utc)
+
+        result = parse_date_string(date_string, feed_key="https://same.example.com/rss")
+
+        assert result.isoformat() == expected.isoformat()
+
+
 class TestFeedParserIntegration:
     """Tests for feedparser integration."""
 
@@ -314,6 +401,191 @@ class TestFeedParserIntegration:
         assert feed.entries[0].get('author') or hasattr(feed.entries[0], 'dc_creator')
 
 
+class TestStreamingParserEngine:
+    """Tests for the incremental expat parser engine."""
+
+    RSS = """<?xml version="1.0" encoding="UTF-8"?>
+    <rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"
+         xmlns:content="http://purl.org/rss/1.0/modules/content/">
+        <channel>
+            <title>Test Feed</title>
+            <link>https://example.com</link>
+            <item>
+                <title> Caf\u00e9 &amp; Tools </title>
+                <link>https://example.com/1</link>
+                <description><![CDATA[<p>Summary one</p>]]></description>
+                <dc:creator>Jane Doe</dc:creator>
+                <category>AI</category>
+                <category>Tools</category>
+                <content:encoded><![CDATA[<p>Full body</p>]]></content:encoded>
+                <pubDate>Mon, 15 Jan 2024 10:30:00 GMT</pubDate>
+            </item>
+            <item>
+                <title>Second</title>
+                <link>https://example.com/2</link>
+                <pubDate>Sun, 14 Jan 2024 10:30:00 +0000</pubDate>
+            </item>
+        </channel>
+    </rss>"""
+
+    ATOM = """<?xml version="1.0" encoding="UTF-8"?>
+    <feed xmlns="http://www.w3.org/2005/Atom">
+        <title>Test Atom Feed</title>
+        <link href="https://example.com"/>
+        <entry>
+            <title>Atom Article</title>
+            <link rel="self" href="https://example.com/self"/>
+            <link href="https://example.com/atom-article"/>
+            <id>urn:uuid:1234</id>
+            <updated>2024-01-15T10:30:00Z</updated>
+            <author><name>Ann Author</name></author>
+            <category term="research"/>
+            <summary>Atom summary</summary>
+            <content type="html">&lt;p&gt;Atom body&lt;/p&gt;</content>
+        </entry>
+    </feed>"""
+
+    # Entries with a body but no description/summary
+    RSS_CONTENT_ONLY = """<?xml version="1.0" encoding="UTF-8"?>
+    <rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+        <channel>
+            <title>Content Feed</title>
+            <item>
+                <title>Body only</title>
+                <link>https://example.com/body</link>
+                <content:encoded><![CDATA[<p>Only the full body</p>]]></content:encoded>
+                <pubDate>Mon, 15 Jan 2024 10:30:00 GMT</pubDate>
+            </item>
+        </channel>
+    </rss>"""
+
+    ATOM_CONTENT_ONLY = """<?xml version="1.0" encoding="UTF-8"?>
+    <feed xmlns="http://www.w3.org/2005/Atom">
+        <title>Content Atom Feed</title>
+        <entry>
+            <title>Atom body only</title>
+            <link href="https://example.com/atom-body"/>
+            <id>urn:uuid:5678</id>
+            <updated>2024-01-15T10:30:00Z</updated>
+            <content type="html">&lt;p&gt;Only the Atom body&lt;/p&gt;</content>
+        </entry>
+    </feed>"""
+
+    def _both(self, content):
+        from perception_app.mcp_service.routers.rss import parse_feed
+
+        stream = parse_feed(content, None, 50, engine="stream")
+        classic = parse_feed(content, None, 50, engine="feedparser")
+        return stream, classic
+
+    def _comparable(self, article):
+        data = article.model_dump()
+        data["categories"] = sorted(data["categories"])
+        return data
+
+    @pytest.mark.parametrize("feed_name", ["RSS", "ATOM", "RSS_CONTENT_ONLY", "ATOM_CONTENT_ONLY"])
+    def test_matches_feedparser(self, feed_name):
+        """Both engines produce the same articles for well-formed feeds."""
+        stream, classic = self._both(getattr(self, feed_name))
+
+        assert stream["engine"] == "stream"
+        assert classic["engine"] == "feedparser"
+        assert [self._comparable(a) for a in stream["articles"]] == [
+            self._comparable(a) for a in classic["articles"]
+        ]
+
+    @pytest.mark.parametrize("feed_name", ["RSS_CONTENT_ONLY", "ATOM_CONTENT_ONLY"])
+    def test_content_fills_missing_summary(self, feed_name):
+        """Like feedparser, entries with only a body get it as their summary."""
+        stream, _ = self._both(getattr(self, feed_name))
+
+        [article] = stream["articles"]
+        assert article.summary
+        assert "body" in article.summary.lower()
+        assert article.content_snippet
+
+    def test_accepts_raw_bytes_in_declared_encoding(self):
+        """Bytes are decoded according to the XML declaration."""
+        from perception_app.mcp_service.routers.rss import parse_feed
+
+        content = self.RSS.replace("UTF-8", "ISO-8859-1").encode("iso-8859-1")
+        parsed = parse_feed(content, None, 50, engine="stream")
+
+        assert parsed["engine"] == "stream"
+        assert parsed["articles"][0].title == "Caf\u00e9 & Tools"
+
+    KOI8_RSS = """<?xml version="1.0"?>
+    <rss version="2.0">
+        <channel>
+            <title>KOI8 Feed</title>
+            <item>
+                <title>\u041f\u0440\u0438\u0432\u0435\u0442 \u043c\u0438\u0440</title>
+                <link>https://example.com/privet</link>
+            </item>
+        </channel>
+    </rss>"""
+
+    @pytest.mark.parametrize("engine", ["stream", "feedparser"])
+    def test_header_only_charset(self, engine):
+        """A charset given only in the Content-Type header is used by both engines."""
+        from perception_app.mcp_service.routers.rss import parse_feed
+
+        parsed = parse_feed(
+            self.KOI8_RSS.encode("koi8-r"), None, 50,
+            content_type="application/rss+xml; charset=KOI8-R", engine=engine
+        )
+
+        assert parsed["engine"] == ("fallback" if engine == "stream" else "feedparser")
+        assert not parsed.get("malformed")
+        assert [a.title for a in parsed["articles"]] == ["\u041f\u0440\u0438\u0432\u0435\u0442 \u043c\u0438\u0440"]
+
+    def test_declared_encoding_beats_header_for_stream_engine(self):
+        """Bodies that declare their encoding, or UTF-8 headers, stay on the stream engine."""
+        from perception_app.mcp_service.routers.rss import parse_feed
+
+        declared = self.RSS.replace("UTF-8", "ISO-8859-1").encode("iso-8859-1")
+        utf8 = self.RSS.encode("utf-8")
+
+        for content, content_type in [(declared, "text/xml; charset=iso-8859-1"), (utf8, "text/xml; charset=utf-8")]:
+            parsed = parse_feed(content, None, 50, content_type=content_type, engine="stream")
+            assert parsed["engine"] == "stream"
+            assert parsed["articles"][0].title == "Caf\u00e9 & Tools"
+
+    def test_stops_after_max_items(self):
+        """Parsing stops once max_items entries are collected."""
+        from perception_app.mcp_service.routers.feed_parser import iter_entries
+        from perception_app.mcp_service.routers.rss import parse_feed
+
+        # A broken tail well past the first parse chunk is never reached
+        filler = "<item><title>Filler</title><link>https://example.com/f</link></item>" * 5000
+        content = self.RSS.split("</item>")[0] + "</item>" + filler + "<item><title>Broken"
+
+        parsed = parse_feed(content, None, 1, engine="stream")
+
+        assert parsed["engine"] == "stream"
+        assert [a.title for a in parsed["articles"]] == ["Caf\u00e9 & Tools"]
+        assert next(iter_entries(content, chunk_size=64)).title == "Caf\u00e9 & Tools"
+
+    def test_falls_back_to_feedparser_on_malformed_feed(self):
+        """Bodies expat rejects are reparsed by feedparser."""
+        from perception_app.mcp_service.routers.rss import parse_feed
+
+        content = self.RSS.replace("<title>Second</title>", "<title>Second &nbsp; item</title>")
+        parsed = parse_feed(content, None, 50, engine="stream")
+
+        assert parsed["engine"] == "fallback"
+        assert len(parsed["articles"]) == 2
+
+    def test_non_feed_document_falls_back(self):
+        """XML that is not RSS/Atom is handed to feedparser."""
+        from perception_app.mcp_service.routers.rss import parse_feed
+
+        parsed = parse_feed("<html><body>Not a feed</body></html>", None, 50, engine="stream")
+
+        assert parsed["engine"] == "fallback"
+        assert parsed["articles"] == []
+
+
 class TestArticlePydanticModel:
     """Tests for Article Pydantic model."""
 